@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Mercury Alert Delivery Benchmark
+================================
+
+A burst of N alerts to several webhooks, one of which is slow, against
+mock endpoints:
+
+- serial:  the previous delivery flow, one worker sending each alert to
+           every webhook in turn with a new HTTP client per request
+- engine:  AlertManager, a worker per destination on one pooled client,
+           alerts that queue up while a destination is busy sent as digests
+
+Reported per flow: when the fast webhooks had received every alert, when
+the slow one had, and how many requests were made.
+
+Usage:
+    python scripts/bench_alerting.py [--alerts 50] [--webhooks 3] [--slow 0.5]
+        [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mercury.core.alerting import (  # noqa: E402
+    Alert,
+    AlertManager,
+    AlertSeverity,
+    WebhookConfig,
+)
+
+
+class Endpoints:
+    """Mock webhooks: the host "slow" answers after --slow seconds."""
+
+    def __init__(self, slow: float, latency: float):
+        self.slow = slow
+        self.latency = latency
+        self.requests = 0
+        self.alerts = {}
+        self.done_at = {}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        await asyncio.sleep(self.slow if host == "slow" else self.latency)
+        self.requests += 1
+        body = request.read()
+        self.alerts[host] = self.alerts.get(host, 0) + max(1, body.count(b'"fingerprint"'))
+        self.done_at[host] = time.perf_counter()
+        return httpx.Response(200)
+
+
+def alerts(n: int) -> list[Alert]:
+    return [
+        Alert(title=f"alert {i}", message="x", severity=AlertSeverity.ERROR, source="bench")
+        for i in range(n)
+    ]
+
+
+def webhooks(n: int) -> list[WebhookConfig]:
+    names = ["slow"] + [f"fast{i}" for i in range(n - 1)]
+    return [WebhookConfig(url=f"http://{name}/hook", name=name) for name in names]
+
+
+async def serial(args, endpoints: Endpoints) -> None:
+    transport = httpx.MockTransport(endpoints)
+    for alert in alerts(args.alerts):
+        for webhook in webhooks(args.webhooks):
+            async with httpx.AsyncClient(transport=transport) as client:
+                await client.post(webhook.url, json=alert.to_dict())
+
+
+async def engine(args, endpoints: Endpoints) -> None:
+    manager = AlertManager(client=httpx.AsyncClient(transport=httpx.MockTransport(endpoints)))
+    for webhook in webhooks(args.webhooks):
+        manager.add_webhook(webhook)
+    await manager.start()
+    for alert in alerts(args.alerts):
+        await manager.send(alert)
+        await asyncio.sleep(0)
+    await manager.drain()
+    await manager.stop()
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(
+        f"{args.alerts} alerts to {args.webhooks} webhooks, one answering in "
+        f"{args.slow * 1000:.0f} ms, the rest in {args.latency * 1000:.0f} ms"
+    )
+    for name, flow in (("serial", serial), ("engine", engine)):
+        endpoints = Endpoints(args.slow, args.latency)
+        started = time.perf_counter()
+        await flow(args, endpoints)
+        fast = max(t for host, t in endpoints.done_at.items() if host != "slow") - started
+        slow = endpoints.done_at["slow"] - started
+        assert all(count == args.alerts for count in endpoints.alerts.values())
+        print(
+            f"  {name}: fast webhooks done {fast:6.2f} s, slow webhook done {slow:6.2f} s, "
+            f"{endpoints.requests} requests"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--alerts", type=int, default=50)
+    parser.add_argument("--webhooks", type=int, default=3)
+    parser.add_argument("--slow", type=float, default=0.5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Mercury Data Bundle Benchmark
+=============================
+
+Wall time of KiteAdapter.get_data_bundle against MockKite with injected
+per-call latency, quotes + positions + holdings + history for N symbols:
+
+- sequential: the previous bundle flow, each part awaited in turn
+  (quotes, positions, holdings, then history symbol by symbol)
+- planned:    plan_bundle + concurrent fetch (get_data_bundle)
+
+Both paths go through one rate limiter shared by every Kite endpoint;
+--rate/--burst set it (the default approximates Kite's 10 req/s API
+limit). The instruments master is loaded before timing.
+
+Usage:
+    python scripts/bench_data_bundle.py [--symbols 10] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mercury.core import rate_limiter  # noqa: E402
+from mercury.core.rate_limiter import (  # noqa: E402
+    EndpointRateLimiter,
+    TokenBucketRateLimiter,
+)
+from mercury.kite.adapter import KiteAdapter, MockKite  # noqa: E402
+from mercury.kite.models import MarketDataBundle  # noqa: E402
+from mercury.kite.quote_cache import QuoteCache  # noqa: E402
+
+
+def make_adapter(symbols: list[str], latency: float, cache_dir: Path) -> KiteAdapter:
+    records = [
+        {
+            "instrument_token": 100000 + i, "exchange_token": i, "tradingsymbol": symbol,
+            "name": symbol, "expiry": "", "strike": 0.0, "tick_size": 0.05, "lot_size": 1,
+            "instrument_type": "EQ", "segment": "NSE", "exchange": "NSE",
+        }
+        for i, symbol in enumerate(symbols)
+    ]
+    adapter = KiteAdapter(
+        api_key="bench",
+        use_oauth_manager=False,
+        instruments_cache_path=cache_dir / "instruments.csv",
+        quote_cache=QuoteCache(),
+    )
+    adapter._kite = MockKite(latency=latency)
+    adapter._kite.instruments = lambda: records
+    return adapter
+
+
+async def sequential(adapter: KiteAdapter, symbols: list[str]) -> MarketDataBundle:
+    bundle = MarketDataBundle()
+    bundle.quotes = await adapter.get_quotes(symbols)
+    bundle.positions = await adapter.get_positions()
+    bundle.holdings = await adapter.get_holdings()
+    for symbol in symbols:
+        bundle.historical[symbol] = await adapter.get_ohlc(symbol)
+    return bundle
+
+
+async def planned(adapter: KiteAdapter, symbols: list[str]) -> MarketDataBundle:
+    return await adapter.get_data_bundle(symbols, include_history=True)
+
+
+async def timed(flow, symbols: list[str], args, cache_dir: Path) -> float:
+    rate_limiter.kite_limiters = EndpointRateLimiter(
+        {}, TokenBucketRateLimiter(rate=args.rate, burst=args.burst)
+    )
+    adapter = make_adapter(symbols, args.latency, cache_dir)
+    await adapter._get_instruments()
+    started = time.perf_counter()
+    bundle = await flow(adapter, symbols)
+    elapsed = time.perf_counter() - started
+    assert len(bundle.quotes) == len(bundle.historical) == len(symbols)
+    return elapsed
+
+
+async def main(args) -> None:
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    calls = 3 + len(symbols)
+    with tempfile.TemporaryDirectory() as tmp:
+        t_seq = await timed(sequential, symbols, args, Path(tmp))
+        t_plan = await timed(planned, symbols, args, Path(tmp))
+
+    print(
+        f"{len(symbols)} symbols with history, {calls} Kite calls, "
+        f"{args.latency * 1000:.0f} ms latency, limiter {args.rate}/s burst {args.burst}"
+    )
+    print(f"  sequential: {t_seq:6.2f} s")
+    print(f"  planned   : {t_plan:6.2f} s  ({t_seq / t_plan:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--rate", type=float, default=10.0)
+    parser.add_argument("--burst", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Mercury Hedging Benchmark
+=========================
+
+Latency of N calls to a mock endpoint with a heavy tail (most calls
+answer in --fast seconds, a --tail fraction take --slow seconds), run
+--concurrency at a time:
+
+- plain:   each call awaited as is
+- hedged:  Hedger.call(idempotent=True), a second attempt sent once a
+           call outlives the observed p95, within the hedge budget
+
+Reported: p50/p95/p99 call latency and the extra attempts hedging sent.
+
+Usage:
+    python scripts/bench_hedging.py [--calls 400] [--concurrency 8]
+        [--fast 0.05] [--slow 1.0] [--tail 0.05]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mercury.core.metrics import Histogram  # noqa: E402
+from mercury.core.resilience import HedgeConfig, Hedger  # noqa: E402
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def run(args: argparse.Namespace, hedger: Hedger = None) -> list[float]:
+    rng = random.Random(7)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+
+    async def upstream() -> None:
+        slow = rng.random() < args.tail
+        await asyncio.sleep(args.slow if slow else args.fast * rng.uniform(0.8, 1.2))
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            if hedger is None:
+                await upstream()
+            else:
+                await hedger.call(upstream, idempotent=True)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(args.calls)))
+    return latencies
+
+
+async def main(args: argparse.Namespace) -> None:
+    histogram = Histogram("bench_call_seconds", quantiles=True)
+    hedger = Hedger("bench", HedgeConfig(min_hedge_delay_seconds=0.0), histogram=histogram)
+    # Warm the latency distribution so hedging is active from the first call
+    await run(argparse.Namespace(**{**vars(args), "calls": 100}), hedger)
+    sent_before = hedger.stats.hedges_sent
+
+    print(
+        f"{args.calls} calls, {args.concurrency} concurrent, "
+        f"{args.tail:.0%} at {args.slow * 1000:.0f} ms, rest ~{args.fast * 1000:.0f} ms"
+    )
+    for name, h in (("plain", None), ("hedged", hedger)):
+        latencies = await run(args, h)
+        extra = ""
+        if h is not None:
+            extra = f", {h.stats.hedges_sent - sent_before} hedges sent"
+        print(
+            f"  {name:6}: p50 {percentile(latencies, 50) * 1000:6.1f} ms, "
+            f"p95 {percentile(latencies, 95) * 1000:6.1f} ms, "
+            f"p99 {percentile(latencies, 99) * 1000:6.1f} ms{extra}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--fast", type=float, default=0.05)
+    parser.add_argument("--slow", type=float, default=1.0)
+    parser.add_argument("--tail", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Mercury Metrics Benchmark
+=========================
+
+Update throughput of the metrics registry from N threads:
+
+- keyword:  counter.inc(**labels) / histogram.observe(v, **labels),
+            labels sorted and looked up on every call
+- bound:    children from metric.labels(...) kept and updated directly
+
+and the cost of a repeated /metrics scrape with and without changes
+between scrapes.
+
+Usage:
+    python scripts/bench_metrics.py [--threads 4] [--updates 200000]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mercury.core.metrics import MetricsRegistry  # noqa: E402
+
+LABELS = {"service": "chat", "outcome": "ok"}
+
+
+def run_threads(work, threads: int) -> float:
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+def main(args: argparse.Namespace) -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total")
+    histogram = registry.histogram("bench_seconds", quantiles=True)
+    per_thread = args.updates // args.threads
+
+    def keyword():
+        for i in range(per_thread):
+            counter.inc(**LABELS)
+            histogram.observe((i % 1000) / 1000, **LABELS)
+
+    def bound():
+        inc = counter.labels(**LABELS).inc
+        observe = histogram.labels(**LABELS).observe
+        for i in range(per_thread):
+            inc()
+            observe((i % 1000) / 1000)
+
+    total = per_thread * args.threads
+    print(f"{total} counter + histogram updates from {args.threads} threads")
+    for name, work in (("keyword", keyword), ("bound", bound)):
+        elapsed = run_threads(work, args.threads)
+        print(f"  {name:8}: {elapsed:6.2f} s  ({total / elapsed / 1000:7.1f}k updates/s)")
+
+    scrapes = 1000
+    started = time.perf_counter()
+    for _ in range(scrapes):
+        registry.to_prometheus()
+    idle = (time.perf_counter() - started) / scrapes
+    started = time.perf_counter()
+    for _ in range(scrapes):
+        counter.inc(**LABELS)
+        registry.to_prometheus()
+    busy = (time.perf_counter() - started) / scrapes
+    print(f"  scrape (cached)     : {idle * 1e6:7.1f} us")
+    print(f"  scrape (re-rendered): {busy * 1e6:7.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--updates", type=int, default=200000)
+    main(parser.parse_args())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Mercury State Store Benchmark
+=============================
+
+N concurrent writers (conversation saves and setting updates) plus
+concurrent readers against StateStore, compared with the previous
+design: one shared connection, one commit per write, every operation
+serialised behind an asyncio.Lock.
+
+Usage:
+    python scripts/bench_state_store.py [--writes 500] [--reads 500]
+"""
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mercury.core.persistence import ConversationRecord, StateStore  # noqa: E402
+
+
+def record(i: int) -> ConversationRecord:
+    now = datetime.now(timezone.utc)
+    return ConversationRecord(
+        id=f"conv-{i % 50}",
+        created_at=now,
+        updated_at=now,
+        messages=[{"role": "user", "content": "x" * 200}] * 20,
+    )
+
+
+class SerialStore:
+    """The previous access pattern: one connection, lock, commit per write."""
+
+    def __init__(self, path: Path):
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE conversations (id TEXT PRIMARY KEY, created_at TEXT,"
+            " updated_at TEXT, messages TEXT, metadata TEXT)"
+        )
+        self.conn.execute("CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT)")
+        self.lock = asyncio.Lock()
+
+    def _save(self, r: ConversationRecord) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?, ?, ?)",
+            (r.id, r.created_at.isoformat(), r.updated_at.isoformat(),
+             json.dumps(r.messages), "{}"),
+        )
+        self.conn.commit()
+
+    def _get(self, key: str):
+        return self.conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+
+    async def save_conversation(self, r: ConversationRecord) -> None:
+        async with self.lock:
+            await asyncio.to_thread(self._save, r)
+
+    async def get_setting(self, key: str):
+        async with self.lock:
+            return await asyncio.to_thread(self._get, key)
+
+    async def close(self) -> None:
+        self.conn.close()
+
+
+async def workload(store, args) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(store.save_conversation(record(i)) for i in range(args.writes)),
+        *(store.get_setting(f"k{i}") for i in range(args.reads)),
+    )
+    return time.perf_counter() - started
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        serial = SerialStore(Path(tmp) / "serial.db")
+        t_serial = await workload(serial, args)
+        await serial.close()
+
+        store = StateStore(db_path=Path(tmp) / "state.db")
+        await store.initialize()
+        t_store = await workload(store, args)
+        status = store.get_status()
+        await store.close()
+
+    print(f"{args.writes} concurrent conversation saves + {args.reads} reads")
+    print(f"  serialised : {t_serial:6.2f} s")
+    print(f"  StateStore : {t_store:6.2f} s  ({t_serial / t_store:.1f}x), "
+          f"{status['batches_committed']} transactions, "
+          f"{status['writes_coalesced']} writes coalesced")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--writes", type=int, default=500)
+    parser.add_argument("--reads", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
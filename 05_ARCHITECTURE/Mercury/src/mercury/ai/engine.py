@@ -13,7 +13,9 @@ Prompts are designed to encourage synthesis and insight.
 
 AUTONOMOUS ENHANCEMENTS:
 - Rate limiting to prevent API quota exhaustion
+- Token-per-minute windows and load shedding under backlog
 - Circuit breaker integration for resilience
+- Hedged requests and adaptive timeouts against tail latency
 """
 
 import logging
@@ -21,12 +23,26 @@ from typing import Optional
 
 from mercury.core.config import get_settings
 from mercury.core.exceptions import AIEngineError
-from mercury.core.rate_limiter import get_anthropic_limiter, RateLimitExceeded
-from mercury.core.resilience import ai_circuit, CircuitOpenError
+from mercury.core.rate_limiter import (
+    get_anthropic_limiter,
+    get_anthropic_token_limiters,
+    try_acquire_all,
+    RateLimitExceeded,
+)
+from mercury.core.resilience import (
+    ANTHROPIC_HEDGE_CONFIG,
+    ai_circuit,
+    get_hedger,
+    CircuitOpenError,
+)
 from mercury.ai.prompts import MERCURY_SYSTEM_PROMPT, build_user_prompt
 
 logger = logging.getLogger(__name__)
 
+# Rough prompt-size estimate: ~4 characters per token, ~1,600 per image
+CHARS_PER_TOKEN = 4
+TOKENS_PER_IMAGE = 1600
+
 
 class AIEngine:
     """
@@ -41,8 +57,12 @@ class AIEngine:
     Responses are passed through directly from Claude.
     
     AUTONOMOUS FEATURES:
-    - Rate limiting (60 requests/minute sliding window)
+    - Rate limiting (60 requests/minute sliding window, plus optional
+      input/output tokens-per-minute windows)
+    - Load shedding when the projected queue wait is too long
     - Circuit breaker protection (fails fast when API is down)
+    - Hedging: a request slower than the observed p95 gets a second
+      attempt when the rate limits and circuit allow it
     """
     
     def __init__(
@@ -61,20 +81,31 @@ class AIEngine:
         self.api_key = api_key or settings.anthropic_api_key
         self.model = model or settings.anthropic_model
         self.max_tokens = settings.max_tokens
+        self.max_queue_seconds = settings.anthropic_max_queue_seconds
         self._client = None
         self._rate_limiter = get_anthropic_limiter()
+        self._input_limiter, self._output_limiter = get_anthropic_token_limiters()
+        self._hedger = get_hedger(
+            "anthropic.generate", ANTHROPIC_HEDGE_CONFIG, circuits=(ai_circuit,)
+        )
         
     @property
     def client(self):
-        """Get or create Anthropic client."""
+        """
+        Get or create the async Anthropic client.
+        
+        Async rather than the sync client on a worker thread: a hedge
+        loser or a timed-out call is cancelled along with its HTTP
+        request, instead of running on (and being billed) unobserved.
+        """
         if self._client is None:
             if not self.api_key:
                 logger.warning("No Anthropic API key configured, using mock mode")
                 return MockAnthropicClient()
             
             try:
-                from anthropic import Anthropic
-                self._client = Anthropic(api_key=self.api_key)
+                from anthropic import AsyncAnthropic
+                self._client = AsyncAnthropic(api_key=self.api_key)
             except ImportError:
                 logger.warning("anthropic package not installed, using mock mode")
                 return MockAnthropicClient()
@@ -124,9 +155,6 @@ class AIEngine:
             )
         
         try:
-            # Apply rate limiting
-            await self._rate_limiter.acquire()
-            
             # Build the prompt with optional attachment context
             user_prompt = build_user_prompt(
                 query=user_query,
@@ -172,17 +200,34 @@ class AIEngine:
                     "content": user_prompt,
                 })
             
-            # Generate response
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=max_tokens or self.max_tokens,
-                system=MERCURY_SYSTEM_PROMPT,
-                messages=messages,
+            # Apply rate limiting (or shed load if the queue is too long)
+            input_tokens = estimate_input_tokens(MERCURY_SYSTEM_PROMPT, messages)
+            self._check_backlog(input_tokens)
+            await self._rate_limiter.acquire()
+            if self._input_limiter:
+                await self._input_limiter.acquire(input_tokens)
+            if self._output_limiter:
+                await self._output_limiter.acquire(0)
+            
+            # Generate response (hedged if slow)
+            response = await self._hedger.call(
+                lambda: self.client.messages.create(
+                    model=self.model,
+                    max_tokens=max_tokens or self.max_tokens,
+                    system=MERCURY_SYSTEM_PROMPT,
+                    messages=messages,
+                ),
+                idempotent=True,
+                reserve=lambda: self._reserve_hedge(input_tokens),
             )
             
             # Record success with circuit breaker
             ai_circuit.record_success()
             
+            if self._output_limiter:
+                usage = getattr(response, "usage", None)
+                self._output_limiter.record(getattr(usage, "output_tokens", 0) or 0)
+            
             # Extract text from response
             if response.content and len(response.content) > 0:
                 result = response.content[0].text
@@ -203,10 +248,38 @@ class AIEngine:
             logger.error(f"AI generation failed: {e}")
             raise AIEngineError(f"Generation failed: {e}")
     
+    def projected_wait(self, input_tokens: int = 0) -> float:
+        """Estimated seconds a new request would queue behind the rate limits."""
+        waits = [self._rate_limiter.projected_wait()]
+        if self._input_limiter:
+            waits.append(self._input_limiter.projected_wait(input_tokens))
+        if self._output_limiter:
+            waits.append(self._output_limiter.projected_wait(0))
+        return max(waits)
+    
+    def _reserve_hedge(self, input_tokens: int) -> bool:
+        """Take rate-limit capacity for a hedged request only if free now."""
+        return try_acquire_all(
+            (self._rate_limiter, 1),
+            (self._input_limiter, input_tokens),
+            (self._output_limiter, 0),
+        )
+    
+    def _check_backlog(self, input_tokens: int) -> None:
+        """Refuse the request rather than queue past max_queue_seconds."""
+        if self.max_queue_seconds <= 0:
+            return
+        wait = self.projected_wait(input_tokens)
+        if wait > self.max_queue_seconds:
+            raise AIEngineError(
+                f"AI service is busy - estimated wait {wait:.0f}s exceeds "
+                f"{self.max_queue_seconds:.0f}s, please retry shortly"
+            )
+    
     async def health_check(self) -> bool:
         """Check if AI service is available."""
         try:
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=10,
                 messages=[{"role": "user", "content": "Hi"}],
@@ -217,11 +290,28 @@ class AIEngine:
             return False
 
 
+def estimate_input_tokens(system: str, messages: list[dict]) -> int:
+    """Rough input token count for a request, used for token rate limits."""
+    chars = len(system)
+    images = 0
+    for message in messages:
+        content = message.get("content", "")
+        if isinstance(content, str):
+            chars += len(content)
+            continue
+        for block in content:
+            if block.get("type") == "text":
+                chars += len(block.get("text", ""))
+            else:
+                images += 1
+    return chars // CHARS_PER_TOKEN + images * TOKENS_PER_IMAGE
+
+
 class MockAnthropicClient:
     """Mock Anthropic client for development without API access."""
     
     class MockMessages:
-        def create(self, **kwargs):
+        async def create(self, **kwargs):
             """Return mock response."""
             query = kwargs.get("messages", [{}])[-1].get("content", "")
             
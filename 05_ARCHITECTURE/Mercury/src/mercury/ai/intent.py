@@ -15,8 +15,15 @@ import logging
 from dataclasses import dataclass, field
 from typing import Optional
 
+from mercury.ai.engine import estimate_input_tokens
 from mercury.core.config import get_settings
 from mercury.core.logging import get_logger
+from mercury.core.rate_limiter import (
+    get_anthropic_limiter,
+    get_anthropic_token_limiters,
+    try_acquire_all,
+)
+from mercury.core.resilience import ANTHROPIC_HEDGE_CONFIG, ai_circuit, get_hedger
 
 logger = get_logger("mercury.intent")
 
@@ -146,15 +153,17 @@ class IntentResolver:
         """
         self.use_fast_model = use_fast_model
         self._client = None
+        self._rate_limiter = get_anthropic_limiter()
+        self._input_limiter, self._output_limiter = get_anthropic_token_limiters()
     
     @property
     def client(self):
-        """Lazy-initialize Anthropic client."""
+        """Lazy-initialize the async Anthropic client."""
         if self._client is None:
             try:
                 import anthropic
                 settings = get_settings()
-                self._client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+                self._client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
             except ImportError:
                 raise ImportError("anthropic package required for intent resolution")
         return self._client
@@ -186,15 +195,36 @@ class IntentResolver:
             # Use Haiku for speed, Sonnet for accuracy
             model = "claude-sonnet-4-20250514"
             
-            # Make the API call
-            import asyncio
-            response = await asyncio.to_thread(
-                self.client.messages.create,
-                model=model,
-                max_tokens=256,
-                messages=[{"role": "user", "content": prompt}],
+            # Make the API call (hedged if slow, within the Anthropic limits)
+            messages = [{"role": "user", "content": prompt}]
+            input_tokens = estimate_input_tokens("", messages)
+            await self._rate_limiter.acquire()
+            if self._input_limiter:
+                await self._input_limiter.acquire(input_tokens)
+            if self._output_limiter:
+                await self._output_limiter.acquire(0)
+            
+            hedger = get_hedger(
+                "anthropic.intent", ANTHROPIC_HEDGE_CONFIG, circuits=(ai_circuit,)
+            )
+            response = await hedger.call(
+                lambda: self.client.messages.create(
+                    model=model,
+                    max_tokens=256,
+                    messages=messages,
+                ),
+                idempotent=True,
+                reserve=lambda: try_acquire_all(
+                    (self._rate_limiter, 1),
+                    (self._input_limiter, input_tokens),
+                    (self._output_limiter, 0),
+                ),
             )
             
+            if self._output_limiter:
+                usage = getattr(response, "usage", None)
+                self._output_limiter.record(getattr(usage, "output_tokens", 0) or 0)
+            
             # Parse response
             raw_text = response.content[0].text.strip()
             
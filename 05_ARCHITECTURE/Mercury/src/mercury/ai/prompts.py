@@ -89,10 +89,13 @@ def format_market_data(data: dict) -> str:
         lines.append("CURRENT QUOTES:")
         for symbol, quote in data["quotes"].items():
             change_sign = "+" if quote.get("change", 0) >= 0 else ""
+            # Cached quotes say how old they are
+            age = quote.get("age_seconds", 0)
             lines.append(
                 f"  {symbol}: ₹{quote.get('ltp', 0):,.2f} "
                 f"({change_sign}{quote.get('change_percent', 0):.2f}%) "
                 f"Vol: {quote.get('volume', 0):,}"
+                + (f" [{age:.0f}s old]" if age >= 1 else "")
             )
         lines.append("")
     
@@ -16,6 +16,8 @@ AUTONOMOUS ENHANCEMENTS:
 import asyncio
 import json
 import logging
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Optional
@@ -32,17 +34,19 @@ from mercury.core.startup import (
     ServiceStatus,
     perform_launch_readiness_check,
 )
-from mercury.core.health import get_system_health
+from mercury.core.health import get_health_registry, get_system_health
 from mercury.core.logging import get_logger, setup_logging
 from mercury.core.monitor import get_health_monitor, start_health_monitor, stop_health_monitor
 from mercury.core.rate_limiter import get_all_limiter_status
+from mercury.core.resilience import get_all_hedger_status
 from mercury.core.persistence import get_state_store, ConversationRecord, shutdown_state_store
 from mercury.core.shutdown import get_shutdown_handler, save_state_on_shutdown
 from mercury.core.metrics import get_metrics_registry, get_mercury_metrics
 from mercury.core.alerting import get_alert_manager, Alert, AlertSeverity, WebhookConfig
+from mercury.kite.executor import get_kite_executor, shutdown_kite_executor
 from mercury.kite.oauth_manager import get_oauth_manager, TokenExpiredError
 from mercury.chat.engine import ChatEngine
-from mercury.chat.conversation import ConversationManager
+from mercury.chat.conversation import Conversation, ConversationManager
 from mercury.attachments import get_attachment_manager, get_supported_formats
 
 logger = get_logger("mercury.api")
@@ -67,13 +71,136 @@ class QueryResponse(BaseModel):
 # Global state
 _readiness: Optional[LaunchReadiness] = None
 _chat_engine: Optional[ChatEngine] = None
-_conversations: dict[str, ConversationManager] = {}
+# Live conversations in least-recently-used order; idle ones are evicted
+# and reloaded from the message log on next use
+_conversations: "OrderedDict[str, ConversationManager]" = OrderedDict()
+_last_used: dict[str, float] = {}
+
+
+async def _get_conversation(conv_id: str) -> Conversation:
+    """Get a live conversation, loading its recent window from the log if needed."""
+    settings = get_settings()
+    manager = _conversations.get(conv_id)
+    if manager is None:
+        entries, created_at = [], None
+        state_store = get_state_store()
+        try:
+            entries, created_at = await asyncio.gather(
+                state_store.load_messages(conv_id, limit=settings.conversation_window_messages),
+                state_store.load_created_at(conv_id),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load conversation {conv_id}: {e}")
+        # A concurrent request may have loaded it while we awaited; two
+        # live copies would both hand out seqs from the same next_seq
+        manager = _conversations.get(conv_id)
+    if manager is None:
+        manager = ConversationManager()
+        manager.add_conversation(Conversation.from_log(
+            conv_id, entries, created_at=created_at,
+            window=settings.conversation_window_messages,
+        ))
+        _conversations[conv_id] = manager
+    else:
+        _conversations.move_to_end(conv_id)
+    _last_used[conv_id] = time.monotonic()
+    _evict_idle_conversations()
+    return manager.get_active_conversation()
+
+
+def _evict_idle_conversations() -> int:
+    """
+    Drop idle (or least recently used, over capacity) conversations.
+    
+    Only conversations whose messages are all in the log are dropped;
+    the rest stay until they are saved.
+    """
+    settings = get_settings()
+    cutoff = time.monotonic() - settings.conversation_idle_seconds
+    evicted = 0
+    for _ in range(len(_conversations)):
+        conv_id = next(iter(_conversations))
+        over_capacity = len(_conversations) > settings.max_live_conversations
+        if not over_capacity and _last_used.get(conv_id, 0.0) > cutoff:
+            break  # LRU order: everything after was used more recently
+        conv = _conversations[conv_id].get_active_conversation()
+        if conv.unsaved_messages():
+            _conversations.move_to_end(conv_id)
+            continue
+        del _conversations[conv_id]
+        _last_used.pop(conv_id, None)
+        evicted += 1
+    if evicted:
+        logger.debug(f"Evicted {evicted} idle conversations")
+    return evicted
+
+
+def _forget_conversation(conv_id: str) -> bool:
+    """Drop a conversation from memory; True if it was live."""
+    _last_used.pop(conv_id, None)
+    return _conversations.pop(conv_id, None) is not None
+
+
+def _conversation_record(conv_id: str) -> Optional[ConversationRecord]:
+    """The not-yet-logged messages of a live conversation, for the state store."""
+    manager = _conversations.get(conv_id)
+    conv = manager.get_active_conversation() if manager else None
+    if conv is None:
+        return None
+    return ConversationRecord(
+        id=conv_id,
+        created_at=conv.created_at,
+        updated_at=datetime.now(timezone.utc),
+        messages=[msg.to_log_entry() for msg in conv.unsaved_messages()],
+    )
+
+
+def _conversation_saved(record: ConversationRecord) -> None:
+    """Mark the messages flush_dirty() appended as saved, so they can be trimmed."""
+    manager = _conversations.get(record.id)
+    conv = manager.get_active_conversation() if manager else None
+    if conv is not None and record.messages:
+        conv.mark_saved(record.messages[-1]["seq"] + 1)
+
+
+async def _flush_dirty_loop(interval: float) -> None:
+    """Retry appends for conversations whose last save failed."""
+    state_store = get_state_store()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            saved = await state_store.flush_dirty()
+        except Exception as e:
+            logger.warning(f"Conversation flush failed: {e}")
+            continue
+        if saved:
+            logger.info(f"Saved {saved} conversations after earlier failures")
+
+
+async def _persist_conversation(conv_id: str, conv: Conversation) -> None:
+    """Append a conversation's new messages to the log and trim its window."""
+    unsaved = conv.unsaved_messages()
+    if not unsaved:
+        return
+    state_store = get_state_store()
+    try:
+        await state_store.append_messages(ConversationRecord(
+            id=conv_id,
+            created_at=conv.created_at,
+            updated_at=datetime.now(timezone.utc),
+            messages=[msg.to_log_entry() for msg in unsaved],
+        ))
+    except Exception as e:
+        logger.warning(f"Failed to save conversation {conv_id}: {e}")
+        state_store.mark_dirty(conv_id)
+        return
+    conv.mark_saved(unsaved[-1].seq + 1)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager with state persistence."""
-    global _readiness, _chat_engine, _conversations
+    global _readiness, _chat_engine
     
     # Startup
     logger.info("Starting Mercury API...")
@@ -81,25 +208,13 @@ async def lifespan(app: FastAPI):
     # Initialize state store
     state_store = get_state_store()
     await state_store.initialize()
+    state_store.set_conversation_source(_conversation_record, on_saved=_conversation_saved)
+    flush_task = asyncio.create_task(
+        _flush_dirty_loop(get_settings().conversation_flush_seconds)
+    )
     logger.info("State persistence initialized")
     
-    # Load previous conversations from storage
-    try:
-        saved_convs = await state_store.list_conversations(limit=10)
-        for conv_record in saved_convs:
-            manager = ConversationManager()
-            conv = manager.create_conversation(conv_record.id)
-            # Restore messages
-            for msg in conv_record.messages:
-                if msg.get("role") == "user":
-                    conv.add_user_message(msg.get("content", ""))
-                else:
-                    conv.add_assistant_message(msg.get("content", ""))
-            _conversations[conv_record.id] = manager
-        if saved_convs:
-            logger.info(f"Restored {len(saved_convs)} conversations from storage")
-    except Exception as e:
-        logger.warning(f"Failed to restore conversations: {e}")
+    # Conversations are loaded from the message log on first use
     
     # Initialize and verify APIs
     _readiness = await perform_launch_readiness_check()
@@ -123,31 +238,29 @@ async def lifespan(app: FastAPI):
     
     yield
     
-    # Shutdown - save all conversations
+    # Shutdown - save conversations changed since they were last saved
     logger.info("Shutting down Mercury API...")
     
-    # Save all active conversations
-    for conv_id, manager in _conversations.items():
-        try:
-            conv = manager.get_active_conversation()
-            if conv:
-                record = ConversationRecord(
-                    id=conv_id,
-                    created_at=datetime.now(timezone.utc),
-                    updated_at=datetime.now(timezone.utc),
-                    messages=conv.get_history(),
-                    metadata={},
-                )
-                await state_store.save_conversation(record)
-        except Exception as e:
-            logger.warning(f"Failed to save conversation {conv_id}: {e}")
-    
-    logger.info(f"Saved {len(_conversations)} conversations to storage")
+    flush_task.cancel()
+    try:
+        await flush_task
+    except asyncio.CancelledError:
+        pass
+    saved = await state_store.flush_dirty()
+    logger.info(f"Saved {saved} changed conversations to storage")
+    _conversations.clear()
+    _last_used.clear()
     
     # Stop background health monitor
     await stop_health_monitor()
     logger.info("Background health monitor stopped")
     
+    # Stop alert delivery and close its HTTP client
+    await get_alert_manager().stop()
+    
+    # Stop the Kite client thread pool
+    shutdown_kite_executor()
+    
     # Close state store
     await shutdown_state_store()
     logger.info("State persistence closed")
@@ -432,8 +545,13 @@ def create_app() -> FastAPI:
         monitor = get_health_monitor()
         return {
             "monitor": monitor.get_status(),
+            "health": get_health_registry().snapshot().to_dict(),
             "trend": monitor.get_health_trend(minutes=10),
             "rate_limiters": get_all_limiter_status(),
+            "kite_executor": get_kite_executor().get_status(),
+            "state_store": get_state_store().get_status(),
+            "alerting": get_alert_manager().get_status(),
+            "hedging": get_all_hedger_status(),
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
     
@@ -446,7 +564,7 @@ def create_app() -> FastAPI:
         monitor.subscribe(websocket)
         
         try:
-            # Send initial health status
+            # Send initial health status (cached; only expired components are probed)
             health = await get_system_health()
             await websocket.send_json({
                 "type": "health_update",
@@ -565,20 +683,14 @@ def create_app() -> FastAPI:
         
         Supports file attachments for data analysis.
         """
-        global _chat_engine, _conversations
+        global _chat_engine
         
         if _chat_engine is None:
             _chat_engine = ChatEngine()
         
         # Get or create conversation
         conv_id = request.conversation_id or f"conv_{datetime.now(timezone.utc).timestamp()}"
-        if conv_id not in _conversations:
-            # Create a ConversationManager and get/create a conversation
-            manager = ConversationManager()
-            conv = manager.create_conversation()
-            _conversations[conv_id] = manager
-        
-        conversation = _conversations[conv_id].get_active_conversation()
+        conversation = await _get_conversation(conv_id)
         
         # Build attachment context if provided
         attachment_context = ""
@@ -619,6 +731,7 @@ def create_app() -> FastAPI:
                 attachment_context=attachment_context if attachment_context else None,
                 image_attachments=image_attachments if image_attachments else None,
             )
+            await _persist_conversation(conv_id, conversation)
             
             return QueryResponse(
                 response=response,
@@ -636,13 +749,29 @@ def create_app() -> FastAPI:
                 data_sources=[],
             )
     
+    @app.get("/api/chat/{conversation_id}/messages")
+    async def conversation_messages(
+        conversation_id: str,
+        before: Optional[int] = Query(None, description="Only messages with seq below this"),
+        limit: int = Query(50, ge=1, le=200),
+    ):
+        """Page back through a conversation's message log (oldest first)."""
+        messages = await get_state_store().load_messages(
+            conversation_id, before_seq=before, limit=limit
+        )
+        return {
+            "conversation_id": conversation_id,
+            "messages": messages,
+            "has_more": bool(messages) and messages[0]["seq"] > 0,
+        }
+    
     @app.delete("/api/chat/{conversation_id}")
     async def clear_conversation(conversation_id: str):
         """Clear a conversation."""
-        global _conversations
+        live = _forget_conversation(conversation_id)
+        stored = await get_state_store().delete_conversation(conversation_id)
         
-        if conversation_id in _conversations:
-            del _conversations[conversation_id]
+        if live or stored:
             return {"status": "cleared", "conversation_id": conversation_id}
         
         return {"status": "not_found", "conversation_id": conversation_id}
@@ -654,14 +783,13 @@ def create_app() -> FastAPI:
     @app.websocket("/ws/chat")
     async def websocket_chat(websocket: WebSocket):
         """WebSocket endpoint for real-time chat."""
-        global _chat_engine, _conversations
+        global _chat_engine
         
         await websocket.accept()
         
+        # The session holds only its ID between messages, so an idle
+        # session's conversation can be evicted and reloaded
         conv_id = f"ws_{datetime.now(timezone.utc).timestamp()}"
-        manager = ConversationManager()
-        _conversations[conv_id] = manager
-        conversation = manager.create_conversation()
         
         if _chat_engine is None:
             _chat_engine = ChatEngine()
@@ -685,10 +813,12 @@ def create_app() -> FastAPI:
                 
                 # Process query
                 try:
+                    conversation = await _get_conversation(conv_id)
                     response = await _chat_engine.process(
                         query=query,
                         conversation=conversation,
                     )
+                    await _persist_conversation(conv_id, conversation)
                     
                     await websocket.send_json({
                         "type": "response",
@@ -705,8 +835,7 @@ def create_app() -> FastAPI:
         
         except WebSocketDisconnect:
             logger.info(f"WebSocket disconnected: {conv_id}")
-            if conv_id in _conversations:
-                del _conversations[conv_id]
+            _forget_conversation(conv_id)
     
     # =========================================================================
     # FRONTEND - BEAUTIFUL UI
@@ -6,6 +6,12 @@ Manages conversation state and history.
 
 CONSTITUTIONAL: MR-004 - Conversation Continuity
 This module maintains context across conversation turns.
+
+Every message gets a sequence number, increasing per conversation. The
+state store keeps the full history as an append-only log keyed by
+(conversation id, seq); a Conversation holds only a bounded window of
+recent messages in memory once older ones are safely in the log, and
+older turns are read back from the log on demand.
 """
 
 from dataclasses import dataclass, field
@@ -27,6 +33,7 @@ class Message:
     content: str
     timestamp: datetime = field(default_factory=_utc_now)
     data_context: Optional[dict] = None  # Market data used for this message
+    seq: int = -1  # Position in the conversation's message log
     
     def to_dict(self) -> dict:
         """Convert to dictionary for API calls."""
@@ -35,6 +42,20 @@ class Message:
             "content": self.content,
             "timestamp": self.timestamp.isoformat(),
         }
+    
+    def to_log_entry(self) -> dict:
+        """Convert to a message log entry (to_dict plus seq)."""
+        return {**self.to_dict(), "seq": self.seq}
+    
+    @classmethod
+    def from_log_entry(cls, entry: dict) -> "Message":
+        """Rebuild a message from a message log entry."""
+        return cls(
+            role=entry["role"],
+            content=entry["content"],
+            timestamp=datetime.fromisoformat(entry["timestamp"]),
+            seq=entry["seq"],
+        )
 
 
 @dataclass
@@ -43,32 +64,41 @@ class Conversation:
     Conversation session with history.
     
     CONSTITUTIONAL: MR-004 - Maintains context across turns.
+    
+    With a window set, messages beyond the newest `window` are dropped
+    from memory once they have been saved to the message log
+    (mark_saved); unsaved messages are always kept.
     """
     
     id: str = field(default_factory=lambda: str(uuid4()))
     messages: list[Message] = field(default_factory=list)
     created_at: datetime = field(default_factory=_utc_now)
     instrument_context: list[str] = field(default_factory=list)
+    window: Optional[int] = None
+    next_seq: int = 0
+    saved_seq: int = 0  # Every message with seq < saved_seq is in the log
     
-    def add_user_message(self, content: str) -> Message:
-        """Add a user message to the conversation."""
-        msg = Message(role="user", content=content)
+    def _append(self, msg: Message) -> Message:
+        msg.seq = self.next_seq
+        self.next_seq += 1
         self.messages.append(msg)
         return msg
     
+    def add_user_message(self, content: str) -> Message:
+        """Add a user message to the conversation."""
+        return self._append(Message(role="user", content=content))
+    
     def add_assistant_message(
         self,
         content: str,
         data_context: Optional[dict] = None,
     ) -> Message:
         """Add an assistant message to the conversation."""
-        msg = Message(
+        return self._append(Message(
             role="assistant",
             content=content,
             data_context=data_context,
-        )
-        self.messages.append(msg)
-        return msg
+        ))
     
     def get_history(self, limit: int = 10) -> list[dict]:
         """
@@ -80,8 +110,55 @@ class Conversation:
         Returns:
             List of message dicts for API consumption
         """
-        recent = self.messages[-limit:] if limit else self.messages
-        return [msg.to_dict() for msg in recent]
+        start = max(len(self.messages) - limit, 0) if limit else 0
+        return [self.messages[i].to_dict() for i in range(start, len(self.messages))]
+    
+    def unsaved_messages(self) -> list[Message]:
+        """Messages not yet in the message log, oldest first."""
+        unsaved = []
+        for msg in reversed(self.messages):
+            if msg.seq < self.saved_seq:
+                break
+            unsaved.append(msg)
+        unsaved.reverse()
+        return unsaved
+    
+    def mark_saved(self, seq: int) -> None:
+        """Record that messages before seq are in the log and trim the window."""
+        self.saved_seq = max(self.saved_seq, seq)
+        if self.window is None or len(self.messages) <= self.window:
+            return
+        excess = len(self.messages) - self.window
+        drop = 0
+        while drop < excess and self.messages[drop].seq < self.saved_seq:
+            drop += 1
+        if drop:
+            del self.messages[:drop]
+    
+    @property
+    def first_seq(self) -> int:
+        """Seq of the oldest message in memory (older ones are only in the log)."""
+        return self.messages[0].seq if self.messages else self.next_seq
+    
+    @classmethod
+    def from_log(
+        cls,
+        conv_id: str,
+        entries: list[dict],
+        created_at: Optional[datetime] = None,
+        window: Optional[int] = None,
+    ) -> "Conversation":
+        """Rebuild a conversation from the newest entries of its message log."""
+        messages = [Message.from_log_entry(entry) for entry in entries]
+        next_seq = messages[-1].seq + 1 if messages else 0
+        return cls(
+            id=conv_id,
+            messages=messages,
+            created_at=created_at or _utc_now(),
+            window=window,
+            next_seq=next_seq,
+            saved_seq=next_seq,
+        )
     
     def update_instrument_context(self, instruments: list[str]) -> None:
         """Update the instruments mentioned in conversation."""
@@ -100,7 +177,7 @@ class Conversation:
     
     @property
     def turn_count(self) -> int:
-        """Number of conversation turns (user messages)."""
+        """Number of conversation turns (user messages) in memory."""
         return len([m for m in self.messages if m.role == "user"])
     
     @property
@@ -121,9 +198,19 @@ class ConversationManager:
         self._conversations: dict[str, Conversation] = {}
         self._active_id: Optional[str] = None
     
-    def create_conversation(self) -> Conversation:
-        """Create a new conversation."""
-        conv = Conversation()
+    def create_conversation(
+        self,
+        conv_id: Optional[str] = None,
+        window: Optional[int] = None,
+    ) -> Conversation:
+        """Create a new conversation (optionally with a given ID and window)."""
+        conv = Conversation(window=window)
+        if conv_id:
+            conv.id = conv_id
+        return self.add_conversation(conv)
+    
+    def add_conversation(self, conv: Conversation) -> Conversation:
+        """Add an existing conversation and make it active."""
         self._conversations[conv.id] = conv
         self._active_id = conv.id
         return conv
@@ -26,6 +26,7 @@ This is the core of Mercury - it:
 
 import logging
 import re
+import time
 from typing import Optional
 
 from mercury.ai.engine import AIEngine
@@ -33,6 +34,7 @@ from mercury.ai.intent import get_intent_resolver, IntentResult
 from mercury.chat.conversation import Conversation
 from mercury.kite.adapter import KiteAdapter
 from mercury.core.exceptions import MercuryError
+from mercury.core.metrics import get_mercury_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +68,13 @@ class ChatEngine:
         self.ai = ai or AIEngine()
         self.use_llm_intent = use_llm_intent
         self._intent_resolver = None
+        
+        # Metric children bound once; process() only updates them
+        metrics = get_mercury_metrics()
+        queries = metrics["chat_queries_total"]
+        self._queries_ok = queries.labels(outcome="ok")
+        self._queries_error = queries.labels(outcome="error")
+        self._query_duration = metrics["chat_query_duration"].labels()
     
     @property
     def intent_resolver(self):
@@ -104,6 +113,8 @@ class ChatEngine:
         Returns:
             AI-generated response grounded in market data
         """
+        started = time.perf_counter()
+        queries = self._queries_error
         try:
             # 1. Add user message to conversation
             conversation.add_user_message(query)
@@ -166,6 +177,7 @@ class ChatEngine:
             # 9. Add assistant response to conversation
             conversation.add_assistant_message(response, market_data)
             
+            queries = self._queries_ok
             return response
             
         except MercuryError as e:
@@ -178,6 +190,9 @@ class ChatEngine:
             error_response = "I encountered an unexpected error. Please try again."
             conversation.add_assistant_message(error_response)
             return error_response
+        finally:
+            self._query_duration.observe(time.perf_counter() - started)
+            queries.inc()
     
     def identify_instruments(
         self,
@@ -13,11 +13,13 @@ MISSION-CRITICAL STANDARD: Observability Pillar 3 - Alerting
 
 import asyncio
 import hashlib
+import heapq
 import json
+import random
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
@@ -150,6 +152,89 @@ class WebhookConfig:
     enabled: bool = True
 
 
+SEVERITY_ORDER = [
+    AlertSeverity.INFO,
+    AlertSeverity.WARNING,
+    AlertSeverity.ERROR,
+    AlertSeverity.CRITICAL,
+]
+
+
+class _Destination:
+    """A webhook with its own bounded queue and delivery worker."""
+    
+    def __init__(self, webhook: WebhookConfig, queue_size: int):
+        self.webhook = webhook
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.task: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.digests = 0
+    
+    def accepts(self, alert: Alert) -> bool:
+        """Check whether the alert passes this webhook's filters."""
+        return (
+            self.webhook.enabled
+            and SEVERITY_ORDER.index(alert.severity)
+            >= SEVERITY_ORDER.index(self.webhook.min_severity)
+        )
+    
+    def offer(self, alert: Alert) -> None:
+        """Queue an alert, dropping the oldest queued alert when full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+        self.queue.put_nowait(alert)
+    
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queue.qsize(),
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "digests": self.digests,
+            "running": self.task is not None and not self.task.done(),
+        }
+
+
+def format_payload(webhook_format: str, alerts: List[Alert]) -> Dict[str, Any]:
+    """
+    Build the webhook body for one alert or a digest of several.
+    
+    A digest keeps each alert's own formatting: Slack attachments and
+    Discord embeds are concatenated under a summary line, JSON bodies
+    are wrapped in an ``alerts`` list.
+    """
+    if len(alerts) == 1:
+        alert = alerts[0]
+        if webhook_format == "slack":
+            return alert.to_slack_payload()
+        if webhook_format == "discord":
+            return alert.to_discord_payload()
+        return alert.to_dict()
+    
+    summary = f"Mercury: {len(alerts)} alerts"
+    if webhook_format == "slack":
+        return {
+            "text": summary,
+            "attachments": [
+                a.to_slack_payload()["attachments"][0] for a in alerts
+            ],
+        }
+    if webhook_format == "discord":
+        return {
+            "content": summary,
+            "embeds": [a.to_discord_payload()["embeds"][0] for a in alerts],
+        }
+    return {
+        "digest": True,
+        "count": len(alerts),
+        "alerts": [a.to_dict() for a in alerts],
+    }
+
+
 class AlertManager:
     """
     Manages alert routing and delivery.
@@ -159,6 +244,15 @@ class AlertManager:
     - Alert deduplication
     - Async delivery with retry
     - Rate limiting per destination
+    
+    Delivery engine:
+    - One pooled HTTP client shared by every destination
+    - A bounded queue and worker per destination, so a slow or failing
+      endpoint only delays its own alerts
+    - Alerts queued while a destination is busy are sent as one digest
+    - Exponential backoff with full jitter between retries
+    - Fingerprint expiry kept in a heap, so cleanup only touches
+      fingerprints that have expired
     """
     
     # Deduplication window
@@ -166,49 +260,87 @@ class AlertManager:
     
     # Retry configuration
     MAX_RETRIES = 3
-    RETRY_DELAY = 5  # seconds
+    RETRY_DELAY = 5  # seconds, base of the exponential backoff
+    RETRY_MAX_DELAY = 60  # seconds
     
-    def __init__(self):
+    # Delivery configuration
+    REQUEST_TIMEOUT = 10.0
+    QUEUE_SIZE = 100  # per destination
+    MAX_DIGEST = 10  # Discord accepts at most 10 embeds per message
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self._webhooks: List[WebhookConfig] = []
+        self._destinations: Dict[str, _Destination] = {}
         self._sent_fingerprints: Dict[str, datetime] = {}
+        self._expiry: List[Tuple[datetime, str]] = []
         self._lock = asyncio.Lock()
-        self._delivery_queue: asyncio.Queue = asyncio.Queue()
-        self._worker_task: Optional[asyncio.Task] = None
+        self._client = client
+        self._owns_client = client is None
+        self._running = False
     
     def add_webhook(self, config: WebhookConfig) -> None:
-        """Add a webhook destination."""
+        """Add a webhook destination, replacing one with the same name."""
+        self.remove_webhook(config.name)
         self._webhooks.append(config)
+        destination = _Destination(config, self.QUEUE_SIZE)
+        self._destinations[config.name] = destination
+        if self._running:
+            self._start_worker(destination)
         logger.info(f"Added webhook: {config.name}")
     
     def remove_webhook(self, name: str) -> bool:
         """Remove a webhook by name."""
         original_len = len(self._webhooks)
         self._webhooks = [w for w in self._webhooks if w.name != name]
+        destination = self._destinations.pop(name, None)
+        if destination is not None and destination.task is not None:
+            destination.task.cancel()
         return len(self._webhooks) < original_len
     
     async def start(self) -> None:
-        """Start the alert delivery worker."""
-        if self._worker_task is None or self._worker_task.done():
-            self._worker_task = asyncio.create_task(self._delivery_worker())
-            logger.info("Alert delivery worker started")
+        """Start a delivery worker for every destination."""
+        self._running = True
+        started = 0
+        for destination in self._destinations.values():
+            if destination.task is None or destination.task.done():
+                self._start_worker(destination)
+                started += 1
+        if started:
+            logger.info(f"Alert delivery workers started: {started}")
     
     async def stop(self) -> None:
-        """Stop the alert delivery worker."""
-        if self._worker_task and not self._worker_task.done():
-            self._worker_task.cancel()
-            try:
-                await self._worker_task
-            except asyncio.CancelledError:
-                pass
-            logger.info("Alert delivery worker stopped")
+        """Stop the delivery workers and close the HTTP client."""
+        self._running = False
+        tasks = [
+            d.task for d in self._destinations.values()
+            if d.task is not None and not d.task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+        if tasks:
+            logger.info("Alert delivery workers stopped")
+    
+    async def drain(self) -> None:
+        """Wait until every queued alert has been delivered or given up on."""
+        await asyncio.gather(
+            *(d.queue.join() for d in list(self._destinations.values()))
+        )
     
     async def send(self, alert: Alert) -> None:
         """
         Send an alert to all configured webhooks.
         
-        Alerts are deduplicated and queued for async delivery.
+        Alerts are deduplicated and queued for async delivery on each
+        matching destination.
         """
         async with self._lock:
+            # Clean old fingerprints
+            self._cleanup_fingerprints()
+            
             # Check deduplication
             if self._is_duplicate(alert):
                 logger.debug(f"Alert deduplicated: {alert.fingerprint}")
@@ -216,12 +348,14 @@ class AlertManager:
             
             # Mark as sent
             self._sent_fingerprints[alert.fingerprint] = alert.timestamp
-            
-            # Clean old fingerprints
-            self._cleanup_fingerprints()
+            heapq.heappush(
+                self._expiry, (alert.timestamp + self.DEDUP_WINDOW, alert.fingerprint)
+            )
         
         # Queue for delivery
-        await self._delivery_queue.put(alert)
+        for destination in self._destinations.values():
+            if destination.accepts(alert):
+                destination.offer(alert)
         logger.info(
             f"Alert queued: {alert.title}",
             context={"severity": alert.severity.value, "fingerprint": alert.fingerprint}
@@ -238,55 +372,70 @@ class AlertManager:
     def _cleanup_fingerprints(self) -> None:
         """Remove expired fingerprints."""
         now = datetime.now(timezone.utc)
-        expired = [
-            fp for fp, ts in self._sent_fingerprints.items()
-            if now - ts >= self.DEDUP_WINDOW
-        ]
-        for fp in expired:
-            del self._sent_fingerprints[fp]
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, fp = heapq.heappop(self._expiry)
+            # A fingerprint sent again after expiring has a newer heap entry
+            sent_at = self._sent_fingerprints.get(fp)
+            if sent_at is not None and sent_at + self.DEDUP_WINDOW <= expires_at:
+                del self._sent_fingerprints[fp]
+    
+    def _start_worker(self, destination: _Destination) -> None:
+        destination.task = asyncio.create_task(
+            self._delivery_worker(destination),
+            name=f"alert-delivery-{destination.webhook.name}",
+        )
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.REQUEST_TIMEOUT)
+            self._owns_client = True
+        return self._client
     
-    async def _delivery_worker(self) -> None:
-        """Background worker that delivers alerts."""
+    async def _delivery_worker(self, destination: _Destination) -> None:
+        """Deliver one destination's alerts, batching any that queued up."""
+        queue = destination.queue
         while True:
             try:
-                alert = await self._delivery_queue.get()
-                await self._deliver_alert(alert)
-                self._delivery_queue.task_done()
+                alerts = [await queue.get()]
+            except asyncio.CancelledError:
+                break
+            while len(alerts) < self.MAX_DIGEST and not queue.empty():
+                alerts.append(queue.get_nowait())
+            try:
+                await self._deliver_alerts(destination, alerts)
             except asyncio.CancelledError:
                 break
             except Exception as e:
+                destination.failed += len(alerts)
                 logger.error(f"Alert delivery error: {e}")
+            finally:
+                for _ in alerts:
+                    queue.task_done()
     
-    async def _deliver_alert(self, alert: Alert) -> None:
-        """Deliver alert to all matching webhooks."""
-        for webhook in self._webhooks:
-            if not webhook.enabled:
-                continue
-            
-            # Check severity threshold
-            severity_order = [
-                AlertSeverity.INFO,
-                AlertSeverity.WARNING,
-                AlertSeverity.ERROR,
-                AlertSeverity.CRITICAL,
-            ]
-            if severity_order.index(alert.severity) < severity_order.index(webhook.min_severity):
-                continue
-            
-            # Format payload
-            if webhook.format == "slack":
-                payload = alert.to_slack_payload()
-            elif webhook.format == "discord":
-                payload = alert.to_discord_payload()
-            else:
-                payload = alert.to_dict()
-            
-            # Send with retry
-            success = await self._send_with_retry(webhook, payload)
-            if success:
-                logger.debug(f"Alert delivered to {webhook.name}")
-            else:
-                logger.warning(f"Failed to deliver alert to {webhook.name}")
+    async def _deliver_alerts(
+        self,
+        destination: _Destination,
+        alerts: List[Alert],
+    ) -> None:
+        """Deliver one alert or a digest of several to a destination."""
+        webhook = destination.webhook
+        payload = format_payload(webhook.format, alerts)
+        
+        success = await self._send_with_retry(webhook, payload)
+        if success:
+            destination.delivered += len(alerts)
+            if len(alerts) > 1:
+                destination.digests += 1
+            logger.debug(f"Alert delivered to {webhook.name}", context={"alerts": len(alerts)})
+        else:
+            destination.failed += len(alerts)
+            logger.warning(f"Failed to deliver alert to {webhook.name}")
+    
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry ``attempt + 1``."""
+        ceiling = min(self.RETRY_MAX_DELAY, self.RETRY_DELAY * 2 ** attempt)
+        return random.uniform(0, ceiling)
     
     async def _send_with_retry(
         self,
@@ -294,24 +443,23 @@ class AlertManager:
         payload: Dict[str, Any],
     ) -> bool:
         """Send payload to webhook with retry."""
+        client = self._get_client()
         for attempt in range(self.MAX_RETRIES):
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        webhook.url,
-                        json=payload,
-                        headers=webhook.headers,
-                        timeout=10.0,
-                    )
-                    
-                    if response.status_code < 300:
-                        return True
-                    
-                    logger.warning(
-                        f"Webhook returned {response.status_code}",
-                        context={"webhook": webhook.name, "attempt": attempt + 1}
-                    )
-                    
+                response = await client.post(
+                    webhook.url,
+                    json=payload,
+                    headers=webhook.headers,
+                )
+                
+                if response.status_code < 300:
+                    return True
+                
+                logger.warning(
+                    f"Webhook returned {response.status_code}",
+                    context={"webhook": webhook.name, "attempt": attempt + 1}
+                )
+                
             except Exception as e:
                 logger.warning(
                     f"Webhook request failed: {e}",
@@ -319,9 +467,19 @@ class AlertManager:
                 )
             
             if attempt < self.MAX_RETRIES - 1:
-                await asyncio.sleep(self.RETRY_DELAY * (attempt + 1))
+                await asyncio.sleep(self._backoff(attempt))
         
         return False
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get delivery status per destination."""
+        return {
+            "running": self._running,
+            "fingerprints": len(self._sent_fingerprints),
+            "destinations": {
+                name: d.get_status() for name, d in self._destinations.items()
+            },
+        }
 
 
 # Global alert manager
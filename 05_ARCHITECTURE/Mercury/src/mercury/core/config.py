@@ -47,10 +47,48 @@ class Settings(BaseSettings):
         default=20, 
         description="Max messages to include in context"
     )
+    conversation_window_messages: int = Field(
+        default=40,
+        description="Messages kept in memory per conversation (older ones stay in the log)"
+    )
+    conversation_idle_seconds: float = Field(
+        default=1800.0,
+        description="Idle time after which a conversation is evicted from memory"
+    )
+    max_live_conversations: int = Field(
+        default=1000,
+        description="Most conversations held in memory at once"
+    )
+    conversation_flush_seconds: float = Field(
+        default=30.0,
+        description="How often conversations whose save failed are retried"
+    )
 
     # Rate Limiting
     kite_rate_limit_per_second: int = Field(default=1)
+    kite_executor_workers: int = Field(
+        default=4,
+        description="Threads running blocking Kite client calls (max calls in flight)"
+    )
     claude_rate_limit_per_minute: int = Field(default=60)
+    anthropic_input_tokens_per_minute: int = Field(
+        default=0,
+        description="Anthropic input tokens per minute for your tier (0 = no limit)"
+    )
+    anthropic_output_tokens_per_minute: int = Field(
+        default=0,
+        description="Anthropic output tokens per minute for your tier (0 = no limit)"
+    )
+    anthropic_max_queue_seconds: float = Field(
+        default=30.0,
+        description="Refuse a chat request instead of queueing longer than this (0 = always queue)"
+    )
+
+    # Market data
+    quote_cache_ttl_seconds: float = Field(
+        default=1.0,
+        description="Seconds a Kite quote is reused across requests (0 to only coalesce)"
+    )
 
 
 @lru_cache
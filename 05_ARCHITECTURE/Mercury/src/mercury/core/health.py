@@ -8,6 +8,17 @@ MISSION-CRITICAL STANDARD: Observability
 - Health checks for all external dependencies
 - Startup validation
 - Liveness and readiness probes
+
+HealthRegistry runs the component probes concurrently, each with its
+own timeout, and caches each result for that component's TTL: callers
+(the monitor, HTTP routes, WebSocket clients) read the cached snapshot
+and only stale components are probed again. Passive signals update
+components between probes without any API call:
+- circuit breaker transitions (open -> unhealthy, half-open -> degraded,
+  closed -> re-probe)
+- a recent successful call through a component's circuit keeps a
+  healthy result fresh
+- requests rejected by a component's rate limiters -> degraded
 """
 
 import asyncio
@@ -15,10 +26,19 @@ import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Optional
 
+from mercury.core import rate_limiter
 from mercury.core.logging import get_logger
-from mercury.core.resilience import get_all_circuit_health, degradation
+from mercury.core.resilience import (
+    KITE_ENDPOINTS,
+    CircuitBreaker,
+    CircuitState,
+    degradation,
+    get_all_circuit_health,
+    get_circuit_breaker,
+    get_kite_circuit,
+)
 
 logger = get_logger("mercury.health")
 
@@ -244,54 +264,348 @@ async def check_memory_health() -> ComponentHealth:
         )
 
 
-async def get_system_health() -> SystemHealth:
+@dataclass
+class HealthProbe:
+    """An active component check with its own cache TTL and timeout."""
+    name: str
+    check: Callable[[], Awaitable[ComponentHealth]]
+    ttl_seconds: float = 30.0
+    timeout_seconds: float = 5.0
+    # Circuit breaker whose recent successes keep a healthy result fresh
+    circuit: Optional[str] = None
+    # Rate limiters whose rejections mark the component degraded
+    limiters: Optional[Callable[[], list]] = None
+    # Per-endpoint breakers whose opening marks the component degraded
+    endpoint_circuits: Optional[Callable[[], list[CircuitBreaker]]] = None
+
+
+class HealthRegistry:
     """
-    Perform comprehensive system health check.
+    Component probes with cached results and passive health signals.
     
-    Returns:
-        SystemHealth with status of all components
+    refresh() probes only components whose result is older than their
+    TTL, all at once, each under its own timeout; concurrent refreshes
+    share one in-flight probe per component. snapshot() never probes.
     """
-    # Run all health checks concurrently
-    results = await asyncio.gather(
-        check_config_health(),
-        check_kite_health(),
-        check_ai_health(),
-        check_memory_health(),
-        return_exceptions=True,
-    )
-    
-    components = []
-    for result in results:
-        if isinstance(result, Exception):
-            components.append(ComponentHealth(
-                name="unknown",
+    
+    CRITICAL_COMPONENTS = ("configuration",)
+    
+    def __init__(self, probes: Optional[list[HealthProbe]] = None):
+        self._probes: dict[str, HealthProbe] = {}
+        self._results: dict[str, ComponentHealth] = {}
+        self._checked_at: dict[str, float] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._rejections: dict[str, int] = {}
+        self._circuit_components: dict[str, str] = {}
+        self._listeners: list[Callable[[ComponentHealth], None]] = []
+        
+        # Probe statistics
+        self.probes_run = 0
+        self.probes_skipped = 0
+        
+        for probe in probes or []:
+            self.register(probe)
+    
+    def register(self, probe: HealthProbe) -> None:
+        """Add (or replace) a component probe."""
+        self._probes[probe.name] = probe
+        breakers = list(probe.endpoint_circuits()) if probe.endpoint_circuits else []
+        if probe.circuit:
+            breakers.append(get_circuit_breaker(probe.circuit))
+        for breaker in breakers:
+            self._circuit_components[breaker.name] = probe.name
+            breaker.add_listener(self._on_circuit_change)
+    
+    def add_listener(self, listener: Callable[[ComponentHealth], None]) -> None:
+        """Call listener(component) whenever a component's status changes."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[ComponentHealth], None]) -> None:
+        """Stop notifying a status listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    # =========================================================================
+    # ACTIVE PROBES
+    # =========================================================================
+    
+    async def refresh(self, force: bool = False) -> SystemHealth:
+        """
+        Probe stale components concurrently and return the snapshot.
+        
+        Args:
+            force: Probe every component regardless of TTL
+        """
+        self._check_limiters()
+        now = time.monotonic()
+        stale = [
+            probe for probe in self._probes.values()
+            if force or self._is_stale(probe, now)
+        ]
+        self.probes_skipped += len(self._probes) - len(stale)
+        if stale:
+            await asyncio.gather(*(self._run_probe(probe) for probe in stale))
+        return self.snapshot()
+    
+    def _is_stale(self, probe: HealthProbe, now: float) -> bool:
+        checked_at = self._checked_at.get(probe.name)
+        if checked_at is None:
+            return True
+        if now - checked_at < probe.ttl_seconds:
+            return False
+        
+        # Live traffic through the circuit stands in for a probe
+        result = self._results.get(probe.name)
+        if probe.circuit and result and result.status == HealthStatus.HEALTHY:
+            breaker = get_circuit_breaker(probe.circuit)
+            last_success = breaker.stats.last_success_time
+            if breaker.state == CircuitState.CLOSED and last_success and (
+                (datetime.now(timezone.utc) - last_success).total_seconds()
+                < probe.ttl_seconds
+            ):
+                self._checked_at[probe.name] = now
+                return False
+        return True
+    
+    async def _run_probe(self, probe: HealthProbe) -> None:
+        future = self._inflight.get(probe.name)
+        if future is None:
+            future = asyncio.ensure_future(self._probe(probe))
+            self._inflight[probe.name] = future
+            future.add_done_callback(lambda _: self._inflight.pop(probe.name, None))
+        await future
+    
+    async def _probe(self, probe: HealthProbe) -> None:
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(probe.check(), timeout=probe.timeout_seconds)
+        except asyncio.TimeoutError:
+            result = ComponentHealth(
+                name=probe.name,
+                status=HealthStatus.UNHEALTHY,
+                message=f"Health check timed out after {probe.timeout_seconds}s",
+                latency_ms=int((time.monotonic() - start) * 1000),
+                last_check=datetime.now(timezone.utc),
+            )
+        except Exception as e:
+            result = ComponentHealth(
+                name=probe.name,
                 status=HealthStatus.UNHEALTHY,
-                message=str(result),
+                message=f"Health check failed: {str(e)}",
+                latency_ms=int((time.monotonic() - start) * 1000),
                 last_check=datetime.now(timezone.utc),
-            ))
+            )
+        self.probes_run += 1
+        # The probe only checks configuration; an open breaker outranks it
+        self._store(self._circuit_health(probe) or result)
+    
+    # =========================================================================
+    # PASSIVE SIGNALS
+    # =========================================================================
+    
+    def report(
+        self,
+        name: str,
+        status: HealthStatus,
+        message: str,
+        details: Optional[dict] = None,
+    ) -> None:
+        """Record a component's status observed without probing it."""
+        self._store(ComponentHealth(
+            name=name,
+            status=status,
+            message=message,
+            last_check=datetime.now(timezone.utc),
+            details={"source": "passive", **(details or {})},
+        ))
+    
+    def invalidate(self, name: str) -> None:
+        """Forget a component's cached result so the next refresh probes it."""
+        self._checked_at.pop(name, None)
+    
+    def _on_circuit_change(
+        self,
+        breaker: CircuitBreaker,
+        previous: CircuitState,
+        current: CircuitState,
+    ) -> None:
+        name = self._circuit_components.get(breaker.name)
+        if name is None:
+            return
+        health = self._circuit_health(self._probes[name])
+        if health is not None:
+            self._store(health)
         else:
-            components.append(result)
+            self.invalidate(name)
     
-    # Determine overall status
+    def _circuit_health(self, probe: HealthProbe) -> Optional[ComponentHealth]:
+        """Component health implied by its breakers (None while all are closed)."""
+        breakers = list(probe.endpoint_circuits()) if probe.endpoint_circuits else []
+        if probe.circuit:
+            breakers.insert(0, get_circuit_breaker(probe.circuit))
+        for breaker in breakers:
+            state = breaker.state
+            if state == CircuitState.CLOSED:
+                continue
+            details = {
+                "source": "passive",
+                "circuit": state.value,
+                "failure_count": breaker.stats.failure_count,
+            }
+            if breaker.name != probe.circuit:
+                details["endpoint_circuit"] = breaker.name
+                message = f"Endpoint circuit {breaker.name} " + (
+                    "open - endpoint failing" if state == CircuitState.OPEN
+                    else "half-open - testing recovery"
+                )
+                status = HealthStatus.DEGRADED
+            elif state == CircuitState.OPEN:
+                message = "Circuit open - calls failing"
+                status = HealthStatus.UNHEALTHY
+            else:
+                message = "Circuit half-open - testing recovery"
+                status = HealthStatus.DEGRADED
+            return ComponentHealth(
+                name=probe.name,
+                status=status,
+                message=message,
+                last_check=datetime.now(timezone.utc),
+                details=details,
+            )
+        return None
+    
+    def _check_limiters(self) -> None:
+        """Degrade healthy components whose limiters rejected requests since last check."""
+        for probe in self._probes.values():
+            if probe.limiters is None:
+                continue
+            rejected = sum(limiter.stats.total_rejected for limiter in probe.limiters())
+            new = rejected - self._rejections.get(probe.name, rejected)
+            self._rejections[probe.name] = rejected
+            result = self._results.get(probe.name)
+            if new > 0 and result and result.status == HealthStatus.HEALTHY:
+                self.report(
+                    probe.name,
+                    HealthStatus.DEGRADED,
+                    f"Rate limited - {new} requests rejected since last check",
+                    {"rejected": new},
+                )
+    
+    # =========================================================================
+    # SNAPSHOT
+    # =========================================================================
+    
+    def _store(self, result: ComponentHealth) -> None:
+        previous = self._results.get(result.name)
+        self._results[result.name] = result
+        self._checked_at[result.name] = time.monotonic()
+        if previous is None or previous.status != result.status:
+            for listener in list(self._listeners):
+                try:
+                    listener(result)
+                except Exception as e:
+                    logger.error(f"Health listener failed: {e}")
+    
+    def snapshot(self) -> SystemHealth:
+        """Current health from cached results (components never checked are UNKNOWN)."""
+        components = [
+            self._results.get(name) or ComponentHealth(
+                name=name,
+                status=HealthStatus.UNKNOWN,
+                message="Not checked yet",
+            )
+            for name in self._probes
+        ]
+        return SystemHealth(
+            status=overall_status(components, self.CRITICAL_COMPONENTS),
+            components=components,
+        )
+    
+    def get_status(self) -> dict:
+        """Get registry status for API."""
+        now = time.monotonic()
+        return {
+            "probes_run": self.probes_run,
+            "probes_skipped": self.probes_skipped,
+            "components": {
+                name: {
+                    "ttl_seconds": probe.ttl_seconds,
+                    "age_seconds": (
+                        round(now - self._checked_at[name], 1)
+                        if name in self._checked_at else None
+                    ),
+                }
+                for name, probe in self._probes.items()
+            },
+        }
+
+
+def overall_status(
+    components: list[ComponentHealth],
+    critical: tuple[str, ...] = ("configuration",),
+) -> HealthStatus:
+    """Combine component statuses into the system status."""
     statuses = [c.status for c in components]
     
     if all(s == HealthStatus.HEALTHY for s in statuses):
-        overall = HealthStatus.HEALTHY
-    elif any(s == HealthStatus.UNHEALTHY for s in statuses):
+        return HealthStatus.HEALTHY
+    if any(s == HealthStatus.UNHEALTHY for s in statuses):
         # Check if critical components are unhealthy
-        critical = ["configuration"]
         critical_unhealthy = any(
             c.status == HealthStatus.UNHEALTHY and c.name in critical
             for c in components
         )
-        overall = HealthStatus.UNHEALTHY if critical_unhealthy else HealthStatus.DEGRADED
-    else:
-        overall = HealthStatus.DEGRADED
+        return HealthStatus.UNHEALTHY if critical_unhealthy else HealthStatus.DEGRADED
+    return HealthStatus.DEGRADED
+
+
+def _anthropic_limiters() -> list:
+    return [
+        rate_limiter.anthropic_limiter,
+        *(limiter for limiter in rate_limiter.get_anthropic_token_limiters() if limiter),
+    ]
+
+
+def default_probes() -> list[HealthProbe]:
+    """Mercury's standard component probes."""
+    return [
+        HealthProbe("configuration", check_config_health, ttl_seconds=300.0),
+        HealthProbe(
+            "kite_api", check_kite_health, ttl_seconds=60.0,
+            circuit="kite_api", limiters=lambda: rate_limiter.kite_limiters.all(),
+            endpoint_circuits=lambda: [get_kite_circuit(e) for e in KITE_ENDPOINTS],
+        ),
+        HealthProbe(
+            "anthropic_api", check_ai_health, ttl_seconds=60.0,
+            circuit="anthropic_api", limiters=_anthropic_limiters,
+        ),
+        HealthProbe("memory", check_memory_health, ttl_seconds=15.0),
+    ]
+
+
+_health_registry: Optional[HealthRegistry] = None
+
+
+def get_health_registry() -> HealthRegistry:
+    """Get or create the global health registry."""
+    global _health_registry
+    if _health_registry is None:
+        _health_registry = HealthRegistry(default_probes())
+    return _health_registry
+
+
+async def get_system_health(force: bool = False) -> SystemHealth:
+    """
+    Get system health, probing only components whose cached result expired.
     
-    return SystemHealth(
-        status=overall,
-        components=components,
-    )
+    Args:
+        force: Probe every component now
+    
+    Returns:
+        SystemHealth with status of all components
+    """
+    return await get_health_registry().refresh(force=force)
 
 
 async def run_startup_checks() -> bool:
@@ -303,7 +617,7 @@ async def run_startup_checks() -> bool:
     """
     logger.info("Running startup health checks...")
     
-    health = await get_system_health()
+    health = await get_system_health(force=True)
     
     for component in health.components:
         icon = "✅" if component.status == HealthStatus.HEALTHY else "⚠️" if component.status == HealthStatus.DEGRADED else "❌"
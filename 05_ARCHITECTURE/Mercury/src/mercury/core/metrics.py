@@ -9,11 +9,22 @@ MISSION-CRITICAL STANDARD: Observability Pillar 2 - Metrics
 - Thread-safe collection
 - Prometheus text format export
 - JSON format for API consumption
+
+HIGH-THROUGHPUT PATH:
+- metric.labels(...) returns a child bound to one label set; keep it
+  and update it directly so labels are sorted and hashed once
+- counters and histograms keep per-thread cells (no lock per update),
+  merged when read
+- histogram buckets are found by bisect, not a linear walk
+- optional streaming quantiles (QuantileSketch) for p50/p95/p99
+- exported output is cached per metric until that metric changes
 """
 
+import bisect
+import itertools
+import math
 import threading
 import time
-from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
@@ -31,147 +42,397 @@ class MetricValue:
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
-class Counter:
+# Change stamps: every update takes the next one, so exporters can tell
+# whether a metric changed since they last rendered it
+_stamps = itertools.count(1)
+
+
+def _label_key(labels: Dict[str, Any]) -> Tuple:
+    return tuple(sorted(labels.items()))
+
+
+class _Shards:
     """
-    Monotonically increasing counter metric.
+    Per-thread storage cells for one labelled child, merged when read.
     
-    Use for: request counts, error counts, messages processed.
+    Each thread updates only its own cell, so updates need no lock; the
+    lock is taken once per thread, when its cell is created.
     """
     
+    __slots__ = ("_local", "_cells", "_lock", "_factory")
+    
+    def __init__(self, factory):
+        self._local = threading.local()
+        self._cells: list = []
+        self._lock = threading.Lock()
+        self._factory = factory
+    
+    def cell(self):
+        """This thread's cell."""
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = self._factory()
+            with self._lock:
+                self._cells.append(cell)
+            self._local.cell = cell
+            return cell
+    
+    def cells(self) -> list:
+        """Every thread's cell."""
+        with self._lock:
+            return list(self._cells)
+
+
+class _Metric:
+    """Label handling shared by all metric types."""
+    
+    kind = ""
+    
     def __init__(self, name: str, help_text: str = ""):
         self.name = name
         self.help_text = help_text
-        self._values: Dict[Tuple, float] = defaultdict(float)
+        self._children: Dict[Tuple, Any] = {}
         self._lock = threading.Lock()
+        self._stamp = 0
     
-    def inc(self, value: float = 1.0, **labels) -> None:
+    def labels(self, **labels):
+        """
+        Get the child for a label set, created on first use.
+        
+        Keep the child and update it directly in hot paths: the labels
+        are then sorted and hashed once instead of on every update.
+        """
+        key = _label_key(labels)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child(labels)
+        return child
+    
+    def _new_child(self, labels: Dict[str, str]):
+        raise NotImplementedError
+    
+    def _items(self) -> List[Tuple[Dict[str, str], Any]]:
+        with self._lock:
+            return [(child.label_values, child) for child in self._children.values()]
+
+
+class _CounterChild:
+    """Counter for one label set."""
+    
+    __slots__ = ("label_values", "_metric", "_shards")
+    
+    def __init__(self, metric: "Counter", labels: Dict[str, str]):
+        self.label_values = labels
+        self._metric = metric
+        self._shards = _Shards(lambda: [0.0])
+    
+    def inc(self, value: float = 1.0) -> None:
         """Increment counter by value."""
         if value < 0:
             raise ValueError("Counter cannot be decremented")
-        
-        label_key = tuple(sorted(labels.items()))
-        with self._lock:
-            self._values[label_key] += value
+        self._shards.cell()[0] += value
+        self._metric._stamp = next(_stamps)
+    
+    def get(self) -> float:
+        """Get current counter value."""
+        return sum(cell[0] for cell in self._shards.cells())
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing counter metric.
+    
+    Use for: request counts, error counts, messages processed.
+    """
+    
+    kind = "counter"
+    
+    def _new_child(self, labels: Dict[str, str]) -> _CounterChild:
+        return _CounterChild(self, labels)
+    
+    def inc(self, value: float = 1.0, **labels) -> None:
+        """Increment counter by value."""
+        self.labels(**labels).inc(value)
     
     def get(self, **labels) -> float:
         """Get current counter value."""
-        label_key = tuple(sorted(labels.items()))
-        with self._lock:
-            return self._values.get(label_key, 0.0)
+        child = self._children.get(_label_key(labels))
+        return child.get() if child is not None else 0.0
     
     def get_all(self) -> List[MetricValue]:
         """Get all counter values."""
+        return [
+            MetricValue(value=child.get(), labels=dict(labels))
+            for labels, child in self._items()
+        ]
+
+
+class _GaugeChild:
+    """Gauge for one label set."""
+    
+    __slots__ = ("label_values", "_metric", "_value", "_lock")
+    
+    def __init__(self, metric: "Gauge", labels: Dict[str, str]):
+        self.label_values = labels
+        self._metric = metric
+        self._value = 0.0
+        self._lock = threading.Lock()
+    
+    def set(self, value: float) -> None:
+        """Set gauge to value."""
+        self._value = value
+        self._metric._stamp = next(_stamps)
+    
+    def inc(self, value: float = 1.0) -> None:
+        """Increment gauge."""
         with self._lock:
-            return [
-                MetricValue(value=v, labels=dict(k))
-                for k, v in self._values.items()
-            ]
+            self._value += value
+        self._metric._stamp = next(_stamps)
+    
+    def dec(self, value: float = 1.0) -> None:
+        """Decrement gauge."""
+        self.inc(-value)
+    
+    def get(self) -> float:
+        """Get current gauge value."""
+        return self._value
 
 
-class Gauge:
+class Gauge(_Metric):
     """
     Metric that can increase or decrease.
     
     Use for: current queue size, active connections, memory usage.
     """
     
-    def __init__(self, name: str, help_text: str = ""):
-        self.name = name
-        self.help_text = help_text
-        self._values: Dict[Tuple, float] = defaultdict(float)
-        self._lock = threading.Lock()
+    kind = "gauge"
+    
+    def _new_child(self, labels: Dict[str, str]) -> _GaugeChild:
+        return _GaugeChild(self, labels)
     
     def set(self, value: float, **labels) -> None:
         """Set gauge to value."""
-        label_key = tuple(sorted(labels.items()))
-        with self._lock:
-            self._values[label_key] = value
+        self.labels(**labels).set(value)
     
     def inc(self, value: float = 1.0, **labels) -> None:
         """Increment gauge."""
-        label_key = tuple(sorted(labels.items()))
-        with self._lock:
-            self._values[label_key] += value
+        self.labels(**labels).inc(value)
     
     def dec(self, value: float = 1.0, **labels) -> None:
         """Decrement gauge."""
-        label_key = tuple(sorted(labels.items()))
-        with self._lock:
-            self._values[label_key] -= value
+        self.labels(**labels).dec(value)
     
     def get(self, **labels) -> float:
         """Get current gauge value."""
-        label_key = tuple(sorted(labels.items()))
-        with self._lock:
-            return self._values.get(label_key, 0.0)
+        child = self._children.get(_label_key(labels))
+        return child.get() if child is not None else 0.0
     
     def get_all(self) -> List[MetricValue]:
         """Get all gauge values."""
-        with self._lock:
-            return [
-                MetricValue(value=v, labels=dict(k))
-                for k, v in self._values.items()
-            ]
+        return [
+            MetricValue(value=child.get(), labels=dict(labels))
+            for labels, child in self._items()
+        ]
+
+
+class QuantileSketch:
+    """
+    Streaming quantile estimate with bounded relative error.
+    
+    DDSketch-style: a non-negative value v is counted in bin
+    ceil(log_gamma(v)), gamma = (1 + a) / (1 - a), so any quantile is
+    returned within relative accuracy a (1% by default) using a few
+    hundred bins however many values are added. Sketches merge by adding
+    bin counts, which is how per-thread sketches are combined on scrape.
+    """
+    
+    MIN_VALUE = 1e-9
+    
+    __slots__ = ("relative_accuracy", "gamma", "_log_gamma", "bins", "zero_count", "count")
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+    
+    def add(self, value: float) -> None:
+        """Add a value (values below MIN_VALUE count as zero)."""
+        self.count += 1
+        if value < self.MIN_VALUE:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + 1
+    
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add another sketch's counts into this one."""
+        for index, count in dict(other.bins).items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+    
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1); 0.0 if empty."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+
+class _HistogramCell:
+    """One thread's observations for a histogram child."""
+    
+    __slots__ = ("counts", "sum", "count", "sketch")
+    
+    def __init__(self, buckets: int, sketch: Optional[QuantileSketch]):
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.sketch = sketch
 
 
-class Histogram:
+class _HistogramChild:
+    """Histogram for one label set."""
+    
+    __slots__ = ("label_values", "_metric", "_bounds", "_shards")
+    
+    def __init__(self, metric: "Histogram", labels: Dict[str, str]):
+        self.label_values = labels
+        self._metric = metric
+        self._bounds = metric.buckets
+        accuracy = metric.quantile_accuracy
+        self._shards = _Shards(lambda: _HistogramCell(
+            len(metric.buckets), QuantileSketch(accuracy) if accuracy else None
+        ))
+    
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        cell = self._shards.cell()
+        # First bucket whose upper bound is >= value; past the end is +Inf
+        cell.counts[bisect.bisect_left(self._bounds, value)] += 1
+        cell.sum += value
+        cell.count += 1
+        if cell.sketch is not None:
+            cell.sketch.add(value)
+        self._metric._stamp = next(_stamps)
+    
+    def sketch(self) -> Optional[QuantileSketch]:
+        """Quantile sketch merged across threads (None without quantiles)."""
+        if not self._metric.quantile_accuracy:
+            return None
+        sketch = QuantileSketch(self._metric.quantile_accuracy)
+        for cell in self._shards.cells():
+            sketch.merge(cell.sketch)
+        return sketch
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get histogram statistics, merged across threads."""
+        counts = [0] * (len(self._bounds) + 1)
+        total = 0
+        sum_val = 0.0
+        for cell in self._shards.cells():
+            for i, count in enumerate(list(cell.counts)):
+                counts[i] += count
+            total += cell.count
+            sum_val += cell.sum
+        sketch = self.sketch()
+        
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self._bounds + (float("inf"),), counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        
+        stats = {
+            "count": total,
+            "sum": sum_val,
+            "mean": sum_val / total if total > 0 else 0,
+            "buckets": buckets,
+        }
+        if sketch is not None:
+            stats["quantiles"] = {q: sketch.quantile(q) for q in self._metric.quantiles}
+        return stats
+
+
+class Histogram(_Metric):
     """
     Metric that samples observations and counts them in buckets.
     
     Use for: request latency, response sizes.
+    
+    With quantiles enabled each child also keeps a QuantileSketch, so
+    p50/p95/p99 are reported directly rather than interpolated from
+    bucket boundaries.
     """
     
     DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+    
+    kind = "histogram"
     
     def __init__(
         self,
         name: str,
         help_text: str = "",
         buckets: Tuple[float, ...] = None,
+        quantiles: bool = False,
+        quantile_accuracy: float = 0.01,
     ):
-        self.name = name
-        self.help_text = help_text
-        self.buckets = buckets or self.DEFAULT_BUCKETS
-        self._counts: Dict[Tuple, Dict[float, int]] = defaultdict(lambda: defaultdict(int))
-        self._sums: Dict[Tuple, float] = defaultdict(float)
-        self._totals: Dict[Tuple, int] = defaultdict(int)
-        self._lock = threading.Lock()
+        """
+        Initialize histogram.
+        
+        Args:
+            name: Metric name
+            help_text: Description
+            buckets: Bucket upper bounds (default: DEFAULT_BUCKETS)
+            quantiles: Also estimate DEFAULT_QUANTILES with a sketch
+            quantile_accuracy: Relative accuracy of the quantile estimates
+        """
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+        self.quantiles = self.DEFAULT_QUANTILES if quantiles else ()
+        self.quantile_accuracy = quantile_accuracy if quantiles else 0.0
+    
+    def _new_child(self, labels: Dict[str, str]) -> _HistogramChild:
+        return _HistogramChild(self, labels)
     
     def observe(self, value: float, **labels) -> None:
         """Record an observation."""
-        label_key = tuple(sorted(labels.items()))
-        
-        with self._lock:
-            self._sums[label_key] += value
-            self._totals[label_key] += 1
-            
-            for bucket in self.buckets:
-                if value <= bucket:
-                    self._counts[label_key][bucket] += 1
-            # Always increment +Inf bucket
-            self._counts[label_key][float('inf')] += 1
+        self.labels(**labels).observe(value)
     
     def get_stats(self, **labels) -> Dict[str, Any]:
         """Get histogram statistics."""
-        label_key = tuple(sorted(labels.items()))
-        
-        with self._lock:
-            total = self._totals.get(label_key, 0)
-            sum_val = self._sums.get(label_key, 0)
-            
-            return {
-                "count": total,
-                "sum": sum_val,
-                "mean": sum_val / total if total > 0 else 0,
-                "buckets": dict(self._counts.get(label_key, {})),
-            }
+        child = self._children.get(_label_key(labels))
+        if child is None:
+            child = _HistogramChild(self, labels)
+        return child.get_stats()
+    
+    def get_all(self) -> List[Tuple[Dict[str, str], Dict[str, Any]]]:
+        """Get (labels, stats) for every label set."""
+        return [(dict(labels), child.get_stats()) for labels, child in self._items()]
 
 
 class MetricsRegistry:
     """
     Central registry for all metrics.
     
-    Provides methods to export metrics in various formats.
+    Provides methods to export metrics in various formats. Each metric's
+    exported section is cached and re-rendered only after the metric
+    changes, so scrapes of a mostly idle registry are cheap.
     """
     
     def __init__(self):
@@ -179,6 +440,8 @@ class MetricsRegistry:
         self._gauges: Dict[str, Gauge] = {}
         self._histograms: Dict[str, Histogram] = {}
         self._lock = threading.Lock()
+        # (format, metric name) -> (stamp when rendered, rendered output)
+        self._rendered: Dict[Tuple[str, str], Tuple[int, Any]] = {}
     
     def counter(self, name: str, help_text: str = "") -> Counter:
         """Get or create a counter."""
@@ -199,46 +462,69 @@ class MetricsRegistry:
         name: str,
         help_text: str = "",
         buckets: Tuple[float, ...] = None,
+        quantiles: bool = False,
     ) -> Histogram:
         """Get or create a histogram."""
         with self._lock:
             if name not in self._histograms:
-                self._histograms[name] = Histogram(name, help_text, buckets)
+                self._histograms[name] = Histogram(name, help_text, buckets, quantiles)
             return self._histograms[name]
     
+    def _metrics(self) -> List[_Metric]:
+        with self._lock:
+            return [
+                *self._counters.values(),
+                *self._gauges.values(),
+                *self._histograms.values(),
+            ]
+    
+    def _cached(self, fmt: str, metric: _Metric, render) -> Any:
+        """Rendered output for a metric, reused until the metric changes."""
+        stamp = metric._stamp
+        cached = self._rendered.get((fmt, metric.name))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        output = render(metric)
+        self._rendered[(fmt, metric.name)] = (stamp, output)
+        return output
+    
     def to_prometheus(self) -> str:
         """Export metrics in Prometheus text format."""
+        sections = [
+            self._cached("prometheus", metric, self._prometheus_section)
+            for metric in self._metrics()
+        ]
+        return "\n".join(line for section in sections for line in section)
+    
+    def _prometheus_section(self, metric: _Metric) -> List[str]:
+        name = metric.name
         lines = []
+        if metric.help_text:
+            lines.append(f"# HELP {name} {metric.help_text}")
+        lines.append(f"# TYPE {name} {metric.kind}")
         
-        # Counters
-        for name, counter in self._counters.items():
-            if counter.help_text:
-                lines.append(f"# HELP {name} {counter.help_text}")
-            lines.append(f"# TYPE {name} counter")
-            
-            for mv in counter.get_all():
+        if not isinstance(metric, Histogram):
+            for mv in metric.get_all():
                 labels_str = self._format_labels(mv.labels)
                 lines.append(f"{name}{labels_str} {mv.value}")
+            return lines
         
-        # Gauges
-        for name, gauge in self._gauges.items():
-            if gauge.help_text:
-                lines.append(f"# HELP {name} {gauge.help_text}")
-            lines.append(f"# TYPE {name} gauge")
-            
-            for mv in gauge.get_all():
-                labels_str = self._format_labels(mv.labels)
-                lines.append(f"{name}{labels_str} {mv.value}")
-        
-        # Histograms
-        for name, histogram in self._histograms.items():
-            if histogram.help_text:
-                lines.append(f"# HELP {name} {histogram.help_text}")
-            lines.append(f"# TYPE {name} histogram")
-            
-            # TODO: Export histogram buckets in Prometheus format
-        
-        return "\n".join(lines)
+        summaries = []
+        for labels, stats in metric.get_all():
+            for bound, count in stats["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels_str = self._format_labels({**labels, "le": le})
+                lines.append(f"{name}_bucket{labels_str} {count}")
+            labels_str = self._format_labels(labels)
+            lines.append(f"{name}_sum{labels_str} {stats['sum']}")
+            lines.append(f"{name}_count{labels_str} {stats['count']}")
+            for q, value in stats.get("quantiles", {}).items():
+                labels_str = self._format_labels({**labels, "quantile": str(q)})
+                summaries.append(f"{name}_quantile{labels_str} {value}")
+        if summaries:
+            lines.append(f"# TYPE {name}_quantile gauge")
+            lines.extend(summaries)
+        return lines
     
     def to_json(self) -> Dict[str, Any]:
         """Export metrics as JSON."""
@@ -248,32 +534,30 @@ class MetricsRegistry:
             "gauges": {},
             "histograms": {},
         }
-        
-        for name, counter in self._counters.items():
-            result["counters"][name] = {
-                "help": counter.help_text,
-                "values": [
-                    {"value": mv.value, "labels": mv.labels}
-                    for mv in counter.get_all()
-                ],
-            }
-        
-        for name, gauge in self._gauges.items():
-            result["gauges"][name] = {
-                "help": gauge.help_text,
+        groups = {"counter": "counters", "gauge": "gauges", "histogram": "histograms"}
+        for metric in self._metrics():
+            result[groups[metric.kind]][metric.name] = self._cached(
+                "json", metric, self._json_section
+            )
+        return result
+    
+    def _json_section(self, metric: _Metric) -> Dict[str, Any]:
+        if not isinstance(metric, Histogram):
+            return {
+                "help": metric.help_text,
                 "values": [
                     {"value": mv.value, "labels": mv.labels}
-                    for mv in gauge.get_all()
+                    for mv in metric.get_all()
                 ],
             }
-        
-        for name, histogram in self._histograms.items():
-            result["histograms"][name] = {
-                "help": histogram.help_text,
-                "stats": histogram.get_stats(),
-            }
-        
-        return result
+        return {
+            "help": metric.help_text,
+            "stats": metric.get_stats(),
+            "values": [
+                {"labels": labels, "stats": stats}
+                for labels, stats in metric.get_all()
+            ],
+        }
     
     def _format_labels(self, labels: Dict[str, str]) -> str:
         """Format labels for Prometheus output."""
@@ -366,7 +650,8 @@ def get_mercury_metrics():
         ),
         "api_call_duration": registry.histogram(
             "mercury_api_call_duration_seconds",
-            "API call duration in seconds"
+            "API call duration in seconds",
+            quantiles=True,
         ),
         
         # Connection metrics
@@ -386,7 +671,8 @@ def get_mercury_metrics():
         ),
         "chat_query_duration": registry.histogram(
             "mercury_chat_query_duration_seconds",
-            "Chat query processing time"
+            "Chat query processing time",
+            quantiles=True,
         ),
         
         # Token metrics
@@ -9,9 +9,15 @@ The system continuously monitors its own health and recovers
 from degradation without human intervention.
 
 MISSION-CRITICAL STANDARD: Self-Healing Infrastructure
+
+The monitor reads health through the HealthRegistry, so a check cycle
+only probes components whose cached result has expired. Component
+status changes reported passively (circuit transitions, rate-limit
+rejections) wake the loop at once instead of waiting for the next tick.
 """
 
 import asyncio
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
@@ -19,7 +25,13 @@ from typing import Optional, Callable, Awaitable, Any
 import weakref
 
 from mercury.core.logging import get_logger
-from mercury.core.health import get_system_health, HealthStatus, SystemHealth
+from mercury.core.health import (
+    ComponentHealth,
+    HealthStatus,
+    SystemHealth,
+    get_health_registry,
+    get_system_health,
+)
 from mercury.core.resilience import (
     kite_circuit,
     ai_circuit,
@@ -89,7 +101,8 @@ class HealthMonitor:
     - Circuit breaker state monitoring
     - WebSocket broadcasting to connected clients
     - Adaptive check intervals based on health
-    - Event-driven architecture for decoupling
+    - Event-driven architecture for decoupling: component status changes
+      trigger an immediate check cycle
     """
     
     # Check intervals in seconds
@@ -102,6 +115,8 @@ class HealthMonitor:
         self._state = MonitorState.STOPPED
         self._task: Optional[asyncio.Task] = None
         self._interval = self.NORMAL_INTERVAL
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
         
         # Use weak references to prevent memory leaks
         self._subscribers: list[weakref.ref] = []
@@ -114,9 +129,11 @@ class HealthMonitor:
         self._on_degradation_callbacks: list[Callable[[DegradationLevel], Awaitable[None]]] = []
         self._on_recovery_callbacks: list[Callable[[], Awaitable[None]]] = []
         
-        # Health history for trending
-        self._health_history: list[tuple[datetime, HealthStatus]] = []
+        # Health history for trending (ring buffer)
         self._max_history = 100
+        self._health_history: deque[tuple[datetime, HealthStatus]] = deque(
+            maxlen=self._max_history
+        )
     
     @property
     def state(self) -> MonitorState:
@@ -135,11 +152,15 @@ class HealthMonitor:
             return
         
         self._state = MonitorState.RUNNING
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        get_health_registry().add_listener(self._on_component_change)
         self._task = asyncio.create_task(self._monitor_loop())
         logger.info("Health monitor started", context={"interval": self._interval})
     
     async def stop(self) -> None:
         """Stop the background monitor."""
+        get_health_registry().remove_listener(self._on_component_change)
         if self._task:
             self._task.cancel()
             try:
@@ -171,7 +192,7 @@ class HealthMonitor:
                 if self._state == MonitorState.RUNNING:
                     await self._perform_check()
                 
-                await asyncio.sleep(self._interval)
+                await self._sleep(self._interval)
                 
             except asyncio.CancelledError:
                 break
@@ -181,6 +202,23 @@ class HealthMonitor:
         
         logger.info("Monitor loop ended")
     
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep until the next tick or until a component status changes."""
+        if self._wake is None:
+            await asyncio.sleep(seconds)
+            return
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+    
+    def _on_component_change(self, component: ComponentHealth) -> None:
+        """Registry listener; may be called from any thread."""
+        if self._loop is None or self._wake is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._wake.set)
+    
     async def _perform_check(self) -> None:
         """Perform a health check cycle."""
         try:
@@ -189,8 +227,6 @@ class HealthMonitor:
             
             # Record in history
             self._health_history.append((datetime.now(timezone.utc), health.status))
-            if len(self._health_history) > self._max_history:
-                self._health_history.pop(0)
             
             # Check for health status changes
             if self._last_health_status and health.status != self._last_health_status:
@@ -399,6 +435,7 @@ class HealthMonitor:
                 for name, state in self._last_circuit_states.items()
             },
             "history_size": len(self._health_history),
+            "health_registry": get_health_registry().get_status(),
         }
     
     def get_health_trend(self, minutes: int = 10) -> dict:
@@ -8,8 +8,13 @@ AUTONOMOUS PRINCIPLE: Zero-loss state management.
 Conversations, preferences, and session data survive restarts.
 
 Features:
-- SQLite-based persistent storage
+- SQLite-based persistent storage (WAL mode)
 - Async-first design
+- Single writer thread committing queued writes in batches
+- Pool of read-only connections for concurrent reads
+- Append-only message log: a turn adds rows instead of rewriting the
+  whole conversation
+- Dirty tracking so only changed conversations are written
 - Automatic migration handling
 - Graceful degradation if storage fails
 """
@@ -17,12 +22,14 @@ Features:
 import asyncio
 import json
 import logging
+import queue
 import sqlite3
+import threading
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from mercury.core.logging import get_logger
 
@@ -58,54 +65,181 @@ class ConversationRecord:
         )
 
 
+@dataclass
+class _WriteOp:
+    """One queued write, resolved on its caller's event loop."""
+    sql: str
+    params: tuple
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    future: Optional[asyncio.Future] = None
+    # Ops with the same statement and key replace each other while queued
+    key: Optional[tuple] = None
+    superseded: bool = False
+    
+    def resolve(self, result: Any = None, error: Optional[BaseException] = None) -> None:
+        if self.future is None:
+            return
+        
+        def _set():
+            if self.future.done():
+                return
+            if error is not None:
+                self.future.set_exception(error)
+            else:
+                self.future.set_result(result)
+        
+        self.loop.call_soon_threadsafe(_set)
+
+
 class StateStore:
     """
     Persistent state storage for Mercury.
     
-    Uses SQLite for reliable, file-based storage.
-    All operations are async-safe using thread pool.
+    Uses SQLite in WAL mode for reliable, file-based storage.
+    
+    - Writes are queued to one dedicated writer thread, which drains the
+      queue into a single transaction per batch. An upsert replaces an
+      earlier queued identical upsert of the same row, so a conversation
+      saved several times in quick succession is written once.
+    - Reads run in worker threads on a small pool of read-only
+      connections, concurrently with each other and with the writer.
+    - SQL text is fixed per statement, so each connection prepares a
+      statement once and reuses it from its statement cache.
+    - Messages live in an append-only log keyed by (conversation id,
+      seq); append_messages() writes only new messages and
+      load_messages() pages back through older ones.
+    - Conversations changed since they were last saved are tracked in a
+      dirty set; flush_dirty() appends their unsaved messages.
     """
     
     # Schema version for migrations
-    SCHEMA_VERSION = 1
+    SCHEMA_VERSION = 2
     
-    def __init__(self, db_path: Optional[Path] = None):
+    SQL_SAVE_CONVERSATION = """
+        INSERT OR REPLACE INTO conversations
+        (id, created_at, updated_at, messages, metadata)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    SQL_LOAD_CONVERSATION = "SELECT * FROM conversations WHERE id = ?"
+    SQL_CONVERSATION_CREATED_AT = "SELECT created_at FROM conversations WHERE id = ?"
+    SQL_LIST_CONVERSATIONS = """
+        SELECT * FROM conversations
+        ORDER BY updated_at DESC
+        LIMIT ? OFFSET ?
+    """
+    SQL_DELETE_CONVERSATION = "DELETE FROM conversations WHERE id = ?"
+    SQL_TOUCH_CONVERSATION = """
+        INSERT INTO conversations (id, created_at, updated_at, messages, metadata)
+        VALUES (?, ?, ?, '[]', ?)
+        ON CONFLICT(id) DO UPDATE SET
+            updated_at = excluded.updated_at,
+            metadata = excluded.metadata
+    """
+    SQL_APPEND_MESSAGE = """
+        INSERT OR IGNORE INTO messages
+        (conversation_id, seq, role, content, timestamp)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    SQL_LOAD_MESSAGES = """
+        SELECT seq, role, content, timestamp FROM messages
+        WHERE conversation_id = ? AND seq < ?
+        ORDER BY seq DESC
+        LIMIT ?
+    """
+    SQL_ALL_MESSAGES = """
+        SELECT seq, role, content, timestamp FROM messages
+        WHERE conversation_id = ?
+        ORDER BY seq
+    """
+    SQL_DELETE_MESSAGES = "DELETE FROM messages WHERE conversation_id = ?"
+    SQL_SET_SETTING = """
+        INSERT OR REPLACE INTO settings (key, value, updated_at)
+        VALUES (?, ?, ?)
+    """
+    SQL_GET_SETTING = "SELECT value FROM settings WHERE key = ?"
+    SQL_SAVE_SESSION = """
+        INSERT OR REPLACE INTO sessions (id, data, created_at, expires_at)
+        VALUES (?, ?, ?, ?)
+    """
+    SQL_LOAD_SESSION = "SELECT data, expires_at FROM sessions WHERE id = ?"
+    SQL_DELETE_SESSION = "DELETE FROM sessions WHERE id = ?"
+    
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        read_connections: int = 2,
+        max_batch: int = 256,
+    ):
         """
         Initialize state store.
         
         Args:
             db_path: Path to SQLite database (default: ~/.mercury/state.db)
+            read_connections: Size of the read-only connection pool
+            max_batch: Most queued writes committed in one transaction
         """
         self.db_path = db_path or (Path.home() / ".mercury" / "state.db")
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.read_connections = read_connections
+        self.max_batch = max_batch
+        
+        # Writer connection, owned by the writer thread
         self._conn: Optional[sqlite3.Connection] = None
+        self._writes: "queue.Queue[Optional[_WriteOp]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all_readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        
         self._lock = asyncio.Lock()
         self._initialized = False
-    
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get or create database connection."""
-        if self._conn is None:
-            self._conn = sqlite3.connect(
-                str(self.db_path),
-                check_same_thread=False,
-            )
-            self._conn.row_factory = sqlite3.Row
-        return self._conn
+        
+        # Dirty conversation id -> mark number, so a save only clears a
+        # flag that was not set again while its write was in flight
+        self._dirty: Dict[str, int] = {}
+        self._dirty_marks = 0
+        self._conversation_source: Optional[
+            Callable[[str], Optional[ConversationRecord]]
+        ] = None
+        self._on_saved: Optional[Callable[[ConversationRecord], None]] = None
+        
+        # Commit statistics
+        self.batches_committed = 0
+        self.writes_committed = 0
+        self.writes_coalesced = 0
     
     async def initialize(self) -> None:
-        """Initialize database schema."""
+        """Initialize database schema and start the writer thread."""
         if self._initialized:
             return
         
         async with self._lock:
-            await asyncio.to_thread(self._create_schema)
+            if self._initialized:
+                return
+            ready = asyncio.get_running_loop().create_future()
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                args=(asyncio.get_running_loop(), ready),
+                name="mercury-state-writer",
+                daemon=True,
+            )
+            self._writer.start()
+            await ready
             self._initialized = True
             logger.info(f"State store initialized at {self.db_path}")
     
+    def _open_writer(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
     def _create_schema(self) -> None:
         """Create database tables."""
-        conn = self._get_connection()
+        conn = self._conn
         cursor = conn.cursor()
+        cursor.execute("BEGIN")
         
         # Conversations table
         cursor.execute("""
@@ -137,6 +271,18 @@ class StateStore:
             )
         """)
         
+        # Append-only message log (schema v2)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS messages (
+                conversation_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                PRIMARY KEY (conversation_id, seq)
+            ) WITHOUT ROWID
+        """)
+        
         # Schema version tracking
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS schema_info (
@@ -145,194 +291,472 @@ class StateStore:
             )
         """)
         
+        row = cursor.execute(
+            "SELECT value FROM schema_info WHERE key = 'version'"
+        ).fetchone()
+        version = int(row[0]) if row else 0
+        if version < 2:
+            self._migrate_to_message_log(cursor)
+        
         # Set schema version
         cursor.execute(
             "INSERT OR REPLACE INTO schema_info (key, value) VALUES (?, ?)",
             ("version", str(self.SCHEMA_VERSION))
         )
         
-        conn.commit()
+        cursor.execute("COMMIT")
+    
+    def _migrate_to_message_log(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Schema v1 -> v2: move conversations.messages JSON into the log.
+        
+        Each stored message becomes log entry seq 0, 1, ... in order, so
+        a conversation reloaded from the log continues at next_seq = the
+        old message count. The JSON column is emptied so whole-record
+        loads do not return the history twice.
+        """
+        migrated = 0
+        rows = cursor.execute(
+            "SELECT id, updated_at, messages FROM conversations"
+        ).fetchall()
+        for conv_id, updated_at, messages_json in rows:
+            messages = json.loads(messages_json or "[]")
+            if not messages:
+                continue
+            cursor.executemany(
+                self.SQL_APPEND_MESSAGE,
+                [
+                    (
+                        conv_id,
+                        seq,
+                        msg.get("role", "user"),
+                        msg.get("content", ""),
+                        msg.get("timestamp") or updated_at,
+                    )
+                    for seq, msg in enumerate(messages)
+                ],
+            )
+            cursor.execute(
+                "UPDATE conversations SET messages = '[]' WHERE id = ?", (conv_id,)
+            )
+            migrated += 1
+        if migrated:
+            logger.info(f"Migrated {migrated} conversations to the message log")
     
     async def close(self) -> None:
-        """Close database connection."""
-        if self._conn:
-            await asyncio.to_thread(self._conn.close)
-            self._conn = None
+        """Flush queued writes, stop the writer and close all connections."""
+        if self._writer is not None:
+            self._writes.put(None)
+            await asyncio.to_thread(self._writer.join)
+            self._writer = None
+        
+        with self._readers_lock:
+            readers, self._all_readers = self._all_readers, []
+            self._readers = queue.LifoQueue()
+        for conn in readers:
+            conn.close()
+        
+        if self._initialized:
+            self._initialized = False
             logger.info("State store closed")
     
     # =========================================================================
-    # CONVERSATION OPERATIONS
+    # WRITER THREAD
     # =========================================================================
     
-    async def save_conversation(self, record: ConversationRecord) -> None:
-        """Save a conversation to persistent storage."""
+    def _writer_loop(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        ready: asyncio.Future,
+    ) -> None:
+        """Open the writer connection, then commit queued writes in batches."""
+        startup = _WriteOp("", (), loop, ready)
+        try:
+            self._conn = self._open_writer()
+            self._create_schema()
+        except Exception as e:
+            logger.error(f"State store failed to open {self.db_path}: {e}")
+            self._conn = None
+            startup.resolve(error=e)
+            return
+        startup.resolve()
+        
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._writes.get()]
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._writes.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in batch:
+                    stopping = True
+                    batch = [op for op in batch if op is not None]
+                if batch:
+                    self._commit_batch(batch)
+        finally:
+            self._conn.close()
+            self._conn = None
+    
+    def _commit_batch(self, batch: List[_WriteOp]) -> None:
+        """Run a batch of writes in one transaction."""
+        # Only the same statement supersedes: a touch of a row must not
+        # replace a queued full save of it
+        latest: Dict[tuple, _WriteOp] = {}
+        for op in batch:
+            if op.key is None:
+                continue
+            slot = (op.sql, op.key)
+            previous = latest.get(slot)
+            if previous is not None:
+                previous.superseded = True
+            latest[slot] = op
+        
+        results = []
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            for op in batch:
+                if op.superseded:
+                    results.append((op, None, None))
+                    continue
+                # A failing write only rolls back itself, not the batch
+                cursor.execute("SAVEPOINT op")
+                try:
+                    cursor.execute(op.sql, op.params)
+                    results.append((op, cursor.rowcount, None))
+                except sqlite3.Error as e:
+                    cursor.execute("ROLLBACK TO op")
+                    results.append((op, None, e))
+                cursor.execute("RELEASE op")
+            cursor.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.error(f"State store batch of {len(batch)} writes failed: {e}")
+            if self._conn.in_transaction:
+                self._conn.rollback()
+            results = [(op, None, e) for op in batch]
+        else:
+            self.batches_committed += 1
+            self.writes_committed += len(batch)
+            self.writes_coalesced += sum(1 for op in batch if op.superseded)
+        
+        for op, result, error in results:
+            op.resolve(result, error)
+    
+    async def _write(self, sql: str, params: tuple, key: Optional[tuple] = None) -> int:
+        """Queue a write and wait until its batch commits; returns rowcount."""
         await self.initialize()
-        
-        async with self._lock:
-            await asyncio.to_thread(
-                self._save_conversation_sync,
-                record
-            )
+        loop = asyncio.get_running_loop()
+        op = _WriteOp(sql, params, loop, loop.create_future(), key)
+        self._writes.put(op)
+        result = await op.future
+        return result or 0
     
-    def _save_conversation_sync(self, record: ConversationRecord) -> None:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO conversations 
-            (id, created_at, updated_at, messages, metadata)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            record.id,
-            record.created_at.isoformat(),
-            record.updated_at.isoformat(),
-            json.dumps(record.messages),
-            json.dumps(record.metadata),
-        ))
-        
-        conn.commit()
-        logger.debug(f"Saved conversation {record.id}")
+    # =========================================================================
+    # READ POOL
+    # =========================================================================
     
-    async def load_conversation(self, conv_id: str) -> Optional[ConversationRecord]:
-        """Load a conversation by ID."""
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path.resolve().as_uri() + "?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _read_sync(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(conn, *args) on a pooled read-only connection."""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._readers_lock:
+                create = len(self._all_readers) < self.read_connections
+                if create:
+                    conn = self._open_reader()
+                    self._all_readers.append(conn)
+            if not create:
+                conn = self._readers.get()
+        try:
+            return func(conn, *args)
+        finally:
+            self._readers.put(conn)
+    
+    async def _read(self, func: Callable[..., Any], *args: Any) -> Any:
         await self.initialize()
-        
-        async with self._lock:
-            return await asyncio.to_thread(
-                self._load_conversation_sync,
-                conv_id
-            )
+        return await asyncio.to_thread(self._read_sync, func, *args)
     
-    def _load_conversation_sync(self, conv_id: str) -> Optional[ConversationRecord]:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "SELECT * FROM conversations WHERE id = ?",
-            (conv_id,)
+    # =========================================================================
+    # CONVERSATION OPERATIONS
+    # =========================================================================
+    
+    async def save_conversation(self, record: ConversationRecord) -> None:
+        """Save a conversation to persistent storage."""
+        mark = self._dirty.get(record.id)
+        await self._write(
+            self.SQL_SAVE_CONVERSATION,
+            (
+                record.id,
+                record.created_at.isoformat(),
+                record.updated_at.isoformat(),
+                json.dumps(record.messages),
+                json.dumps(record.metadata),
+            ),
+            key=("conversation", record.id),
+        )
+        self._clear_dirty(record.id, mark)
+        logger.debug(f"Saved conversation {record.id}")
+    
+    def _row_to_conversation(
+        self,
+        conn: sqlite3.Connection,
+        row: sqlite3.Row,
+    ) -> ConversationRecord:
+        # Whole-record saves keep messages in the row; appended ones follow
+        messages = json.loads(row["messages"])
+        messages.extend(
+            self._log_entry(entry)
+            for entry in conn.execute(self.SQL_ALL_MESSAGES, (row["id"],))
         )
-        row = cursor.fetchone()
-        
-        if row is None:
-            return None
-        
         return ConversationRecord(
             id=row["id"],
             created_at=datetime.fromisoformat(row["created_at"]),
             updated_at=datetime.fromisoformat(row["updated_at"]),
-            messages=json.loads(row["messages"]),
+            messages=messages,
             metadata=json.loads(row["metadata"]),
         )
     
+    @staticmethod
+    def _log_entry(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "seq": row["seq"],
+            "role": row["role"],
+            "content": row["content"],
+            "timestamp": row["timestamp"],
+        }
+    
+    async def load_conversation(self, conv_id: str) -> Optional[ConversationRecord]:
+        """Load a conversation by ID."""
+        return await self._read(self._load_conversation_sync, conv_id)
+    
+    def _load_conversation_sync(
+        self,
+        conn: sqlite3.Connection,
+        conv_id: str,
+    ) -> Optional[ConversationRecord]:
+        row = conn.execute(self.SQL_LOAD_CONVERSATION, (conv_id,)).fetchone()
+        if row is None:
+            return None
+        return self._row_to_conversation(conn, row)
+    
+    async def load_created_at(self, conv_id: str) -> Optional[datetime]:
+        """When a conversation was created, without loading its messages."""
+        return await self._read(self._load_created_at_sync, conv_id)
+    
+    def _load_created_at_sync(
+        self,
+        conn: sqlite3.Connection,
+        conv_id: str,
+    ) -> Optional[datetime]:
+        row = conn.execute(self.SQL_CONVERSATION_CREATED_AT, (conv_id,)).fetchone()
+        return datetime.fromisoformat(row["created_at"]) if row else None
+    
     async def list_conversations(
         self,
         limit: int = 50,
         offset: int = 0,
     ) -> List[ConversationRecord]:
         """List recent conversations."""
-        await self.initialize()
-        
-        async with self._lock:
-            return await asyncio.to_thread(
-                self._list_conversations_sync,
-                limit,
-                offset
-            )
+        return await self._read(self._list_conversations_sync, limit, offset)
     
     def _list_conversations_sync(
         self,
+        conn: sqlite3.Connection,
         limit: int,
         offset: int,
     ) -> List[ConversationRecord]:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM conversations 
-            ORDER BY updated_at DESC 
-            LIMIT ? OFFSET ?
-        """, (limit, offset))
-        
-        return [
-            ConversationRecord(
-                id=row["id"],
-                created_at=datetime.fromisoformat(row["created_at"]),
-                updated_at=datetime.fromisoformat(row["updated_at"]),
-                messages=json.loads(row["messages"]),
-                metadata=json.loads(row["metadata"]),
-            )
-            for row in cursor.fetchall()
-        ]
+        rows = conn.execute(self.SQL_LIST_CONVERSATIONS, (limit, offset)).fetchall()
+        return [self._row_to_conversation(conn, row) for row in rows]
     
     async def delete_conversation(self, conv_id: str) -> bool:
         """Delete a conversation."""
-        await self.initialize()
+        self._dirty.pop(conv_id, None)
+        _, rows = await asyncio.gather(
+            self._write(self.SQL_DELETE_MESSAGES, (conv_id,)),
+            self._write(self.SQL_DELETE_CONVERSATION, (conv_id,)),
+        )
+        deleted = rows > 0
+        if deleted:
+            logger.debug(f"Deleted conversation {conv_id}")
+        return deleted
+    
+    async def append_messages(self, record: ConversationRecord) -> None:
+        """
+        Append a conversation's new messages to the message log.
         
-        async with self._lock:
-            return await asyncio.to_thread(
-                self._delete_conversation_sync,
-                conv_id
+        record.messages holds only the new messages, each with its "seq".
+        A seq already in the log is ignored, so retrying an append is
+        safe. The conversation row's updated_at and metadata are
+        refreshed; existing messages are not rewritten. The conversation
+        stays dirty unless every write commits.
+        """
+        mark = self._dirty.get(record.id)
+        rows = [
+            (
+                record.id,
+                msg["seq"],
+                msg["role"],
+                msg["content"],
+                msg.get("timestamp") or datetime.now(timezone.utc).isoformat(),
             )
+            for msg in record.messages
+        ]
+        writes = [
+            self._write(
+                self.SQL_TOUCH_CONVERSATION,
+                (
+                    record.id,
+                    record.created_at.isoformat(),
+                    record.updated_at.isoformat(),
+                    json.dumps(record.metadata),
+                ),
+                key=("conversation", record.id),
+            ),
+            *(self._write(self.SQL_APPEND_MESSAGE, row) for row in rows),
+        ]
+        await asyncio.gather(*writes)
+        self._clear_dirty(record.id, mark)
+        logger.debug(f"Appended {len(record.messages)} messages to {record.id}")
     
-    def _delete_conversation_sync(self, conv_id: str) -> bool:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM conversations WHERE id = ?", (conv_id,))
-        conn.commit()
+    async def load_messages(
+        self,
+        conv_id: str,
+        before_seq: Optional[int] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Load up to limit logged messages with seq < before_seq, oldest first.
         
-        deleted = cursor.rowcount > 0
-        if deleted:
-            logger.debug(f"Deleted conversation {conv_id}")
-        return deleted
+        With before_seq None this is the newest messages; pass the
+        oldest seq already held to page back through older turns.
+        """
+        if before_seq is None:
+            before_seq = 2 ** 63 - 1
+        return await self._read(self._load_messages_sync, conv_id, before_seq, limit)
+    
+    def _load_messages_sync(
+        self,
+        conn: sqlite3.Connection,
+        conv_id: str,
+        before_seq: int,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        rows = conn.execute(self.SQL_LOAD_MESSAGES, (conv_id, before_seq, limit)).fetchall()
+        return [self._log_entry(row) for row in reversed(rows)]
     
     # =========================================================================
-    # SETTINGS OPERATIONS
+    # DIRTY CONVERSATION TRACKING
     # =========================================================================
     
-    async def set_setting(self, key: str, value: Any) -> None:
-        """Save a setting."""
-        await self.initialize()
+    def set_conversation_source(
+        self,
+        source: Callable[[str], Optional[ConversationRecord]],
+        on_saved: Optional[Callable[[ConversationRecord], None]] = None,
+    ) -> None:
+        """
+        Set how flush_dirty() gets the unsaved part of a conversation.
         
-        async with self._lock:
-            await asyncio.to_thread(
-                self._set_setting_sync,
-                key,
-                value
-            )
+        The source returns a record holding only the messages not yet in
+        the log (see append_messages), or None for conversations that no
+        longer exist. on_saved(record) is called once a record's append
+        has committed, so the owner can mark those messages saved.
+        """
+        self._conversation_source = source
+        self._on_saved = on_saved
     
-    def _set_setting_sync(self, key: str, value: Any) -> None:
-        conn = self._get_connection()
-        cursor = conn.cursor()
+    def mark_dirty(self, conv_id: str) -> None:
+        """Record that a conversation changed since it was last saved."""
+        self._dirty_marks += 1
+        self._dirty[conv_id] = self._dirty_marks
+    
+    def _clear_dirty(self, conv_id: str, mark: Optional[int]) -> None:
+        """Clear a dirty flag after its save committed, unless marked again since."""
+        if mark is not None and self._dirty.get(conv_id) == mark:
+            del self._dirty[conv_id]
+    
+    @property
+    def dirty_conversations(self) -> Set[str]:
+        """IDs of conversations with unsaved changes."""
+        return set(self._dirty)
+    
+    async def flush_dirty(self) -> int:
+        """
+        Append every dirty conversation's unsaved messages.
         
-        cursor.execute("""
-            INSERT OR REPLACE INTO settings (key, value, updated_at)
-            VALUES (?, ?, ?)
-        """, (key, json.dumps(value), datetime.now(timezone.utc).isoformat()))
+        Each conversation is clean once its append commits; those that
+        fail stay dirty for the next flush.
         
-        conn.commit()
+        Returns:
+            Number of conversations saved
+        """
+        if not self._dirty or self._conversation_source is None:
+            return 0
+        
+        records = []
+        for conv_id in list(self._dirty):
+            try:
+                record = self._conversation_source(conv_id)
+            except Exception as e:
+                logger.warning(f"Failed to snapshot conversation {conv_id}: {e}")
+                continue
+            if record is None:
+                self._dirty.pop(conv_id, None)  # No longer exists
+            else:
+                records.append(record)
+        
+        results = await asyncio.gather(
+            *(self.append_messages(record) for record in records),
+            return_exceptions=True,
+        )
+        saved = 0
+        for record, result in zip(records, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to save conversation {record.id}: {result}")
+                continue
+            saved += 1
+            if self._on_saved is not None:
+                try:
+                    self._on_saved(record)
+                except Exception as e:
+                    logger.warning(f"Failed to mark conversation {record.id} saved: {e}")
+        return saved
+    
+    # =========================================================================
+    # SETTINGS OPERATIONS
+    # =========================================================================
+    
+    async def set_setting(self, key: str, value: Any) -> None:
+        """Save a setting."""
+        await self._write(
+            self.SQL_SET_SETTING,
+            (key, json.dumps(value), datetime.now(timezone.utc).isoformat()),
+            key=("setting", key),
+        )
     
     async def get_setting(self, key: str, default: Any = None) -> Any:
         """Get a setting value."""
-        await self.initialize()
-        
-        async with self._lock:
-            return await asyncio.to_thread(
-                self._get_setting_sync,
-                key,
-                default
-            )
+        return await self._read(self._get_setting_sync, key, default)
     
-    def _get_setting_sync(self, key: str, default: Any) -> Any:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-        row = cursor.fetchone()
-        
+    def _get_setting_sync(
+        self,
+        conn: sqlite3.Connection,
+        key: str,
+        default: Any,
+    ) -> Any:
+        row = conn.execute(self.SQL_GET_SETTING, (key,)).fetchone()
         if row is None:
             return default
-        
         return json.loads(row["value"])
     
     # =========================================================================
@@ -346,87 +770,61 @@ class StateStore:
         expires_at: Optional[datetime] = None,
     ) -> None:
         """Save session data."""
-        await self.initialize()
-        
-        async with self._lock:
-            await asyncio.to_thread(
-                self._save_session_sync,
+        await self._write(
+            self.SQL_SAVE_SESSION,
+            (
                 session_id,
-                data,
-                expires_at
-            )
-    
-    def _save_session_sync(
-        self,
-        session_id: str,
-        data: Dict[str, Any],
-        expires_at: Optional[datetime],
-    ) -> None:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO sessions (id, data, created_at, expires_at)
-            VALUES (?, ?, ?, ?)
-        """, (
-            session_id,
-            json.dumps(data),
-            datetime.now(timezone.utc).isoformat(),
-            expires_at.isoformat() if expires_at else None,
-        ))
-        
-        conn.commit()
+                json.dumps(data),
+                datetime.now(timezone.utc).isoformat(),
+                expires_at.isoformat() if expires_at else None,
+            ),
+            key=("session", session_id),
+        )
         logger.debug(f"Saved session {session_id}")
     
     async def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Load session data."""
-        await self.initialize()
-        
-        async with self._lock:
-            return await asyncio.to_thread(
-                self._load_session_sync,
-                session_id
-            )
-    
-    def _load_session_sync(self, session_id: str) -> Optional[Dict[str, Any]]:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "SELECT data, expires_at FROM sessions WHERE id = ?",
-            (session_id,)
-        )
-        row = cursor.fetchone()
-        
+        row = await self._read(self._load_session_sync, session_id)
         if row is None:
             return None
         
+        data, expires_at = row
         # Check expiry
-        if row["expires_at"]:
-            expires = datetime.fromisoformat(row["expires_at"])
+        if expires_at:
+            expires = datetime.fromisoformat(expires_at)
             if datetime.now(timezone.utc) >= expires:
                 # Session expired, delete it
-                cursor.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
-                conn.commit()
+                await self.delete_session(session_id)
                 return None
         
-        return json.loads(row["data"])
+        return json.loads(data)
+    
+    def _load_session_sync(
+        self,
+        conn: sqlite3.Connection,
+        session_id: str,
+    ) -> Optional[tuple]:
+        row = conn.execute(self.SQL_LOAD_SESSION, (session_id,)).fetchone()
+        if row is None:
+            return None
+        return row["data"], row["expires_at"]
     
     async def delete_session(self, session_id: str) -> None:
         """Delete session data."""
-        await self.initialize()
-        
-        async with self._lock:
-            await asyncio.to_thread(
-                self._delete_session_sync,
-                session_id
-            )
+        await self._write(self.SQL_DELETE_SESSION, (session_id,))
     
-    def _delete_session_sync(self, session_id: str) -> None:
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
-        conn.commit()
+    def get_status(self) -> dict:
+        """Get store status for API."""
+        return {
+            "db_path": str(self.db_path),
+            "initialized": self._initialized,
+            "queued_writes": self._writes.qsize(),
+            "read_connections": len(self._all_readers),
+            "batches_committed": self.batches_committed,
+            "writes_committed": self.writes_committed,
+            "writes_coalesced": self.writes_coalesced,
+            "dirty_conversations": len(self._dirty),
+        }
 
 
 # Global state store instance
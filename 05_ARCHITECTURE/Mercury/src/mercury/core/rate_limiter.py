@@ -13,12 +13,14 @@ MISSION-CRITICAL STANDARD: Zero-Ban Operation
 
 import asyncio
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional, TypeVar, Callable, Awaitable, Any
 from functools import wraps
 from enum import Enum
 
+from mercury.core.config import get_settings
 from mercury.core.logging import get_logger
 
 logger = get_logger("mercury.rate_limiter")
@@ -71,6 +73,13 @@ class TokenBucketRateLimiter:
         @limiter.limit
         async def call_api():
             ...
+    
+    FIFO mode (fifo=True): instead of holding the lock while it sleeps,
+    a waiter reserves its tokens under the lock - the bucket may go into
+    debt - and is given the departure time at which that debt is repaid.
+    It then releases the lock and sleeps until exactly that time. Waiters
+    depart in arrival order, one waiter never holds up another's
+    bookkeeping, and the wait is computed once rather than polled.
     """
     
     def __init__(
@@ -79,6 +88,7 @@ class TokenBucketRateLimiter:
         burst: int = 1,
         blocking: bool = True,
         max_wait: float = 60.0,
+        fifo: bool = False,
     ):
         """
         Initialize rate limiter.
@@ -88,11 +98,13 @@ class TokenBucketRateLimiter:
             burst: Maximum tokens in bucket (allows bursting)
             blocking: If True, wait for tokens. If False, raise exception.
             max_wait: Maximum seconds to wait for a token
+            fifo: Reserve departure slots in arrival order (see class docs)
         """
         self.rate = rate
         self.burst = burst
         self.blocking = blocking
         self.max_wait = max_wait
+        self.fifo = fifo
         
         self._tokens = float(burst)
         self._last_update = time.monotonic()
@@ -108,7 +120,7 @@ class TokenBucketRateLimiter:
     def available_tokens(self) -> float:
         """Get current available tokens (approximate, not locked)."""
         elapsed = time.monotonic() - self._last_update
-        return min(self._tokens + elapsed * self.rate, self.burst)
+        return max(0.0, min(self._tokens + elapsed * self.rate, self.burst))
     
     def _refill(self) -> None:
         """Refill tokens based on elapsed time."""
@@ -130,6 +142,9 @@ class TokenBucketRateLimiter:
         Raises:
             RateLimitExceeded: If blocking=False and no tokens available
         """
+        if self.fifo:
+            return await self._acquire_fifo(tokens)
+        
         start_time = time.monotonic()
         total_wait = 0.0
         
@@ -139,6 +154,7 @@ class TokenBucketRateLimiter:
             while self._tokens < tokens:
                 if not self.blocking:
                     wait_time = (tokens - self._tokens) / self.rate
+                    self._stats.total_rejected += 1
                     raise RateLimitExceeded(
                         f"Rate limit exceeded, retry after {wait_time:.2f}s",
                         retry_after=wait_time,
@@ -148,6 +164,7 @@ class TokenBucketRateLimiter:
                 wait_needed = (tokens - self._tokens) / self.rate
                 
                 if total_wait + wait_needed > self.max_wait:
+                    self._stats.total_rejected += 1
                     raise RateLimitExceeded(
                         f"Rate limit wait exceeded max_wait of {self.max_wait}s",
                         retry_after=wait_needed,
@@ -177,6 +194,69 @@ class TokenBucketRateLimiter:
         
         return total_wait
     
+    async def _acquire_fifo(self, tokens: int) -> float:
+        """Reserve tokens and a departure slot under the lock, then sleep."""
+        async with self._lock:
+            self._refill()
+            wait_time = max(0.0, (tokens - self._tokens) / self.rate)
+            
+            if wait_time > 0 and not self.blocking:
+                self._stats.total_rejected += 1
+                raise RateLimitExceeded(
+                    f"Rate limit exceeded, retry after {wait_time:.2f}s",
+                    retry_after=wait_time,
+                )
+            if wait_time > self.max_wait:
+                self._stats.total_rejected += 1
+                raise RateLimitExceeded(
+                    f"Rate limit wait exceeded max_wait of {self.max_wait}s",
+                    retry_after=wait_time,
+                )
+            
+            # Reserve: a negative balance is the queue ahead of later callers
+            self._tokens -= tokens
+            self._record(wait_time)
+        
+        if wait_time > 0:
+            try:
+                await asyncio.sleep(wait_time)
+            except asyncio.CancelledError:
+                # Give the slot back so the next caller can use it
+                self._tokens = min(self._tokens + tokens, self.burst)
+                raise
+        
+        return wait_time
+    
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """
+        Take tokens only if they are available right now.
+        
+        Never waits and never jumps ahead of callers already waiting.
+        
+        Args:
+            tokens: Number of tokens to acquire
+            
+        Returns:
+            True if the tokens were taken
+        """
+        if self._lock.locked():
+            return False
+        self._refill()
+        if self._tokens < tokens:
+            return False
+        self._tokens -= tokens
+        self._record(0.0)
+        return True
+    
+    def _record(self, wait_time: float) -> None:
+        """Update stats for a granted request."""
+        self._stats.total_requests += 1
+        self._stats.last_request_time = datetime.now(timezone.utc)
+        if wait_time > 0:
+            wait_ms = wait_time * 1000
+            self._stats.total_waited_ms += wait_ms
+            self._stats.max_wait_ms = max(self._stats.max_wait_ms, wait_ms)
+    
     async def __aenter__(self) -> "TokenBucketRateLimiter":
         """Async context manager entry - acquires a token."""
         await self.acquire()
@@ -218,6 +298,7 @@ class TokenBucketRateLimiter:
             "burst": self.burst,
             "available_tokens": round(self.available_tokens, 2),
             "blocking": self.blocking,
+            "fifo": self.fifo,
             "stats": {
                 "total_requests": self._stats.total_requests,
                 "avg_wait_ms": round(self._stats.avg_wait_ms, 2),
@@ -227,6 +308,69 @@ class TokenBucketRateLimiter:
         }
 
 
+class EndpointRateLimiter:
+    """
+    One token bucket per API endpoint, with a shared default bucket.
+    
+    Kite meters endpoint families separately (quotes, historical candles,
+    orders, everything else), so a burst of history requests should not
+    eat into the quote allowance. Endpoints without their own limit use
+    the default bucket.
+    
+    Example:
+        limiters = EndpointRateLimiter(
+            {"quote": (1.0, 1), "historical": (3.0, 3)},
+            default=TokenBucketRateLimiter(rate=1.0, burst=3),
+        )
+        await limiters.acquire("historical")
+    """
+    
+    def __init__(
+        self,
+        limits: dict[str, tuple[float, int]],
+        default: TokenBucketRateLimiter,
+        **limiter_kwargs: Any,
+    ):
+        """
+        Initialize endpoint limiters.
+        
+        Args:
+            limits: Endpoint -> (rate per second, burst)
+            default: Bucket for endpoints not listed in limits
+            **limiter_kwargs: Passed to each endpoint's TokenBucketRateLimiter
+        """
+        self.default = default
+        self._limiters = {
+            endpoint: TokenBucketRateLimiter(rate=rate, burst=burst, **limiter_kwargs)
+            for endpoint, (rate, burst) in limits.items()
+        }
+    
+    def get(self, endpoint: Optional[str] = None) -> TokenBucketRateLimiter:
+        """Get the bucket for an endpoint (default bucket if it has none)."""
+        return self._limiters.get(endpoint, self.default)
+    
+    async def acquire(self, endpoint: Optional[str] = None, tokens: int = 1) -> float:
+        """Acquire tokens from an endpoint's bucket, waiting if necessary."""
+        return await self.get(endpoint).acquire(tokens)
+    
+    def try_acquire(self, endpoint: Optional[str] = None, tokens: int = 1) -> bool:
+        """Take tokens from an endpoint's bucket only if available right now."""
+        return self.get(endpoint).try_acquire(tokens)
+    
+    def all(self) -> list[TokenBucketRateLimiter]:
+        """Every bucket, endpoint buckets first and the default last."""
+        return [*self._limiters.values(), self.default]
+    
+    def get_status(self) -> dict:
+        """Get status of every endpoint bucket for API."""
+        status = {
+            endpoint: limiter.get_status()
+            for endpoint, limiter in self._limiters.items()
+        }
+        status["default"] = self.default.get_status()
+        return status
+
+
 class SlidingWindowRateLimiter:
     """
     Sliding window rate limiter for longer time windows.
@@ -234,8 +378,22 @@ class SlidingWindowRateLimiter:
     Better for rate limits like "60 requests per minute" where
     we need to track requests over a sliding time window.
     
+    Each admitted request is kept as a (timestamp, weight) entry in a
+    deque in arrival order, with a running total of the weight inside
+    the window. Expired entries are popped from the left, so eviction
+    and counting are O(1) amortised instead of rebuilding and rescanning
+    the whole list.
+    
+    Weights make token-based windows possible ("30,000 input tokens per
+    minute"): acquire(weight) admits a request once the window has room
+    for its weight, and record(weight) adds usage only known afterwards.
+    projected_wait() estimates how long a new request would queue, so
+    callers can shed load instead of waiting.
+    
     Example:
         limiter = SlidingWindowRateLimiter(limit=60, window_seconds=60)
+        tokens = SlidingWindowRateLimiter(limit=30_000, window_seconds=60)
+        await tokens.acquire(1_200)
     """
     
     def __init__(
@@ -248,7 +406,7 @@ class SlidingWindowRateLimiter:
         Initialize sliding window rate limiter.
         
         Args:
-            limit: Maximum requests in the window
+            limit: Maximum requests (or total weight) in the window
             window_seconds: Window size in seconds
             blocking: If True, wait for capacity. If False, raise exception.
         """
@@ -256,7 +414,9 @@ class SlidingWindowRateLimiter:
         self.window_seconds = window_seconds
         self.blocking = blocking
         
-        self._timestamps: list[float] = []
+        self._entries: deque[tuple[float, int]] = deque()
+        self._used = 0
+        self._queued = 0
         self._lock = asyncio.Lock()
         self._stats = RateLimitStats()
     
@@ -265,69 +425,159 @@ class SlidingWindowRateLimiter:
         """Get rate limiter statistics."""
         return self._stats
     
-    def _clean_old_timestamps(self) -> None:
-        """Remove timestamps outside the current window."""
-        cutoff = time.monotonic() - self.window_seconds
-        self._timestamps = [ts for ts in self._timestamps if ts > cutoff]
+    def _evict(self, now: float) -> None:
+        """Drop entries that have left the window."""
+        cutoff = now - self.window_seconds
+        entries = self._entries
+        while entries and entries[0][0] <= cutoff:
+            self._used -= entries.popleft()[1]
+    
+    def _add(self, now: float, weight: int) -> None:
+        if weight > 0:
+            self._entries.append((now, weight))
+            self._used += weight
+    
+    def _wait_for(self, needed: float, now: float) -> float:
+        """Seconds until `needed` weight has expired from the window."""
+        if needed <= 0:
+            return 0.0
+        freed = 0
+        for timestamp, weight in self._entries:
+            freed += weight
+            if freed >= needed:
+                return max(0.0, timestamp + self.window_seconds - now)
+        # More than the window holds: later windows fill up at the limit
+        return self.window_seconds * (1 + (needed - freed) / self.limit)
     
     @property
     def current_count(self) -> int:
-        """Get current request count in window (approximate)."""
-        cutoff = time.monotonic() - self.window_seconds
-        return len([ts for ts in self._timestamps if ts > cutoff])
+        """Get requests (or weight) used in the current window."""
+        self._evict(time.monotonic())
+        return self._used
     
     @property
     def available_capacity(self) -> int:
         """Get available capacity (approximate)."""
         return max(0, self.limit - self.current_count)
     
-    async def acquire(self) -> float:
+    def projected_wait(self, weight: int = 1) -> float:
+        """
+        Estimate how long a request of this weight would wait if made now.
+        
+        Counts the weight of callers already queued ahead of it.
+        
+        Args:
+            weight: Weight of the prospective request
+            
+        Returns:
+            Estimated wait in seconds (0 if it would be admitted at once)
+        """
+        now = time.monotonic()
+        self._evict(now)
+        return self._wait_for(self._used + self._queued + weight - self.limit, now)
+    
+    def record(self, weight: int) -> None:
+        """
+        Add usage to the window without waiting.
+        
+        For costs only known after the call (e.g. output tokens). The
+        window may go over its limit; later acquires wait until it drains.
+        """
+        now = time.monotonic()
+        self._evict(now)
+        self._add(now, weight)
+    
+    def can_acquire(self, weight: int = 1) -> bool:
+        """
+        Check whether try_acquire(weight) would succeed, without taking it.
+        
+        Lets a caller that needs capacity from several windows check all
+        of them before taking any.
+        """
+        if self._lock.locked() or self._queued:
+            return False
+        self._evict(time.monotonic())
+        return self._used + weight <= self.limit
+    
+    def try_acquire(self, weight: int = 1) -> bool:
+        """
+        Use capacity only if it is available right now.
+        
+        Never waits and never jumps ahead of callers already waiting.
+        
+        Args:
+            weight: Capacity the request uses
+        
+        Returns:
+            True if the capacity was taken
+        """
+        if not self.can_acquire(weight):
+            return False
+        now = time.monotonic()
+        self._add(now, weight)
+        self._stats.total_requests += 1
+        self._stats.last_request_time = datetime.now(timezone.utc)
+        return True
+    
+    async def acquire(self, weight: int = 1) -> float:
         """
         Acquire permission for a request.
         
+        Args:
+            weight: Capacity the request uses (1 per request, or its tokens)
+            
         Returns:
             Time waited in seconds
             
         Raises:
-            RateLimitExceeded: If blocking=False and at capacity
+            RateLimitExceeded: If blocking=False and at capacity, or if
+                weight can never fit in the window
         """
-        start_time = time.monotonic()
+        if weight > self.limit:
+            raise RateLimitExceeded(
+                f"Request weight {weight} exceeds the window limit of {self.limit}",
+                retry_after=self.window_seconds,
+            )
+        
         total_wait = 0.0
+        self._queued += weight
+        queued = True
         
-        async with self._lock:
-            self._clean_old_timestamps()
-            
-            while len(self._timestamps) >= self.limit:
-                if not self.blocking:
-                    # Calculate when oldest will expire
-                    oldest = min(self._timestamps)
-                    retry_after = (oldest + self.window_seconds) - time.monotonic()
-                    raise RateLimitExceeded(
-                        f"Rate limit of {self.limit}/{self.window_seconds}s exceeded",
-                        retry_after=max(0.1, retry_after),
-                    )
+        try:
+            async with self._lock:
+                now = time.monotonic()
+                self._evict(now)
                 
-                # Wait for oldest to expire
-                oldest = min(self._timestamps)
-                wait_time = (oldest + self.window_seconds) - time.monotonic()
+                while self._used + weight > self.limit:
+                    # Wait for just enough of the oldest entries to expire
+                    wait_time = self._wait_for(self._used + weight - self.limit, now)
+                    if not self.blocking:
+                        raise RateLimitExceeded(
+                            f"Rate limit of {self.limit}/{self.window_seconds}s exceeded",
+                            retry_after=max(0.1, wait_time),
+                        )
+                    
+                    await asyncio.sleep(wait_time)
+                    total_wait += wait_time
+                    now = time.monotonic()
+                    self._evict(now)
                 
-                if wait_time > 0:
-                    await asyncio.sleep(min(wait_time + 0.01, 1.0))
-                    total_wait += min(wait_time + 0.01, 1.0)
+                # Record this request
+                self._add(now, weight)
+                self._queued -= weight
+                queued = False
                 
-                self._clean_old_timestamps()
-            
-            # Record this request
-            self._timestamps.append(time.monotonic())
-            
-            # Update stats
-            self._stats.total_requests += 1
-            self._stats.last_request_time = datetime.now(timezone.utc)
-            
-            if total_wait > 0:
-                wait_ms = total_wait * 1000
-                self._stats.total_waited_ms += wait_ms
-                self._stats.max_wait_ms = max(self._stats.max_wait_ms, wait_ms)
+                # Update stats
+                self._stats.total_requests += 1
+                self._stats.last_request_time = datetime.now(timezone.utc)
+                
+                if total_wait > 0:
+                    wait_ms = total_wait * 1000
+                    self._stats.total_waited_ms += wait_ms
+                    self._stats.max_wait_ms = max(self._stats.max_wait_ms, wait_ms)
+        finally:
+            if queued:
+                self._queued -= weight
         
         return total_wait
     
@@ -359,6 +609,7 @@ class SlidingWindowRateLimiter:
             "window_seconds": self.window_seconds,
             "current_count": self.current_count,
             "available_capacity": self.available_capacity,
+            "projected_wait_seconds": round(self.projected_wait(), 2),
             "blocking": self.blocking,
             "stats": {
                 "total_requests": self._stats.total_requests,
@@ -378,6 +629,23 @@ kite_limiter = TokenBucketRateLimiter(
     burst=3,   # Allow small bursts
     blocking=True,
     max_wait=30.0,
+    fifo=True,
+)
+
+# Kite endpoints with their own published limits (rate/s, burst);
+# everything else shares kite_limiter
+KITE_ENDPOINT_LIMITS = {
+    "quote": (1.0, 1),
+    "historical": (3.0, 3),
+    "orders": (10.0, 10),
+}
+
+kite_limiters = EndpointRateLimiter(
+    KITE_ENDPOINT_LIMITS,
+    default=kite_limiter,
+    blocking=True,
+    max_wait=30.0,
+    fifo=True,
 )
 
 # Anthropic API: 60 requests per minute
@@ -387,10 +655,31 @@ anthropic_limiter = SlidingWindowRateLimiter(
     blocking=True,
 )
 
+# Anthropic input/output tokens per minute (from settings; None = unlimited)
+_anthropic_token_limiters: Optional[
+    tuple[Optional[SlidingWindowRateLimiter], Optional[SlidingWindowRateLimiter]]
+] = None
 
-def get_kite_limiter() -> TokenBucketRateLimiter:
-    """Get the Kite API rate limiter."""
-    return kite_limiter
+
+def try_acquire_all(*claims: tuple[Optional[SlidingWindowRateLimiter], int]) -> bool:
+    """
+    Take capacity from several windows only if every one has it now.
+    
+    Each claim is (limiter, weight); None limiters are skipped. All
+    windows are checked before any is charged, so a refusal holds no
+    capacity anywhere.
+    """
+    claims = [(limiter, weight) for limiter, weight in claims if limiter is not None]
+    if not all(limiter.can_acquire(weight) for limiter, weight in claims):
+        return False
+    for limiter, weight in claims:
+        limiter.try_acquire(weight)
+    return True
+
+
+def get_kite_limiter(endpoint: Optional[str] = None) -> TokenBucketRateLimiter:
+    """Get the Kite API rate limiter for an endpoint (default: shared bucket)."""
+    return kite_limiters.get(endpoint)
 
 
 def get_anthropic_limiter() -> SlidingWindowRateLimiter:
@@ -398,9 +687,32 @@ def get_anthropic_limiter() -> SlidingWindowRateLimiter:
     return anthropic_limiter
 
 
+def get_anthropic_token_limiters() -> tuple[
+    Optional[SlidingWindowRateLimiter], Optional[SlidingWindowRateLimiter]
+]:
+    """Get the Anthropic (input, output) tokens-per-minute limiters."""
+    global _anthropic_token_limiters
+    if _anthropic_token_limiters is None:
+        settings = get_settings()
+        _anthropic_token_limiters = tuple(
+            SlidingWindowRateLimiter(limit=limit, window_seconds=60) if limit > 0 else None
+            for limit in (
+                settings.anthropic_input_tokens_per_minute,
+                settings.anthropic_output_tokens_per_minute,
+            )
+        )
+    return _anthropic_token_limiters
+
+
 def get_all_limiter_status() -> dict:
     """Get status of all rate limiters."""
     return {
-        "kite": kite_limiter.get_status(),
+        "kite": kite_limiters.default.get_status(),
+        "kite_endpoints": kite_limiters.get_status(),
         "anthropic": anthropic_limiter.get_status(),
+        **{
+            f"anthropic_{kind}_tokens": limiter.get_status()
+            for kind, limiter in zip(("input", "output"), get_anthropic_token_limiters())
+            if limiter is not None
+        },
     }
@@ -8,22 +8,27 @@ MISSION-CRITICAL STANDARD: Resilience Pillar
 - Circuit breaker for external services
 - Graceful degradation hierarchy
 - Retry with exponential backoff
+- Hedged requests and adaptive timeouts
 - Health monitoring
 """
 
 import asyncio
 import inspect
 import time
-from dataclasses import dataclass, field
+from collections import deque
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from enum import Enum
 from functools import wraps
-from typing import Any, Callable, Optional, TypeVar
+from typing import Any, Awaitable, Callable, Optional, Sequence, TypeVar
 
 from mercury.core.logging import get_logger
+from mercury.core.metrics import Histogram, get_mercury_metrics
 
 logger = get_logger("mercury.resilience")
 
+T = TypeVar("T")
+
 
 class CircuitState(Enum):
     """Circuit breaker states."""
@@ -40,8 +45,10 @@ class CircuitStats:
     success_count: int = 0
     last_failure_time: Optional[datetime] = None
     last_success_time: Optional[datetime] = None
+    opened_at: Optional[datetime] = None
     total_requests: int = 0
     total_failures: int = 0
+    total_slow_calls: int = 0
     
     @property
     def failure_rate(self) -> float:
@@ -51,6 +58,107 @@ class CircuitStats:
         return (self.total_failures / self.total_requests) * 100
 
 
+@dataclass
+class WindowStats:
+    """Call outcomes over a circuit breaker's rolling window."""
+    calls: int = 0
+    failures: int = 0
+    slow_calls: int = 0
+    timed_calls: int = 0
+    total_duration: float = 0.0
+    
+    @property
+    def failure_rate(self) -> float:
+        """Failure rate over the window as percentage."""
+        if self.calls == 0:
+            return 0.0
+        return (self.failures / self.calls) * 100
+    
+    @property
+    def slow_call_rate(self) -> float:
+        """Share of timed calls over the window that were slow, as percentage."""
+        if self.timed_calls == 0:
+            return 0.0
+        return (self.slow_calls / self.timed_calls) * 100
+    
+    @property
+    def mean_duration(self) -> Optional[float]:
+        """Mean duration in seconds of timed calls over the window."""
+        if self.timed_calls == 0:
+            return None
+        return self.total_duration / self.timed_calls
+
+
+class RollingWindow:
+    """
+    Call outcomes over the last ``window_seconds``, in fixed time buckets.
+    
+    Buckets form a ring indexed by ``epoch % buckets``, where an epoch
+    is one bucket's span of time. Recording touches one bucket and
+    resets it first if it still holds an older epoch, so it is O(1);
+    a snapshot sums the buckets still inside the window, O(buckets).
+    """
+    
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        buckets: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self.bucket_seconds = window_seconds / buckets
+        self._clock = clock
+        self._epochs = [-1] * buckets
+        self._calls = [0] * buckets
+        self._failures = [0] * buckets
+        self._slow = [0] * buckets
+        self._timed = [0] * buckets
+        self._durations = [0.0] * buckets
+    
+    def _epoch(self) -> int:
+        return int(self._clock() // self.bucket_seconds)
+    
+    def record(
+        self,
+        failed: bool,
+        duration: Optional[float] = None,
+        slow: bool = False,
+    ) -> None:
+        """Record one call outcome in the current bucket."""
+        epoch = self._epoch()
+        i = epoch % self.buckets
+        if self._epochs[i] != epoch:
+            self._epochs[i] = epoch
+            self._calls[i] = self._failures[i] = self._slow[i] = self._timed[i] = 0
+            self._durations[i] = 0.0
+        self._calls[i] += 1
+        if failed:
+            self._failures[i] += 1
+        if duration is not None:
+            self._timed[i] += 1
+            self._durations[i] += duration
+            if slow:
+                self._slow[i] += 1
+    
+    def snapshot(self) -> WindowStats:
+        """Sum the buckets that are still inside the window."""
+        oldest = self._epoch() - self.buckets
+        stats = WindowStats()
+        for i, epoch in enumerate(self._epochs):
+            if epoch > oldest:
+                stats.calls += self._calls[i]
+                stats.failures += self._failures[i]
+                stats.slow_calls += self._slow[i]
+                stats.timed_calls += self._timed[i]
+                stats.total_duration += self._durations[i]
+        return stats
+    
+    def clear(self) -> None:
+        """Forget every recorded call."""
+        self._epochs = [-1] * self.buckets
+
+
 @dataclass
 class CircuitBreakerConfig:
     """Configuration for a circuit breaker."""
@@ -58,6 +166,22 @@ class CircuitBreakerConfig:
     success_threshold: int = 3       # Successes to close from half-open
     timeout_seconds: float = 30.0    # Time before trying half-open
     half_open_max_calls: int = 1     # Max calls in half-open state
+    half_open_timeout_seconds: float = 30.0  # Trial calls unanswered this long are abandoned
+    
+    # Rolling window, always kept for reporting; with rolling=True the
+    # breaker opens on failure rate over the window instead of on
+    # failure_threshold consecutive failures
+    rolling: bool = False
+    window_seconds: float = 60.0
+    window_buckets: int = 10
+    failure_rate_threshold: float = 50.0  # Percent of calls in the window
+    minimum_calls: int = 10               # Calls in the window before rates count
+    
+    # Slow calls: a call taking slow_call_seconds or longer is slow, and
+    # the breaker opens when slow_call_rate_threshold percent of timed
+    # calls in the window were slow (None disables)
+    slow_call_seconds: Optional[float] = None
+    slow_call_rate_threshold: float = 50.0
 
 
 class CircuitBreaker:
@@ -66,6 +190,11 @@ class CircuitBreaker:
     
     Prevents cascade failures by failing fast when a service is down.
     
+    Opens after failure_threshold consecutive failures or, in rolling
+    mode, when the failure rate over the rolling window crosses
+    failure_rate_threshold. With slow_call_seconds set it also opens
+    when too many recent calls were slow, even if they succeeded.
+    
     Usage:
         breaker = CircuitBreaker("kite_api")
         
@@ -73,13 +202,14 @@ class CircuitBreaker:
         async def call_kite():
             ...
             
-        # Or manually
+        # Or manually, passing durations to enable slow-call tripping
         if breaker.allow_request():
+            started = time.perf_counter()
             try:
                 result = await call_external()
-                breaker.record_success()
-            except Exception:
-                breaker.record_failure()
+                breaker.record_success(time.perf_counter() - started)
+            except Exception as e:
+                breaker.record_failure(e, time.perf_counter() - started)
     """
     
     def __init__(
@@ -90,7 +220,32 @@ class CircuitBreaker:
         self.name = name
         self.config = config or CircuitBreakerConfig()
         self.stats = CircuitStats()
+        self.window = RollingWindow(self.config.window_seconds, self.config.window_buckets)
         self._half_open_calls = 0
+        self._last_trial_at = 0.0
+        self._listeners: list[Callable[["CircuitBreaker", CircuitState, CircuitState], None]] = []
+    
+    def add_listener(
+        self,
+        listener: Callable[["CircuitBreaker", CircuitState, CircuitState], None],
+    ) -> None:
+        """Call listener(breaker, previous_state, new_state) on every transition."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable) -> None:
+        """Stop notifying a transition listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _notify(self, previous: CircuitState) -> None:
+        if previous == self.stats.state:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(self, previous, self.stats.state)
+            except Exception as e:
+                logger.error(f"Circuit '{self.name}' listener failed: {e}")
     
     @property
     def state(self) -> CircuitState:
@@ -108,41 +263,102 @@ class CircuitBreaker:
             return True
         
         if self.stats.state == CircuitState.OPEN:
-            # Check if timeout has elapsed
-            if self.stats.last_failure_time:
-                elapsed = (datetime.now(timezone.utc) - self.stats.last_failure_time).total_seconds()
-                if elapsed >= self.config.timeout_seconds:
-                    self._transition_to_half_open()
-                    return True
-            return False
+            # Check if timeout has elapsed; if so this call is the first trial
+            opened_at = self.stats.opened_at or self.stats.last_failure_time
+            if not opened_at:
+                return False
+            elapsed = (datetime.now(timezone.utc) - opened_at).total_seconds()
+            if elapsed < self.config.timeout_seconds:
+                return False
+            self._transition_to_half_open()
         
         if self.stats.state == CircuitState.HALF_OPEN:
-            # Allow limited calls in half-open
+            # Allow limited calls in half-open; trials that never recorded a
+            # result (caller cancelled or skipped recording) are given up on
+            # after half_open_timeout_seconds so the breaker cannot stick
+            now = time.monotonic()
+            if (
+                self._half_open_calls >= self.config.half_open_max_calls
+                and now - self._last_trial_at >= self.config.half_open_timeout_seconds
+            ):
+                self._half_open_calls = 0
             if self._half_open_calls < self.config.half_open_max_calls:
                 self._half_open_calls += 1
+                self._last_trial_at = now
                 return True
             return False
         
         return False
     
-    def record_success(self) -> None:
-        """Record a successful call."""
+    def release(self) -> None:
+        """
+        Give back a half-open trial slot without recording a result.
+        
+        For calls admitted by allow_request() that are then not made, or
+        whose outcome says nothing about the service's health.
+        """
+        if self.stats.state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+    
+    def _is_slow(self, duration: Optional[float]) -> bool:
+        slow_after = self.config.slow_call_seconds
+        return slow_after is not None and duration is not None and duration >= slow_after
+    
+    def _window_exceeded(self) -> bool:
+        """Check the rolling window against the rate thresholds."""
+        if not self.config.rolling and self.config.slow_call_seconds is None:
+            return False
+        window = self.window.snapshot()
+        if window.calls < self.config.minimum_calls:
+            return False
+        if self.config.rolling and window.failure_rate >= self.config.failure_rate_threshold:
+            return True
+        return (
+            self.config.slow_call_seconds is not None
+            and window.timed_calls >= self.config.minimum_calls
+            and window.slow_call_rate >= self.config.slow_call_rate_threshold
+        )
+    
+    def record_success(self, duration: Optional[float] = None) -> None:
+        """Record a successful call, optionally with its duration in seconds."""
+        slow = self._is_slow(duration)
+        self.window.record(False, duration, slow)
         self.stats.success_count += 1
         self.stats.total_requests += 1
         self.stats.last_success_time = datetime.now(timezone.utc)
         
+        if slow:
+            self.stats.total_slow_calls += 1
+            if self.stats.state == CircuitState.HALF_OPEN:
+                # A slow trial call means the service has not recovered
+                self._transition_to_open()
+                return
+            if self.stats.state == CircuitState.CLOSED and self._window_exceeded():
+                self._transition_to_open()
+                return
+        
         if self.stats.state == CircuitState.HALF_OPEN:
+            # The trial is answered; its slot goes to the next trial
+            self.release()
             if self.stats.success_count >= self.config.success_threshold:
                 self._transition_to_closed()
         elif self.stats.state == CircuitState.CLOSED:
             # Reset failure count on success
             self.stats.failure_count = 0
     
-    def record_failure(self, error: Optional[Exception] = None) -> None:
-        """Record a failed call."""
+    def record_failure(
+        self,
+        error: Optional[Exception] = None,
+        duration: Optional[float] = None,
+    ) -> None:
+        """Record a failed call, optionally with its duration in seconds."""
+        slow = self._is_slow(duration)
+        self.window.record(True, duration, slow)
         self.stats.failure_count += 1
         self.stats.total_failures += 1
         self.stats.total_requests += 1
+        if slow:
+            self.stats.total_slow_calls += 1
         self.stats.last_failure_time = datetime.now(timezone.utc)
         
         logger.warning(
@@ -155,42 +371,60 @@ class CircuitBreaker:
         )
         
         if self.stats.state == CircuitState.HALF_OPEN:
+            self.release()
             self._transition_to_open()
         elif self.stats.state == CircuitState.CLOSED:
-            if self.stats.failure_count >= self.config.failure_threshold:
+            if (
+                not self.config.rolling
+                and self.stats.failure_count >= self.config.failure_threshold
+            ) or self._window_exceeded():
                 self._transition_to_open()
     
     def _transition_to_open(self) -> None:
         """Transition to open state."""
+        previous = self.stats.state
         self.stats.state = CircuitState.OPEN
         self.stats.success_count = 0
+        self.stats.opened_at = datetime.now(timezone.utc)
         logger.warning(
             f"Circuit '{self.name}' OPENED - failing fast",
             context={"failure_count": self.stats.failure_count}
         )
+        self._notify(previous)
     
     def _transition_to_half_open(self) -> None:
         """Transition to half-open state."""
+        previous = self.stats.state
         self.stats.state = CircuitState.HALF_OPEN
         self.stats.success_count = 0
         self._half_open_calls = 0
         logger.info(f"Circuit '{self.name}' half-open - testing")
+        self._notify(previous)
     
     def _transition_to_closed(self) -> None:
         """Transition to closed state."""
+        previous = self.stats.state
         self.stats.state = CircuitState.CLOSED
         self.stats.failure_count = 0
         self._half_open_calls = 0
+        # Start the window afresh so pre-outage calls cannot re-trip it
+        self.window.clear()
         logger.info(f"Circuit '{self.name}' CLOSED - recovered")
+        self._notify(previous)
     
     def reset(self) -> None:
         """Reset circuit breaker to initial state."""
+        previous = self.stats.state
         self.stats = CircuitStats()
+        self.window.clear()
         self._half_open_calls = 0
         logger.info(f"Circuit '{self.name}' reset")
+        self._notify(previous)
     
     def get_health(self) -> dict:
         """Get circuit health information."""
+        window = self.window.snapshot()
+        mean_duration = window.mean_duration
         return {
             "name": self.name,
             "state": self.stats.state.value,
@@ -199,6 +433,16 @@ class CircuitBreaker:
             "failure_rate": round(self.stats.failure_rate, 2),
             "last_failure": self.stats.last_failure_time.isoformat() if self.stats.last_failure_time else None,
             "last_success": self.stats.last_success_time.isoformat() if self.stats.last_success_time else None,
+            "window": {
+                "mode": "rolling" if self.config.rolling else "consecutive",
+                "seconds": self.window.window_seconds,
+                "calls": window.calls,
+                "failures": window.failures,
+                "failure_rate": round(window.failure_rate, 2),
+                "slow_calls": window.slow_calls,
+                "slow_call_rate": round(window.slow_call_rate, 2),
+                "mean_duration_ms": round(mean_duration * 1000, 1) if mean_duration is not None else None,
+            },
         }
     
     def protect(self, func: Callable) -> Callable:
@@ -214,12 +458,13 @@ class CircuitBreaker:
                     raise CircuitOpenError(
                         f"Circuit '{self.name}' is open - request rejected"
                     )
+                started = time.perf_counter()
                 try:
                     result = await func(*args, **kwargs)
-                    self.record_success()
+                    self.record_success(time.perf_counter() - started)
                     return result
                 except Exception as e:
-                    self.record_failure(e)
+                    self.record_failure(e, time.perf_counter() - started)
                     raise
             return async_wrapper
         else:
@@ -229,12 +474,13 @@ class CircuitBreaker:
                     raise CircuitOpenError(
                         f"Circuit '{self.name}' is open - request rejected"
                     )
+                started = time.perf_counter()
                 try:
                     result = func(*args, **kwargs)
-                    self.record_success()
+                    self.record_success(time.perf_counter() - started)
                     return result
                 except Exception as e:
-                    self.record_failure(e)
+                    self.record_failure(e, time.perf_counter() - started)
                     raise
             return sync_wrapper
 
@@ -282,6 +528,43 @@ ai_circuit = get_circuit_breaker(
     )
 )
 
+# Per-endpoint Kite breakers, in front of kite_circuit: open on the
+# failure rate or slow-call rate of one endpoint over the last 30s, so a
+# degraded endpoint (historical data timing out, say) fails fast without
+# taking quotes and portfolio calls down with it
+KITE_ENDPOINT_CIRCUIT = CircuitBreakerConfig(
+    success_threshold=2,
+    timeout_seconds=30.0,
+    rolling=True,
+    window_seconds=30.0,
+    window_buckets=10,
+    failure_rate_threshold=50.0,
+    minimum_calls=5,
+    slow_call_seconds=5.0,
+    slow_call_rate_threshold=50.0,
+)
+
+# Endpoints the Kite adapter guards with their own breaker
+KITE_ENDPOINTS = ("quote", "historical", "positions", "holdings", "instruments")
+
+# Endpoints whose calls are expected to take longer
+KITE_ENDPOINT_SLOW_CALL_SECONDS = {
+    "historical": 10.0,
+    "instruments": 30.0,
+}
+
+
+def get_kite_circuit(endpoint: str) -> CircuitBreaker:
+    """Get the circuit breaker for one Kite endpoint ("kite_api.<endpoint>")."""
+    name = f"kite_api.{endpoint}"
+    if name not in _circuit_breakers:
+        slow_after = KITE_ENDPOINT_SLOW_CALL_SECONDS.get(
+            endpoint, KITE_ENDPOINT_CIRCUIT.slow_call_seconds
+        )
+        config = replace(KITE_ENDPOINT_CIRCUIT, slow_call_seconds=slow_after)
+        _circuit_breakers[name] = CircuitBreaker(name, config)
+    return _circuit_breakers[name]
+
 
 @dataclass
 class RetryConfig:
@@ -348,6 +631,282 @@ async def retry_async(
     raise last_exception
 
 
+@dataclass
+class HedgeConfig:
+    """Configuration for hedged calls and adaptive timeouts."""
+    hedge_quantile: float = 0.95       # Hedge a call still running past this latency
+    min_samples: int = 20              # Observed calls before hedging/adapting
+    min_hedge_delay_seconds: float = 0.05
+    budget_ratio: float = 0.1          # Hedges earned per call (10% extra load at most)
+    budget_burst: float = 5.0          # Unused hedges that can be saved up
+    timeout_quantile: float = 0.99
+    timeout_multiplier: float = 3.0    # Timeout = multiplier x observed timeout_quantile
+    min_timeout_seconds: float = 1.0
+    max_timeout_seconds: float = 60.0  # Also the timeout until min_samples are seen
+    refresh_seconds: float = 1.0       # How often quantiles are re-read
+    window_samples: int = 200          # Recent attempts the quantiles are estimated from
+
+
+@dataclass
+class HedgeStats:
+    """Statistics for a hedger."""
+    calls: int = 0
+    hedges_sent: int = 0
+    hedges_won: int = 0
+    hedges_refused: int = 0            # Hedge was due but a circuit, limit or budget said no
+    timeouts: int = 0
+
+
+def latency_quantile(samples: Sequence[tuple[float, bool]], q: float) -> Optional[float]:
+    """
+    q-quantile of (seconds, censored) latency samples (Kaplan-Meier).
+    
+    A censored sample is an attempt that timed out, was cancelled or
+    failed: its latency is only known to be at least that long, so it
+    leaves the at-risk set without counting as a completion. If too many
+    attempts were censored for the quantile to be reached, the longest
+    sample is returned as a lower bound.
+    """
+    if not samples:
+        return None
+    at_risk = len(samples)
+    survival = 1.0
+    # Completions sort before censored samples of the same duration
+    for seconds, censored in sorted(samples):
+        if not censored:
+            survival *= 1.0 - 1.0 / at_risk
+            if 1.0 - survival >= q:
+                return seconds
+        at_risk -= 1
+    return max(seconds for seconds, _ in samples)
+
+
+class Hedger:
+    """
+    Hedged requests and adaptive timeouts for one upstream endpoint.
+    
+    Every attempt's elapsed time is kept in a window of the last
+    window_samples attempts; attempts that time out, are cancelled or fail
+    count as censored samples (latency at least that long), so a slowing
+    endpoint raises the estimates instead of dropping out of them.
+    Completed attempts are also observed in the endpoint's
+    mercury_api_call_duration_seconds histogram. Once the window holds
+    min_samples attempts:
+    
+    - an idempotent call still running after the observed hedge_quantile
+      latency gets a second, identical attempt; the first to succeed wins
+      and the other is cancelled
+    - the whole call is bounded by timeout_multiplier x the observed
+      timeout_quantile latency (max_timeout_seconds until then)
+    
+    A hedge is only sent while every circuit given is closed, while the
+    hedge budget lasts, and if `reserve` grants capacity without waiting
+    (typically a rate limiter's try_acquire). During an incident or at
+    the rate limit, calls simply are not hedged.
+    
+    Usage:
+        hedger = get_hedger("anthropic.generate", circuits=(ai_circuit,))
+        response = await hedger.call(
+            lambda: client.messages.create(**request),
+            idempotent=True,
+            reserve=limiter.try_acquire,
+        )
+    """
+    
+    def __init__(
+        self,
+        endpoint: str,
+        config: Optional[HedgeConfig] = None,
+        circuits: Sequence[CircuitBreaker] = (),
+        histogram: Optional[Histogram] = None,
+    ):
+        self.endpoint = endpoint
+        self.config = config or HedgeConfig()
+        self.circuits = tuple(circuits)
+        self.stats = HedgeStats()
+        histogram = histogram or get_mercury_metrics()["api_call_duration"]
+        self._latency = histogram.labels(endpoint=endpoint)
+        self._samples: deque[tuple[float, bool]] = deque(maxlen=self.config.window_samples)
+        self._budget = self.config.budget_burst
+        self._hedge_delay: Optional[float] = None
+        self._timeout = self.config.max_timeout_seconds
+        self._refreshed_at = float("-inf")
+    
+    def _refresh(self) -> None:
+        """Re-read the latency quantiles, at most every refresh_seconds."""
+        now = time.monotonic()
+        if now - self._refreshed_at < self.config.refresh_seconds:
+            return
+        self._refreshed_at = now
+        if len(self._samples) < self.config.min_samples:
+            return
+        samples = list(self._samples)
+        self._hedge_delay = max(
+            self.config.min_hedge_delay_seconds,
+            latency_quantile(samples, self.config.hedge_quantile),
+        )
+        self._timeout = min(
+            self.config.max_timeout_seconds,
+            max(
+                self.config.min_timeout_seconds,
+                self.config.timeout_multiplier
+                * latency_quantile(samples, self.config.timeout_quantile),
+            ),
+        )
+    
+    def observe(self, seconds: float, censored: bool = False) -> None:
+        """Add one attempt's elapsed time (censored: it never completed)."""
+        self._samples.append((seconds, censored))
+    
+    @property
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds before a hedge is sent (None until enough samples)."""
+        self._refresh()
+        return self._hedge_delay
+    
+    @property
+    def timeout(self) -> float:
+        """Current adaptive timeout in seconds."""
+        self._refresh()
+        return self._timeout
+    
+    def _may_hedge(self, reserve: Optional[Callable[[], bool]]) -> bool:
+        if any(circuit.state != CircuitState.CLOSED for circuit in self.circuits):
+            return False
+        if self._budget < 1:
+            return False
+        if reserve is not None and not reserve():
+            return False
+        self._budget -= 1
+        return True
+    
+    async def _attempt(self, func: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        try:
+            result = await func()
+        except BaseException:
+            # Timed out, lost to the other attempt, or failed
+            self.observe(time.perf_counter() - started, censored=True)
+            raise
+        elapsed = time.perf_counter() - started
+        self._latency.observe(elapsed)
+        self.observe(elapsed)
+        return result
+    
+    async def call(
+        self,
+        func: Callable[[], Awaitable[T]],
+        idempotent: bool = False,
+        reserve: Optional[Callable[[], bool]] = None,
+    ) -> T:
+        """
+        Await func(), hedging it if idempotent, within the adaptive timeout.
+        
+        Args:
+            func: Zero-argument callable returning a new awaitable per attempt
+            idempotent: Whether a second concurrent attempt is safe
+            reserve: Claims capacity for a hedge without waiting; the hedge
+                is skipped if it returns False
+            
+        Returns:
+            Result of the first attempt to succeed
+            
+        Raises:
+            TimeoutError: If no attempt succeeded within the timeout
+            The last attempt's exception if every attempt failed
+        """
+        config = self.config
+        self.stats.calls += 1
+        self._budget = min(config.budget_burst, self._budget + config.budget_ratio)
+        self._refresh()
+        timeout = self._timeout
+        hedge_delay = self._hedge_delay if idempotent else None
+        deadline = time.monotonic() + timeout
+        
+        primary = asyncio.ensure_future(self._attempt(func))
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                wait = remaining
+                if hedge_delay is not None:
+                    wait = min(remaining, hedge_delay)
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, wait), return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                winner = None
+                for task in done:
+                    if task.exception() is None:
+                        winner = winner or task
+                    else:
+                        error = task.exception()
+                if winner is not None:
+                    if winner is not primary:
+                        self.stats.hedges_won += 1
+                    return winner.result()
+                
+                if not done and time.monotonic() >= deadline:
+                    self.stats.timeouts += 1
+                    raise TimeoutError(
+                        f"{self.endpoint} call exceeded adaptive timeout of {timeout:.2f}s"
+                    )
+                
+                if hedge_delay is not None and not done:
+                    # Hedge point reached with the primary still running
+                    hedge_delay = None
+                    if self._may_hedge(reserve):
+                        self.stats.hedges_sent += 1
+                        pending.add(asyncio.ensure_future(self._attempt(func)))
+                    else:
+                        self.stats.hedges_refused += 1
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        raise error
+    
+    def get_status(self) -> dict:
+        """Get hedging status for API."""
+        return {
+            "endpoint": self.endpoint,
+            "hedge_delay_ms": round(self.hedge_delay * 1000, 1) if self.hedge_delay else None,
+            "timeout_seconds": round(self.timeout, 3),
+            "window_samples": len(self._samples),
+            "censored_samples": sum(1 for _, censored in self._samples if censored),
+            "calls": self.stats.calls,
+            "hedges_sent": self.stats.hedges_sent,
+            "hedges_won": self.stats.hedges_won,
+            "hedges_refused": self.stats.hedges_refused,
+            "timeouts": self.stats.timeouts,
+        }
+
+
+# Hedgers per upstream endpoint
+_hedgers: dict[str, Hedger] = {}
+
+# Kite quotes answer in well under a second; Claude can take a minute
+KITE_HEDGE_CONFIG = HedgeConfig(min_timeout_seconds=2.0, max_timeout_seconds=30.0)
+ANTHROPIC_HEDGE_CONFIG = HedgeConfig(min_timeout_seconds=10.0, max_timeout_seconds=120.0)
+
+
+def get_hedger(
+    endpoint: str,
+    config: Optional[HedgeConfig] = None,
+    circuits: Sequence[CircuitBreaker] = (),
+) -> Hedger:
+    """Get or create the hedger for an endpoint."""
+    if endpoint not in _hedgers:
+        _hedgers[endpoint] = Hedger(endpoint, config, circuits)
+    return _hedgers[endpoint]
+
+
+def get_all_hedger_status() -> dict[str, dict]:
+    """Get status of all hedgers."""
+    return {name: hedger.get_status() for name, hedger in _hedgers.items()}
+
+
 class DegradationLevel(Enum):
     """Levels of service degradation."""
     FULL = "full"           # Full functionality
@@ -167,6 +167,10 @@ async def save_state_on_shutdown() -> None:
     
     store = get_state_store()
     
+    # Save conversations changed since they were last saved
+    saved = await store.flush_dirty()
+    logger.info(f"Saved {saved} changed conversations")
+    
     # Save shutdown timestamp
     await store.set_setting("last_shutdown", {
         "timestamp": datetime.now(timezone.utc).isoformat(),
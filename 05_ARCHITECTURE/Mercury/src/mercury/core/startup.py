@@ -102,6 +102,7 @@ async def verify_kite_api(settings: Settings) -> APIStatus:
     # Attempt connection verification
     try:
         from mercury.kite.adapter import KiteAdapter
+        from mercury.kite.executor import get_kite_executor
         
         adapter = KiteAdapter(
             api_key=settings.kite_api_key,
@@ -125,7 +126,7 @@ async def verify_kite_api(settings: Settings) -> APIStatus:
         
         # Try a profile fetch to verify authentication
         try:
-            profile = kite.profile()
+            profile = await get_kite_executor().run(kite.profile)
             latency = int((time.time() - start) * 1000)
             
             return APIStatus(
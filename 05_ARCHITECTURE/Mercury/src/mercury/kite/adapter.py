@@ -10,10 +10,15 @@ AUTONOMOUS ENHANCEMENTS:
 - Integrated OAuth manager for automatic token handling
 - Rate limiting to prevent API bans
 - Circuit breaker integration for resilience
+- Blocking kiteconnect calls run on a dedicated thread pool
 """
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
 from typing import Optional, Callable, TypeVar, Awaitable
 from functools import wraps
 
@@ -25,7 +30,20 @@ from mercury.core.exceptions import (
     SymbolNotFoundError,
 )
 from mercury.core.rate_limiter import get_kite_limiter, RateLimitExceeded
-from mercury.core.resilience import kite_circuit, CircuitOpenError
+from mercury.core.resilience import (
+    KITE_HEDGE_CONFIG,
+    kite_circuit,
+    get_hedger,
+    get_kite_circuit,
+    CircuitOpenError,
+)
+from mercury.kite.executor import KiteExecutor, get_kite_executor
+from mercury.kite.instruments import (
+    InstrumentIndex,
+    cache_is_fresh,
+    load_cached_index,
+)
+from mercury.kite.quote_cache import QUOTE_BATCH_SIZE, QuoteCache, get_quote_cache
 from mercury.kite.models import (
     Quote,
     OHLC,
@@ -40,38 +58,75 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
 
-def rate_limited(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
-    """Decorator to apply rate limiting to Kite API calls."""
-    @wraps(func)
-    async def wrapper(*args, **kwargs) -> T:
-        limiter = get_kite_limiter()
-        try:
-            await limiter.acquire()
-            return await func(*args, **kwargs)
-        except RateLimitExceeded as e:
-            raise KiteRateLimitError(f"Rate limit exceeded: {e}")
-    return wrapper
+def rate_limited(endpoint=None):
+    """
+    Decorator to apply rate limiting to Kite API calls.
+    
+    Use bare for the shared Kite bucket, or as @rate_limited("quote") to
+    draw from an endpoint's own bucket.
+    """
+    if callable(endpoint):
+        return rate_limited()(endpoint)
+    
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            limiter = get_kite_limiter(endpoint)
+            try:
+                await limiter.acquire()
+                return await func(*args, **kwargs)
+            except RateLimitExceeded as e:
+                raise KiteRateLimitError(f"Rate limit exceeded: {e}")
+        return wrapper
+    return decorator
 
 
-def circuit_protected(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
-    """Decorator to apply circuit breaker protection to Kite API calls."""
-    @wraps(func)
-    async def wrapper(*args, **kwargs) -> T:
-        if not kite_circuit.allow_request():
-            raise KiteAPIError(
-                "Kite API circuit breaker is open - service temporarily unavailable"
-            )
-        try:
-            result = await func(*args, **kwargs)
-            kite_circuit.record_success()
-            return result
-        except (KiteAuthError, SymbolNotFoundError):
-            # Don't count auth errors or symbol not found as circuit failures
-            raise
-        except Exception as e:
-            kite_circuit.record_failure(e)
-            raise
-    return wrapper
+def circuit_protected(endpoint=None):
+    """
+    Decorator to apply circuit breaker protection to Kite API calls.
+    
+    Calls go through the shared kite_circuit; as @circuit_protected("quote")
+    they must also pass that endpoint's own breaker, which times each call
+    and opens on its recent failure or slow-call rate.
+    """
+    if callable(endpoint):
+        return circuit_protected()(endpoint)
+    
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            endpoint_circuit = get_kite_circuit(endpoint) if endpoint else None
+            if not kite_circuit.allow_request():
+                raise KiteAPIError(
+                    "Kite API circuit breaker is open - service temporarily unavailable"
+                )
+            if endpoint_circuit and not endpoint_circuit.allow_request():
+                # Not called, so hand back any half-open trial slot taken above
+                kite_circuit.release()
+                raise KiteAPIError(
+                    f"Kite {endpoint} circuit breaker is open - endpoint temporarily unavailable"
+                )
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+                kite_circuit.record_success()
+                if endpoint_circuit:
+                    endpoint_circuit.record_success(time.perf_counter() - started)
+                return result
+            except (KiteAuthError, SymbolNotFoundError, asyncio.CancelledError):
+                # Don't count auth errors, symbol not found or cancellation
+                # as circuit failures, but free the trial slots they took
+                kite_circuit.release()
+                if endpoint_circuit:
+                    endpoint_circuit.release()
+                raise
+            except Exception as e:
+                kite_circuit.record_failure(e)
+                if endpoint_circuit:
+                    endpoint_circuit.record_failure(e, time.perf_counter() - started)
+                raise
+        return wrapper
+    return decorator
 
 
 class KiteAdapter:
@@ -82,9 +137,13 @@ class KiteAdapter:
     All data-grounded responses must come through this adapter.
     
     AUTONOMOUS FEATURES:
-    - Rate limiting (1 request/second with burst of 3)
-    - Circuit breaker protection (fails fast when API is down)
+    - Rate limiting (per-endpoint Kite limits: quotes 1/s, history 3/s,
+      everything else 1/s with burst of 3)
+    - Circuit breaker protection (fails fast when the API is down, or
+      when one endpoint is failing or slow)
+    - Adaptive timeouts on quote reads (tail latency)
     - OAuth manager integration (automatic token handling)
+    - Kite client calls off the event loop (dedicated thread pool)
     """
     
     def __init__(
@@ -92,6 +151,9 @@ class KiteAdapter:
         api_key: Optional[str] = None,
         access_token: Optional[str] = None,
         use_oauth_manager: bool = True,
+        instruments_cache_path: Optional[Path] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        executor: Optional[KiteExecutor] = None,
     ):
         """
         Initialize Kite adapter.
@@ -100,13 +162,26 @@ class KiteAdapter:
             api_key: Kite API key (defaults to settings)
             access_token: Session access token (defaults to settings)
             use_oauth_manager: Whether to use OAuth manager for token handling
+            instruments_cache_path: Instruments master cache file
+                (default: ~/.mercury/instruments.csv)
+            quote_cache: Short-TTL quote cache shared across requests
+                (default: the process-wide cache)
+            executor: Thread pool for blocking Kite client calls
+                (default: the process-wide Kite executor)
         """
         settings = get_settings()
         self.api_key = api_key or settings.kite_api_key
         self.access_token = access_token or settings.kite_access_token
         self._kite = None
-        self._instruments_cache: dict[str, Instrument] = {}
+        self._instruments: Optional[InstrumentIndex] = None
+        self._instruments_loaded_on: Optional[date] = None
+        self._instruments_lock = asyncio.Lock()
+        self.instruments_cache_path = instruments_cache_path or (
+            Path.home() / ".mercury" / "instruments.csv"
+        )
         self._use_oauth_manager = use_oauth_manager
+        self.quote_cache = quote_cache or get_quote_cache()
+        self._executor = executor
         self._oauth_manager = None
         
     @property
@@ -148,15 +223,51 @@ class KiteAdapter:
         if self.oauth_manager:
             await self.oauth_manager.handle_token_exception(error)
     
-    @rate_limited
-    @circuit_protected
-    async def get_quote(self, symbol: str, exchange: str = "NSE") -> Quote:
+    @property
+    def executor(self) -> KiteExecutor:
+        """Thread pool that runs kiteconnect calls."""
+        return self._executor or get_kite_executor()
+    
+    async def _call(self, method: str, *args, **kwargs):
+        """
+        Call a kiteconnect client method off the event loop.
+        
+        The client is synchronous; it runs on the dedicated Kite executor
+        so the loop keeps serving other requests while Kite responds.
+        """
+        return await self.executor.run(getattr(self.kite, method), *args, **kwargs)
+    
+    async def _timed_call(self, endpoint: str, method: str, *args, **kwargs):
+        """
+        _call within a timeout adapted to the endpoint's observed latency.
+        
+        Not hedged: the quote limit is 1/s with a burst of 1, so the
+        primary call always uses the only token and a hedge would have
+        to wait a full second - longer than it could save.
+        """
+        hedger = get_hedger(
+            f"kite.{endpoint}",
+            KITE_HEDGE_CONFIG,
+            circuits=(kite_circuit, get_kite_circuit(endpoint)),
+        )
+        return await hedger.call(lambda: self._call(method, *args, **kwargs))
+    
+    async def get_quote(
+        self,
+        symbol: str,
+        exchange: str = "NSE",
+        max_age: Optional[float] = None,
+    ) -> Quote:
         """
         Get current market quote for a symbol.
         
+        Served from the quote cache when a fresh enough quote exists;
+        Quote.timestamp is when it was fetched from Kite.
+        
         Args:
             symbol: Trading symbol (any valid symbol on the exchange)
             exchange: Exchange code (NSE, BSE, NFO)
+            max_age: Maximum acceptable quote age in seconds (default: cache TTL)
             
         Returns:
             Quote object with current market data
@@ -165,33 +276,57 @@ class KiteAdapter:
             SymbolNotFoundError: If symbol doesn't exist
             KiteAPIError: If API call fails
         """
-        try:
-            instrument_key = f"{exchange}:{symbol}"
-            data = self.kite.quote([instrument_key])
-            
-            if instrument_key not in data:
-                raise SymbolNotFoundError(symbol)
-            
-            q = data[instrument_key]
+        instrument_key = f"{exchange}:{symbol}"
+        batch = await self.quote_cache.get_many(
+            [instrument_key], self._fetch_quotes, max_age=max_age, raise_errors=True
+        )
+        if instrument_key not in batch.results:
+            raise SymbolNotFoundError(symbol)
+        return batch.results[instrument_key]
+    
+    async def get_quotes(
+        self,
+        symbols: list[str],
+        max_age: Optional[float] = None,
+    ) -> dict[str, Quote]:
+        """
+        Get quotes for several symbols in as few Kite calls as possible.
+        
+        Misses are batched into one kite.quote() call (per 500 instruments)
+        and merged with concurrent requests for the same instruments.
+        Symbols that fail are logged and left out.
+        
+        Args:
+            symbols: Symbols as "EXCHANGE:SYMBOL" or bare (NSE)
+            max_age: Maximum acceptable quote age in seconds (default: cache TTL)
             
-            return Quote(
-                symbol=symbol,
-                exchange=exchange,
-                ltp=q.get("last_price", 0),
-                open=q.get("ohlc", {}).get("open", 0),
-                high=q.get("ohlc", {}).get("high", 0),
-                low=q.get("ohlc", {}).get("low", 0),
-                close=q.get("ohlc", {}).get("close", 0),
-                volume=q.get("volume", 0),
-                change=q.get("net_change", 0),
-                change_percent=q.get("change", 0),
-                timestamp=datetime.now(),
-                bid=q.get("depth", {}).get("buy", [{}])[0].get("price"),
-                ask=q.get("depth", {}).get("sell", [{}])[0].get("price"),
-            )
+        Returns:
+            Dict mapping each requested symbol to its Quote
+        """
+        keys = {symbol: _instrument_key(symbol) for symbol in symbols}
+        batch = await self.quote_cache.get_many(
+            keys.values(), self._fetch_quotes, max_age=max_age
+        )
+        for key, error in batch.errors.items():
+            logger.warning(f"Failed to fetch quote for {key}: {error}")
+        return {
+            symbol: batch.results[key]
+            for symbol, key in keys.items()
+            if key in batch.results
+        }
+    
+    @rate_limited("quote")
+    @circuit_protected("quote")
+    async def _fetch_quotes(self, instrument_keys: list[str]) -> dict[str, Quote]:
+        """Fetch quotes for up to 500 "EXCHANGE:SYMBOL" keys in one call."""
+        try:
+            data = await self._timed_call("quote", "quote", instrument_keys)
+            return {
+                key: _parse_quote(key, data[key])
+                for key in instrument_keys
+                if key in data
+            }
             
-        except SymbolNotFoundError:
-            raise
         except Exception as e:
             if "TokenException" in str(type(e).__name__):
                 await self._handle_token_error(e)
@@ -199,11 +334,11 @@ class KiteAdapter:
             if "NetworkException" in str(type(e).__name__):
                 raise KiteAPIError(f"Network error: {e}")
             if "DataException" in str(type(e).__name__):
-                raise SymbolNotFoundError(symbol)
+                raise SymbolNotFoundError(", ".join(instrument_keys))
             raise KiteAPIError(f"Quote fetch failed: {e}")
     
-    @rate_limited
-    @circuit_protected
+    @rate_limited("quote")
+    @circuit_protected("quote")
     async def get_ltp(self, symbols: list[str]) -> dict[str, float]:
         """
         Get last traded prices for multiple symbols.
@@ -215,7 +350,7 @@ class KiteAdapter:
             Dict mapping symbol to LTP
         """
         try:
-            data = self.kite.ltp(symbols)
+            data = await self._timed_call("quote", "ltp", symbols)
             return {
                 key: val.get("last_price", 0)
                 for key, val in data.items()
@@ -226,8 +361,6 @@ class KiteAdapter:
                 raise KiteAuthError("Session expired")
             raise KiteAPIError(f"LTP fetch failed: {e}")
     
-    @rate_limited
-    @circuit_protected
     async def get_ohlc(
         self,
         symbol: str,
@@ -249,27 +382,36 @@ class KiteAdapter:
         Returns:
             List of OHLC candles
         """
+        try:
+            instruments = await self._get_instruments()
+        except Exception as e:
+            raise KiteAPIError(f"OHLC fetch failed: {e}")
+        instrument = instruments.get(exchange, symbol)
+        if instrument is None:
+            raise SymbolNotFoundError(symbol)
+        return await self._fetch_ohlc(
+            instrument.instrument_token, interval, from_date, to_date
+        )
+    
+    @rate_limited("historical")
+    @circuit_protected("historical")
+    async def _fetch_ohlc(
+        self,
+        instrument_token: int,
+        interval: str = "day",
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+    ) -> list[OHLC]:
+        """Fetch historical candles for an already resolved instrument token."""
         try:
             if to_date is None:
                 to_date = datetime.now()
             if from_date is None:
                 from_date = to_date - timedelta(days=30)
             
-            # Get instrument token
-            instrument_key = f"{exchange}:{symbol}"
-            instruments = await self.search_instruments(symbol)
-            
-            token = None
-            for inst in instruments:
-                if inst.exchange == exchange and inst.symbol == symbol:
-                    token = inst.instrument_token
-                    break
-            
-            if token is None:
-                raise SymbolNotFoundError(symbol)
-            
-            data = self.kite.historical_data(
-                instrument_token=token,
+            data = await self._call(
+                "historical_data",
+                instrument_token=instrument_token,
                 from_date=from_date,
                 to_date=to_date,
                 interval=interval,
@@ -287,17 +429,15 @@ class KiteAdapter:
                 for candle in data
             ]
             
-        except SymbolNotFoundError:
-            raise
         except Exception as e:
             raise KiteAPIError(f"OHLC fetch failed: {e}")
     
     @rate_limited
-    @circuit_protected
+    @circuit_protected("positions")
     async def get_positions(self) -> list[Position]:
         """Get all open positions."""
         try:
-            data = self.kite.positions()
+            data = await self._call("positions")
             net_positions = data.get("net", [])
             
             positions = []
@@ -331,11 +471,11 @@ class KiteAdapter:
             raise KiteAPIError(f"Positions fetch failed: {e}")
     
     @rate_limited
-    @circuit_protected
+    @circuit_protected("holdings")
     async def get_holdings(self) -> list[Holding]:
         """Get all holdings (delivery positions)."""
         try:
-            data = self.kite.holdings()
+            data = await self._call("holdings")
             
             holdings = []
             for h in data:
@@ -366,43 +506,99 @@ class KiteAdapter:
                 raise KiteAuthError("Session expired")
             raise KiteAPIError(f"Holdings fetch failed: {e}")
     
-    @rate_limited
-    @circuit_protected
     async def search_instruments(self, query: str) -> list[Instrument]:
-        """Search for instruments by name or symbol."""
+        """
+        Search for instruments by name or symbol.
+        
+        Searches the local index; only a download of the instruments
+        master (see _download_instruments) is a Kite call.
+        """
         try:
-            # Cache instruments on first call
-            if not self._instruments_cache:
-                all_instruments = self.kite.instruments()
-                for i in all_instruments:
-                    key = f"{i['exchange']}:{i['tradingsymbol']}"
-                    self._instruments_cache[key] = Instrument(
-                        instrument_token=i["instrument_token"],
-                        exchange_token=i["exchange_token"],
-                        symbol=i["tradingsymbol"],
-                        name=i.get("name", ""),
-                        exchange=i["exchange"],
-                        segment=i.get("segment", ""),
-                        instrument_type=i.get("instrument_type", ""),
-                        lot_size=i.get("lot_size", 1),
-                        tick_size=i.get("tick_size", 0.05),
-                    )
-            
-            # Search
-            query_lower = query.lower()
-            results = []
-            for inst in self._instruments_cache.values():
-                if (query_lower in inst.symbol.lower() or 
-                    query_lower in inst.name.lower()):
-                    results.append(inst)
-                    if len(results) >= 20:  # Limit results
-                        break
-            
-            return results
+            instruments = await self._get_instruments()
+            return instruments.search(query)
             
         except Exception as e:
             raise KiteAPIError(f"Instrument search failed: {e}")
     
+    async def _get_instruments(self) -> InstrumentIndex:
+        """
+        Get today's instruments master index.
+        
+        Loaded once per day: from the cache file if it was written today,
+        otherwise downloaded from Kite and written back to the cache.
+        """
+        if self._instruments is not None and self._instruments_loaded_on == date.today():
+            return self._instruments
+        
+        async with self._instruments_lock:
+            if self._instruments is None or self._instruments_loaded_on != date.today():
+                path = self.instruments_cache_path
+                if cache_is_fresh(path):
+                    index = await asyncio.to_thread(load_cached_index, path)
+                else:
+                    records = await self._download_instruments()
+                    index = await asyncio.to_thread(InstrumentIndex.from_records, records)
+                    try:
+                        await asyncio.to_thread(index.write_csv, path)
+                    except OSError as e:
+                        logger.warning(f"Could not write instruments cache: {e}")
+                self._instruments = index
+                self._instruments_loaded_on = date.today()
+                logger.info(f"Instruments master loaded: {len(index)} instruments")
+        return self._instruments
+    
+    @rate_limited
+    @circuit_protected("instruments")
+    async def _download_instruments(self) -> list[dict]:
+        """Download the instruments master, within the Kite limits and breakers."""
+        return await self._call("instruments")
+    
+    async def plan_bundle(
+        self,
+        symbols: list[str],
+        include_positions: bool = True,
+        include_holdings: bool = True,
+        include_history: bool = False,
+    ) -> "BundlePlan":
+        """
+        Work out the Kite calls a data bundle needs before making any.
+        
+        Symbols are de-duplicated and, when history is wanted, resolved to
+        instrument tokens against the instruments index in one pass, so
+        unknown symbols cost no history call.
+        
+        Args:
+            symbols: Symbols as "EXCHANGE:SYMBOL" or bare (NSE)
+            include_positions: Include user's positions
+            include_holdings: Include user's holdings
+            include_history: Include historical data for symbols
+            
+        Returns:
+            BundlePlan listing the quote keys and history tokens to fetch
+        """
+        plan = BundlePlan(
+            quote_symbols=list(dict.fromkeys(symbols)),
+            include_positions=include_positions,
+            include_holdings=include_holdings,
+        )
+        if not include_history or not plan.quote_symbols:
+            return plan
+        
+        try:
+            instruments = await self._get_instruments()
+        except Exception as e:
+            logger.warning(f"Failed to load instruments for history: {e}")
+            plan.unresolved = list(plan.quote_symbols)
+            return plan
+        
+        for symbol in plan.quote_symbols:
+            instrument = instruments.get(*_split_symbol(symbol))
+            if instrument is None:
+                plan.unresolved.append(symbol)
+            else:
+                plan.history_tokens[symbol] = instrument.instrument_token
+        return plan
+    
     async def get_data_bundle(
         self,
         symbols: list[str],
@@ -413,6 +609,11 @@ class KiteAdapter:
         """
         Get a bundle of market data for AI context.
         
+        The bundle is planned first (see plan_bundle), then quotes (one
+        batched call), positions, holdings and each symbol's history are
+        fetched concurrently. Every call still goes through the Kite rate
+        limiter and circuit breaker; a failed part is logged and left empty.
+        
         Args:
             symbols: List of symbols to fetch quotes for
             include_positions: Include user's positions
@@ -422,59 +623,111 @@ class KiteAdapter:
         Returns:
             MarketDataBundle with all requested data
         """
-        bundle = MarketDataBundle()
-        
-        # Fetch quotes
-        for symbol in symbols:
-            try:
-                # Parse "EXCHANGE:SYMBOL" format or default to NSE
-                if ":" in symbol:
-                    exchange, sym = symbol.split(":", 1)
-                else:
-                    exchange, sym = "NSE", symbol
-                
-                quote = await self.get_quote(sym, exchange)
-                bundle.quotes[symbol] = quote
-            except Exception as e:
-                logger.warning(f"Failed to fetch quote for {symbol}: {e}")
+        plan = await self.plan_bundle(
+            symbols, include_positions, include_holdings, include_history
+        )
+        for symbol in plan.unresolved:
+            logger.warning(f"Failed to fetch history for {symbol}: symbol not found")
         
-        # Fetch positions
-        if include_positions:
-            try:
-                bundle.positions = await self.get_positions()
-            except Exception as e:
-                logger.warning(f"Failed to fetch positions: {e}")
+        parts: dict[str, Awaitable] = {}
+        if plan.quote_symbols:
+            parts["quotes"] = self.get_quotes(plan.quote_symbols)
+        if plan.include_positions:
+            parts["positions"] = self.get_positions()
+        if plan.include_holdings:
+            parts["holdings"] = self.get_holdings()
+        history = [self._fetch_ohlc(token) for token in plan.history_tokens.values()]
         
-        # Fetch holdings
-        if include_holdings:
-            try:
-                bundle.holdings = await self.get_holdings()
-            except Exception as e:
-                logger.warning(f"Failed to fetch holdings: {e}")
+        results = await asyncio.gather(*parts.values(), *history, return_exceptions=True)
         
-        # Fetch historical data
-        if include_history:
-            for symbol in symbols:
-                try:
-                    if ":" in symbol:
-                        exchange, sym = symbol.split(":", 1)
-                    else:
-                        exchange, sym = "NSE", symbol
-                    
-                    history = await self.get_ohlc(sym, exchange)
-                    bundle.historical[symbol] = history
-                except Exception as e:
-                    logger.warning(f"Failed to fetch history for {symbol}: {e}")
+        bundle = MarketDataBundle()
+        for name, result in zip(parts, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to fetch {name}: {result}")
+            else:
+                setattr(bundle, name, result)
+        for symbol, result in zip(plan.history_tokens, results[len(parts):]):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to fetch history for {symbol}: {result}")
+            else:
+                bundle.historical[symbol] = result
         
         bundle.timestamp = datetime.now()
         return bundle
 
 
+@dataclass
+class BundlePlan:
+    """Kite calls needed to build one MarketDataBundle."""
+    
+    quote_symbols: list[str]
+    include_positions: bool = True
+    include_holdings: bool = True
+    history_tokens: dict[str, int] = field(default_factory=dict)
+    unresolved: list[str] = field(default_factory=list)
+    
+    @property
+    def call_count(self) -> int:
+        """Number of rate-limited Kite calls the plan makes."""
+        return (
+            -(-len(self.quote_symbols) // QUOTE_BATCH_SIZE)
+            + self.include_positions
+            + self.include_holdings
+            + len(self.history_tokens)
+        )
+
+
+def _instrument_key(symbol: str) -> str:
+    """Normalize a symbol to "EXCHANGE:SYMBOL" (NSE by default)."""
+    return symbol if ":" in symbol else f"NSE:{symbol}"
+
+
+def _split_symbol(symbol: str) -> tuple[str, str]:
+    """Split a symbol into (exchange, symbol), NSE by default."""
+    if ":" in symbol:
+        exchange, sym = symbol.split(":", 1)
+        return exchange, sym
+    return "NSE", symbol
+
+
+def _parse_quote(instrument_key: str, q: dict) -> Quote:
+    """Build a Quote from one kite.quote() entry."""
+    exchange, symbol = instrument_key.split(":", 1)
+    return Quote(
+        symbol=symbol,
+        exchange=exchange,
+        ltp=q.get("last_price", 0),
+        open=q.get("ohlc", {}).get("open", 0),
+        high=q.get("ohlc", {}).get("high", 0),
+        low=q.get("ohlc", {}).get("low", 0),
+        close=q.get("ohlc", {}).get("close", 0),
+        volume=q.get("volume", 0),
+        change=q.get("net_change", 0),
+        change_percent=q.get("change", 0),
+        timestamp=datetime.now(),
+        bid=q.get("depth", {}).get("buy", [{}])[0].get("price"),
+        ask=q.get("depth", {}).get("sell", [{}])[0].get("price"),
+    )
+
+
 class MockKite:
-    """Mock Kite client for development without API access."""
+    """
+    Mock Kite client for development without API access.
+    
+    latency (seconds) is slept, blocking, in every data call to mimic the
+    synchronous kiteconnect client waiting on the network.
+    """
+    
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+    
+    def _wait(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
     
     def quote(self, instruments: list[str]) -> dict:
         """Return mock quote data."""
+        self._wait()
         import random
         result = {}
         for inst in instruments:
@@ -496,15 +749,18 @@ class MockKite:
     
     def ltp(self, instruments: list[str]) -> dict:
         """Return mock LTP data."""
+        self._wait()
         import random
         return {inst: {"last_price": random.uniform(50, 5000)} for inst in instruments}
     
     def positions(self) -> dict:
         """Return mock positions."""
+        self._wait()
         return {"net": [], "day": []}
     
     def holdings(self) -> list:
         """Return mock holdings."""
+        self._wait()
         return []
     
     def instruments(self) -> list:
@@ -521,6 +777,7 @@ class MockKite:
     
     def historical_data(self, **kwargs) -> list:
         """Return mock historical data."""
+        self._wait()
         import random
         from datetime import datetime, timedelta
         
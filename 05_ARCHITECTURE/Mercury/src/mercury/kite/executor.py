@@ -0,0 +1,112 @@
+"""
+Mercury Kite Executor
+=====================
+
+Dedicated, bounded thread pool for the synchronous kiteconnect client.
+
+kiteconnect does blocking HTTP on the calling thread. Called from an
+async method it stalls the whole event loop - websocket chat, health
+streaming and the background monitor - for as long as Kite takes to
+answer. Kite calls are instead submitted to a small pool of their own:
+the loop only awaits the result, and the pool size caps how many calls
+are on the wire at once without competing with asyncio's default
+executor (used for file and database work).
+
+CONSTITUTIONAL: MR-001 - The executor only moves Kite calls off the
+event loop; rate limiting and circuit breaking stay in the adapter.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from mercury.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class KiteExecutor:
+    """
+    Runs blocking Kite client calls on a fixed-size worker pool.
+
+    Calls beyond max_workers queue inside the pool; their callers wait
+    without blocking the event loop.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Kite calls allowed in flight at once
+        """
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mercury-kite"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run func(*args, **kwargs) on the pool and await its result."""
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._pool.submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        # Settle from the thread's future: a cancelled caller stops waiting,
+        # but the call keeps running (and occupying a worker) until it returns
+        future.add_done_callback(self._finished)
+        return await asyncio.wrap_future(future)
+
+    def _finished(self, future: Future) -> None:
+        """Count a pool call as finished once its thread is done with it."""
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    @property
+    def pending(self) -> int:
+        """Calls submitted and not yet finished (running or queued)."""
+        return self._pending
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the pool; queued calls that have not started are cancelled."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def get_status(self) -> dict:
+        """Get executor status for API."""
+        return {
+            "max_workers": self.max_workers,
+            "pending": self._pending,
+            "completed": self._completed,
+        }
+
+
+_kite_executor: Optional[KiteExecutor] = None
+
+
+def get_kite_executor() -> KiteExecutor:
+    """Get the process-wide Kite executor."""
+    global _kite_executor
+    if _kite_executor is None:
+        _kite_executor = KiteExecutor(max_workers=get_settings().kite_executor_workers)
+    return _kite_executor
+
+
+def shutdown_kite_executor() -> None:
+    """Shut down the process-wide Kite executor (recreated on next use)."""
+    global _kite_executor
+    if _kite_executor is not None:
+        _kite_executor.shutdown()
+        _kite_executor = None
+        logger.info("Kite executor stopped")
@@ -0,0 +1,342 @@
+"""
+Mercury Instruments Index
+=========================
+
+Compact, indexed copy of the Kite instruments master.
+
+The master has ~100k rows. Building an Instrument dataclass per row and
+scanning them linearly on every search costs memory and time, so the
+index keeps one column per field (typed arrays for numbers, interned
+strings for text) and materializes Instrument objects only for results.
+
+Indexes:
+- "EXCHANGE:SYMBOL" -> row (O(1) lookups for quotes and history)
+- sorted symbols for prefix search (bisect)
+- trigrams of symbols and distinct names for substring search, built on
+  first search
+
+The master is persisted as Kite's CSV layout. Kite regenerates it daily,
+so a cache file written today is reused across restarts.
+
+CONSTITUTIONAL: MR-001 - Instrument data comes from Kite only.
+"""
+
+import bisect
+import csv
+import os
+import sys
+from array import array
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from mercury.kite.models import Instrument
+
+CSV_FIELDS = (
+    "instrument_token",
+    "exchange_token",
+    "tradingsymbol",
+    "name",
+    "last_price",
+    "expiry",
+    "strike",
+    "tick_size",
+    "lot_size",
+    "instrument_type",
+    "segment",
+    "exchange",
+)
+
+MAX_SEARCH_RESULTS = 20
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _TrigramIndex:
+    """Trigram -> ids of the strings containing it."""
+
+    __slots__ = ("_postings",)
+
+    def __init__(self, terms: Iterable[str]):
+        postings: dict[str, array] = {}
+        for term_id, term in enumerate(terms):
+            for gram in _trigrams(term.lower()):
+                ids = postings.get(gram)
+                if ids is None:
+                    ids = postings[gram] = array("I")
+                ids.append(term_id)
+        self._postings = postings
+
+    def candidates(self, needle: str) -> set[int]:
+        """Ids of strings containing every trigram of needle."""
+        lists = []
+        for gram in _trigrams(needle):
+            ids = self._postings.get(gram)
+            if ids is None:
+                return set()
+            lists.append(ids)
+        lists.sort(key=len)
+
+        found = set(lists[0])
+        for ids in lists[1:]:
+            found.intersection_update(ids)
+            if not found:
+                break
+        return found
+
+
+class InstrumentIndex:
+    """
+    Columnar instruments master with lookup and search indexes.
+
+    Build with from_records (kiteconnect's instruments() output) or
+    from_csv (the cache file).
+    """
+
+    __slots__ = (
+        "tokens",
+        "exchange_tokens",
+        "symbols",
+        "names",
+        "expiries",
+        "strikes",
+        "tick_sizes",
+        "lot_sizes",
+        "instrument_types",
+        "segments",
+        "exchanges",
+        "_by_key",
+        "_prefix_keys",
+        "_prefix_rows",
+        "_symbol_grams",
+        "_name_grams",
+        "_name_rows",
+    )
+
+    def __init__(self):
+        self.tokens = array("q")
+        self.exchange_tokens = array("q")
+        self.symbols: list[str] = []
+        self.names: list[str] = []
+        self.expiries: list[str] = []
+        self.strikes = array("d")
+        self.tick_sizes = array("d")
+        self.lot_sizes = array("q")
+        self.instrument_types: list[str] = []
+        self.segments: list[str] = []
+        self.exchanges: list[str] = []
+        self._by_key: dict[str, int] = {}
+        self._prefix_keys: list[str] = []
+        self._prefix_rows = array("I")
+        self._symbol_grams: Optional[_TrigramIndex] = None
+        self._name_grams: Optional[_TrigramIndex] = None
+        self._name_rows: list[array] = []
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "InstrumentIndex":
+        """Build from dict rows as returned by KiteConnect.instruments()."""
+        index = cls()
+        for r in records:
+            index._append(
+                r["instrument_token"],
+                r.get("exchange_token") or 0,
+                r["tradingsymbol"],
+                r.get("name") or "",
+                _expiry_text(r.get("expiry")),
+                r.get("strike") or 0,
+                r.get("tick_size") or 0.05,
+                r.get("lot_size") or 1,
+                r.get("instrument_type") or "",
+                r.get("segment") or "",
+                r["exchange"],
+            )
+        index._build_prefix_index()
+        return index
+
+    @classmethod
+    def from_csv(cls, lines: Iterable[str]) -> "InstrumentIndex":
+        """Stream-parse Kite's instruments CSV (header included)."""
+        index = cls()
+        for r in csv.DictReader(lines):
+            index._append(
+                int(r["instrument_token"]),
+                int(r["exchange_token"] or 0),
+                r["tradingsymbol"],
+                r["name"],
+                r["expiry"],
+                float(r["strike"] or 0),
+                float(r["tick_size"] or 0.05),
+                int(r["lot_size"] or 1),
+                r["instrument_type"],
+                r["segment"],
+                r["exchange"],
+            )
+        index._build_prefix_index()
+        return index
+
+    def _append(
+        self,
+        token: int,
+        exchange_token: int,
+        symbol: str,
+        name: str,
+        expiry: str,
+        strike: float,
+        tick_size: float,
+        lot_size: int,
+        instrument_type: str,
+        segment: str,
+        exchange: str,
+    ) -> None:
+        intern = sys.intern
+        exchange = intern(exchange)
+        self._by_key[f"{exchange}:{symbol}"] = len(self.symbols)
+        self.tokens.append(token)
+        self.exchange_tokens.append(exchange_token)
+        self.symbols.append(symbol)
+        # Names, expiries and types repeat across derivative rows
+        self.names.append(intern(name))
+        self.expiries.append(intern(expiry))
+        self.strikes.append(strike)
+        self.tick_sizes.append(tick_size)
+        self.lot_sizes.append(lot_size)
+        self.instrument_types.append(intern(instrument_type))
+        self.segments.append(intern(segment))
+        self.exchanges.append(exchange)
+
+    def _build_prefix_index(self) -> None:
+        order = sorted(range(len(self.symbols)), key=lambda r: self.symbols[r].lower())
+        self._prefix_keys = [self.symbols[r].lower() for r in order]
+        self._prefix_rows = array("I", order)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def write_csv(self, path: Path) -> None:
+        """Write the index in Kite's CSV layout (atomically replaces path)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(path.suffix + ".part")
+        with open(partial, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+            for i in range(len(self)):
+                writer.writerow((
+                    self.tokens[i],
+                    self.exchange_tokens[i],
+                    self.symbols[i],
+                    self.names[i],
+                    0,
+                    self.expiries[i],
+                    self.strikes[i],
+                    self.tick_sizes[i],
+                    self.lot_sizes[i],
+                    self.instrument_types[i],
+                    self.segments[i],
+                    self.exchanges[i],
+                ))
+        os.replace(partial, path)
+
+    # =========================================================================
+    # LOOKUPS
+    # =========================================================================
+
+    def get(self, exchange: str, symbol: str) -> Optional[Instrument]:
+        """Instrument for an exchange and trading symbol, or None."""
+        row = self._by_key.get(f"{exchange}:{symbol}")
+        return None if row is None else self.instrument(row)
+
+    def instrument(self, row: int) -> Instrument:
+        """Materialize one row as an Instrument."""
+        expiry = self.expiries[row]
+        return Instrument(
+            instrument_token=self.tokens[row],
+            exchange_token=self.exchange_tokens[row],
+            symbol=self.symbols[row],
+            name=self.names[row],
+            exchange=self.exchanges[row],
+            segment=self.segments[row],
+            instrument_type=self.instrument_types[row],
+            lot_size=self.lot_sizes[row],
+            tick_size=self.tick_sizes[row],
+            expiry=datetime.fromisoformat(expiry) if expiry else None,
+            strike=self.strikes[row] or None,
+        )
+
+    def search(self, query: str, limit: int = MAX_SEARCH_RESULTS) -> list[Instrument]:
+        """
+        Instruments whose symbol or name contains the query (case-insensitive).
+
+        Symbol prefix matches come first in symbol order, then other
+        substring matches in master order.
+        """
+        needle = query.strip().lower()
+        if not needle or limit <= 0:
+            return []
+
+        rows: list[int] = []
+        keys = self._prefix_keys
+        position = bisect.bisect_left(keys, needle)
+        while position < len(keys) and keys[position].startswith(needle) and len(rows) < limit:
+            rows.append(self._prefix_rows[position])
+            position += 1
+
+        if len(rows) < limit:
+            seen = set(rows)
+            for row in self._substring_candidates(needle):
+                if row in seen:
+                    continue
+                if needle in self.symbols[row].lower() or needle in self.names[row].lower():
+                    rows.append(row)
+                    if len(rows) >= limit:
+                        break
+
+        return [self.instrument(row) for row in rows]
+
+    def _substring_candidates(self, needle: str) -> Iterable[int]:
+        if len(needle) < 3:
+            return range(len(self))
+
+        if self._symbol_grams is None:
+            self._build_trigram_indexes()
+        candidates = self._symbol_grams.candidates(needle)
+        for name_id in self._name_grams.candidates(needle):
+            candidates.update(self._name_rows[name_id])
+        return sorted(candidates)
+
+    def _build_trigram_indexes(self) -> None:
+        # Index each distinct name once and map it back to its rows
+        name_ids: dict[str, int] = {}
+        name_rows: list[array] = []
+        for row, name in enumerate(self.names):
+            name_id = name_ids.get(name)
+            if name_id is None:
+                name_id = name_ids[name] = len(name_rows)
+                name_rows.append(array("I"))
+            name_rows[name_id].append(row)
+
+        self._symbol_grams = _TrigramIndex(self.symbols)
+        self._name_grams = _TrigramIndex(name_ids)
+        self._name_rows = name_rows
+
+
+def _expiry_text(expiry) -> str:
+    if not expiry:
+        return ""
+    if isinstance(expiry, datetime):
+        expiry = expiry.date()
+    return expiry.isoformat() if isinstance(expiry, date) else str(expiry)
+
+
+def cache_is_fresh(path: Path) -> bool:
+    """True if the cache file exists and was written today."""
+    if not path.exists():
+        return False
+    return datetime.fromtimestamp(path.stat().st_mtime).date() >= date.today()
+
+
+def load_cached_index(path: Path) -> InstrumentIndex:
+    """Load an index from its cache file."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return InstrumentIndex.from_csv(f)
@@ -39,6 +39,11 @@ class Quote:
     bid_qty: Optional[int] = None
     ask_qty: Optional[int] = None
     
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since this quote was fetched from Kite."""
+        return (datetime.now(self.timestamp.tzinfo) - self.timestamp).total_seconds()
+    
     def format_summary(self) -> str:
         """Format quote as readable summary."""
         direction = "▲" if self.change >= 0 else "▼"
@@ -201,6 +206,8 @@ class MarketDataBundle:
                 "volume": quote.volume,
                 "high": quote.high,
                 "low": quote.low,
+                "as_of": quote.timestamp.isoformat(),
+                "age_seconds": round(quote.age_seconds, 1),
             }
         
         for pos in self.positions:
@@ -0,0 +1,206 @@
+"""
+Mercury Quote Cache
+===================
+
+Short-lived quote snapshots with coalesced upstream fetches.
+
+Several chat sessions asking about the same index in the same second
+would otherwise each make their own rate-limited kite.quote() call. The
+cache returns quotes fetched within a short TTL, and parks misses for one
+event-loop turn so concurrent callers join a single batched fetch of the
+union of their instruments. Instruments already being fetched are awaited
+rather than fetched again.
+
+CONSTITUTIONAL: MR-001 - Cached quotes keep the timestamp they were
+fetched at, so their age is always visible to the AI context.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Generic, Iterable, Optional, TypeVar
+
+from mercury.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+FetchQuotes = Callable[[list[str]], Awaitable[dict[str, T]]]
+
+# Maximum instruments per kite.quote() call
+QUOTE_BATCH_SIZE = 500
+
+
+@dataclass
+class QuoteBatch(Generic[T]):
+    """Quotes by instrument key, plus an error message for each failure."""
+
+    results: dict[str, T] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+class QuoteCache(Generic[T]):
+    """
+    TTL cache with fan-in of concurrent misses into batched fetches.
+
+    `fetch` receives up to `max_batch` instrument keys and returns the
+    quotes it found; keys it leaves out are reported as missing, and an
+    exception fails every key in that batch.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 1.0,
+        max_batch: int = QUOTE_BATCH_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a quote is reused (0 disables reuse but still coalesces)
+            max_batch: Most instruments passed to one fetch call
+            clock: Monotonic time source
+        """
+        self.ttl = ttl
+        self.max_batch = max_batch
+        self._clock = clock
+        self._entries: dict[str, tuple[float, T]] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    async def get_many(
+        self,
+        keys: Iterable[str],
+        fetch: FetchQuotes,
+        max_age: Optional[float] = None,
+        raise_errors: bool = False,
+    ) -> QuoteBatch[T]:
+        """
+        Get quotes, from cache where fresh enough and otherwise via fetch.
+
+        Args:
+            keys: Instrument keys ("EXCHANGE:SYMBOL")
+            fetch: Upstream batch fetch, used if this call starts a flush
+            max_age: Tighter freshness bound than the TTL for this call
+            raise_errors: Re-raise a failed fetch instead of recording it
+
+        Returns:
+            QuoteBatch with a quote or an error for each key
+        """
+        max_age = self.ttl if max_age is None else min(max_age, self.ttl)
+        now = self._clock()
+        batch: QuoteBatch[T] = QuoteBatch()
+        waiting: dict[str, asyncio.Future] = {}
+
+        for key in dict.fromkeys(keys):
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= max_age:
+                batch.results[key] = entry[1]
+                self.hits += 1
+                continue
+            self.misses += 1
+            future = self._in_flight.get(key) or self._pending.get(key)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._pending[key] = future
+            waiting[key] = future
+
+        if not waiting:
+            return batch
+
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush(fetch))
+
+        # Shield: one caller giving up must not cancel a fetch others await
+        outcomes = await asyncio.gather(
+            *(asyncio.shield(f) for f in waiting.values()), return_exceptions=True
+        )
+        for key, outcome in zip(waiting, outcomes):
+            if isinstance(outcome, BaseException):
+                if raise_errors:
+                    raise outcome
+                batch.errors[key] = str(outcome) or type(outcome).__name__
+            elif outcome is None:
+                batch.errors[key] = "No quote returned"
+            else:
+                batch.results[key] = outcome
+        return batch
+
+    def invalidate(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Drop cached quotes (all of them if keys is None)."""
+        if keys is None:
+            self._entries.clear()
+        else:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    async def _flush(self, fetch: FetchQuotes) -> None:
+        # One loop turn lets concurrent callers add their misses
+        await asyncio.sleep(0)
+        pending, self._pending = self._pending, {}
+        self._in_flight.update(pending)
+        self._flush_task = None
+
+        keys = list(pending)
+        chunks = [keys[i:i + self.max_batch] for i in range(0, len(keys), self.max_batch)]
+        try:
+            await asyncio.gather(*(self._fetch_chunk(chunk, pending, fetch) for chunk in chunks))
+        finally:
+            for key, future in pending.items():
+                self._in_flight.pop(key, None)
+                _resolve(future, exception=ConnectionError("Quote fetch cancelled"))
+
+    async def _fetch_chunk(
+        self,
+        chunk: list[str],
+        futures: dict[str, asyncio.Future],
+        fetch: FetchQuotes,
+    ) -> None:
+        self.fetches += 1
+        try:
+            quotes = await fetch(chunk)
+        except Exception as e:
+            logger.debug(f"Quote fetch failed for {len(chunk)} instruments: {e}")
+            for key in chunk:
+                _resolve(futures[key], exception=e)
+            return
+
+        fetched_at = self._clock()
+        for key in chunk:
+            quote = quotes.get(key)
+            if quote is not None:
+                self._entries[key] = (fetched_at, quote)
+            _resolve(futures[key], result=quote)
+
+
+def _resolve(
+    future: asyncio.Future,
+    result=None,
+    exception: Optional[BaseException] = None,
+) -> None:
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+        # Retrieved here so an abandoned waiter doesn't log "never retrieved"
+        future.exception()
+    else:
+        future.set_result(result)
+
+
+_quote_cache: Optional[QuoteCache] = None
+
+
+def get_quote_cache() -> QuoteCache:
+    """Get the process-wide quote cache."""
+    global _quote_cache
+    if _quote_cache is None:
+        _quote_cache = QuoteCache(ttl=get_settings().quote_cache_ttl_seconds)
+    return _quote_cache
@@ -0,0 +1,298 @@
+"""
+Tests for Kite Adapter
+======================
+
+Tests for data bundle planning, concurrent fetching, off-loop Kite
+calls and per-endpoint circuit breakers in KiteAdapter.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from mercury.core import rate_limiter, resilience
+from mercury.core.exceptions import KiteAPIError, KiteAuthError
+from mercury.core.rate_limiter import EndpointRateLimiter, TokenBucketRateLimiter
+from mercury.kite.adapter import KiteAdapter, MockKite
+from mercury.kite.executor import KiteExecutor
+from mercury.kite.quote_cache import QuoteCache
+
+
+RECORDS = [
+    {
+        "instrument_token": 738561 + i, "exchange_token": 2885 + i,
+        "tradingsymbol": symbol, "name": symbol, "expiry": "", "strike": 0.0,
+        "tick_size": 0.05, "lot_size": 1, "instrument_type": "EQ",
+        "segment": "NSE", "exchange": "NSE",
+    }
+    for i, symbol in enumerate(["RELIANCE", "INFY", "TCS", "HDFCBANK"])
+]
+
+
+@pytest.fixture
+def fast_limiter(monkeypatch):
+    """Replace the Kite limiters with one fast bucket so tests are not paced."""
+    limiter = TokenBucketRateLimiter(rate=1000.0, burst=1000)
+    monkeypatch.setattr(rate_limiter, "kite_limiters", EndpointRateLimiter({}, limiter))
+    return limiter
+
+
+def _adapter(
+    tmp_path, latency: float = 0.0, executor: KiteExecutor = None
+) -> KiteAdapter:
+    adapter = KiteAdapter(
+        api_key="test",
+        use_oauth_manager=False,
+        instruments_cache_path=tmp_path / "instruments.csv",
+        quote_cache=QuoteCache(),
+        executor=executor,
+    )
+    kite = MockKite(latency=latency)
+    kite.instruments = lambda: RECORDS
+    adapter._kite = MagicMock(wraps=kite)
+    return adapter
+
+
+class TestBundlePlan:
+    """Tests for KiteAdapter.plan_bundle."""
+
+    @pytest.mark.asyncio
+    async def test_resolves_tokens_from_index(self, tmp_path):
+        """Test symbols are de-duplicated and resolved without search calls."""
+        adapter = _adapter(tmp_path)
+
+        plan = await adapter.plan_bundle(
+            ["INFY", "NSE:TCS", "INFY", "NOPE"], include_history=True
+        )
+
+        assert plan.quote_symbols == ["INFY", "NSE:TCS", "NOPE"]
+        assert plan.history_tokens == {"INFY": 738562, "NSE:TCS": 738563}
+        assert plan.unresolved == ["NOPE"]
+        assert plan.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_no_history_skips_instruments(self, tmp_path):
+        """Test a quote-only plan never loads the instruments master."""
+        adapter = _adapter(tmp_path)
+
+        plan = await adapter.plan_bundle(["INFY"], False, False)
+
+        assert plan.call_count == 1
+        assert adapter._kite.instruments.call_count == 0
+
+
+class TestDataBundle:
+    """Tests for KiteAdapter.get_data_bundle."""
+
+    @pytest.mark.asyncio
+    async def test_one_quote_call_and_token_history(self, tmp_path, fast_limiter):
+        """Test quotes are batched and history goes straight to resolved tokens."""
+        adapter = _adapter(tmp_path)
+
+        bundle = await adapter.get_data_bundle(
+            ["RELIANCE", "INFY", "NOPE"], include_history=True
+        )
+
+        assert adapter._kite.quote.call_count == 1
+        tokens = sorted(
+            call.kwargs["instrument_token"]
+            for call in adapter._kite.historical_data.call_args_list
+        )
+        assert tokens == [738561, 738562]
+        assert set(bundle.historical) == {"RELIANCE", "INFY"}
+        # quote, two histories, positions, holdings and the instruments download
+        assert fast_limiter.stats.total_requests == 6
+
+    @pytest.mark.asyncio
+    async def test_calls_overlap(self, tmp_path, fast_limiter):
+        """Test slow Kite calls run concurrently rather than back to back."""
+        adapter = _adapter(tmp_path, latency=0.1)
+        await adapter._get_instruments()
+
+        started = time.perf_counter()
+        bundle = await adapter.get_data_bundle(
+            ["RELIANCE", "INFY", "TCS", "HDFCBANK"], include_history=True
+        )
+        elapsed = time.perf_counter() - started
+
+        assert len(bundle.quotes) == 4
+        assert len(bundle.historical) == 4
+        assert elapsed < 0.4  # 7 calls of 0.1s each in sequence
+
+    @pytest.mark.asyncio
+    async def test_failed_part_left_empty(self, tmp_path, fast_limiter):
+        """Test one failing call does not lose the rest of the bundle."""
+        adapter = _adapter(tmp_path)
+        adapter._kite.positions = MagicMock(side_effect=RuntimeError("down"))
+
+        bundle = await adapter.get_data_bundle(["INFY"])
+
+        assert bundle.positions == []
+        assert set(bundle.quotes) == {"INFY"}
+
+
+class TestKiteExecutor:
+    """Tests for running Kite client calls off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_loop_stays_responsive(self, tmp_path, fast_limiter):
+        """Test slow concurrent Kite calls do not stall the event loop."""
+        adapter = _adapter(tmp_path, latency=0.2, executor=KiteExecutor(max_workers=4))
+        lags = []
+
+        async def probe():
+            for _ in range(30):
+                started = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lags.append(time.perf_counter() - started - 0.01)
+
+        await asyncio.gather(
+            probe(),
+            *(adapter.get_ltp([f"NSE:SYM{i}"]) for i in range(8)),
+            adapter.get_positions(),
+            adapter.get_holdings(),
+        )
+
+        assert max(lags) < 0.05
+
+    @pytest.mark.asyncio
+    async def test_pool_bounds_calls_in_flight(self, tmp_path, fast_limiter):
+        """Test no more than max_workers Kite calls run at once."""
+        executor = KiteExecutor(max_workers=2)
+        adapter = _adapter(tmp_path, latency=0.1, executor=executor)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(adapter.get_ltp([f"NSE:SYM{i}"]) for i in range(4)))
+
+        assert time.perf_counter() - started >= 0.2
+        assert executor.get_status() == {"max_workers": 2, "pending": 0, "completed": 4}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_still_pending(self):
+        """Test a call stays pending until its thread finishes, not its caller."""
+        executor = KiteExecutor(max_workers=1)
+        release = threading.Event()
+        task = asyncio.create_task(executor.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert executor.pending == 1
+
+        release.set()
+        for _ in range(50):
+            if executor.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.get_status() == {"max_workers": 1, "pending": 0, "completed": 1}
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_quote_reads_not_hedged(self, tmp_path, fast_limiter, monkeypatch):
+        """Test a slow quote read is not sent twice, even with tokens to spare."""
+        hedger = resilience.Hedger(
+            "kite.quote",
+            resilience.HedgeConfig(min_hedge_delay_seconds=0.0, refresh_seconds=0.0),
+        )
+        for _ in range(20):
+            hedger.observe(0.01)
+        monkeypatch.setattr(resilience, "_hedgers", {"kite.quote": hedger})
+        adapter = _adapter(tmp_path, latency=0.1, executor=KiteExecutor(max_workers=4))
+
+        await adapter.get_ltp(["NSE:INFY"])
+
+        assert adapter._kite.ltp.call_count == 1
+        assert hedger.stats.hedges_sent == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_still_translated(self, tmp_path, fast_limiter):
+        """Test exceptions raised in the pool reach the adapter's error handling."""
+        class TokenException(Exception):
+            pass
+
+        adapter = _adapter(tmp_path, executor=KiteExecutor(max_workers=1))
+        adapter._kite.ltp = MagicMock(side_effect=TokenException("expired"))
+
+        with pytest.raises(KiteAuthError):
+            await adapter.get_ltp(["NSE:INFY"])
+
+
+class TestEndpointCircuits:
+    """Tests for per-endpoint Kite circuit breakers."""
+
+    @pytest.fixture
+    def endpoint_circuits(self, monkeypatch):
+        """Start from fresh endpoint breakers with a short historical slow-call limit."""
+        monkeypatch.setattr(resilience, "KITE_ENDPOINT_SLOW_CALL_SECONDS", {"historical": 0.05})
+        monkeypatch.setattr(resilience, "_circuit_breakers", {
+            name: cb for name, cb in resilience._circuit_breakers.items()
+            if not name.startswith("kite_api.")
+        })
+
+    @pytest.mark.asyncio
+    async def test_slow_endpoint_opens_alone(self, tmp_path, fast_limiter, endpoint_circuits):
+        """Test slow history calls open the historical breaker but not quotes."""
+        adapter = _adapter(tmp_path, latency=0.06)
+        await adapter._get_instruments()
+
+        for _ in range(5):
+            await adapter.get_ohlc("INFY")
+
+        historical = resilience.get_kite_circuit("historical")
+        assert historical.state == resilience.CircuitState.OPEN
+        with pytest.raises(KiteAPIError, match="historical circuit breaker is open"):
+            await adapter.get_ohlc("INFY")
+        assert adapter._kite.historical_data.call_count == 5
+
+        assert await adapter.get_ltp(["NSE:INFY"])
+        assert resilience.kite_circuit.state == resilience.CircuitState.CLOSED
+        health = resilience.get_all_circuit_health()
+        assert health["kite_api.historical"]["window"]["slow_calls"] == 5
+        assert health["kite_api.quote"]["window"]["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_instruments_download_protected(
+        self, tmp_path, fast_limiter, endpoint_circuits
+    ):
+        """Test the instruments download goes through its limiter and breaker."""
+        adapter = _adapter(tmp_path)
+        instruments = resilience.get_kite_circuit("instruments")
+        instruments.config = resilience.CircuitBreakerConfig(failure_threshold=1)
+        instruments.record_failure()
+
+        with pytest.raises(KiteAPIError):
+            await adapter.get_ohlc("INFY")
+        assert adapter._kite.instruments.call_count == 0
+
+        instruments.reset()
+        await adapter.plan_bundle(["INFY"], include_history=True)
+        assert adapter._kite.instruments.call_count == 1
+        assert instruments.stats.success_count == 1
+        # One token for the refused attempt, one for the download
+        assert fast_limiter.stats.total_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_open_shared_circuit_keeps_endpoint_trial(
+        self, tmp_path, fast_limiter, endpoint_circuits, monkeypatch
+    ):
+        """Test a call rejected by kite_circuit does not use up the endpoint's trial."""
+        monkeypatch.setattr(resilience.kite_circuit, "stats", resilience.CircuitStats())
+        adapter = _adapter(tmp_path)
+        await adapter._get_instruments()
+        historical = resilience.get_kite_circuit("historical")
+        historical.config = resilience.CircuitBreakerConfig(failure_threshold=1, timeout_seconds=0)
+        historical.record_failure()
+        resilience.kite_circuit.stats.state = resilience.CircuitState.OPEN
+        resilience.kite_circuit.stats.opened_at = datetime.now(timezone.utc)
+
+        with pytest.raises(KiteAPIError, match="Kite API circuit breaker is open"):
+            await adapter.get_ohlc("INFY")
+
+        resilience.kite_circuit.reset()
+        assert await adapter.get_ohlc("INFY")
+        assert historical.stats.success_count == 1
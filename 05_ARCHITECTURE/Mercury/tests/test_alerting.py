@@ -0,0 +1,199 @@
+"""
+Tests for Alerting
+==================
+
+Tests for AlertManager delivery: per-destination workers, digests,
+retry backoff and fingerprint expiry.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from mercury.core.alerting import (
+    Alert,
+    AlertManager,
+    AlertSeverity,
+    WebhookConfig,
+    format_payload,
+)
+
+
+def _alert(title: str = "Disk full", severity: AlertSeverity = AlertSeverity.ERROR) -> Alert:
+    return Alert(title=title, message="details", severity=severity, source="test")
+
+
+class Recorder:
+    """Mock webhook endpoints with per-host latency and status codes."""
+
+    def __init__(self, latency=None, statuses=None):
+        self.latency = latency or {}
+        self.statuses = statuses or {}
+        self.requests = []
+        self.delivered_at = {}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        await asyncio.sleep(self.latency.get(host, 0.0))
+        self.requests.append((host, json.loads(request.content)))
+        self.delivered_at.setdefault(host, asyncio.get_running_loop().time())
+        codes = self.statuses.get(host)
+        return httpx.Response(codes.pop(0) if codes else 200)
+
+
+def _manager(recorder: Recorder) -> AlertManager:
+    manager = AlertManager(client=httpx.AsyncClient(transport=httpx.MockTransport(recorder)))
+    manager.RETRY_DELAY = 0.01
+    return manager
+
+
+class TestDelivery:
+    """Tests for the per-destination delivery engine."""
+
+    @pytest.mark.asyncio
+    async def test_slow_destination_does_not_block_others(self):
+        """Test a slow webhook only delays its own alerts."""
+        recorder = Recorder(latency={"slow": 0.5})
+        manager = _manager(recorder)
+        manager.add_webhook(WebhookConfig(url="http://slow/hook", name="slow"))
+        manager.add_webhook(WebhookConfig(url="http://fast/hook", name="fast"))
+        await manager.start()
+
+        started = asyncio.get_running_loop().time()
+        await manager.send(_alert())
+        await asyncio.sleep(0.1)
+
+        assert recorder.delivered_at["fast"] - started < 0.1
+        assert "slow" not in recorder.delivered_at
+        await manager.drain()
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_burst_sent_as_digest(self):
+        """Test alerts queued while a destination is busy go out as one digest."""
+        recorder = Recorder(latency={"hook": 0.05})
+        manager = _manager(recorder)
+        manager.add_webhook(WebhookConfig(url="http://hook/", name="hook"))
+        await manager.start()
+
+        await manager.send(_alert(title="first"))
+        await asyncio.sleep(0.01)
+        for i in range(4):
+            await manager.send(_alert(title=f"alert {i}"))
+        await manager.drain()
+
+        assert len(recorder.requests) == 2
+        digest = recorder.requests[1][1]
+        assert digest["digest"] is True
+        assert [a["title"] for a in digest["alerts"]] == [f"alert {i}" for i in range(4)]
+        status = manager.get_status()["destinations"]["hook"]
+        assert status["delivered"] == 5
+        assert status["digests"] == 1
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_severity_filter_per_destination(self):
+        """Test each destination only receives alerts at or above its threshold."""
+        recorder = Recorder()
+        manager = _manager(recorder)
+        manager.add_webhook(WebhookConfig(
+            url="http://pager/", name="pager", min_severity=AlertSeverity.CRITICAL,
+        ))
+        manager.add_webhook(WebhookConfig(url="http://chat/", name="chat"))
+        await manager.start()
+
+        await manager.send(_alert(severity=AlertSeverity.ERROR))
+        await manager.drain()
+
+        assert [host for host, _ in recorder.requests] == ["chat"]
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_retries_then_succeeds(self):
+        """Test a failed delivery is retried on the shared client."""
+        recorder = Recorder(statuses={"hook": [503, 500]})
+        manager = _manager(recorder)
+        manager.add_webhook(WebhookConfig(url="http://hook/", name="hook"))
+        await manager.start()
+
+        await manager.send(_alert())
+        await manager.drain()
+
+        assert len(recorder.requests) == 3
+        assert manager.get_status()["destinations"]["hook"]["delivered"] == 1
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest(self):
+        """Test a destination that is not draining keeps only the newest alerts."""
+        manager = _manager(Recorder())
+        manager.QUEUE_SIZE = 2
+        manager.add_webhook(WebhookConfig(url="http://hook/", name="hook"))
+
+        for i in range(3):
+            await manager.send(_alert(title=f"alert {i}"))
+
+        status = manager.get_status()["destinations"]["hook"]
+        assert status["queued"] == 2
+        assert status["dropped"] == 1
+        assert not status["running"]
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test retry delays stay within the exponential ceiling."""
+        manager = AlertManager()
+        manager.RETRY_DELAY = 1
+        manager.RETRY_MAX_DELAY = 4
+
+        delays = [manager._backoff(attempt) for attempt in (0, 1, 5) for _ in range(50)]
+
+        assert all(0 <= d <= 1 for d in delays[:50])
+        assert all(0 <= d <= 4 for d in delays[50:])
+        assert len(set(delays)) > 1
+
+
+class TestFingerprints:
+    """Tests for deduplication and fingerprint expiry."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_suppressed(self):
+        """Test the same alert is queued once within the dedup window."""
+        manager = _manager(Recorder())
+        manager.add_webhook(WebhookConfig(url="http://hook/", name="hook"))
+
+        await manager.send(_alert())
+        await manager.send(_alert())
+
+        assert manager.get_status()["destinations"]["hook"]["queued"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_fingerprints_removed(self):
+        """Test cleanup drops expired fingerprints and keeps live ones."""
+        manager = AlertManager()
+        old = _alert(title="old")
+        old.timestamp = datetime.now(timezone.utc) - timedelta(minutes=20)
+        await manager.send(old)
+        await manager.send(_alert(title="new"))
+
+        manager._cleanup_fingerprints()
+
+        assert list(manager._sent_fingerprints) == [_alert(title="new").fingerprint]
+        assert len(manager._expiry) == 1
+
+
+class TestPayloads:
+    """Tests for single and digest webhook bodies."""
+
+    def test_single_alert_unchanged(self):
+        """Test one alert uses the existing per-format payload."""
+        alert = _alert()
+        assert format_payload("slack", [alert]) == alert.to_slack_payload()
+
+    def test_discord_digest_embeds(self):
+        """Test a Discord digest carries one embed per alert."""
+        payload = format_payload("discord", [_alert("a"), _alert("b")])
+
+        assert payload["content"] == "Mercury: 2 alerts"
+        assert [e["title"] for e in payload["embeds"]] == ["a", "b"]
@@ -5,9 +5,16 @@ Tests for Mercury API Application
 DIRECTIVE: System must be glitch-free and performant.
 """
 
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
 
+from mercury.api import app as app_module
+from mercury.core import persistence
+from mercury.core.config import get_settings
+from mercury.core.persistence import StateStore
+
 
 class TestHealthEndpoint:
     """Tests for health check endpoint."""
@@ -170,3 +177,114 @@ class TestClearConversation:
         
         assert response.status_code == 200
         assert response.json()["status"] == "not_found"
+
+
+class TestConversationEviction:
+    """Tests for lazily loaded, bounded and evictable live conversations."""
+    
+    @pytest.fixture
+    async def store(self, tmp_path, monkeypatch):
+        """Use a temporary state store and empty live-conversation table."""
+        store = StateStore(db_path=tmp_path / "state.db")
+        monkeypatch.setattr(persistence, "_state_store", store)
+        monkeypatch.setattr(app_module, "_conversations", app_module.OrderedDict())
+        monkeypatch.setattr(app_module, "_last_used", {})
+        settings = get_settings()
+        monkeypatch.setattr(settings, "conversation_window_messages", 4)
+        monkeypatch.setattr(settings, "conversation_idle_seconds", 60.0)
+        monkeypatch.setattr(settings, "max_live_conversations", 100)
+        yield store
+        await store.close()
+    
+    async def _turns(self, conv_id: str, count: int):
+        for i in range(count):
+            conv = await app_module._get_conversation(conv_id)
+            conv.add_user_message(f"Q{i}")
+            conv.add_assistant_message(f"A{i}")
+            await app_module._persist_conversation(conv_id, conv)
+        return conv
+    
+    @pytest.mark.asyncio
+    async def test_window_bounded_and_logged(self, store):
+        """Test memory holds the window while the log holds every turn."""
+        conv = await self._turns("conv-a", 10)
+        
+        assert len(conv.messages) == 4
+        assert len(await store.load_messages("conv-a", limit=100)) == 20
+    
+    @pytest.mark.asyncio
+    async def test_idle_conversation_evicted_and_reloaded(self, store, monkeypatch):
+        """Test idle conversations leave memory and come back from the log."""
+        await self._turns("conv-a", 3)
+        monkeypatch.setitem(app_module._last_used, "conv-a", 0.0)
+        
+        await app_module._get_conversation("conv-b")
+        
+        assert list(app_module._conversations) == ["conv-b"]
+        
+        conv = await app_module._get_conversation("conv-a")
+        assert conv.get_history(limit=1)[0]["content"] == "A2"
+        assert conv.add_user_message("Q3").seq == 6
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_first_requests_share_conversation(self, store):
+        """Test requests racing to load one conversation get the same instance."""
+        await self._turns("conv-a", 2)
+        app_module._forget_conversation("conv-a")
+        
+        first, second = await asyncio.gather(
+            app_module._get_conversation("conv-a"),
+            app_module._get_conversation("conv-a"),
+        )
+        
+        assert first is second
+        assert first.add_user_message("Q2").seq == 4
+        assert second.add_user_message("Q3").seq == 5
+    
+    @pytest.mark.asyncio
+    async def test_unsaved_conversation_not_evicted(self, store, monkeypatch):
+        """Test a conversation with messages not yet in the log stays live."""
+        conv = await app_module._get_conversation("conv-a")
+        conv.add_user_message("pending")
+        monkeypatch.setitem(app_module._last_used, "conv-a", 0.0)
+        
+        await app_module._get_conversation("conv-b")
+        
+        assert "conv-a" in app_module._conversations
+    
+    @pytest.mark.asyncio
+    async def test_capacity_evicts_least_recently_used(self, store, monkeypatch):
+        """Test the live table never exceeds max_live_conversations."""
+        monkeypatch.setattr(get_settings(), "max_live_conversations", 3)
+        for i in range(6):
+            await app_module._get_conversation(f"conv-{i}")
+        
+        assert list(app_module._conversations) == ["conv-3", "conv-4", "conv-5"]
+    
+    @pytest.mark.asyncio
+    async def test_flushed_conversation_marked_saved(self, store, monkeypatch):
+        """Test a conversation saved by flush_dirty can be evicted afterwards."""
+        store.set_conversation_source(
+            app_module._conversation_record, on_saved=app_module._conversation_saved
+        )
+        conv = await app_module._get_conversation("conv-a")
+        conv.add_user_message("pending")
+        store.mark_dirty("conv-a")
+        
+        assert await store.flush_dirty() == 1
+        assert conv.unsaved_messages() == []
+        
+        monkeypatch.setitem(app_module._last_used, "conv-a", 0.0)
+        await app_module._get_conversation("conv-b")
+        assert "conv-a" not in app_module._conversations
+    
+    @pytest.mark.asyncio
+    async def test_reload_keeps_created_at(self, store):
+        """Test a conversation reloaded from the log keeps its creation time."""
+        conv = await self._turns("conv-a", 1)
+        created_at = conv.created_at
+        app_module._forget_conversation("conv-a")
+        
+        reloaded = await app_module._get_conversation("conv-a")
+        
+        assert reloaded.created_at == created_at
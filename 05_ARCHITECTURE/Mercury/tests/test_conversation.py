@@ -123,6 +123,49 @@ class TestConversation:
         assert conv.turn_count == 2
 
 
+class TestConversationWindow:
+    """Tests for message sequence numbers and the bounded in-memory window."""
+    
+    def test_messages_numbered(self):
+        """Test each message gets the next sequence number."""
+        conv = Conversation()
+        conv.add_user_message("Q1")
+        conv.add_assistant_message("A1")
+        
+        assert [m.seq for m in conv.messages] == [0, 1]
+        assert conv.next_seq == 2
+    
+    def test_window_trims_only_saved(self):
+        """Test messages beyond the window are dropped once saved, not before."""
+        conv = Conversation(window=4)
+        for i in range(6):
+            conv.add_user_message(f"Q{i}")
+        
+        assert len(conv.messages) == 6
+        assert len(conv.unsaved_messages()) == 6
+        
+        conv.mark_saved(6)
+        
+        assert [m.content for m in conv.messages] == ["Q2", "Q3", "Q4", "Q5"]
+        assert conv.first_seq == 2
+        assert conv.unsaved_messages() == []
+        assert conv.get_history(limit=2)[0]["content"] == "Q4"
+    
+    def test_from_log(self):
+        """Test a conversation rebuilt from log entries continues its sequence."""
+        conv = Conversation.from_log("conv-1", [
+            {"seq": 8, "role": "user", "content": "Q", "timestamp": "2024-01-01T00:00:00+00:00"},
+            {"seq": 9, "role": "assistant", "content": "A", "timestamp": "2024-01-01T00:00:01+00:00"},
+        ], window=10)
+        
+        msg = conv.add_user_message("next")
+        
+        assert conv.id == "conv-1"
+        assert msg.seq == 10
+        assert conv.unsaved_messages() == [msg]
+        assert conv.first_seq == 8
+
+
 class TestConversationManager:
     """Tests for ConversationManager."""
     
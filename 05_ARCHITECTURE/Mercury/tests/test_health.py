@@ -5,15 +5,28 @@ Tests for Mercury Health Check System
 Tests for health checks and system status.
 """
 
+import asyncio
+from datetime import datetime, timezone
+
 import pytest
 from mercury.core.health import (
     HealthStatus,
     ComponentHealth,
     SystemHealth,
+    HealthProbe,
+    HealthRegistry,
     check_config_health,
     check_memory_health,
+    default_probes,
     get_system_health,
 )
+from mercury.core.rate_limiter import RateLimitExceeded, TokenBucketRateLimiter
+from mercury.core.resilience import (
+    KITE_ENDPOINTS,
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    get_circuit_breaker,
+)
 
 
 class TestHealthStatus:
@@ -161,3 +174,184 @@ class TestGetSystemHealth:
         
         assert "configuration" in component_names
         assert "memory" in component_names
+
+
+def _probe(name: str, status=HealthStatus.HEALTHY, delay: float = 0.0, calls=None, **kwargs):
+    async def check():
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delay)
+        return ComponentHealth(name=name, status=status, last_check=datetime.now(timezone.utc))
+    return HealthProbe(name, check, **kwargs)
+
+
+class TestHealthRegistry:
+    """Tests for cached, concurrent and passive component health."""
+    
+    @pytest.mark.asyncio
+    async def test_probes_run_concurrently_with_timeouts(self):
+        """Slow probes overlap and a hung probe is cut off at its timeout."""
+        registry = HealthRegistry([
+            _probe("a", delay=0.1),
+            _probe("b", delay=0.1),
+            _probe("hung", delay=10, timeout_seconds=0.1),
+        ])
+        
+        started = asyncio.get_running_loop().time()
+        health = await registry.refresh()
+        elapsed = asyncio.get_running_loop().time() - started
+        
+        assert elapsed < 0.3
+        hung = next(c for c in health.components if c.name == "hung")
+        assert hung.status == HealthStatus.UNHEALTHY
+        assert "timed out" in hung.message
+    
+    @pytest.mark.asyncio
+    async def test_results_cached_per_ttl(self):
+        """Only components whose TTL expired are probed again."""
+        calls = []
+        registry = HealthRegistry([
+            _probe("slow_changing", calls=calls, ttl_seconds=60),
+            _probe("fast_changing", calls=calls, ttl_seconds=0),
+        ])
+        
+        await registry.refresh()
+        await registry.refresh()
+        registry.snapshot()
+        
+        assert calls.count("slow_changing") == 1
+        assert calls.count("fast_changing") == 2
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_share_probe(self):
+        """Simultaneous readers wait on one in-flight probe."""
+        calls = []
+        registry = HealthRegistry([_probe("a", delay=0.05, calls=calls)])
+        
+        await asyncio.gather(*(registry.refresh() for _ in range(5)))
+        
+        assert calls == ["a"]
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_never_probes(self):
+        """Unchecked components read as UNKNOWN without probing."""
+        calls = []
+        registry = HealthRegistry([_probe("a", calls=calls)])
+        
+        health = registry.snapshot()
+        
+        assert calls == []
+        assert health.components[0].status == HealthStatus.UNKNOWN
+    
+    @pytest.mark.asyncio
+    async def test_circuit_transitions_update_component(self):
+        """An opening circuit marks its component unhealthy with no probe."""
+        breaker = get_circuit_breaker("health_test_circuit")
+        breaker.reset()
+        calls = []
+        changes = []
+        registry = HealthRegistry([
+            _probe("health_test_circuit", calls=calls, circuit="health_test_circuit")
+        ])
+        registry.add_listener(changes.append)
+        await registry.refresh()
+        
+        for _ in range(breaker.config.failure_threshold):
+            breaker.record_failure()
+        health = await registry.refresh()
+        
+        assert calls == ["health_test_circuit"]
+        assert health.components[0].status == HealthStatus.UNHEALTHY
+        assert health.components[0].details["source"] == "passive"
+        assert [c.status for c in changes] == [HealthStatus.HEALTHY, HealthStatus.UNHEALTHY]
+        
+        breaker.reset()
+        health = await registry.refresh()
+        
+        assert calls == ["health_test_circuit"] * 2
+        assert health.components[0].status == HealthStatus.HEALTHY
+    
+    @pytest.mark.asyncio
+    async def test_open_circuit_outranks_probe(self):
+        """An expired result is not probed back to healthy while the circuit is open."""
+        breaker = get_circuit_breaker("health_test_open")
+        breaker.reset()
+        calls = []
+        registry = HealthRegistry([
+            _probe("health_test_open", calls=calls, circuit="health_test_open", ttl_seconds=0)
+        ])
+        await registry.refresh()
+        
+        for _ in range(breaker.config.failure_threshold):
+            breaker.record_failure()
+        health = await registry.refresh()
+        
+        assert calls == ["health_test_open"] * 2
+        assert health.components[0].status == HealthStatus.UNHEALTHY
+        breaker.reset()
+    
+    @pytest.mark.asyncio
+    async def test_endpoint_circuit_degrades_component(self):
+        """An open per-endpoint breaker degrades its component until it closes."""
+        endpoint = CircuitBreaker("health_test_api.quote", CircuitBreakerConfig(failure_threshold=1))
+        calls = []
+        registry = HealthRegistry([
+            _probe("health_test_api", calls=calls, endpoint_circuits=lambda: [endpoint])
+        ])
+        await registry.refresh()
+        
+        endpoint.record_failure()
+        health = await registry.refresh(force=True)
+        
+        component = health.components[0]
+        assert component.status == HealthStatus.DEGRADED
+        assert component.details["endpoint_circuit"] == "health_test_api.quote"
+        
+        endpoint.reset()
+        health = await registry.refresh()
+        
+        assert calls == ["health_test_api"] * 3
+        assert health.components[0].status == HealthStatus.HEALTHY
+    
+    def test_default_kite_probe_watches_endpoints(self):
+        """The Kite component listens to every per-endpoint breaker."""
+        registry = HealthRegistry(default_probes())
+        
+        for endpoint in KITE_ENDPOINTS:
+            assert registry._circuit_components[f"kite_api.{endpoint}"] == "kite_api"
+    
+    @pytest.mark.asyncio
+    async def test_recent_success_keeps_result_fresh(self):
+        """Successful live calls stand in for an expired probe."""
+        breaker = get_circuit_breaker("health_test_traffic")
+        breaker.reset()
+        calls = []
+        registry = HealthRegistry([
+            _probe("health_test_traffic", calls=calls, circuit="health_test_traffic",
+                   ttl_seconds=0.05)
+        ])
+        await registry.refresh()
+        await asyncio.sleep(0.06)
+        breaker.record_success()
+        
+        await registry.refresh()
+        
+        assert calls == ["health_test_traffic"]
+        assert registry.probes_skipped == 1
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_rejections_degrade(self):
+        """Requests rejected by a component's limiter mark it degraded."""
+        limiter = TokenBucketRateLimiter(rate=0.001, burst=1, blocking=False)
+        registry = HealthRegistry([
+            _probe("limited", limiters=lambda: [limiter], ttl_seconds=60)
+        ])
+        await registry.refresh()
+        
+        await limiter.acquire()
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire()
+        health = await registry.refresh()
+        
+        assert health.components[0].status == HealthStatus.DEGRADED
+        assert health.components[0].details["rejected"] == 1
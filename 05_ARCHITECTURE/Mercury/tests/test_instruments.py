@@ -0,0 +1,145 @@
+"""
+Tests for Instruments Index
+===========================
+
+Tests for the compact instruments master and its use by KiteAdapter.
+"""
+
+import os
+import time
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from mercury.kite.adapter import KiteAdapter
+from mercury.kite.instruments import InstrumentIndex, load_cached_index
+
+
+RECORDS = [
+    {
+        "instrument_token": 738561, "exchange_token": 2885, "tradingsymbol": "RELIANCE",
+        "name": "RELIANCE INDUSTRIES", "expiry": "", "strike": 0.0, "tick_size": 0.05,
+        "lot_size": 1, "instrument_type": "EQ", "segment": "NSE", "exchange": "NSE",
+    },
+    {
+        "instrument_token": 128083204, "exchange_token": 500325, "tradingsymbol": "RELIANCE",
+        "name": "RELIANCE INDUSTRIES", "expiry": "", "strike": 0.0, "tick_size": 0.05,
+        "lot_size": 1, "instrument_type": "EQ", "segment": "BSE", "exchange": "BSE",
+    },
+    {
+        "instrument_token": 341249, "exchange_token": 1333, "tradingsymbol": "HDFCBANK",
+        "name": "HDFC BANK", "expiry": "", "strike": 0.0, "tick_size": 0.05,
+        "lot_size": 1, "instrument_type": "EQ", "segment": "NSE", "exchange": "NSE",
+    },
+    {
+        "instrument_token": 12345678, "exchange_token": 48225,
+        "tradingsymbol": "RELIANCE25JAN1300CE", "name": "RELIANCE",
+        "expiry": date(2025, 1, 30), "strike": 1300.0, "tick_size": 0.05,
+        "lot_size": 250, "instrument_type": "CE", "segment": "NFO-OPT", "exchange": "NFO",
+    },
+]
+
+
+def _adapter(tmp_path) -> KiteAdapter:
+    adapter = KiteAdapter(
+        api_key="test",
+        use_oauth_manager=False,
+        instruments_cache_path=tmp_path / "instruments.csv",
+    )
+    adapter._kite = MagicMock()
+    adapter._kite.instruments.return_value = RECORDS
+    return adapter
+
+
+class TestInstrumentIndex:
+    """Tests for InstrumentIndex."""
+
+    def test_get_by_exchange_and_symbol(self):
+        """Test O(1) lookup distinguishes exchanges."""
+        index = InstrumentIndex.from_records(RECORDS)
+
+        assert index.get("NSE", "RELIANCE").instrument_token == 738561
+        assert index.get("BSE", "RELIANCE").instrument_token == 128083204
+        assert index.get("NSE", "UNKNOWN") is None
+
+    def test_search_prefix_then_substring(self):
+        """Test prefix matches lead and names are searched too."""
+        index = InstrumentIndex.from_records(RECORDS)
+
+        symbols = [i.tradingsymbol for i in index.search("reliance")]
+
+        assert symbols == ["NSE:RELIANCE", "BSE:RELIANCE", "NFO:RELIANCE25JAN1300CE"]
+        assert [i.symbol for i in index.search("bank")] == ["HDFCBANK"]
+        assert index.search("zzz") == []
+
+    def test_search_respects_limit(self):
+        """Test results are capped."""
+        index = InstrumentIndex.from_records(RECORDS)
+
+        assert len(index.search("re", limit=2)) == 2
+
+    def test_csv_roundtrip(self, tmp_path):
+        """Test the cache file reproduces the index."""
+        index = InstrumentIndex.from_records(RECORDS)
+        path = tmp_path / "instruments.csv"
+
+        index.write_csv(path)
+        loaded = load_cached_index(path)
+
+        option = loaded.get("NFO", "RELIANCE25JAN1300CE")
+        assert len(loaded) == 4
+        assert option.expiry == datetime(2025, 1, 30)
+        assert option.strike == 1300.0
+        assert option.lot_size == 250
+
+
+class TestAdapterInstruments:
+    """Tests for KiteAdapter instrument loading."""
+
+    @pytest.mark.asyncio
+    async def test_download_once_and_cache(self, tmp_path):
+        """Test the master is downloaded once and written to disk."""
+        adapter = _adapter(tmp_path)
+
+        await adapter.search_instruments("reliance")
+        await adapter.search_instruments("hdfc")
+
+        assert adapter._kite.instruments.call_count == 1
+        assert (tmp_path / "instruments.csv").exists()
+
+    @pytest.mark.asyncio
+    async def test_fresh_cache_skips_download(self, tmp_path):
+        """Test a restart on the same day reuses the cache file."""
+        InstrumentIndex.from_records(RECORDS).write_csv(tmp_path / "instruments.csv")
+        adapter = _adapter(tmp_path)
+
+        results = await adapter.search_instruments("hdfc")
+
+        assert adapter._kite.instruments.call_count == 0
+        assert results[0].instrument_token == 341249
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_is_refreshed(self, tmp_path):
+        """Test a cache file from an earlier day is replaced."""
+        path = tmp_path / "instruments.csv"
+        InstrumentIndex.from_records(RECORDS[:1]).write_csv(path)
+        two_days_ago = time.time() - 2 * 86400
+        os.utime(path, (two_days_ago, two_days_ago))
+        adapter = _adapter(tmp_path)
+
+        await adapter.search_instruments("hdfc")
+
+        assert adapter._kite.instruments.call_count == 1
+        assert len(load_cached_index(path)) == 4
+
+    @pytest.mark.asyncio
+    async def test_historical_resolves_token_directly(self, tmp_path):
+        """Test OHLC history uses the exchange:symbol index."""
+        adapter = _adapter(tmp_path)
+        adapter._kite.historical_data.return_value = []
+
+        await adapter.get_ohlc("RELIANCE", exchange="BSE")
+
+        kwargs = adapter._kite.historical_data.call_args.kwargs
+        assert kwargs["instrument_token"] == 128083204
@@ -122,15 +122,34 @@ class TestIntentResolver:
         mock_response.content = [MagicMock(text='{"symbols": ["RELIANCE"], "data_types": ["quotes"], "intent_summary": "Price check", "confidence": 0.95}')]
         
         mock_client = MagicMock()
-        mock_client.messages.create = MagicMock(return_value=mock_response)
+        mock_client.messages.create = AsyncMock(return_value=mock_response)
         
         resolver._client = mock_client
         
-        with patch("asyncio.to_thread", new=AsyncMock(return_value=mock_response)):
-            result = await resolver.resolve("What's RELIANCE price?")
+        result = await resolver.resolve("What's RELIANCE price?")
         
-        # Should use fallback since mock doesn't work with to_thread properly
-        assert isinstance(result, IntentResult)
+        assert result.symbols == ["RELIANCE"]
+        assert result.confidence == 0.95
+    
+    @pytest.mark.asyncio
+    async def test_resolve_charges_anthropic_windows(self, resolver):
+        """Test the intent call acquires the request and token windows."""
+        from mercury.core.rate_limiter import SlidingWindowRateLimiter
+        
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(text='{"symbols": ["TCS"]}')]
+        mock_response.usage.output_tokens = 40
+        resolver._client = MagicMock()
+        resolver._client.messages.create = AsyncMock(return_value=mock_response)
+        resolver._rate_limiter = SlidingWindowRateLimiter(limit=10, window_seconds=60)
+        resolver._input_limiter = SlidingWindowRateLimiter(limit=100_000, window_seconds=60)
+        resolver._output_limiter = SlidingWindowRateLimiter(limit=100_000, window_seconds=60)
+        
+        await resolver.resolve("How is TCS?")
+        
+        assert resolver._rate_limiter.current_count == 1
+        assert resolver._input_limiter.current_count > 0
+        assert resolver._output_limiter.current_count == 40
     
     @pytest.mark.skip(reason="Cannot patch client property - needs code refactoring")
     @pytest.mark.asyncio
@@ -140,10 +159,9 @@ class TestIntentResolver:
         mock_response.content = [MagicMock(text='invalid json {{{')]
         
         with patch.object(resolver, "client") as mock_client:
-            mock_client.messages.create = MagicMock(return_value=mock_response)
+            mock_client.messages.create = AsyncMock(return_value=mock_response)
             
-            with patch("asyncio.to_thread", new=AsyncMock(return_value=mock_response)):
-                result = await resolver.resolve("market update")
+            result = await resolver.resolve("market update")
         
         # Should fall back to rule-based
         assert isinstance(result, IntentResult)
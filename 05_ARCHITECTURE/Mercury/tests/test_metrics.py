@@ -5,12 +5,16 @@ Tests for Mercury Metrics System
 Tests for counters, gauges, histograms, and the metrics registry.
 """
 
+import random
+import threading
+
 import pytest
 from mercury.core.metrics import (
     Counter,
     Gauge,
     Histogram,
     MetricsRegistry,
+    QuantileSketch,
     get_registry,
     get_metrics,
     inc_queries,
@@ -250,3 +254,164 @@ class TestGlobalMetrics:
         
         # Verify count increased for that specific label
         assert metrics["chat_queries_total"].get(source="test_timing") == initial + 1
+
+
+class TestLabelledChildren:
+    """Tests for pre-bound label children and per-thread cells."""
+    
+    def test_child_shared_with_keyword_api(self):
+        """Children are reused and see updates made through labels kwargs."""
+        counter = Counter("test", "Test counter")
+        child = counter.labels(method="GET", path="/")
+        
+        assert counter.labels(path="/", method="GET") is child
+        child.inc()
+        counter.inc(2, method="GET", path="/")
+        
+        assert counter.get(method="GET", path="/") == 3
+        assert child.get() == 3
+    
+    def test_threads_merged_on_read(self):
+        """Increments from many threads are all counted."""
+        counter = Counter("test", "Test counter")
+        histogram = Histogram("test_hist", "Test", buckets=(1.0,))
+        inc = counter.labels().inc
+        observe = histogram.labels().observe
+        
+        def work():
+            for _ in range(1000):
+                inc()
+                observe(0.5)
+        
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert counter.get() == 8000
+        stats = histogram.get_stats()
+        assert stats["count"] == 8000
+        assert stats["buckets"][1.0] == 8000
+    
+    def test_child_rejects_negative(self):
+        """Bound counter children still refuse to decrement."""
+        with pytest.raises(ValueError):
+            Counter("test").labels().inc(-1)
+
+
+class TestHistogramBuckets:
+    """Tests for bucket placement and quantiles."""
+    
+    def test_bucket_edges(self):
+        """A value equal to a bound lands in that bucket; larger ones in +Inf."""
+        histogram = Histogram("test", "Test", buckets=(1.0, 0.1, 0.5))
+        for value in (0.1, 0.5, 0.50001, 7.0):
+            histogram.observe(value)
+        
+        stats = histogram.get_stats()
+        
+        assert stats["buckets"] == {0.1: 1, 0.5: 2, 1.0: 3, float("inf"): 4}
+    
+    def test_quantiles_reported(self):
+        """Quantile-enabled histograms report p50/p95/p99 within accuracy."""
+        histogram = Histogram("test", "Test", quantiles=True)
+        for i in range(1, 1001):
+            histogram.observe(i / 1000)
+        
+        quantiles = histogram.get_stats()["quantiles"]
+        
+        assert quantiles[0.5] == pytest.approx(0.5, rel=0.02)
+        assert quantiles[0.99] == pytest.approx(0.99, rel=0.02)
+    
+    def test_plain_histogram_has_no_quantiles(self):
+        """Quantiles are opt-in."""
+        histogram = Histogram("test", "Test")
+        histogram.observe(1.0)
+        
+        assert "quantiles" not in histogram.get_stats()
+
+
+class TestQuantileSketch:
+    """Tests for QuantileSketch."""
+    
+    def test_relative_accuracy(self):
+        """Estimates stay within the configured relative error."""
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(-3, 1) for _ in range(5000))
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+        
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+    
+    def test_merge(self):
+        """Merged sketches answer as if all values were added to one."""
+        left, right, whole = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i in range(100):
+            (left if i % 2 else right).add(i / 10)
+            whole.add(i / 10)
+        
+        left.merge(right)
+        
+        assert left.count == 100
+        assert left.quantile(0.9) == whole.quantile(0.9)
+    
+    def test_empty_and_zero(self):
+        """Empty sketches return 0 and zero values are counted."""
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) == 0.0
+        
+        sketch.add(0.0)
+        sketch.add(0.0)
+        sketch.add(1.0)
+        
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == pytest.approx(1.0, rel=0.01)
+
+
+class TestExport:
+    """Tests for Prometheus/JSON export."""
+    
+    def test_prometheus_histogram(self):
+        """Histograms export cumulative buckets, sum, count and quantiles."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency", "Latency", buckets=(0.1, 1.0), quantiles=True)
+        histogram.observe(0.05, route="a")
+        histogram.observe(0.5, route="a")
+        
+        text = registry.to_prometheus()
+        
+        assert '# TYPE latency histogram' in text
+        assert 'latency_bucket{le="0.1",route="a"} 1' in text
+        assert 'latency_bucket{le="+Inf",route="a"} 2' in text
+        assert 'latency_sum{route="a"} 0.55' in text
+        assert 'latency_count{route="a"} 2' in text
+        assert 'latency_quantile{quantile="0.5",route="a"}' in text
+    
+    def test_output_cached_until_change(self):
+        """Unchanged metrics are not re-rendered; updates are picked up."""
+        registry = MetricsRegistry()
+        counter = registry.counter("hits", "Hits")
+        counter.inc(path="/")
+        
+        first = registry.to_json()
+        second = registry.to_json()
+        assert second["counters"]["hits"] is first["counters"]["hits"]
+        
+        counter.inc(path="/")
+        
+        assert registry.to_json()["counters"]["hits"]["values"][0]["value"] == 2
+        assert 'hits{path="/"} 2.0' in registry.to_prometheus()
+    
+    def test_json_histogram_labelled_values(self):
+        """JSON export includes per-label histogram stats."""
+        registry = MetricsRegistry()
+        registry.histogram("latency").observe(0.2, route="a")
+        
+        section = registry.to_json()["histograms"]["latency"]
+        
+        assert section["values"][0]["labels"] == {"route": "a"}
+        assert section["values"][0]["stats"]["count"] == 1
@@ -272,3 +272,41 @@ class TestMonitorIntegration:
             await monitor._perform_check()
         
         assert len(monitor._health_history) == initial_history_len + 1
+
+
+class TestEventDrivenMonitor:
+    """Tests for the ring-buffer history and change-driven wakeups."""
+    
+    def test_history_is_ring_buffer(self):
+        """History keeps only the newest entries."""
+        monitor = HealthMonitor()
+        for _ in range(monitor._max_history + 10):
+            monitor._health_history.append((datetime.now(timezone.utc), HealthStatus.HEALTHY))
+        
+        assert len(monitor._health_history) == monitor._max_history
+    
+    @pytest.mark.asyncio
+    async def test_component_change_wakes_loop(self):
+        """A reported status change triggers a check before the interval ends."""
+        from mercury.core.health import get_health_registry
+        
+        monitor = HealthMonitor()
+        checks = []
+        
+        async def perform_check():
+            checks.append(datetime.now(timezone.utc))
+        
+        monitor._perform_check = perform_check
+        await monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert len(checks) == 1
+            
+            registry = get_health_registry()
+            registry.report("memory", HealthStatus.DEGRADED, "test signal")
+            await asyncio.sleep(0.05)
+            
+            assert len(checks) == 2
+        finally:
+            await monitor.stop()
+            get_health_registry().invalidate("memory")
@@ -8,15 +8,18 @@ Tests for the persistence module that handles saving/restoring state.
 import asyncio
 import json
 import pytest
+import sqlite3
 import tempfile
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from mercury.chat.conversation import Conversation
 from mercury.core.persistence import (
     StateStore,
     ConversationRecord,
     get_state_store,
+    _WriteOp,
 )
 
 
@@ -216,6 +219,271 @@ class TestStateStore:
         assert store._conn is None
 
 
+def _record(conv_id: str, messages: int = 0) -> ConversationRecord:
+    now = datetime.now(timezone.utc)
+    return ConversationRecord(
+        id=conv_id,
+        created_at=now,
+        updated_at=now,
+        messages=[
+            {"seq": i, "role": "user", "content": f"m{i}"} for i in range(messages)
+        ],
+    )
+
+
+class TestStateStoreEngine:
+    """Tests for the batched writer, read pool and dirty tracking."""
+    
+    @pytest.fixture
+    async def store(self, tmp_path):
+        """Create an initialized StateStore and close it afterwards."""
+        store = StateStore(db_path=tmp_path / "state.db", read_connections=2)
+        await store.initialize()
+        yield store
+        await store.close()
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_batched(self, store):
+        """Test concurrent writes share transactions instead of one commit each."""
+        await asyncio.gather(
+            *(store.save_conversation(_record(f"conv-{i}")) for i in range(50)),
+            *(store.set_setting(f"key-{i}", i) for i in range(50)),
+        )
+        
+        assert store.writes_committed == 100
+        assert store.batches_committed < 100
+        assert len(await store.list_conversations(limit=100)) == 50
+    
+    @pytest.mark.asyncio
+    async def test_queued_upserts_coalesced(self, store):
+        """Test repeated saves of one row queued together are written once."""
+        await asyncio.gather(
+            *(store.save_conversation(_record("conv-x", messages=i)) for i in range(20))
+        )
+        
+        loaded = await store.load_conversation("conv-x")
+        
+        assert len(loaded.messages) == 19
+        assert store.writes_coalesced > 0
+    
+    @pytest.mark.asyncio
+    async def test_touch_does_not_supersede_full_save(self, tmp_path):
+        """Test only identical statements coalesce when sharing a key."""
+        store = StateStore(db_path=tmp_path / "state.db")
+        loop = asyncio.get_running_loop()
+        now = datetime.now(timezone.utc).isoformat()
+        key = ("conversation", "conv-x")
+        # Queued before the writer starts, so both land in one batch
+        ops = [
+            _WriteOp(
+                store.SQL_SAVE_CONVERSATION,
+                ("conv-x", now, now, json.dumps([{"role": "user", "content": "hi"}]), "{}"),
+                loop, loop.create_future(), key,
+            ),
+            _WriteOp(
+                store.SQL_TOUCH_CONVERSATION,
+                ("conv-x", now, now, "{}"),
+                loop, loop.create_future(), key,
+            ),
+        ]
+        for op in ops:
+            store._writes.put(op)
+        await store.initialize()
+        await asyncio.gather(*(op.future for op in ops))
+        
+        loaded = await store.load_conversation("conv-x")
+        
+        assert [m["content"] for m in loaded.messages] == ["hi"]
+        assert store.writes_coalesced == 0
+        await store.close()
+    
+    @pytest.mark.asyncio
+    async def test_failed_write_isolated(self, store):
+        """Test one failing write does not roll back the rest of its batch."""
+        results = await asyncio.gather(
+            store.set_setting("good", 1),
+            store._write("INSERT INTO missing_table VALUES (?)", (1,)),
+            store.set_setting("also_good", 2),
+            return_exceptions=True,
+        )
+        
+        assert isinstance(results[1], Exception)
+        assert await store.get_setting("good") == 1
+        assert await store.get_setting("also_good") == 2
+    
+    @pytest.mark.asyncio
+    async def test_reads_use_bounded_read_only_pool(self, store):
+        """Test reads run on at most read_connections read-only connections."""
+        await store.set_setting("k", "v")
+        
+        values = await asyncio.gather(*(store.get_setting("k") for _ in range(20)))
+        
+        assert values == ["v"] * 20
+        assert 1 <= len(store._all_readers) <= 2
+        with pytest.raises(Exception):
+            store._all_readers[0].execute("DELETE FROM settings")
+    
+    @pytest.mark.asyncio
+    async def test_wal_mode(self, store):
+        """Test the database runs in WAL mode."""
+        mode = await store._read(
+            lambda conn: conn.execute("PRAGMA journal_mode").fetchone()[0]
+        )
+        
+        assert mode == "wal"
+    
+    @pytest.mark.asyncio
+    async def test_flush_dirty_saves_only_changed(self, store):
+        """Test flush_dirty writes dirty conversations and skips the rest."""
+        snapshots = {"a": _record("a", 2), "b": _record("b", 1)}
+        store.set_conversation_source(snapshots.get)
+        store.mark_dirty("a")
+        store.mark_dirty("gone")
+        
+        assert await store.flush_dirty() == 1
+        assert store.dirty_conversations == set()
+        assert await store.load_conversation("b") is None
+        assert len((await store.load_conversation("a")).messages) == 2
+        
+        # Nothing changed since: nothing rewritten
+        committed = store.writes_committed
+        assert await store.flush_dirty() == 0
+        assert store.writes_committed == committed
+    
+    @pytest.mark.asyncio
+    async def test_failed_append_stays_dirty(self, store):
+        """Test a conversation is only clean once its append has committed."""
+        record = _record("a", 1)
+        record.messages[0]["content"] = object()  # sqlite cannot bind this
+        store.mark_dirty("a")
+        
+        with pytest.raises(Exception):
+            await store.append_messages(record)
+        assert store.dirty_conversations == {"a"}
+        
+        store.set_conversation_source({"a": _record("a", 1)}.get)
+        assert await store.flush_dirty() == 1
+        assert store.dirty_conversations == set()
+    
+    @pytest.mark.asyncio
+    async def test_mark_during_save_kept(self, store):
+        """Test a change marked while a save is in flight is not cleared by it."""
+        store.mark_dirty("a")
+        save = asyncio.ensure_future(store.append_messages(_record("a", 1)))
+        await asyncio.sleep(0)
+        store.mark_dirty("a")
+        await save
+        
+        assert store.dirty_conversations == {"a"}
+    
+    @pytest.mark.asyncio
+    async def test_close_flushes_queue(self, tmp_path):
+        """Test writes queued before close are committed."""
+        store = StateStore(db_path=tmp_path / "state.db")
+        await store.initialize()
+        await asyncio.gather(*(store.set_setting(f"k{i}", i) for i in range(10)))
+        await store.close()
+        
+        reopened = StateStore(db_path=tmp_path / "state.db")
+        assert await reopened.get_setting("k9") == 9
+        await reopened.close()
+
+
+class TestMessageLog:
+    """Tests for the append-only conversation message log."""
+    
+    @pytest.fixture
+    async def store(self, tmp_path):
+        """Create an initialized StateStore and close it afterwards."""
+        store = StateStore(db_path=tmp_path / "state.db")
+        await store.initialize()
+        yield store
+        await store.close()
+    
+    @pytest.mark.asyncio
+    async def test_append_and_page_back(self, store):
+        """Test appends accumulate and older turns load page by page."""
+        for start in range(0, 30, 10):
+            await store.append_messages(_record_slice("conv-log", start, 10))
+        
+        newest = await store.load_messages("conv-log", limit=5)
+        older = await store.load_messages("conv-log", before_seq=newest[0]["seq"], limit=5)
+        
+        assert [m["seq"] for m in newest] == [25, 26, 27, 28, 29]
+        assert [m["seq"] for m in older] == [20, 21, 22, 23, 24]
+    
+    @pytest.mark.asyncio
+    async def test_append_does_not_rewrite(self, store):
+        """Test an append writes the new rows only and retries are ignored."""
+        await store.append_messages(_record_slice("conv-log", 0, 10))
+        committed = store.writes_committed
+        
+        await store.append_messages(_record_slice("conv-log", 10, 2))
+        await store.append_messages(_record_slice("conv-log", 10, 2))
+        
+        assert store.writes_committed - committed == 6  # 2 x (header + 2 rows)
+        assert len(await store.load_messages("conv-log", limit=100)) == 12
+    
+    @pytest.mark.asyncio
+    async def test_load_and_delete_include_log(self, store):
+        """Test whole-conversation load includes the log and delete removes it."""
+        await store.append_messages(_record_slice("conv-log", 0, 3))
+        
+        loaded = await store.load_conversation("conv-log")
+        assert [m["seq"] for m in loaded.messages] == [0, 1, 2]
+        
+        assert await store.delete_conversation("conv-log")
+        assert await store.load_messages("conv-log") == []
+
+
+class TestSchemaMigration:
+    """Tests for upgrading older databases."""
+    
+    @pytest.mark.asyncio
+    async def test_v1_messages_seed_log(self, tmp_path):
+        """Test v1 conversation JSON becomes the log, once, with seqs in order."""
+        db_path = tmp_path / "state.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            CREATE TABLE conversations (
+                id TEXT PRIMARY KEY, created_at TEXT NOT NULL, updated_at TEXT NOT NULL,
+                messages TEXT NOT NULL, metadata TEXT DEFAULT '{}'
+            );
+            CREATE TABLE schema_info (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            INSERT INTO schema_info VALUES ('version', '1');
+        """)
+        now = datetime.now(timezone.utc).isoformat()
+        history = [{"role": "user", "content": f"m{i}", "timestamp": now} for i in range(3)]
+        conn.execute(
+            "INSERT INTO conversations VALUES (?, ?, ?, ?, '{}')",
+            ("old", now, now, json.dumps(history)),
+        )
+        conn.commit()
+        conn.close()
+        
+        for _ in range(2):  # reopening does not migrate again
+            store = StateStore(db_path=db_path)
+            entries = await store.load_messages("old")
+            loaded = await store.load_conversation("old")
+            await store.close()
+            
+            assert [(m["seq"], m["content"]) for m in entries] == [
+                (0, "m0"), (1, "m1"), (2, "m2")
+            ]
+            assert len(loaded.messages) == 3
+            assert Conversation.from_log("old", entries).next_seq == 3
+
+
+def _record_slice(conv_id: str, start: int, count: int) -> ConversationRecord:
+    record = _record(conv_id)
+    record.messages = [
+        {"seq": i, "role": "user", "content": f"m{i}",
+         "timestamp": datetime.now(timezone.utc).isoformat()}
+        for i in range(start, start + count)
+    ]
+    return record
+
+
 class TestIntentResolver:
     """Tests for the LLM-driven intent resolver."""
     
@@ -0,0 +1,137 @@
+"""
+Tests for Quote Cache
+=====================
+
+Tests for quote reuse and coalescing in KiteAdapter.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from mercury.core.exceptions import SymbolNotFoundError
+from mercury.kite.adapter import KiteAdapter, MockKite
+from mercury.kite.quote_cache import QuoteCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _adapter(cache: QuoteCache) -> KiteAdapter:
+    adapter = KiteAdapter(api_key="test", use_oauth_manager=False, quote_cache=cache)
+    adapter._kite = MagicMock(wraps=MockKite())
+    return adapter
+
+
+class TestQuoteCache:
+    """Tests for QuoteCache."""
+
+    @pytest.mark.asyncio
+    async def test_overlapping_requests_share_one_fetch(self):
+        """Test concurrent misses for overlapping keys become one batched fetch."""
+        cache = QuoteCache()
+        calls = []
+
+        async def fetch(keys):
+            calls.append(sorted(keys))
+            await asyncio.sleep(0.01)
+            return {k: k.lower() for k in keys}
+
+        first, second = await asyncio.gather(
+            cache.get_many(["NSE:INFY", "NSE:TCS"], fetch),
+            cache.get_many(["NSE:TCS", "NSE:WIPRO"], fetch),
+        )
+
+        assert calls == [["NSE:INFY", "NSE:TCS", "NSE:WIPRO"]]
+        assert first.results == {"NSE:INFY": "nse:infy", "NSE:TCS": "nse:tcs"}
+        assert second.results == {"NSE:TCS": "nse:tcs", "NSE:WIPRO": "nse:wipro"}
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        """Test entries are reused within the TTL and refetched after."""
+        clock = FakeClock()
+        cache = QuoteCache(ttl=1.0, clock=clock)
+        calls = []
+
+        async def fetch(keys):
+            calls.append(keys)
+            return {k: k for k in keys}
+
+        await cache.get_many(["NSE:INFY"], fetch)
+        clock.now = 0.5
+        await cache.get_many(["NSE:INFY"], fetch)
+        clock.now = 2.0
+        await cache.get_many(["NSE:INFY"], fetch)
+
+        assert len(calls) == 2
+
+
+class TestAdapterQuotes:
+    """Tests for cached quotes in KiteAdapter."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_bundles_share_quote_call(self):
+        """Test two users asking at once cause a single kite.quote call."""
+        adapter = _adapter(QuoteCache())
+
+        first, second = await asyncio.gather(
+            adapter.get_data_bundle(["NIFTY 50", "RELIANCE"], False, False),
+            adapter.get_data_bundle(["RELIANCE", "BSE:INFY"], False, False),
+        )
+
+        assert adapter._kite.quote.call_count == 1
+        assert sorted(adapter._kite.quote.call_args.args[0]) == [
+            "BSE:INFY", "NSE:NIFTY 50", "NSE:RELIANCE",
+        ]
+        assert set(second.quotes) == {"RELIANCE", "BSE:INFY"}
+        assert first.quotes["RELIANCE"] is second.quotes["RELIANCE"]
+
+    @pytest.mark.asyncio
+    async def test_get_quote_served_from_cache(self):
+        """Test a repeat get_quote within the TTL makes no Kite call."""
+        adapter = _adapter(QuoteCache(ttl=5.0))
+
+        first = await adapter.get_quote("INFY")
+        second = await adapter.get_quote("INFY")
+
+        assert adapter._kite.quote.call_count == 1
+        assert second is first
+        assert second.exchange == "NSE"
+
+    @pytest.mark.asyncio
+    async def test_max_age_forces_refresh(self):
+        """Test a caller can insist on a fresher quote."""
+        adapter = _adapter(QuoteCache(ttl=5.0))
+
+        await adapter.get_quote("INFY")
+        await adapter.get_quote("INFY", max_age=0)
+
+        assert adapter._kite.quote.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_symbol(self):
+        """Test a symbol Kite does not return raises SymbolNotFoundError."""
+        adapter = _adapter(QuoteCache())
+        adapter._kite.quote = MagicMock(return_value={})
+
+        with pytest.raises(SymbolNotFoundError):
+            await adapter.get_quote("NOPE")
+
+    @pytest.mark.asyncio
+    async def test_context_reports_quote_age(self):
+        """Test the AI context carries each quote's fetch time and age."""
+        adapter = _adapter(QuoteCache())
+
+        bundle = await adapter.get_data_bundle(["INFY"], False, False)
+        quote = bundle.to_context_dict()["quotes"]["INFY"]
+
+        assert quote["as_of"] == bundle.quotes["INFY"].timestamp.isoformat()
+        assert 0 <= quote["age_seconds"] < 1
@@ -13,6 +13,7 @@ from datetime import datetime, timezone
 from mercury.core.rate_limiter import (
     TokenBucketRateLimiter,
     SlidingWindowRateLimiter,
+    EndpointRateLimiter,
     RateLimitExceeded,
     get_kite_limiter,
     get_anthropic_limiter,
@@ -142,6 +143,119 @@ class TestTokenBucketRateLimiter:
         assert limiter.available_tokens == 5.0
 
 
+class TestFifoTokenBucket:
+    """Tests for TokenBucketRateLimiter in FIFO reservation mode."""
+    
+    @pytest.mark.asyncio
+    async def test_departures_in_arrival_order_at_rate(self):
+        """Test waiters leave in arrival order, each on its reserved slot."""
+        limiter = TokenBucketRateLimiter(rate=20.0, burst=1, fifo=True)
+        departures = []
+        
+        async def waiter(i):
+            await limiter.acquire()
+            departures.append((i, time.monotonic()))
+        
+        start = time.monotonic()
+        await asyncio.gather(*(waiter(i) for i in range(6)))
+        
+        assert [i for i, _ in departures] == list(range(6))
+        for i, departed in departures:
+            assert departed - start == pytest.approx(i / 20.0, abs=0.03)
+    
+    @pytest.mark.asyncio
+    async def test_lock_not_held_while_sleeping(self):
+        """Test a new caller reserves its slot while earlier ones sleep."""
+        limiter = TokenBucketRateLimiter(rate=10.0, burst=1, fifo=True)
+        await limiter.acquire()
+        
+        first = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        
+        assert not limiter._lock.locked()
+        assert await limiter.acquire() == pytest.approx(0.2, abs=0.02)
+        assert await first == pytest.approx(0.1, abs=0.02)
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_returns_slot(self):
+        """Test cancelling a waiter gives its tokens back."""
+        limiter = TokenBucketRateLimiter(rate=1.0, burst=1, fifo=True)
+        await limiter.acquire()
+        
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        
+        assert await limiter.acquire() < 1.0
+    
+    @pytest.mark.asyncio
+    async def test_max_wait_and_non_blocking(self):
+        """Test over-long reservations and non-blocking callers are refused."""
+        limiter = TokenBucketRateLimiter(rate=1.0, burst=1, max_wait=0.5, fifo=True)
+        await limiter.acquire()
+        
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire()
+        
+        limiter.blocking = False
+        with pytest.raises(RateLimitExceeded) as exc:
+            await limiter.acquire()
+        assert exc.value.retry_after == pytest.approx(1.0, abs=0.05)
+        assert limiter.stats.total_rejected == 2
+    
+    @pytest.mark.asyncio
+    async def test_try_acquire_never_jumps_queue(self):
+        """Test try_acquire succeeds only when nobody is waiting."""
+        limiter = TokenBucketRateLimiter(rate=10.0, burst=2, fifo=True)
+        
+        assert limiter.try_acquire()
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        
+        assert not limiter.try_acquire()
+        await waiter
+        assert limiter.stats.total_requests == 3
+    
+    def test_try_acquire_legacy_mode(self):
+        """Test try_acquire on a bucket in the default mode."""
+        limiter = TokenBucketRateLimiter(rate=1.0, burst=1)
+        
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+
+
+class TestEndpointRateLimiter:
+    """Tests for EndpointRateLimiter."""
+    
+    @pytest.mark.asyncio
+    async def test_endpoints_have_separate_buckets(self):
+        """Test draining one endpoint leaves the others untouched."""
+        limiters = EndpointRateLimiter(
+            {"quote": (1.0, 1), "historical": (3.0, 3)},
+            default=TokenBucketRateLimiter(rate=1.0, burst=2),
+            fifo=True,
+        )
+        
+        await limiters.acquire("quote")
+        
+        assert not limiters.try_acquire("quote")
+        assert limiters.try_acquire("historical")
+        assert limiters.try_acquire("positions")
+        assert limiters.get("positions") is limiters.default
+        assert limiters.get("historical").fifo
+    
+    def test_kite_endpoint_limits(self):
+        """Test Kite's quote and historical buckets use their own limits."""
+        assert get_kite_limiter("quote").rate == 1.0
+        assert get_kite_limiter("historical").rate == 3.0
+        assert get_kite_limiter("orders").burst == 10
+        assert get_kite_limiter("positions") is get_kite_limiter()
+        assert "historical" in get_all_limiter_status()["kite_endpoints"]
+
+
 class TestSlidingWindowRateLimiter:
     """Tests for SlidingWindowRateLimiter."""
     
@@ -218,6 +332,198 @@ class TestSlidingWindowRateLimiter:
         assert "available_capacity" in status
 
 
+class TestWeightedSlidingWindow:
+    """Tests for deque-backed, token-weighted sliding windows."""
+    
+    @pytest.mark.asyncio
+    async def test_weights_count_against_limit(self):
+        """Test a window limits total weight, not just request count."""
+        limiter = SlidingWindowRateLimiter(limit=1000, window_seconds=60, blocking=False)
+        
+        await limiter.acquire(600)
+        await limiter.acquire(400)
+        
+        assert limiter.current_count == 1000
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire(1)
+    
+    @pytest.mark.asyncio
+    async def test_waits_only_until_enough_weight_expires(self):
+        """Test a waiter sleeps until exactly the entries it needs have expired."""
+        limiter = SlidingWindowRateLimiter(limit=100, window_seconds=0.3)
+        await limiter.acquire(50)
+        await asyncio.sleep(0.1)
+        await limiter.acquire(50)
+        
+        waited = await limiter.acquire(40)
+        
+        assert waited == pytest.approx(0.2, abs=0.03)
+        assert limiter.current_count == 90
+    
+    @pytest.mark.asyncio
+    async def test_oversized_weight_rejected(self):
+        """Test a weight that can never fit is refused instead of waiting forever."""
+        limiter = SlidingWindowRateLimiter(limit=100, window_seconds=60)
+        
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire(101)
+    
+    @pytest.mark.asyncio
+    async def test_projected_wait_counts_queue(self):
+        """Test projected wait includes callers already queued."""
+        limiter = SlidingWindowRateLimiter(limit=2, window_seconds=0.5)
+        await limiter.acquire()
+        await limiter.acquire()
+        
+        assert limiter.projected_wait() == pytest.approx(0.5, abs=0.05)
+        
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        
+        assert limiter.projected_wait() == pytest.approx(0.5, abs=0.05)
+        assert limiter.projected_wait(2) > 0.5
+        await queued
+    
+    def test_record_after_the_fact(self):
+        """Test usage recorded afterwards can push the window over its limit."""
+        limiter = SlidingWindowRateLimiter(limit=100, window_seconds=60)
+        
+        limiter.record(150)
+        
+        assert limiter.current_count == 150
+        assert limiter.available_capacity == 0
+        assert limiter.projected_wait(0) > 0
+    
+    def test_expired_entries_evicted(self):
+        """Test entries leave the window and the running total."""
+        limiter = SlidingWindowRateLimiter(limit=10, window_seconds=0.05)
+        limiter.record(5)
+        limiter.record(3)
+        
+        time.sleep(0.06)
+        
+        assert limiter.current_count == 0
+        assert len(limiter._entries) == 0
+    
+    @pytest.mark.asyncio
+    async def test_try_acquire_never_waits(self):
+        """Test try_acquire takes free capacity and refuses otherwise."""
+        limiter = SlidingWindowRateLimiter(limit=100, window_seconds=0.3)
+        
+        assert limiter.try_acquire(60) is True
+        assert limiter.try_acquire(60) is False
+        assert limiter.current_count == 60
+        
+        await limiter.acquire(40)
+        queued = asyncio.create_task(limiter.acquire(10))
+        await asyncio.sleep(0)
+        
+        assert limiter.try_acquire(0) is False  # never ahead of a waiter
+        await queued
+    
+    def test_can_acquire_takes_nothing(self):
+        """Test can_acquire reports free capacity without using it."""
+        limiter = SlidingWindowRateLimiter(limit=100, window_seconds=60)
+        
+        assert limiter.can_acquire(100) is True
+        assert limiter.current_count == 0
+        limiter.record(60)
+        assert limiter.can_acquire(60) is False
+
+
+class TestAnthropicLoadShedding:
+    """Tests for AIEngine shedding load on a long projected wait."""
+    
+    @pytest.mark.asyncio
+    async def test_busy_window_refuses_instead_of_queueing(self):
+        """Test generate fails fast when the queue wait exceeds the maximum."""
+        from mercury.ai.engine import AIEngine, MockAnthropicClient
+        from mercury.core.exceptions import AIEngineError
+        
+        engine = AIEngine()
+        engine._client = MockAnthropicClient()
+        engine._rate_limiter = SlidingWindowRateLimiter(limit=1, window_seconds=60)
+        engine._rate_limiter.record(1)
+        engine.max_queue_seconds = 5.0
+        
+        start = time.monotonic()
+        with pytest.raises(AIEngineError, match="busy"):
+            await engine.generate("How is INFY?", market_data={})
+        
+        assert time.monotonic() - start < 0.5
+    
+    @pytest.mark.asyncio
+    async def test_token_windows_charged(self):
+        """Test input tokens are acquired up front and output tokens recorded."""
+        from mercury.ai.engine import AIEngine, MockAnthropicClient
+        
+        engine = AIEngine()
+        engine._client = MockAnthropicClient()
+        engine._rate_limiter = SlidingWindowRateLimiter(limit=10, window_seconds=60)
+        engine._input_limiter = SlidingWindowRateLimiter(limit=100_000, window_seconds=60)
+        engine._output_limiter = SlidingWindowRateLimiter(limit=100_000, window_seconds=60)
+        
+        await engine.generate("How is INFY?", market_data={})
+        
+        assert engine._input_limiter.current_count > 0
+        assert engine._output_limiter.stats.total_requests == 1
+    
+    @pytest.mark.asyncio
+    async def test_hedge_loser_cancelled(self):
+        """Test the slower of two hedged attempts is cancelled, not left running."""
+        from mercury.ai.engine import AIEngine, MockResponse
+        from mercury.core.resilience import HedgeConfig, Hedger
+        
+        calls, cancelled = [], []
+        
+        class SlowFirstMessages:
+            async def create(self, **kwargs):
+                calls.append(kwargs)
+                attempt = len(calls)
+                try:
+                    await asyncio.sleep(1.0 if attempt == 1 else 0.01)
+                except asyncio.CancelledError:
+                    cancelled.append(attempt)
+                    raise
+                return MockResponse("ok")
+        
+        engine = AIEngine()
+        engine._client = type("Client", (), {"messages": SlowFirstMessages()})()
+        engine._rate_limiter = SlidingWindowRateLimiter(limit=10, window_seconds=60)
+        engine._input_limiter = engine._output_limiter = None
+        engine._hedger = Hedger(
+            "test.generate", HedgeConfig(min_hedge_delay_seconds=0.0, refresh_seconds=0.0)
+        )
+        for _ in range(20):
+            engine._hedger.observe(0.02)
+        
+        assert await engine.generate("How is INFY?", market_data={}) == "ok"
+        await asyncio.sleep(0)
+        
+        assert len(calls) == 2
+        assert cancelled == [1]
+        assert engine._rate_limiter.current_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_refused_hedge_takes_no_capacity(self):
+        """Test a hedge refused by the token window leaves the request window alone."""
+        from mercury.ai.engine import AIEngine
+        
+        engine = AIEngine()
+        engine._rate_limiter = SlidingWindowRateLimiter(limit=10, window_seconds=60)
+        engine._input_limiter = SlidingWindowRateLimiter(limit=100_000, window_seconds=60)
+        engine._output_limiter = None
+        
+        await engine._input_limiter._lock.acquire()  # a caller mid-acquire
+        assert engine._reserve_hedge(500) is False
+        assert engine._rate_limiter.current_count == 0
+        
+        engine._input_limiter._lock.release()
+        assert engine._reserve_hedge(500) is True
+        assert engine._rate_limiter.current_count == 1
+        assert engine._input_limiter.current_count == 500
+
+
 class TestPreConfiguredLimiters:
     """Tests for pre-configured rate limiters."""
     
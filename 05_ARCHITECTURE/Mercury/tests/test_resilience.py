@@ -6,7 +6,10 @@ Tests for circuit breakers, retries, and graceful degradation.
 """
 
 import asyncio
+import time
+
 import pytest
+from mercury.core.metrics import Histogram
 from mercury.core.resilience import (
     CircuitBreaker,
     CircuitBreakerConfig,
@@ -17,6 +20,11 @@ from mercury.core.resilience import (
     GracefulDegradation,
     DegradationLevel,
     get_circuit_breaker,
+    get_kite_circuit,
+    RollingWindow,
+    HedgeConfig,
+    Hedger,
+    latency_quantile,
 )
 
 
@@ -111,6 +119,213 @@ class TestCircuitBreaker:
         assert breaker.stats.failure_count == 1
 
 
+class TestHalfOpenTrials:
+    """Tests for half-open trial slots that never record a result."""
+    
+    def _half_open(self, **config) -> CircuitBreaker:
+        breaker = CircuitBreaker("test", CircuitBreakerConfig(
+            failure_threshold=1, timeout_seconds=0.0, **config
+        ))
+        breaker.record_failure()
+        assert breaker.allow_request() is True  # OPEN -> HALF_OPEN trial
+        assert breaker.state == CircuitState.HALF_OPEN
+        return breaker
+    
+    def test_release_frees_trial_slot(self):
+        """A released trial lets the next caller probe the service."""
+        breaker = self._half_open()
+        assert breaker.allow_request() is False
+        
+        breaker.release()
+        
+        assert breaker.allow_request() is True
+    
+    def test_abandoned_trial_times_out(self):
+        """An unanswered trial stops blocking after half_open_timeout_seconds."""
+        breaker = self._half_open(half_open_timeout_seconds=0.05)
+        assert breaker.allow_request() is False
+        
+        time.sleep(0.06)
+        
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+    
+    def test_answered_trials_close_without_waiting(self):
+        """Each recorded trial frees its slot, so recovery needs no clock advance."""
+        breaker = self._half_open(success_threshold=2)
+        breaker.record_success()
+        
+        assert breaker.allow_request() is True
+        breaker.record_success()
+        
+        assert breaker.state == CircuitState.CLOSED
+    
+    def test_failed_trial_frees_slot(self):
+        """A failed trial reopens the breaker without holding its slot."""
+        breaker = self._half_open()
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitState.OPEN
+        assert breaker._half_open_calls == 0
+
+
+class TestCircuitBreakerListeners:
+    """Tests for circuit transition listeners."""
+    
+    def test_listener_sees_transitions(self):
+        """Listeners receive each state change once."""
+        breaker = CircuitBreaker("test", CircuitBreakerConfig(failure_threshold=2))
+        seen = []
+        breaker.add_listener(lambda b, old, new: seen.append((old, new)))
+        
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.reset()
+        
+        assert seen == [
+            (CircuitState.CLOSED, CircuitState.OPEN),
+            (CircuitState.OPEN, CircuitState.CLOSED),
+        ]
+    
+    def test_failing_listener_isolated(self):
+        """A listener error does not break the breaker."""
+        breaker = CircuitBreaker("test", CircuitBreakerConfig(failure_threshold=1))
+        breaker.add_listener(lambda b, old, new: 1 / 0)
+        
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitState.OPEN
+
+
+class TestRollingWindow:
+    """Tests for the time-bucketed rolling window."""
+    
+    def test_counts_within_window(self):
+        """Should sum outcomes recorded inside the window."""
+        now = [100.0]
+        window = RollingWindow(window_seconds=10, buckets=5, clock=lambda: now[0])
+        
+        window.record(False, 0.1)
+        window.record(True, 0.3, slow=True)
+        now[0] += 4
+        window.record(False)
+        
+        stats = window.snapshot()
+        assert (stats.calls, stats.failures, stats.slow_calls, stats.timed_calls) == (3, 1, 1, 2)
+        assert stats.failure_rate == pytest.approx(100 / 3)
+        assert stats.mean_duration == pytest.approx(0.2)
+    
+    def test_old_buckets_expire(self):
+        """Should drop buckets older than the window, including reused slots."""
+        now = [100.0]
+        window = RollingWindow(window_seconds=10, buckets=5, clock=lambda: now[0])
+        window.record(True)
+        now[0] += 6
+        window.record(False)
+        
+        now[0] += 5  # first call now outside the window
+        assert window.snapshot().calls == 1
+        
+        now[0] += 10  # a full window later the slot is reused
+        window.record(False)
+        assert window.snapshot().calls == 1
+        assert window.snapshot().failures == 0
+
+
+class TestRollingCircuitBreaker:
+    """Tests for failure-rate and slow-call tripping."""
+    
+    def _breaker(self, **config) -> CircuitBreaker:
+        return CircuitBreaker("test", CircuitBreakerConfig(**config))
+    
+    def test_opens_on_failure_rate(self):
+        """Should open when the window failure rate crosses the threshold."""
+        breaker = self._breaker(rolling=True, minimum_calls=4, failure_rate_threshold=50.0)
+        
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED  # below minimum_calls
+        
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+    
+    def test_ignores_consecutive_threshold(self):
+        """Interleaved failures below the rate should not open it."""
+        breaker = self._breaker(rolling=True, minimum_calls=4, failure_threshold=2)
+        
+        for _ in range(10):
+            breaker.record_success()
+            breaker.record_success()
+            breaker.record_failure()
+        
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_health()["window"]["failure_rate"] == pytest.approx(33.33)
+    
+    def test_opens_on_slow_calls(self):
+        """Should open when too many successful calls were slow."""
+        breaker = self._breaker(minimum_calls=4, slow_call_seconds=1.0)
+        
+        for duration in (0.1, 2.0, 0.1):
+            breaker.record_success(duration)
+        assert breaker.state == CircuitState.CLOSED
+        
+        breaker.record_success(1.5)
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.stats.total_slow_calls == 2
+        assert breaker.allow_request() is False
+    
+    def test_slow_trial_call_reopens(self):
+        """A slow call while half-open should reopen the circuit."""
+        breaker = self._breaker(slow_call_seconds=1.0, timeout_seconds=0.0)
+        breaker.record_failure()
+        breaker._transition_to_open()
+        
+        assert breaker.allow_request() is True
+        assert breaker.state == CircuitState.HALF_OPEN
+        breaker.record_success(3.0)
+        
+        assert breaker.state == CircuitState.OPEN
+    
+    def test_window_cleared_on_close(self):
+        """Recovering should start the window afresh."""
+        breaker = self._breaker(rolling=True, minimum_calls=2, success_threshold=1)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        
+        breaker._transition_to_half_open()
+        breaker.record_success()
+        
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_health()["window"]["calls"] == 0
+    
+    def test_protect_records_duration(self):
+        """Should time protected calls into the window."""
+        breaker = self._breaker(slow_call_seconds=10.0)
+        
+        @breaker.protect
+        def my_func():
+            return "ok"
+        
+        my_func()
+        window = breaker.get_health()["window"]
+        assert window["calls"] == 1
+        assert window["slow_calls"] == 0
+        assert window["mean_duration_ms"] is not None
+    
+    def test_kite_endpoint_circuits(self):
+        """Should keep one rolling breaker per Kite endpoint."""
+        quote = get_kite_circuit("quote")
+        historical = get_kite_circuit("historical")
+        
+        assert quote is get_kite_circuit("quote")
+        assert quote.name == "kite_api.quote"
+        assert quote.config.rolling is True
+        assert historical.config.slow_call_seconds > quote.config.slow_call_seconds
+
+
 class TestCircuitBreakerAsync:
     """Async tests for CircuitBreaker."""
     
@@ -215,6 +430,184 @@ class TestRetryAsync:
         assert len(retries) == 2
 
 
+class TestHedger:
+    """Tests for hedged calls and adaptive timeouts."""
+    
+    def _hedger(self, samples=20, latency=0.02, **config) -> Hedger:
+        config.setdefault("min_hedge_delay_seconds", 0.0)
+        hedger = Hedger(
+            "test", HedgeConfig(**config), histogram=Histogram("test_call_seconds")
+        )
+        for _ in range(samples):
+            hedger.observe(latency)
+        return hedger
+    
+    def _calls(self, *delays):
+        """Attempt factory: the nth attempt sleeps delays[n] and returns n."""
+        attempts = []
+        
+        async def attempt():
+            n = len(attempts)
+            attempts.append(n)
+            await asyncio.sleep(delays[n])
+            return n
+        return attempts, attempt
+    
+    @pytest.mark.asyncio
+    async def test_slow_call_hedged(self):
+        """Should send a second attempt past the observed p95 and use the faster."""
+        hedger = self._hedger()
+        attempts, attempt = self._calls(0.5, 0.01)
+        
+        started = time.perf_counter()
+        result = await hedger.call(attempt, idempotent=True)
+        
+        assert result == 1
+        assert time.perf_counter() - started < 0.2
+        assert hedger.stats.hedges_sent == 1
+        assert hedger.stats.hedges_won == 1
+    
+    @pytest.mark.asyncio
+    async def test_fast_call_not_hedged(self):
+        """Should not hedge a call that finishes before the hedge delay."""
+        hedger = self._hedger(latency=0.2)
+        attempts, attempt = self._calls(0.01)
+        
+        assert await hedger.call(attempt, idempotent=True) == 0
+        assert attempts == [0]
+    
+    @pytest.mark.asyncio
+    async def test_non_idempotent_never_hedged(self):
+        """Should only hedge calls marked idempotent."""
+        hedger = self._hedger()
+        attempts, attempt = self._calls(0.1)
+        
+        assert await hedger.call(attempt) == 0
+        assert attempts == [0]
+    
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_samples(self):
+        """Should not hedge or adapt the timeout before min_samples."""
+        hedger = self._hedger(samples=5)
+        attempts, attempt = self._calls(0.1)
+        
+        await hedger.call(attempt, idempotent=True)
+        
+        assert attempts == [0]
+        assert hedger.hedge_delay is None
+        assert hedger.timeout == HedgeConfig().max_timeout_seconds
+    
+    @pytest.mark.asyncio
+    async def test_refused_when_circuit_not_closed(self):
+        """Should not hedge while a circuit is open or half-open."""
+        circuit = CircuitBreaker("test", CircuitBreakerConfig(failure_threshold=1))
+        circuit.record_failure()
+        hedger = self._hedger()
+        hedger.circuits = (circuit,)
+        attempts, attempt = self._calls(0.1)
+        
+        await hedger.call(attempt, idempotent=True)
+        
+        assert attempts == [0]
+        assert hedger.stats.hedges_refused == 1
+    
+    @pytest.mark.asyncio
+    async def test_refused_without_capacity(self):
+        """Should not hedge when reserve() cannot claim capacity."""
+        hedger = self._hedger()
+        attempts, attempt = self._calls(0.1)
+        
+        await hedger.call(attempt, idempotent=True, reserve=lambda: False)
+        
+        assert attempts == [0]
+        assert hedger.stats.hedges_refused == 1
+    
+    @pytest.mark.asyncio
+    async def test_budget_bounds_extra_load(self):
+        """Should hedge at most budget_burst calls plus budget_ratio per call."""
+        hedger = self._hedger(budget_ratio=0.1, budget_burst=2.0)
+        
+        for _ in range(5):
+            attempts, attempt = self._calls(0.06, 0.06)
+            await hedger.call(attempt, idempotent=True)
+        
+        assert hedger.stats.hedges_sent == 2
+        assert hedger.stats.hedges_refused == 3
+    
+    @pytest.mark.asyncio
+    async def test_adaptive_timeout(self):
+        """Should time out at multiplier x the observed p99."""
+        hedger = self._hedger(latency=0.02, timeout_multiplier=3.0, min_timeout_seconds=0.0)
+        attempts, attempt = self._calls(1.0, 1.0)
+        
+        assert hedger.timeout == pytest.approx(0.06, rel=0.05)
+        with pytest.raises(TimeoutError):
+            await hedger.call(attempt, idempotent=True)
+        assert hedger.stats.timeouts == 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_attempt_falls_back_to_other(self):
+        """Should return the hedge's result if the primary fails after it is sent."""
+        hedger = self._hedger()
+        calls = []
+        
+        async def attempt():
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(0.1)
+                raise ValueError("primary failed")
+            await asyncio.sleep(0.2)
+            return "hedge"
+        
+        assert await hedger.call(attempt, idempotent=True) == "hedge"
+    
+    @pytest.mark.asyncio
+    async def test_timeouts_recorded_as_censored(self):
+        """Should count attempts cut off by the timeout and raise the estimates."""
+        hedger = self._hedger(
+            latency=0.01, timeout_multiplier=1.0, min_timeout_seconds=0.0,
+            refresh_seconds=0.0, budget_burst=0.0,
+        )
+        attempts, attempt = self._calls(*[1.0] * 5)
+        
+        for _ in range(5):
+            with pytest.raises(TimeoutError):
+                await hedger.call(attempt)
+        await asyncio.sleep(0)
+        
+        assert hedger.get_status()["censored_samples"] == 5
+        assert hedger.timeout > 0.01
+    
+    def test_window_forgets_old_latency(self):
+        """Should estimate from the last window_samples attempts only."""
+        hedger = self._hedger(samples=20, latency=1.0, window_samples=20, refresh_seconds=0.0)
+        assert hedger.hedge_delay == pytest.approx(1.0)
+        
+        for _ in range(20):
+            hedger.observe(0.05)
+        
+        assert hedger.hedge_delay == pytest.approx(0.05)
+    
+    def test_censored_samples_are_lower_bounds(self):
+        """Early cancellations should not pull quantiles below real completions."""
+        samples = [(0.001, True)] * 50 + [(0.1, False)] * 50
+        
+        assert latency_quantile(samples, 0.5) == 0.1
+        assert latency_quantile([(0.1, False), (2.0, True)], 0.99) == 2.0
+        assert latency_quantile([], 0.5) is None
+    
+    @pytest.mark.asyncio
+    async def test_all_attempts_fail(self):
+        """Should raise the error when every attempt fails."""
+        hedger = self._hedger()
+        
+        async def attempt():
+            raise ValueError("down")
+        
+        with pytest.raises(ValueError):
+            await hedger.call(attempt, idempotent=True)
+
+
 class TestGracefulDegradation:
     """Tests for GracefulDegradation class."""
     
@@ -130,6 +130,7 @@ class TestSaveStateOnShutdown:
         with patch("mercury.core.shutdown.get_state_store") as mock_get_store:
             mock_store = MagicMock()
             mock_store.set_setting = AsyncMock()
+            mock_store.flush_dirty = AsyncMock(return_value=0)
             mock_get_store.return_value = mock_store
             
             await save_state_on_shutdown()
@@ -139,6 +140,7 @@ class TestSaveStateOnShutdown:
             assert call_args[0][0] == "last_shutdown"
             assert "timestamp" in call_args[0][1]
             assert call_args[0][1]["graceful"] is True
+            mock_store.flush_dirty.assert_awaited_once()
 
 
 class TestGetShutdownHandler:
@@ -0,0 +1,154 @@
+"""Split conversation messages into their own table
+
+Revision ID: 7b3e9c41a2f5
+Revises: d06c96f6b20c
+Create Date: 2026-10-19 09:00:00.000000+00:00
+
+CIA-SIE Database Migration
+==========================
+
+Adds conversation_messages: one row per chat message with a per-conversation
+sequence number and token count. Chat turns append two rows instead of
+rewriting the conversations.messages JSON list, and prompt assembly reads
+only the most recent messages that fit the history token budget.
+
+Existing conversations are split into rows and their JSON list is cleared.
+Downgrade folds the rows back into the JSON column.
+
+NOTE: Raw SQL with IF NOT EXISTS is used for idempotency, matching d06c96f6b20c.
+
+GOVERNED BY: Section 14 (AI Narrative Engine)
+"""
+import json
+import math
+from datetime import datetime, timezone
+from typing import Sequence, Union
+from uuid import uuid4
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9c41a2f5'
+down_revision: Union[str, None] = 'd06c96f6b20c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHARS_PER_TOKEN = 4
+
+
+def _load_messages(raw) -> list:
+    """Decode a conversations.messages value (JSON text or already decoded)."""
+    if not raw:
+        return []
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return []
+    return raw if isinstance(raw, list) else []
+
+
+def _timestamp(value, fallback):
+    """Normalize an ISO message timestamp to naive UTC for the DATETIME column."""
+    if not value:
+        return fallback
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return fallback
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def upgrade() -> None:
+    """Apply migration changes."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS conversation_messages (
+            message_id VARCHAR(36) NOT NULL PRIMARY KEY,
+            conversation_id VARCHAR(36) NOT NULL REFERENCES conversations(conversation_id),
+            sequence INTEGER NOT NULL,
+            role VARCHAR(20) NOT NULL,
+            content TEXT NOT NULL,
+            token_count INTEGER NOT NULL DEFAULT 0,
+            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT uq_conversation_message_sequence UNIQUE (conversation_id, sequence)
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_conversation_messages_sequence "
+        "ON conversation_messages(conversation_id, sequence)"
+    )
+
+    # Split existing JSON message lists into rows
+    bind = op.get_bind()
+    conversations = bind.execute(
+        sa.text("SELECT conversation_id, messages, created_at FROM conversations")
+    ).fetchall()
+
+    insert = sa.text("""
+        INSERT INTO conversation_messages
+            (message_id, conversation_id, sequence, role, content, token_count, created_at)
+        VALUES
+            (:message_id, :conversation_id, :sequence, :role, :content, :token_count, :created_at)
+    """)
+    for conversation_id, raw_messages, created_at in conversations:
+        messages = _load_messages(raw_messages)
+        if not messages:
+            continue
+
+        already = bind.execute(
+            sa.text("SELECT COUNT(*) FROM conversation_messages WHERE conversation_id = :cid"),
+            {"cid": conversation_id},
+        ).scalar()
+        if already:
+            continue
+
+        bind.execute(
+            insert,
+            [
+                {
+                    "message_id": str(uuid4()),
+                    "conversation_id": conversation_id,
+                    "sequence": sequence,
+                    "role": m.get("role", "user"),
+                    "content": m.get("content", ""),
+                    "token_count": math.ceil(len(m.get("content", "")) / CHARS_PER_TOKEN),
+                    "created_at": _timestamp(m.get("timestamp"), created_at),
+                }
+                for sequence, m in enumerate(messages)
+            ],
+        )
+        bind.execute(
+            sa.text("UPDATE conversations SET messages = '[]' WHERE conversation_id = :cid"),
+            {"cid": conversation_id},
+        )
+
+
+def downgrade() -> None:
+    """Revert migration changes."""
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text("""
+            SELECT conversation_id, role, content, created_at
+            FROM conversation_messages
+            ORDER BY conversation_id, sequence
+        """)
+    ).fetchall()
+
+    folded: dict[str, list] = {}
+    for conversation_id, role, content, created_at in rows:
+        folded.setdefault(conversation_id, []).append(
+            {"role": role, "content": content, "timestamp": str(created_at)}
+        )
+
+    for conversation_id, messages in folded.items():
+        bind.execute(
+            sa.text("UPDATE conversations SET messages = :messages WHERE conversation_id = :cid"),
+            {"messages": json.dumps(messages), "cid": conversation_id},
+        )
+
+    op.drop_index('idx_conversation_messages_sequence', table_name='conversation_messages')
+    op.drop_table('conversation_messages')
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark Anthropic connection reuse against a local fake Messages API.
+
+Starts a minimal HTTP/1.1 server that answers POST /v1/messages with a canned
+response and counts TCP connections. Runs the same number of requests with a
+fresh AsyncAnthropic per request (the old per-request behaviour) and with the
+pooled AnthropicClientManager, then prints connections opened and wall time.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_anthropic_pool.py [--requests 200] [--latency-ms 5]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from anthropic import AsyncAnthropic
+
+from cia_sie.ai.client_manager import AnthropicClientManager
+
+RESPONSE_BODY = json.dumps({
+    "id": "msg_bench",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-3-haiku-20240307",
+    "content": [{"type": "text", "text": "OK"}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 10, "output_tokens": 1},
+}).encode()
+
+
+class FakeMessagesServer:
+    """Keep-alive HTTP server that counts accepted connections."""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                await asyncio.sleep(self.latency)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Connection: keep-alive\r\n"
+                    + f"Content-Length: {len(RESPONSE_BODY)}\r\n\r\n".encode()
+                    + RESPONSE_BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _call(client: AsyncAnthropic) -> None:
+    await client.messages.create(
+        model="claude-3-haiku-20240307",
+        max_tokens=10,
+        messages=[{"role": "user", "content": "ping"}],
+    )
+
+
+async def run_fresh(base_url: str, n: int) -> None:
+    for _ in range(n):
+        client = AsyncAnthropic(api_key="bench", base_url=base_url, max_retries=0)
+        await _call(client)
+        await client.close()
+
+
+async def run_pooled(base_url: str, n: int) -> None:
+    manager = AnthropicClientManager(base_url=base_url)
+    await manager.startup()
+    try:
+        for _ in range(n):
+            await _call(manager.get_client("bench"))
+    finally:
+        await manager.shutdown()
+
+
+async def main(n: int, latency_ms: float) -> None:
+    for name, runner in (("fresh client per request", run_fresh), ("pooled manager", run_pooled)):
+        server = FakeMessagesServer(latency_ms)
+        base_url = await server.start()
+        start = time.perf_counter()
+        await runner(base_url, n)
+        elapsed = time.perf_counter() - start
+        await server.stop()
+        print(
+            f"{name:26s} requests={server.requests:5d} "
+            f"connections={server.connections:5d} wall={elapsed * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.latency_ms))
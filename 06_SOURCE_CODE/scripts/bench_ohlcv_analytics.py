@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark the OHLCV analytics kernels against the per-candle Decimal loops.
+
+Generates synthetic daily candles (Decimal prices, as the engine receives
+them) for N symbols x D days, then times price change, volume change,
+annualised volatility and standard pivots for every symbol:
+
+- per-candle: the engine's previous implementation (float(Decimal) per
+  access, Python loop over candle objects, statistics.stdev)
+- kernels:    OHLCVSeries.from_candles + compare_series/pivot_levels_many,
+              reported with and without the one-off conversion
+
+Usage:
+    PYTHONPATH=src python scripts/bench_ohlcv_analytics.py [--symbols 500] [--days 252]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from cia_sie.platforms.ohlcv_analytics import (
+    OHLCVSeries,
+    compare_series,
+    pivot_levels_many,
+)
+
+
+@dataclass
+class Candle:
+    timestamp: datetime
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    volume: int
+
+
+def make_candles(days: int, rng: random.Random) -> list[Candle]:
+    price = rng.uniform(100, 3000)
+    start = datetime(2024, 1, 1)
+    candles = []
+    for d in range(days):
+        close = price * (1 + rng.gauss(0, 0.015))
+        high = max(price, close) * (1 + abs(rng.gauss(0, 0.005)))
+        low = min(price, close) * (1 - abs(rng.gauss(0, 0.005)))
+        candles.append(
+            Candle(
+                start + timedelta(days=d),
+                Decimal(f"{price:.2f}"),
+                Decimal(f"{high:.2f}"),
+                Decimal(f"{low:.2f}"),
+                Decimal(f"{close:.2f}"),
+                rng.randint(10_000, 5_000_000),
+            )
+        )
+        price = close
+    return candles
+
+
+def per_candle(universe: dict[str, list[Candle]]) -> dict:
+    """The engine's previous loops, verbatim in structure."""
+    out = {}
+    for symbol, candles in universe.items():
+        start_price = float(candles[0].close)
+        end_price = float(candles[-1].close)
+        change = ((end_price - start_price) / start_price) * 100
+
+        first_half = sum(c.volume for c in candles[: len(candles) // 2])
+        second_half = sum(c.volume for c in candles[len(candles) // 2 :])
+        vol_change = ((second_half - first_half) / first_half * 100) if first_half > 0 else 0
+
+        returns = []
+        for i in range(1, len(candles)):
+            returns.append(
+                (float(candles[i].close) - float(candles[i - 1].close))
+                / float(candles[i - 1].close)
+            )
+        volatility = statistics.stdev(returns) * 100 * (252**0.5)
+
+        prev = candles[-1]
+        high, low, close = float(prev.high), float(prev.low), float(prev.close)
+        pivot = (high + low + close) / 3
+        out[symbol] = (round(change, 2), round(vol_change, 2), round(volatility, 2), round(pivot, 2))
+    return out
+
+
+def kernels(series: dict[str, OHLCVSeries]) -> dict:
+    price = compare_series(series, "price_change")
+    volume = compare_series(series, "volume_change")
+    volatility = compare_series(series, "volatility")
+    pivots = pivot_levels_many(series, "standard_pivot")
+    return {
+        symbol: (
+            price[symbol]["change_percent"],
+            volume[symbol]["volume_change_percent"],
+            volatility[symbol]["volatility_percent"],
+            pivots[symbol]["pivot"],
+        )
+        for symbol in series
+    }
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(symbols: int, days: int, repeat: int) -> None:
+    rng = random.Random(42)
+    universe = {f"SYM{i:03d}": make_candles(days, rng) for i in range(symbols)}
+
+    def convert():
+        return {s: OHLCVSeries.from_candles(s, c) for s, c in universe.items()}
+
+    series = convert()
+
+    legacy = per_candle(universe)
+    fast = kernels(series)
+    mismatches = sum(
+        1 for s in universe if any(abs(a - b) > 0.011 for a, b in zip(legacy[s], fast[s]))
+    )
+
+    t_legacy = best_of(lambda: per_candle(universe), repeat)
+    t_convert = best_of(convert, repeat)
+    t_kernels = best_of(lambda: kernels(series), repeat)
+
+    print(f"{symbols} symbols x {days} days, best of {repeat}")
+    print(f"  per-candle Decimal loops : {t_legacy * 1000:8.1f} ms")
+    print(f"  kernels (incl. convert)  : {(t_convert + t_kernels) * 1000:8.1f} ms")
+    print(f"  kernels (series ready)   : {t_kernels * 1000:8.1f} ms")
+    print(f"  speedup (series ready)   : {t_legacy / t_kernels:8.1f}x")
+    print(f"  result mismatches        : {mismatches}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=252)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.symbols, args.days, args.repeat)
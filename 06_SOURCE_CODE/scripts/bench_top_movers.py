@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark top-movers ranking over the NSE cash universe.
+
+Generates N synthetic quotes (Decimal fields, as the engine receives them)
+and ranks them by all four metrics, top and bottom:
+
+- full sort: the engine's previous implementation (Decimal metric per
+  quote into a list of tuples, sorted in full, once per metric)
+- heaps:     QuoteColumns.from_quotes + rank() for all metrics,
+             reported with and without the one-off conversion
+- engine:    get_top_movers("ALL", ...) end to end with every quote
+             already in the quote cache
+
+Usage:
+    PYTHONPATH=src python scripts/bench_top_movers.py [--symbols 2500] [--limit 20]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from decimal import Decimal
+from unittest.mock import Mock
+
+import httpx
+
+from cia_sie.platforms.instruments_master import InstrumentsMaster
+from cia_sie.platforms.kite_intelligence import KiteIntelligenceEngine, Quote
+from cia_sie.platforms.kite_scheduler import KiteRequestScheduler
+from cia_sie.platforms.movers import METRICS, QuoteColumns, rank
+from cia_sie.platforms.quote_cache import QuoteCache
+
+
+def make_quotes(n: int, rng: random.Random) -> dict[str, Quote]:
+    quotes = {}
+    for i in range(n):
+        open_ = rng.uniform(10, 3000)
+        ltp = open_ * rng.uniform(0.9, 1.1)
+        quotes[f"SYM{i}"] = Quote(
+            symbol=f"SYM{i}",
+            ltp=Decimal(f"{ltp:.2f}"),
+            open=Decimal(f"{open_:.2f}"),
+            high=Decimal(f"{max(open_, ltp) * 1.01:.2f}"),
+            low=Decimal(f"{min(open_, ltp) * 0.99:.2f}"),
+            close=Decimal(f"{open_:.2f}"),
+            volume=rng.randint(0, 10**7),
+            change=Decimal(f"{ltp - open_:.2f}"),
+            change_percent=Decimal(f"{(ltp / open_ - 1) * 100:.2f}"),
+            timestamp=None,
+        )
+    return quotes
+
+
+def full_sort(quotes: dict[str, Quote], limit: int) -> None:
+    for direction in ("top", "bottom"):
+        for metric in METRICS:
+            ranked = []
+            for symbol, quote in quotes.items():
+                if metric == "volume":
+                    value = quote.volume
+                elif metric == "change_percent":
+                    value = float(quote.change_percent)
+                elif metric == "range_percent":
+                    value = (
+                        float((quote.high - quote.low) / quote.open * 100) if quote.open > 0 else 0
+                    )
+                else:
+                    value = float(quote.ltp) * quote.volume
+                ranked.append((symbol, value, quote.ltp))
+            ranked.sort(key=lambda x: x[1], reverse=(direction == "top"))
+            ranked[:limit]
+
+
+def heaps(columns: QuoteColumns, limit: int) -> None:
+    for direction in ("top", "bottom"):
+        rank(columns, METRICS, limit, direction)
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def engine_ranking(quotes: dict[str, Quote], limit: int, repeat: int) -> float:
+    master = InstrumentsMaster()
+    master.load_csv(
+        [
+            "instrument_token,exchange_token,tradingsymbol,name,last_price,expiry,strike,"
+            "tick_size,lot_size,instrument_type,segment,exchange"
+        ]
+        + [f"{i},{i},{s},{s},0,,0,0.05,1,EQ,NSE,NSE" for i, s in enumerate(quotes)]
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        data = {}
+        for key in request.url.params.get_list("i"):
+            q = quotes[key.removeprefix("NSE:")]
+            data[key] = {
+                "last_price": float(q.ltp),
+                "ohlc": {
+                    "open": float(q.open), "high": float(q.high),
+                    "low": float(q.low), "close": float(q.close),
+                },
+                "volume": q.volume,
+                "change": float(q.change),
+                "change_percent": float(q.change_percent),
+            }
+        return httpx.Response(200, json={"data": data})
+
+    adapter = Mock()
+    adapter.is_connected = True
+    adapter._client = httpx.AsyncClient(
+        base_url="https://api.kite.trade", transport=httpx.MockTransport(handler)
+    )
+    engine = KiteIntelligenceEngine(
+        adapter,
+        candle_store=None,
+        scheduler=KiteRequestScheduler({"quote": 1000}),
+        quote_cache=QuoteCache(ttl=3600),
+        instruments=master,
+    )
+
+    await engine.get_top_movers("ALL", "volume", limit)  # warm the quote cache
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await engine.rank_universe("ALL", list(METRICS), limit)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(symbols: int, limit: int, repeat: int) -> None:
+    quotes = make_quotes(symbols, random.Random(42))
+    columns = QuoteColumns.from_quotes(quotes)
+
+    t_sort = best_of(lambda: full_sort(quotes, limit), repeat)
+    t_convert = best_of(lambda: QuoteColumns.from_quotes(quotes), repeat)
+    t_heaps = best_of(lambda: heaps(columns, limit), repeat)
+    t_engine = asyncio.run(engine_ranking(quotes, limit, repeat))
+
+    print(f"{symbols} symbols, 4 metrics x top/bottom, limit {limit}, best of {repeat}")
+    print(f"  full sort per metric     : {t_sort * 1000:8.1f} ms")
+    print(f"  heaps (incl. convert)    : {(t_convert + t_heaps) * 1000:8.1f} ms")
+    print(f"  heaps (columns ready)    : {t_heaps * 1000:8.1f} ms")
+    print(f"  engine ALL, cached quotes: {t_engine * 1000:8.1f} ms (4 metrics, top)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--symbols", type=int, default=2500)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.symbols, args.limit, args.repeat)
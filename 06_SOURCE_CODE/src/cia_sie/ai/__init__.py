@@ -18,6 +18,7 @@ VALIDATION:
 """
 
 from cia_sie.ai.claude_client import ClaudeClient
+from cia_sie.ai.client_manager import AnthropicClientManager, get_client_manager
 from cia_sie.ai.narrative_generator import NarrativeGenerator
 from cia_sie.ai.prompt_builder import NarrativePromptBuilder
 from cia_sie.ai.response_validator import (
@@ -36,6 +37,8 @@ __all__ = [
     "NarrativeGenerator",
     "NarrativePromptBuilder",
     "ClaudeClient",
+    "AnthropicClientManager",
+    "get_client_manager",
     # Validators
     "AIResponseValidator",
     "ValidatedResponseGenerator",
@@ -0,0 +1,208 @@
+"""
+CIA-SIE AI Budget Admission Control
+===================================
+
+Up-front budget reservation for AI requests.
+
+Checking spend after the fact lets a burst of concurrent requests all pass
+the budget check and then overshoot ai_budget_limit together. The admission
+controller instead:
+
+1. Estimates the worst-case cost of a request before it is sent
+   (prompt length + max_tokens per model call, priced via estimate_cost)
+2. Reserves that amount against the remaining monthly budget in memory
+3. Releases the reservation once actual usage has been recorded
+
+Admission reads only in-memory state (the UsageAccumulator's monthly cost
+plus outstanding reservations), so a rejection costs microseconds and no
+database round-trip.
+
+GOVERNED BY: Section 14 (AI Narrative Engine)
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+from uuid import uuid4
+
+from cia_sie.ai.model_registry import estimate_cost, estimate_tokens
+from cia_sie.ai.usage_accumulator import UsageAccumulator, get_usage_accumulator
+from cia_sie.core.config import get_settings
+from cia_sie.core.enums import UsagePeriod
+from cia_sie.core.exceptions import AIBudgetExceededError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BudgetReservation:
+    """An amount of budget held for one in-flight AI request."""
+
+    reservation_id: str
+    model_id: str
+    estimated_cost: Decimal
+    created_at: float
+
+
+class BudgetAdmissionController:
+    """
+    Admits AI requests only if their estimated cost fits the remaining budget.
+
+    Usage:
+        admission = get_budget_admission()
+        reservation = admission.reserve(model_id, prompt, max_tokens=1500)
+        try:
+            ...  # call Claude, then tracker.record_usage(...)
+        finally:
+            admission.release(reservation)
+    """
+
+    def __init__(
+        self,
+        accumulator: Optional[UsageAccumulator] = None,
+        budget_limit: Optional[float] = None,
+        reservation_ttl_seconds: float = 300.0,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            accumulator: Usage accumulator holding actual spend (defaults to shared)
+            budget_limit: Monthly budget in USD (defaults to settings.ai_budget_limit)
+            reservation_ttl_seconds: Reservations older than this are expired
+        """
+        self.accumulator = accumulator or get_usage_accumulator()
+        self._budget_limit = budget_limit
+        self.reservation_ttl_seconds = reservation_ttl_seconds
+
+        self._reservations: dict[str, BudgetReservation] = {}
+        self._reserved = Decimal("0")
+        self._lock = threading.Lock()
+
+    @property
+    def budget_limit(self) -> Decimal:
+        """Monthly budget limit in USD."""
+        limit = self._budget_limit
+        if limit is None:
+            limit = get_settings().ai_budget_limit
+        return Decimal(str(limit))
+
+    @property
+    def reserved(self) -> Decimal:
+        """Total held by outstanding reservations."""
+        return self._reserved
+
+    @property
+    def outstanding(self) -> int:
+        """Number of outstanding reservations."""
+        return len(self._reservations)
+
+    def estimate(
+        self, model_id: str, prompt: str, max_tokens: int, iterations: int = 1
+    ) -> Decimal:
+        """
+        Estimate the worst-case cost of a request.
+
+        Input tokens are approximated from prompt length (estimate_tokens, the
+        same estimator callers use to record usage); output is assumed to use
+        the full max_tokens. A request that may call the model up to
+        ``iterations`` times (an agent tool loop) resends the prompt and may
+        fill max_tokens on every call.
+        """
+        input_tokens = estimate_tokens(prompt) * iterations
+        output_tokens = max_tokens * iterations
+        return Decimal(str(estimate_cost(model_id, input_tokens, output_tokens)))
+
+    def remaining(self) -> Decimal:
+        """Budget left after actual spend and outstanding reservations."""
+        spent = self.accumulator.get(UsagePeriod.MONTHLY).cost
+        return self.budget_limit - spent - self._reserved
+
+    def reserve(
+        self, model_id: str, prompt: str, max_tokens: int, iterations: int = 1
+    ) -> BudgetReservation:
+        """
+        Reserve budget for a request.
+
+        Args:
+            model_id: Model the request will use
+            prompt: Full prompt text (system prompt, history and message)
+            max_tokens: max_tokens of each model call
+            iterations: Maximum number of model calls the request may make
+
+        Raises:
+            AIBudgetExceededError: If the estimate does not fit the remaining budget
+        """
+        estimated = self.estimate(model_id, prompt, max_tokens, iterations)
+
+        with self._lock:
+            self._expire_stale()
+            remaining = self.remaining()
+            if estimated > remaining:
+                raise AIBudgetExceededError(
+                    "AI budget would be exceeded by this request",
+                    {
+                        "estimated_cost": float(estimated),
+                        "remaining": float(max(remaining, Decimal("0"))),
+                        "outstanding_reservations": len(self._reservations),
+                    },
+                )
+
+            reservation = BudgetReservation(
+                reservation_id=str(uuid4()),
+                model_id=model_id,
+                estimated_cost=estimated,
+                created_at=time.monotonic(),
+            )
+            self._reservations[reservation.reservation_id] = reservation
+            self._reserved += estimated
+            return reservation
+
+    def release(self, reservation: BudgetReservation) -> None:
+        """
+        Release a reservation. Idempotent.
+
+        Call after actual usage has been recorded (or the request failed),
+        so in-flight spend is always counted as reserved or as actual.
+        """
+        with self._lock:
+            if self._reservations.pop(reservation.reservation_id, None) is not None:
+                self._reserved -= reservation.estimated_cost
+
+    def reconcile(self, reservation: BudgetReservation, actual_cost: float) -> Decimal:
+        """
+        Release a reservation once actual usage is known.
+
+        Returns:
+            Estimate minus actual (positive = over-reserved)
+        """
+        self.release(reservation)
+        delta = reservation.estimated_cost - Decimal(str(actual_cost))
+        if delta < 0:
+            logger.warning(
+                f"AI cost exceeded reservation by ${-delta:.6f} "
+                f"(model={reservation.model_id})"
+            )
+        return delta
+
+    def _expire_stale(self) -> None:
+        """Drop reservations whose request never released them."""
+        cutoff = time.monotonic() - self.reservation_ttl_seconds
+        for rid in [r for r, res in self._reservations.items() if res.created_at < cutoff]:
+            res = self._reservations.pop(rid)
+            self._reserved -= res.estimated_cost
+            logger.warning(f"Expired stale AI budget reservation {rid}")
+
+
+_budget_admission: Optional[BudgetAdmissionController] = None
+
+
+def get_budget_admission() -> BudgetAdmissionController:
+    """Get the application-wide admission controller."""
+    global _budget_admission
+    if _budget_admission is None:
+        _budget_admission = BudgetAdmissionController()
+    return _budget_admission
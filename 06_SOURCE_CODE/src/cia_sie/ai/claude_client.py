@@ -13,6 +13,7 @@ from typing import Optional
 
 from anthropic import AsyncAnthropic
 
+from cia_sie.ai.client_manager import AnthropicClientManager, get_client_manager
 from cia_sie.core.config import get_settings
 from cia_sie.core.exceptions import AIProviderError
 
@@ -30,6 +31,7 @@ class ClaudeClient:
         self,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
+        client_manager: Optional[AnthropicClientManager] = None,
     ):
         """
         Initialize the Claude client.
@@ -37,10 +39,12 @@ class ClaudeClient:
         Args:
             api_key: Anthropic API key (defaults to settings)
             model: Model to use (defaults to settings)
+            client_manager: Pooled client manager (defaults to the application-wide one)
         """
         settings = get_settings()
         self.api_key = api_key or settings.anthropic_api_key
         self.model = model or settings.anthropic_model
+        self.client_manager = client_manager
 
         if not self.api_key:
             logger.warning("No Anthropic API key configured")
@@ -49,14 +53,23 @@ class ClaudeClient:
 
     @property
     def client(self) -> AsyncAnthropic:
-        """Get or create the async client."""
+        """
+        Get or create the async client.
+
+        Uses the pooled transport when the client manager has been started
+        (application lifespan), otherwise creates a private client.
+        """
         if self._client is None:
             if not self.api_key:
                 raise AIProviderError(
                     "Anthropic API key not configured",
                     {"hint": "Set ANTHROPIC_API_KEY in environment"},
                 )
-            self._client = AsyncAnthropic(api_key=self.api_key)
+            manager = self.client_manager or get_client_manager()
+            if manager.is_started:
+                self._client = manager.get_client(self.api_key)
+            else:
+                self._client = AsyncAnthropic(api_key=self.api_key)
         return self._client
 
     async def generate(
@@ -65,6 +78,7 @@ class ClaudeClient:
         user_prompt: str,
         max_tokens: int = 2000,
         temperature: float = 0.3,
+        history: Optional[list[dict[str, str]]] = None,
     ) -> str:
         """
         Generate a response from Claude.
@@ -74,6 +88,7 @@ class ClaudeClient:
             user_prompt: User message/request
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature (lower = more focused)
+            history: Prior {role, content} messages, oldest first
 
         Returns:
             Generated text response
@@ -87,7 +102,7 @@ class ClaudeClient:
                 max_tokens=max_tokens,
                 temperature=temperature,
                 system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}],
+                messages=[*(history or []), {"role": "user", "content": user_prompt}],
             )
 
             # Extract text from response
@@ -0,0 +1,143 @@
+"""
+CIA-SIE Anthropic Client Manager
+================================
+
+Application-scoped owner of the pooled HTTP transport used for Claude.
+
+Creating an AsyncAnthropic per request creates a new connection pool per
+request, so every chat message pays TCP + TLS setup. The manager owns ONE
+httpx.AsyncClient with tuned keep-alive and connection limits, and hands out
+AsyncAnthropic instances that share it.
+
+Lifecycle:
+- startup() is called from the FastAPI lifespan
+- shutdown() closes pooled connections on application exit
+- Before startup (scripts, tests), ClaudeClient falls back to a private client
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+from anthropic import AsyncAnthropic
+
+from cia_sie.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class AnthropicClientManager:
+    """
+    Owns one pooled HTTP transport shared by all Claude callers.
+
+    Usage:
+        manager = get_client_manager()
+        await manager.startup()
+        client = manager.get_client(api_key)
+        ...
+        await manager.shutdown()
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            base_url: Override API base URL (e.g. a local fake server)
+            max_connections: Upper bound on concurrent connections
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: Request timeout in seconds
+        """
+        settings = get_settings()
+        self.base_url = base_url or settings.anthropic_base_url
+        self.max_connections = max_connections or settings.anthropic_max_connections
+        self.max_keepalive_connections = (
+            max_keepalive_connections or settings.anthropic_max_keepalive_connections
+        )
+        self.keepalive_expiry = keepalive_expiry or settings.anthropic_keepalive_expiry
+        self.timeout = timeout or settings.anthropic_timeout
+
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._clients: dict[Optional[str], AsyncAnthropic] = {}
+
+    @property
+    def is_started(self) -> bool:
+        """Whether the pooled transport is open."""
+        return self._http_client is not None and not self._http_client.is_closed
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """The shared pooled transport."""
+        if not self.is_started:
+            raise RuntimeError("AnthropicClientManager has not been started")
+        return self._http_client
+
+    async def startup(self) -> None:
+        """Open the pooled transport. Idempotent."""
+        if self.is_started:
+            return
+
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=10.0),
+        )
+        self._clients = {}
+        logger.info(
+            f"Anthropic client pool started "
+            f"(max_connections={self.max_connections}, "
+            f"keepalive={self.max_keepalive_connections})"
+        )
+
+    async def shutdown(self) -> None:
+        """Close the pooled transport. Idempotent."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            logger.info("Anthropic client pool closed")
+        self._http_client = None
+        self._clients = {}
+
+    def get_client(self, api_key: Optional[str] = None) -> AsyncAnthropic:
+        """
+        Get an AsyncAnthropic bound to the shared transport.
+
+        Clients are cached per API key, so repeated calls are free.
+
+        Args:
+            api_key: Anthropic API key (defaults to settings)
+
+        Raises:
+            RuntimeError: If the manager has not been started
+        """
+        api_key = api_key or get_settings().anthropic_api_key
+        client = self._clients.get(api_key)
+        if client is None:
+            client = AsyncAnthropic(
+                api_key=api_key,
+                base_url=self.base_url,
+                http_client=self.http_client,
+            )
+            self._clients[api_key] = client
+        return client
+
+
+_client_manager: Optional[AnthropicClientManager] = None
+
+
+def get_client_manager() -> AnthropicClientManager:
+    """Get the application-wide client manager."""
+    global _client_manager
+    if _client_manager is None:
+        _client_manager = AnthropicClientManager()
+    return _client_manager
@@ -16,7 +16,7 @@ GOVERNED BY: Constitutional Rules (CR-001, CR-002, CR-003)
 
 import json
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from typing import Any, Optional
 
@@ -40,6 +40,21 @@ class ExecutionLogEntry:
     timestamp: str
 
 
+@dataclass
+class IterationUsage:
+    """Token usage for a single iteration of the agentic loop."""
+    iteration: int
+    input_tokens: int
+    output_tokens: int
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+
+    @property
+    def total_input_tokens(self) -> int:
+        """Input tokens including those written to or read from the prompt cache."""
+        return self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
+
+
 @dataclass
 class AgentResponse:
     """Response from the market intelligence agent."""
@@ -48,6 +63,32 @@ class AgentResponse:
     execution_log: list[ExecutionLogEntry]
     data_sources: list[str]  # e.g., ["kite_quotes", "cia_sie_signals"]
     disclaimer: str
+    iteration_usage: list[IterationUsage] = field(default_factory=list)
+
+    @property
+    def total_input_tokens(self) -> int:
+        """Input tokens across all iterations (uncached + cache write + cache read)."""
+        return sum(u.total_input_tokens for u in self.iteration_usage)
+
+    @property
+    def uncached_input_tokens(self) -> int:
+        """Input tokens billed at the base rate across all iterations."""
+        return sum(u.input_tokens for u in self.iteration_usage)
+
+    @property
+    def cache_creation_input_tokens(self) -> int:
+        """Input tokens written to the prompt cache across all iterations."""
+        return sum(u.cache_creation_input_tokens for u in self.iteration_usage)
+
+    @property
+    def cache_read_input_tokens(self) -> int:
+        """Input tokens served from the prompt cache across all iterations."""
+        return sum(u.cache_read_input_tokens for u in self.iteration_usage)
+
+    @property
+    def total_output_tokens(self) -> int:
+        """Output tokens across all iterations."""
+        return sum(u.output_tokens for u in self.iteration_usage)
 
 
 # Tool definitions for Claude
@@ -75,8 +116,8 @@ MARKET_INTELLIGENCE_TOOLS = [
             "properties": {
                 "universe": {
                     "type": "string",
-                    "enum": ["NIFTY50", "NIFTY100", "NIFTYBANK", "NIFTYIT", "WATCHLIST"],
-                    "description": "Which universe of stocks to scan"
+                    "enum": ["NIFTY50", "NIFTY100", "NIFTYBANK", "NIFTYIT", "ALL", "WATCHLIST"],
+                    "description": "Which universe of stocks to scan (ALL = every NSE equity)"
                 },
                 "metric": {
                     "type": "string",
@@ -177,19 +218,23 @@ MARKET_INTELLIGENCE_TOOLS = [
     },
     {
         "name": "calculate_technical_levels",
-        "description": "Calculate pivot points, support, and resistance levels for an instrument. These are mathematical calculations based on previous day's price action.",
+        "description": "Calculate pivot points, support, and resistance levels for one instrument, or for several at once via symbols. These are mathematical calculations based on previous day's price action.",
         "input_schema": {
             "type": "object",
             "properties": {
                 "symbol": {"type": "string", "description": "Trading symbol"},
+                "symbols": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Several trading symbols, calculated in one batch (use instead of symbol)"
+                },
                 "method": {
                     "type": "string",
                     "enum": ["standard_pivot", "fibonacci", "camarilla"],
                     "default": "standard_pivot",
                     "description": "Calculation method"
                 }
-            },
-            "required": ["symbol"]
+            }
         }
     },
     {
@@ -200,8 +245,11 @@ MARKET_INTELLIGENCE_TOOLS = [
             "properties": {
                 "index": {
                     "type": "string",
-                    "enum": ["NIFTY50", "NIFTY100", "NIFTYBANK", "NIFTYIT", "NIFTYPHARMA", "NIFTYAUTO"],
-                    "description": "Index name"
+                    "description": "Index name (e.g., NIFTY50, NIFTY100, NIFTYBANK, NIFTYIT, NIFTYPHARMA, NIFTYAUTO)"
+                },
+                "as_of": {
+                    "type": "string",
+                    "description": "Optional date (YYYY-MM-DD) for historical membership; default is current"
                 }
             },
             "required": ["index"]
@@ -215,8 +263,11 @@ MARKET_INTELLIGENCE_TOOLS = [
             "properties": {
                 "sector": {
                     "type": "string",
-                    "enum": ["BANKING", "IT", "AUTO", "PHARMA", "FMCG", "METALS", "ENERGY", "REALTY"],
-                    "description": "Sector name"
+                    "description": "Sector name (e.g., BANKING, IT, AUTO, PHARMA, FMCG, METALS, ENERGY, REALTY)"
+                },
+                "as_of": {
+                    "type": "string",
+                    "description": "Optional date (YYYY-MM-DD) for historical membership; default is current"
                 }
             },
             "required": ["sector"]
@@ -263,6 +314,26 @@ MARKET_INTELLIGENCE_TOOLS = [
 ]
 
 
+# Prompt caching: a cache_control breakpoint on the last tool caches the whole
+# tool block, and a breakpoint on the system block caches tools + system.
+# Built once at import so every query reuses the same definitions.
+_EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+CACHED_MARKET_INTELLIGENCE_TOOLS = [
+    *MARKET_INTELLIGENCE_TOOLS[:-1],
+    {**MARKET_INTELLIGENCE_TOOLS[-1], "cache_control": _EPHEMERAL_CACHE},
+]
+
+# Tool results larger than this (serialized chars) are replaced with a
+# summary once Claude has seen them in a previous iteration.
+TOOL_RESULT_COMPACTION_THRESHOLD = 2000
+
+# Bounds of the agentic loop: model calls per query and max_tokens per call.
+# Callers reserve AI budget for the worst case of both.
+MAX_ITERATIONS = 10
+MAX_TOKENS_PER_ITERATION = 4000
+
+
 SYSTEM_PROMPT = """You are a market data assistant for CIA-SIE (Chart Intelligence Auditor & Signal Intelligence Engine).
 
 You have access to:
@@ -326,21 +397,26 @@ class MarketIntelligenceAgent:
         relationship_exposer: RelationshipExposer,
         instrument_repository: InstrumentRepository,
         model: str = "claude-sonnet-4-20250514",
+        enable_prompt_cache: bool = True,
+        compact_tool_results: bool = True,
     ):
         self.client = anthropic_client
         self.kite = kite_engine
         self.exposer = relationship_exposer
         self.instruments = instrument_repository
         self.model = model
+        self.enable_prompt_cache = enable_prompt_cache
+        self.compact_tool_results = compact_tool_results
         
         self.execution_log: list[ExecutionLogEntry] = []
         self.data_sources_used: set[str] = set()
+        self.iteration_usage: list[IterationUsage] = []
     
     async def query(
         self,
         user_message: str,
         user_context: Optional[dict] = None,
-        max_iterations: int = 10,
+        max_iterations: int = MAX_ITERATIONS,
     ) -> AgentResponse:
         """
         Process a natural language market query.
@@ -355,23 +431,33 @@ class MarketIntelligenceAgent:
         """
         self.execution_log = []
         self.data_sources_used = set()
+        self.iteration_usage = []
         
         # Build system prompt with optional user context
         system = self._build_system_prompt(user_context)
+        if self.enable_prompt_cache:
+            system = [{"type": "text", "text": system, "cache_control": _EPHEMERAL_CACHE}]
+            tools = CACHED_MARKET_INTELLIGENCE_TOOLS
+        else:
+            tools = MARKET_INTELLIGENCE_TOOLS
         
         # Initial message
         messages = [{"role": "user", "content": user_message}]
         
+        # Tool results already sent to Claude: (result block, tool name, raw result)
+        sent_results: list[tuple[dict, str, Any]] = []
+        
         # Agentic loop
         response = None
         for iteration in range(max_iterations):
             response = await self.client.messages.create(
                 model=self.model,
-                max_tokens=4000,
+                max_tokens=MAX_TOKENS_PER_ITERATION,
                 system=system,
-                tools=MARKET_INTELLIGENCE_TOOLS,
+                tools=tools,
                 messages=messages
             )
+            self._record_usage(iteration, response)
             
             # Check if we're done
             if response.stop_reason == "end_turn":
@@ -379,6 +465,14 @@ class MarketIntelligenceAgent:
             
             # Handle tool calls
             if response.stop_reason == "tool_use":
+                # Claude has now consumed every earlier tool result
+                if self.compact_tool_results:
+                    for block, tool_name, raw in sent_results:
+                        block["content"] = self._compact_tool_result(
+                            tool_name, raw, block["content"]
+                        )
+                    sent_results = []
+                
                 # Add assistant's response to message history
                 messages.append({"role": "assistant", "content": response.content})
                 
@@ -390,11 +484,13 @@ class MarketIntelligenceAgent:
                             block.name,
                             block.input
                         )
-                        tool_results.append({
+                        result_block = {
                             "type": "tool_result",
                             "tool_use_id": block.id,
                             "content": json.dumps(result, default=str)
-                        })
+                        }
+                        tool_results.append(result_block)
+                        sent_results.append((result_block, block.name, result))
                 
                 # Add tool results to messages
                 messages.append({"role": "user", "content": tool_results})
@@ -420,9 +516,56 @@ class MarketIntelligenceAgent:
             tools_used=[log.tool_name for log in self.execution_log],
             execution_log=self.execution_log,
             data_sources=list(self.data_sources_used),
-            disclaimer=self.MANDATORY_DISCLAIMER
+            disclaimer=self.MANDATORY_DISCLAIMER,
+            iteration_usage=self.iteration_usage
         )
     
+    def _record_usage(self, iteration: int, response: Any) -> None:
+        """Record token usage reported by the API for one iteration."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        self.iteration_usage.append(IterationUsage(
+            iteration=iteration,
+            input_tokens=getattr(usage, "input_tokens", 0) or 0,
+            output_tokens=getattr(usage, "output_tokens", 0) or 0,
+            cache_creation_input_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            cache_read_input_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+        ))
+    
+    def _compact_tool_result(self, tool_name: str, result: Any, content: str) -> str:
+        """
+        Replace a consumed tool result with a compact summary.
+        
+        Small payloads are kept verbatim. OHLCV arrays are reduced to their
+        range, extremes and total volume; other large payloads are reduced
+        to their shape.
+        """
+        if len(content) <= TOOL_RESULT_COMPACTION_THRESHOLD:
+            return content
+        
+        summary: dict[str, Any] = {"compacted": True, "tool": tool_name}
+        if tool_name == "get_historical_data" and isinstance(result, list) and result:
+            summary.update({
+                "candles": len(result),
+                "from": result[0]["timestamp"],
+                "to": result[-1]["timestamp"],
+                "open": result[0]["open"],
+                "close": result[-1]["close"],
+                "high": max(c["high"] for c in result),
+                "low": min(c["low"] for c in result),
+                "total_volume": sum(c["volume"] for c in result),
+            })
+        elif isinstance(result, list):
+            summary["items"] = len(result)
+            summary["first"] = result[0] if result else None
+        elif isinstance(result, dict):
+            summary["keys"] = sorted(str(k) for k in result)[:50]
+        else:
+            summary["preview"] = content[:200]
+        
+        return json.dumps(summary, default=str)
+    
     async def _execute_tool(self, tool_name: str, tool_input: dict) -> Any:
         """Execute a tool call and log it."""
         start_time = datetime.now()
@@ -479,16 +622,29 @@ class MarketIntelligenceAgent:
                 
             elif tool_name == "calculate_technical_levels":
                 self.data_sources_used.add("kite_historical")
-                result = await self.kite.calculate_technical_levels(
-                    symbol=tool_input["symbol"],
-                    method=tool_input.get("method", "standard_pivot")
-                )
+                method = tool_input.get("method", "standard_pivot")
+                if tool_input.get("symbols"):
+                    result = await self.kite.calculate_technical_levels_many(
+                        symbols=tool_input["symbols"],
+                        method=method
+                    )
+                else:
+                    result = await self.kite.calculate_technical_levels(
+                        symbol=tool_input["symbol"],
+                        method=method
+                    )
                 
             elif tool_name == "get_index_constituents":
-                result = await self.kite.get_index_constituents(tool_input["index"])
+                as_of = tool_input.get("as_of")
+                result = await self.kite.get_index_constituents(
+                    tool_input["index"], date.fromisoformat(as_of) if as_of else None
+                )
                 
             elif tool_name == "get_sector_instruments":
-                result = await self.kite.get_sector_instruments(tool_input["sector"])
+                as_of = tool_input.get("as_of")
+                result = await self.kite.get_sector_instruments(
+                    tool_input["sector"], date.fromisoformat(as_of) if as_of else None
+                )
                 
             elif tool_name == "get_cia_sie_signals":
                 self.data_sources_used.add("cia_sie_signals")
@@ -690,7 +846,9 @@ class MarketIntelligenceAgent:
             "close": float(q.close),
             "volume": q.volume,
             "change": float(q.change),
-            "change_percent": float(q.change_percent)
+            "change_percent": float(q.change_percent),
+            "as_of": q.timestamp.isoformat(),
+            "age_seconds": round(q.age_seconds, 1)
         }
     
     def _mover_to_dict(self, m) -> dict:
@@ -7,11 +7,19 @@ Defines available Claude models and their characteristics.
 GOVERNED BY: Section 14 (AI Narrative Engine)
 """
 
+import math
 from dataclasses import dataclass
 from typing import Optional
 
 from cia_sie.core.enums import AIModelTier
 
+# Rough approximation used wherever exact token counts are unavailable
+CHARS_PER_TOKEN = 4
+
+# Prompt-cache pricing relative to the base input rate (5-minute ephemeral cache)
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
 
 @dataclass(frozen=True)
 class ModelInfo:
@@ -121,14 +129,22 @@ def get_models_by_tier(tier: AIModelTier) -> list[ModelInfo]:
     return [m for m in CLAUDE_MODELS.values() if m.tier == tier]
 
 
-def estimate_cost(model_id: str, input_tokens: int, output_tokens: int) -> float:
+def estimate_cost(
+    model_id: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_creation_tokens: int = 0,
+    cache_read_tokens: int = 0,
+) -> float:
     """
     Estimate cost for a request.
 
     Args:
         model_id: Model identifier
-        input_tokens: Number of input tokens
+        input_tokens: Number of uncached input tokens
         output_tokens: Number of output tokens
+        cache_creation_tokens: Input tokens written to the prompt cache
+        cache_read_tokens: Input tokens served from the prompt cache
 
     Returns:
         Estimated cost in USD
@@ -138,6 +154,23 @@ def estimate_cost(model_id: str, input_tokens: int, output_tokens: int) -> float
         model = get_default_model()
 
     input_cost = (input_tokens / 1000) * model.cost_per_1k_input
+    cache_write_cost = (
+        (cache_creation_tokens / 1000) * model.cost_per_1k_input * CACHE_WRITE_MULTIPLIER
+    )
+    cache_read_cost = (cache_read_tokens / 1000) * model.cost_per_1k_input * CACHE_READ_MULTIPLIER
     output_cost = (output_tokens / 1000) * model.cost_per_1k_output
 
-    return round(input_cost + output_cost, 6)
+    return round(input_cost + cache_write_cost + cache_read_cost + output_cost, 6)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the token count of text (~4 characters per token).
+
+    Args:
+        text: Prompt or message text
+
+    Returns:
+        Estimated number of tokens
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
@@ -0,0 +1,391 @@
+"""
+CIA-SIE AI Usage Accumulator
+============================
+
+In-memory, write-behind accounting for AI usage.
+
+Requests update the accumulator synchronously (no database round-trip) and a
+background task flushes pending deltas to AIUsageDB periodically and at
+shutdown. DAILY, WEEKLY and MONTHLY periods are maintained together.
+
+Each period keeps two sets of totals:
+- persisted: what AIUsageDB held when last loaded or flushed
+- pending:   usage recorded since, not yet written
+
+Budget checks read persisted + pending, so they stay exact between flushes.
+
+GOVERNED BY: Section 14 (AI Narrative Engine)
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cia_sie.core.config import get_settings
+from cia_sie.core.enums import UsagePeriod
+from cia_sie.dal.models import AIUsageDB
+
+logger = logging.getLogger(__name__)
+
+TRACKED_PERIODS = (UsagePeriod.DAILY, UsagePeriod.WEEKLY, UsagePeriod.MONTHLY)
+
+
+def get_period_bounds(period: UsagePeriod, reference_date: date) -> tuple[date, date]:
+    """Get start and end dates for a period."""
+    if period == UsagePeriod.DAILY:
+        return reference_date, reference_date
+
+    elif period == UsagePeriod.WEEKLY:
+        # Start on Monday
+        start = reference_date - timedelta(days=reference_date.weekday())
+        end = start + timedelta(days=6)
+        return start, end
+
+    else:  # MONTHLY
+        start = reference_date.replace(day=1)
+        # Last day of month
+        if reference_date.month == 12:
+            end = reference_date.replace(year=reference_date.year + 1, month=1, day=1)
+        else:
+            end = reference_date.replace(month=reference_date.month + 1, day=1)
+        end = end - timedelta(days=1)
+        return start, end
+
+
+@dataclass
+class UsageTotals:
+    """Token, cost and request totals with a per-model breakdown."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: Decimal = Decimal("0")
+    requests_count: int = 0
+    model_breakdown: dict[str, dict] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether nothing has been recorded."""
+        return self.requests_count == 0 and not self.model_breakdown
+
+    def add(self, model_id: str, input_tokens: int, output_tokens: int, cost: Decimal) -> None:
+        """Add one request's usage."""
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cost += cost
+        self.requests_count += 1
+
+        stats = self.model_breakdown.setdefault(
+            model_id, {"requests": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0}
+        )
+        stats["requests"] += 1
+        stats["input_tokens"] += input_tokens
+        stats["output_tokens"] += output_tokens
+        stats["cost"] += float(cost)
+
+    def merge(self, other: "UsageTotals") -> None:
+        """Add another set of totals into this one."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cost += other.cost
+        self.requests_count += other.requests_count
+
+        for model_id, other_stats in other.model_breakdown.items():
+            stats = self.model_breakdown.setdefault(
+                model_id, {"requests": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0}
+            )
+            for key in ("requests", "input_tokens", "output_tokens", "cost"):
+                stats[key] = stats.get(key, 0) + other_stats.get(key, 0)
+
+    def copy(self) -> "UsageTotals":
+        """Deep-enough copy for reporting."""
+        return UsageTotals(
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            cost=self.cost,
+            requests_count=self.requests_count,
+            model_breakdown={k: dict(v) for k, v in self.model_breakdown.items()},
+        )
+
+    @classmethod
+    def from_row(cls, row: AIUsageDB) -> "UsageTotals":
+        """Build totals from a persisted usage row."""
+        breakdown = row.model_breakdown or {}
+        if isinstance(breakdown, str):
+            breakdown = json.loads(breakdown) if breakdown else {}
+
+        return cls(
+            input_tokens=row.input_tokens or 0,
+            output_tokens=row.output_tokens or 0,
+            cost=Decimal(row.total_cost or 0),
+            requests_count=row.requests_count or 0,
+            model_breakdown={k: dict(v) for k, v in breakdown.items()},
+        )
+
+
+@dataclass
+class PeriodUsage:
+    """Usage for one period (e.g. MONTHLY starting 2025-06-01)."""
+
+    period: UsagePeriod
+    period_start: date
+    period_end: date
+    persisted: UsageTotals = field(default_factory=UsageTotals)
+    pending: UsageTotals = field(default_factory=UsageTotals)
+    loaded: bool = False
+
+    @property
+    def cost(self) -> Decimal:
+        """Persisted plus pending cost (cheaper than building totals)."""
+        return self.persisted.cost + self.pending.cost
+
+    @property
+    def totals(self) -> UsageTotals:
+        """Persisted plus pending usage."""
+        totals = self.persisted.copy()
+        totals.merge(self.pending)
+        return totals
+
+
+class UsageAccumulator:
+    """
+    Write-behind usage accumulator.
+
+    Usage:
+        accumulator = get_usage_accumulator()
+        accumulator.start()                       # FastAPI lifespan startup
+        await accumulator.ensure_loaded(session)  # once per period
+        accumulator.record(model_id, 1200, 300, Decimal("0.0081"))
+        await accumulator.stop()                  # final flush at shutdown
+    """
+
+    def __init__(self, flush_interval_seconds: Optional[float] = None):
+        """
+        Initialize the accumulator.
+
+        Args:
+            flush_interval_seconds: Seconds between background flushes (defaults to settings)
+        """
+        self.flush_interval_seconds = (
+            flush_interval_seconds or get_settings().ai_usage_flush_interval_seconds
+        )
+        self._periods: dict[tuple[UsagePeriod, date], PeriodUsage] = {}
+        self._lock = threading.Lock()
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # =========================================================================
+    # RECORDING
+    # =========================================================================
+
+    def record(
+        self,
+        model_id: str,
+        input_tokens: int,
+        output_tokens: int,
+        cost: Decimal,
+        today: Optional[date] = None,
+    ) -> dict[UsagePeriod, UsageTotals]:
+        """
+        Record one request's usage in every tracked period.
+
+        Atomic: all periods are updated under one lock with no awaits.
+
+        Returns:
+            Post-update totals per period
+        """
+        today = today or date.today()
+        with self._lock:
+            result = {}
+            for period in TRACKED_PERIODS:
+                usage = self._get_or_create(period, today)
+                usage.pending.add(model_id, input_tokens, output_tokens, cost)
+                result[period] = usage.totals
+            return result
+
+    def get(self, period: UsagePeriod, today: Optional[date] = None) -> PeriodUsage:
+        """Get usage for the period containing today."""
+        today = today or date.today()
+        with self._lock:
+            return self._get_or_create(period, today)
+
+    def _get_or_create(self, period: UsagePeriod, today: date) -> PeriodUsage:
+        start, end = get_period_bounds(period, today)
+        key = (period, start)
+        usage = self._periods.get(key)
+        if usage is None:
+            usage = PeriodUsage(period=period, period_start=start, period_end=end)
+            self._periods[key] = usage
+        return usage
+
+    # =========================================================================
+    # LOADING / FLUSHING
+    # =========================================================================
+
+    async def ensure_loaded(self, session: AsyncSession, today: Optional[date] = None) -> None:
+        """Load persisted totals for the current periods (once per period)."""
+        today = today or date.today()
+        for period in TRACKED_PERIODS:
+            usage = self.get(period, today)
+            if usage.loaded:
+                continue
+
+            row = await self._fetch_row(session, period, usage.period_start)
+            with self._lock:
+                if not usage.loaded:
+                    usage.persisted = UsageTotals.from_row(row) if row else UsageTotals()
+                    usage.loaded = True
+
+    async def flush(self, session: AsyncSession) -> int:
+        """
+        Write pending deltas to AIUsageDB.
+
+        Pending totals are swapped out before any await, so requests keep
+        recording while the flush runs. On failure they are merged back.
+
+        Returns:
+            Number of period rows written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            with self._lock:
+                batch = [
+                    (usage, usage.pending)
+                    for usage in self._periods.values()
+                    if not usage.pending.is_empty
+                ]
+                for usage, _ in batch:
+                    usage.pending = UsageTotals()
+
+            try:
+                rows = []
+                for usage, delta in batch:
+                    row = await self._fetch_row(session, usage.period, usage.period_start)
+                    if row is None:
+                        row = AIUsageDB(
+                            period_type=usage.period.value,
+                            period_start=usage.period_start,
+                            period_end=usage.period_end,
+                            input_tokens=0,
+                            output_tokens=0,
+                            total_cost=Decimal("0"),
+                            requests_count=0,
+                            model_breakdown={},
+                        )
+                        session.add(row)
+
+                    merged = UsageTotals.from_row(row)
+                    merged.merge(delta)
+                    row.input_tokens = merged.input_tokens
+                    row.output_tokens = merged.output_tokens
+                    row.total_cost = merged.cost
+                    row.requests_count = merged.requests_count
+                    row.model_breakdown = merged.model_breakdown
+                    rows.append((usage, merged))
+
+                await session.commit()
+            except Exception:
+                with self._lock:
+                    for usage, delta in batch:
+                        delta.merge(usage.pending)
+                        usage.pending = delta
+                raise
+
+            with self._lock:
+                for usage, merged in rows:
+                    usage.persisted = merged
+                    usage.loaded = True
+                self._prune(date.today())
+
+            return len(rows)
+
+    def _prune(self, today: date) -> None:
+        """Drop finished periods that have nothing left to flush."""
+        for key in [
+            k for k, u in self._periods.items() if u.period_end < today and u.pending.is_empty
+        ]:
+            del self._periods[key]
+
+    async def _fetch_row(
+        self,
+        session: AsyncSession,
+        period: UsagePeriod,
+        period_start: date,
+    ) -> Optional[AIUsageDB]:
+        stmt = select(AIUsageDB).where(
+            and_(
+                AIUsageDB.period_type == period.value,
+                AIUsageDB.period_start == period_start,
+            )
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    # =========================================================================
+    # BACKGROUND FLUSH
+    # =========================================================================
+
+    def start(
+        self,
+        session_factory: Optional[Callable[[], AbstractAsyncContextManager[AsyncSession]]] = None,
+    ) -> None:
+        """Start the periodic background flush."""
+        if self._task is not None and not self._task.done():
+            return
+        self._session_factory = session_factory or _default_session_factory()
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info(f"AI usage accumulator started (flush every {self.flush_interval_seconds}s)")
+
+    async def stop(self) -> None:
+        """Stop the background flush and write anything still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self._flush_with_new_session()
+            logger.info("AI usage accumulator stopped")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await self._flush_with_new_session()
+            except Exception as e:
+                logger.error(f"AI usage flush failed: {e}")
+
+    async def _flush_with_new_session(self) -> None:
+        async with self._session_factory() as session:
+            written = await self.flush(session)
+            if written:
+                logger.debug(f"Flushed AI usage for {written} period(s)")
+
+
+def _default_session_factory():
+    from cia_sie.dal.database import async_session_factory
+
+    return async_session_factory
+
+
+_usage_accumulator: Optional[UsageAccumulator] = None
+
+
+def get_usage_accumulator() -> UsageAccumulator:
+    """Get the application-wide usage accumulator."""
+    global _usage_accumulator
+    if _usage_accumulator is None:
+        _usage_accumulator = UsageAccumulator()
+    return _usage_accumulator
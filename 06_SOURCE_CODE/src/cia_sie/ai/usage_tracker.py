@@ -8,17 +8,20 @@ GOVERNED BY: Section 14 (AI Narrative Engine)
 """
 
 import logging
-from datetime import date, timedelta
+from datetime import date
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cia_sie.ai.model_registry import estimate_cost
+from cia_sie.ai.usage_accumulator import (
+    UsageAccumulator,
+    get_period_bounds,
+    get_usage_accumulator,
+)
 from cia_sie.core.config import get_settings
 from cia_sie.core.enums import UsagePeriod
-from cia_sie.dal.models import AIUsageDB
 
 logger = logging.getLogger(__name__)
 
@@ -32,72 +35,56 @@ class UsageTracker:
     - Calculate costs
     - Monitor budget limits
     - Alert at thresholds
+
+    Usage is recorded in the shared UsageAccumulator and written to
+    AIUsageDB in the background, so requests never contend on the
+    period rows.
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, accumulator: Optional[UsageAccumulator] = None):
         """Initialize with database session."""
         self.session = session
         self.settings = get_settings()
+        self.accumulator = accumulator or get_usage_accumulator()
 
     async def record_usage(
         self,
         model_id: str,
         input_tokens: int,
         output_tokens: int,
+        cache_creation_tokens: int = 0,
+        cache_read_tokens: int = 0,
     ) -> dict:
         """
         Record AI usage for a request.
 
         Args:
             model_id: Model used
-            input_tokens: Input tokens consumed
+            input_tokens: Uncached input tokens consumed
             output_tokens: Output tokens generated
+            cache_creation_tokens: Input tokens written to the prompt cache
+            cache_read_tokens: Input tokens served from the prompt cache
 
         Returns:
             Usage record with cost info
         """
-        cost = estimate_cost(model_id, input_tokens, output_tokens)
+        cost = estimate_cost(
+            model_id, input_tokens, output_tokens, cache_creation_tokens, cache_read_tokens
+        )
+        input_tokens += cache_creation_tokens + cache_read_tokens
         today = date.today()
 
-        # Get or create monthly usage record
-        monthly_usage = await self._get_or_create_period_usage(UsagePeriod.MONTHLY, today)
-
-        # Update totals
-        monthly_usage.input_tokens += input_tokens
-        monthly_usage.output_tokens += output_tokens
-        monthly_usage.total_cost = Decimal(str(float(monthly_usage.total_cost) + cost))
-        monthly_usage.requests_count += 1
-
-        # Update model breakdown
-        breakdown = monthly_usage.model_breakdown or {}
-        if isinstance(breakdown, str):
-            import json
-
-            breakdown = json.loads(breakdown) if breakdown else {}
-
-        if model_id not in breakdown:
-            breakdown[model_id] = {
-                "requests": 0,
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "cost": 0,
-            }
-
-        breakdown[model_id]["requests"] += 1
-        breakdown[model_id]["input_tokens"] += input_tokens
-        breakdown[model_id]["output_tokens"] += output_tokens
-        breakdown[model_id]["cost"] += cost
-
-        monthly_usage.model_breakdown = breakdown
-
-        await self.session.flush()
+        await self.accumulator.ensure_loaded(self.session, today)
+        totals = self.accumulator.record(
+            model_id, input_tokens, output_tokens, Decimal(str(cost)), today
+        )
 
         return {
             "model_id": model_id,
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
             "cost": cost,
-            "period_total_cost": float(monthly_usage.total_cost),
+            "period_total_cost": float(totals[UsagePeriod.MONTHLY].cost),
         }
 
     async def get_usage(
@@ -114,10 +101,12 @@ class UsageTracker:
             Usage statistics
         """
         today = date.today()
-        usage = await self._get_or_create_period_usage(period, today)
+        await self.accumulator.ensure_loaded(self.session, today)
+        usage = self.accumulator.get(period, today)
+        totals = usage.totals
 
         budget_limit = self.settings.ai_budget_limit
-        used = float(usage.total_cost)
+        used = float(totals.cost)
         remaining = max(0, budget_limit - used)
         percentage_used = (used / budget_limit * 100) if budget_limit > 0 else 0
 
@@ -126,9 +115,9 @@ class UsageTracker:
             "period_start": usage.period_start.isoformat(),
             "period_end": usage.period_end.isoformat(),
             "tokens_used": {
-                "input": usage.input_tokens,
-                "output": usage.output_tokens,
-                "total": usage.input_tokens + usage.output_tokens,
+                "input": totals.input_tokens,
+                "output": totals.output_tokens,
+                "total": totals.input_tokens + totals.output_tokens,
             },
             "cost": {
                 "amount": round(used, 4),
@@ -140,19 +129,22 @@ class UsageTracker:
                 "remaining": round(remaining, 4),
                 "percentage_used": round(percentage_used, 1),
             },
-            "requests_count": usage.requests_count,
+            "requests_count": totals.requests_count,
             "average_tokens_per_request": (
-                (usage.input_tokens + usage.output_tokens) // usage.requests_count
-                if usage.requests_count > 0
+                (totals.input_tokens + totals.output_tokens) // totals.requests_count
+                if totals.requests_count > 0
                 else 0
             ),
-            "model_breakdown": self._format_model_breakdown(usage.model_breakdown),
+            "model_breakdown": self._format_model_breakdown(totals.model_breakdown),
         }
 
     async def check_budget(self) -> dict:
         """
         Check budget status.
 
+        Served from the in-memory accumulator; only the first check of a
+        period touches the database.
+
         Returns:
             Budget status with alerts
         """
@@ -180,65 +172,13 @@ class UsageTracker:
 
         return status
 
-    async def _get_or_create_period_usage(
-        self,
-        period: UsagePeriod,
-        reference_date: date,
-    ) -> AIUsageDB:
-        """Get or create usage record for a period."""
-        period_start, period_end = self._get_period_bounds(period, reference_date)
-
-        # Try to find existing record
-        stmt = select(AIUsageDB).where(
-            and_(
-                AIUsageDB.period_type == period.value,
-                AIUsageDB.period_start == period_start,
-            )
-        )
-        result = await self.session.execute(stmt)
-        usage = result.scalar_one_or_none()
-
-        if not usage:
-            # Create new record
-            usage = AIUsageDB(
-                period_type=period.value,
-                period_start=period_start,
-                period_end=period_end,
-                input_tokens=0,
-                output_tokens=0,
-                total_cost=Decimal("0"),
-                requests_count=0,
-                model_breakdown={},
-            )
-            self.session.add(usage)
-            await self.session.flush()
-
-        return usage
-
     def _get_period_bounds(
         self,
         period: UsagePeriod,
         reference_date: date,
     ) -> tuple[date, date]:
         """Get start and end dates for a period."""
-        if period == UsagePeriod.DAILY:
-            return reference_date, reference_date
-
-        elif period == UsagePeriod.WEEKLY:
-            # Start on Monday
-            start = reference_date - timedelta(days=reference_date.weekday())
-            end = start + timedelta(days=6)
-            return start, end
-
-        else:  # MONTHLY
-            start = reference_date.replace(day=1)
-            # Last day of month
-            if reference_date.month == 12:
-                end = reference_date.replace(year=reference_date.year + 1, month=1, day=1)
-            else:
-                end = reference_date.replace(month=reference_date.month + 1, day=1)
-            end = end - timedelta(days=1)
-            return start, end
+        return get_period_bounds(period, reference_date)
 
     def _format_model_breakdown(self, breakdown: Optional[dict | str]) -> list[dict]:
         """Format model breakdown for API response."""
@@ -21,6 +21,8 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from cia_sie.ai.client_manager import get_client_manager
+from cia_sie.ai.usage_accumulator import get_usage_accumulator
 from cia_sie.api.routes import api_router
 from cia_sie.core.config import get_settings
 from cia_sie.core.security import (
@@ -28,6 +30,8 @@ from cia_sie.core.security import (
     SecurityHeadersMiddleware,
 )
 from cia_sie.dal.database import init_db
+from cia_sie.platforms.index_registry import get_index_registry
+from cia_sie.platforms.kite_ticker import stop_kite_ticker
 
 logger = logging.getLogger(__name__)
 
@@ -46,8 +50,22 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await init_db()
     logger.info("Database initialized")
 
-    # Log security configuration
+    # Open the pooled Anthropic transport shared by all AI callers
+    client_manager = get_client_manager()
+    await client_manager.startup()
+
+    # Start write-behind flushing of AI usage accounting
+    usage_accumulator = get_usage_accumulator()
+    usage_accumulator.start()
+
     settings = get_settings()
+
+    # Keep index constituent snapshots current
+    index_registry = get_index_registry()
+    if settings.index_snapshot_refresh_hours:
+        index_registry.start_refresh(settings.index_snapshot_refresh_hours)
+
+    # Log security configuration
     if settings.webhook_secret:
         logger.info("Webhook authentication: ENABLED")
     else:
@@ -57,6 +75,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Shutdown
     logger.info("Shutting down CIA-SIE application...")
+    await usage_accumulator.stop()
+    await client_manager.shutdown()
+    await stop_kite_ticker()
+    await index_registry.stop_refresh()
 
 
 def create_app() -> FastAPI:
@@ -18,20 +18,30 @@ from datetime import UTC, datetime
 from typing import Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
+from cia_sie.ai.budget_admission import get_budget_admission
 from cia_sie.ai.claude_client import ClaudeClient
-from cia_sie.ai.model_registry import estimate_cost, get_default_model, get_model_info
+from cia_sie.ai.model_registry import (
+    estimate_cost,
+    estimate_tokens,
+    get_default_model,
+    get_model_info,
+)
 from cia_sie.ai.response_validator import ensure_disclaimer, validate_ai_response
 from cia_sie.ai.usage_tracker import UsageTracker
+from cia_sie.core.config import get_settings
 from cia_sie.core.enums import MessageRole
+from cia_sie.core.exceptions import AIBudgetExceededError
 from cia_sie.dal.database import get_session_dependency
-from cia_sie.dal.models import ConversationDB
+from cia_sie.dal.models import ConversationDB, ConversationMessageDB
 from cia_sie.dal.repositories import (
     ChartRepository,
+    ConversationMessageRepository,
     InstrumentRepository,
     SignalRepository,
     SiloRepository,
@@ -48,6 +58,9 @@ MANDATORY_DISCLAIMER = (
     "The interpretation and any decision is entirely yours."
 )
 
+# Upper bound for history page sizes
+MAX_PAGE_SIZE = 200
+
 
 # =============================================================================
 # REQUEST/RESPONSE MODELS
@@ -60,6 +73,7 @@ class ChatMessage(BaseModel):
     role: str
     content: str
     timestamp: Optional[str] = None
+    sequence: Optional[int] = None
 
 
 class ChatRequest(BaseModel):
@@ -105,6 +119,8 @@ class ConversationSummary(BaseModel):
     created_at: str
     total_tokens: int
     total_cost: float
+    message_count: Optional[int] = None
+    has_more_messages: bool = False
 
 
 class ChatHistoryResponse(BaseModel):
@@ -112,6 +128,8 @@ class ChatHistoryResponse(BaseModel):
 
     scrip_id: str
     conversations: list[ConversationSummary]
+    offset: int = 0
+    has_more: bool = False
 
 
 # =============================================================================
@@ -207,6 +225,71 @@ Use this context to answer questions about current signals. Always describe the
     return base_prompt
 
 
+async def _get_or_create_conversation(
+    session: AsyncSession,
+    conversation_id: str,
+    instrument_id: str,
+    model_id: str,
+) -> ConversationDB:
+    """Get or create a conversation record (without loading the legacy messages column)."""
+    stmt = (
+        select(ConversationDB)
+        .options(defer(ConversationDB.messages))
+        .where(ConversationDB.conversation_id == conversation_id)
+    )
+    result = await session.execute(stmt)
+    conversation = result.scalar_one_or_none()
+
+    if not conversation:
+        conversation = ConversationDB(
+            conversation_id=conversation_id,
+            instrument_id=instrument_id,
+            messages=[],
+            model_used=model_id,
+            total_tokens=0,
+            total_cost=0,
+        )
+        session.add(conversation)
+        await session.flush()
+
+    return conversation
+
+
+def _trim_to_user_start(
+    messages: list[ConversationMessageDB],
+) -> list[ConversationMessageDB]:
+    """Drop leading non-user messages; Claude requires history to open with a user turn."""
+    start = 0
+    while start < len(messages) and messages[start].role != MessageRole.USER.value:
+        start += 1
+    return messages[start:]
+
+
+def _conversation_summary(
+    conversation: ConversationDB,
+    messages: list[ConversationMessageDB],
+    message_count: int,
+) -> ConversationSummary:
+    """Build a conversation summary from a page of message rows."""
+    return ConversationSummary(
+        conversation_id=conversation.conversation_id,
+        messages=[
+            ChatMessage(
+                role=m.role,
+                content=m.content,
+                timestamp=m.created_at.isoformat() if m.created_at else None,
+                sequence=m.sequence,
+            )
+            for m in messages
+        ],
+        created_at=conversation.created_at.isoformat() if conversation.created_at else "",
+        total_tokens=conversation.total_tokens or 0,
+        total_cost=float(conversation.total_cost) if conversation.total_cost else 0,
+        message_count=message_count,
+        has_more_messages=bool(messages) and messages[0].sequence > 0,
+    )
+
+
 # =============================================================================
 # ROUTES
 # =============================================================================
@@ -276,60 +359,83 @@ async def send_chat_message(
     conversation_id = request.conversation_id or str(uuid4())
     conversation = await _get_or_create_conversation(session, conversation_id, scrip_id, model_id)
 
-    # Generate response
-    client = ClaudeClient(model=model_id)
-    try:
-        response_text = await client.generate(
-            system_prompt=system_prompt,
-            user_prompt=request.message,
-            max_tokens=1500,
-            temperature=0.3,
+    # Prior turns that fit the history token budget
+    settings = get_settings()
+    message_repo = ConversationMessageRepository(session)
+    history = _trim_to_user_start(
+        await message_repo.get_context_window(
+            conversation_id,
+            token_budget=settings.chat_history_token_budget,
+            max_messages=settings.chat_history_max_messages,
         )
-    except Exception as e:
-        logger.error(f"AI generation error: {e}")
+    )
+    history_text = "".join(m.content for m in history)
+
+    # Reserve the worst-case cost before calling Claude
+    prompt_text = system_prompt + history_text + request.message
+    admission = get_budget_admission()
+    try:
+        reservation = admission.reserve(model_id, prompt_text, max_tokens=1500)
+    except AIBudgetExceededError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="AI service temporarily unavailable.",
+            detail="AI budget exhausted. AI features are temporarily disabled.",
         )
 
-    # Validate response
-    validation = validate_ai_response(response_text)
-    if not validation.is_valid:
-        logger.warning(f"AI response validation failed: {validation.violations}")
-        # Remediate by ensuring disclaimer
-        response_text = ensure_disclaimer(response_text)
+    try:
+        # Generate response
+        client = ClaudeClient(model=model_id)
+        try:
+            response_text = await client.generate(
+                system_prompt=system_prompt,
+                user_prompt=request.message,
+                max_tokens=1500,
+                temperature=0.3,
+                history=[{"role": m.role, "content": m.content} for m in history],
+            )
+        except Exception as e:
+            logger.error(f"AI generation error: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="AI service temporarily unavailable.",
+            )
+
+        # Validate response
+        validation = validate_ai_response(response_text)
+        if not validation.is_valid:
+            logger.warning(f"AI response validation failed: {validation.violations}")
+            # Remediate by ensuring disclaimer
+            response_text = ensure_disclaimer(response_text)
 
-    # Estimate tokens (rough approximation)
-    input_tokens = len(system_prompt.split()) + len(request.message.split())
-    output_tokens = len(response_text.split())
+        # Estimate tokens with the estimator the reservation used
+        input_tokens = estimate_tokens(prompt_text)
+        output_tokens = estimate_tokens(response_text)
 
-    # Calculate cost
-    cost = estimate_cost(model_id, input_tokens * 4, output_tokens * 4)  # ~4 chars/token
+        # Calculate cost
+        cost = estimate_cost(model_id, input_tokens, output_tokens)
 
-    # Record usage
-    await tracker.record_usage(model_id, input_tokens * 4, output_tokens * 4)
+        # Record usage, then settle the up-front reservation
+        await tracker.record_usage(model_id, input_tokens, output_tokens)
+        admission.reconcile(reservation, cost)
+    finally:
+        admission.release(reservation)
 
-    # Update conversation
+    # Append this turn (two rows; earlier messages are not rewritten)
     now = datetime.now(UTC)
-    messages = conversation.messages if isinstance(conversation.messages, list) else []
-
-    messages.append(
-        {
-            "role": MessageRole.USER.value,
-            "content": request.message,
-            "timestamp": now.isoformat(),
-        }
+    await message_repo.append(
+        conversation_id,
+        MessageRole.USER.value,
+        request.message,
+        token_count=estimate_tokens(request.message),
     )
-    messages.append(
-        {
-            "role": MessageRole.ASSISTANT.value,
-            "content": response_text,
-            "timestamp": now.isoformat(),
-        }
+    assistant_message = await message_repo.append(
+        conversation_id,
+        MessageRole.ASSISTANT.value,
+        response_text,
+        token_count=estimate_tokens(response_text),
     )
 
-    conversation.messages = messages
-    conversation.total_tokens += (input_tokens + output_tokens) * 4
+    conversation.total_tokens += input_tokens + output_tokens
     conversation.total_cost = float(conversation.total_cost) + cost
 
     await session.flush()
@@ -340,6 +446,7 @@ async def send_chat_message(
             role=MessageRole.ASSISTANT.value,
             content=response_text,
             timestamp=now.isoformat(),
+            sequence=assistant_message.sequence,
         ),
         context_used=ContextInfo(
             signals_included=signal_count,
@@ -348,8 +455,8 @@ async def send_chat_message(
         if request.include_context
         else None,
         usage=UsageInfo(
-            input_tokens=input_tokens * 4,
-            output_tokens=output_tokens * 4,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
             cost=cost,
             model_used=model_id,
         ),
@@ -360,18 +467,26 @@ async def send_chat_message(
 @router.get("/{scrip_id}/history", response_model=ChatHistoryResponse)
 async def get_chat_history(
     scrip_id: str,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    message_limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
     session: AsyncSession = Depends(get_session_dependency),
 ):
     """
     Get conversation history for an instrument.
 
+    Conversations are paged with limit/offset (newest first). Each includes
+    only its latest message_limit messages; page further back through
+    /{scrip_id}/history/{conversation_id}.
+
     Args:
         scrip_id: Instrument ID
         limit: Maximum conversations to return
+        offset: Conversations to skip
+        message_limit: Latest messages to include per conversation
 
     Returns:
-        List of conversations with messages
+        List of conversations with their latest messages
     """
     # Verify instrument exists
     instrument_repo = InstrumentRepository(session)
@@ -382,64 +497,79 @@ async def get_chat_history(
             detail=f"Instrument not found: {scrip_id}",
         )
 
-    # Get conversations
+    # Get one page of conversations (plus one row to detect a next page)
     stmt = (
         select(ConversationDB)
+        .options(defer(ConversationDB.messages))
         .where(ConversationDB.instrument_id == scrip_id)
         .order_by(ConversationDB.created_at.desc())
-        .limit(limit)
+        .offset(offset)
+        .limit(limit + 1)
     )
     result = await session.execute(stmt)
-    conversations = result.scalars().all()
+    conversations = list(result.scalars().all())
+    has_more = len(conversations) > limit
+    conversations = conversations[:limit]
+
+    conversation_ids = [c.conversation_id for c in conversations]
+    message_repo = ConversationMessageRepository(session)
+    latest = await message_repo.get_latest_by_conversations(conversation_ids, message_limit)
+    counts = await message_repo.count_by_conversations(conversation_ids)
 
     return ChatHistoryResponse(
         scrip_id=scrip_id,
         conversations=[
-            ConversationSummary(
-                conversation_id=c.conversation_id,
-                messages=[
-                    ChatMessage(
-                        role=m.get("role", "user"),
-                        content=m.get("content", ""),
-                        timestamp=m.get("timestamp"),
-                    )
-                    for m in (c.messages if isinstance(c.messages, list) else [])
-                ],
-                created_at=c.created_at.isoformat() if c.created_at else "",
-                total_tokens=c.total_tokens or 0,
-                total_cost=float(c.total_cost) if c.total_cost else 0,
+            _conversation_summary(
+                c,
+                latest.get(c.conversation_id, []),
+                counts.get(c.conversation_id, 0),
             )
             for c in conversations
         ],
+        offset=offset,
+        has_more=has_more,
     )
 
 
-# =============================================================================
-# HELPER FUNCTIONS
-# =============================================================================
+@router.get("/{scrip_id}/history/{conversation_id}", response_model=ConversationSummary)
+async def get_conversation_messages(
+    scrip_id: str,
+    conversation_id: str,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    before_sequence: Optional[int] = None,
+    session: AsyncSession = Depends(get_session_dependency),
+):
+    """
+    Get one page of messages from a conversation.
 
+    Args:
+        scrip_id: Instrument ID
+        conversation_id: Conversation ID
+        limit: Maximum messages to return
+        before_sequence: Return messages older than this sequence number
+            (the oldest sequence from the previous page)
 
-async def _get_or_create_conversation(
-    session: AsyncSession,
-    conversation_id: str,
-    instrument_id: str,
-    model_id: str,
-) -> ConversationDB:
-    """Get or create a conversation record."""
-    stmt = select(ConversationDB).where(ConversationDB.conversation_id == conversation_id)
+    Returns:
+        Conversation with the requested page of messages
+    """
+    stmt = (
+        select(ConversationDB)
+        .options(defer(ConversationDB.messages))
+        .where(
+            ConversationDB.conversation_id == conversation_id,
+            ConversationDB.instrument_id == scrip_id,
+        )
+    )
     result = await session.execute(stmt)
     conversation = result.scalar_one_or_none()
-
     if not conversation:
-        conversation = ConversationDB(
-            conversation_id=conversation_id,
-            instrument_id=instrument_id,
-            messages=[],
-            model_used=model_id,
-            total_tokens=0,
-            total_cost=0,
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Conversation not found: {conversation_id}",
         )
-        session.add(conversation)
-        await session.flush()
 
-    return conversation
+    message_repo = ConversationMessageRepository(session)
+    messages = await message_repo.get_page(conversation_id, limit, before_sequence)
+    message_count = await message_repo.count(conversation_id)
+
+    return _conversation_summary(conversation, messages, message_count)
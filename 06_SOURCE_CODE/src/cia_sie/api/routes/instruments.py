@@ -5,6 +5,7 @@ CIA-SIE Instruments API Routes
 CRUD operations for Instrument entities.
 """
 
+import logging
 from typing import Optional
 from uuid import UUID
 
@@ -16,7 +17,10 @@ from cia_sie.core.models import Instrument, InstrumentCreate
 from cia_sie.dal.database import get_session_dependency
 from cia_sie.dal.models import InstrumentDB
 from cia_sie.dal.repositories import InstrumentRepository
+from cia_sie.platforms.instruments_master import get_instruments_master
+from cia_sie.platforms.kite_ticker import refresh_ticker_subscriptions
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
@@ -76,6 +80,7 @@ async def create_instrument(
             metadata_json=metadata or None,
         )
         created = await repo.create(instrument_db)
+        await _refresh_ticker(repo)
         return _db_to_model(created)
     except DuplicateError as e:
         raise HTTPException(
@@ -134,6 +139,8 @@ async def update_instrument(
             display_name=display_name,
             is_active=is_active,
         )
+        if is_active is not None:
+            await _refresh_ticker(repo)
         return _db_to_model(updated)
     except InstrumentNotFoundError as e:
         raise HTTPException(
@@ -156,6 +163,17 @@ async def delete_instrument(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Cannot delete instrument: The instrument with ID '{instrument_id}' was not found.",
         )
+    await _refresh_ticker(repo)
+
+
+async def _refresh_ticker(repo: InstrumentRepository) -> None:
+    """Resync ticker subscriptions; the instrument change itself already succeeded."""
+    try:
+        unresolved = await refresh_ticker_subscriptions(repo, get_instruments_master())
+        if unresolved:
+            logger.warning(f"Kite ticker: no instrument token for {unresolved}")
+    except Exception as e:
+        logger.error(f"Kite ticker resync failed: {e}")
 
 
 def _db_to_model(db: InstrumentDB) -> Instrument:
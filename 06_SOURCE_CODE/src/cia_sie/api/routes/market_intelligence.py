@@ -21,11 +21,19 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from anthropic import AsyncAnthropic
-
-from cia_sie.ai.market_intelligence_agent import AgentResponse, MarketIntelligenceAgent
+from cia_sie.ai.budget_admission import get_budget_admission
+from cia_sie.ai.claude_client import ClaudeClient
+from cia_sie.ai.market_intelligence_agent import (
+    MAX_ITERATIONS,
+    MAX_TOKENS_PER_ITERATION,
+    SYSTEM_PROMPT,
+    AgentResponse,
+    MarketIntelligenceAgent,
+)
+from cia_sie.ai.model_registry import estimate_cost, estimate_tokens
 from cia_sie.ai.usage_tracker import UsageTracker
 from cia_sie.core.config import get_settings
+from cia_sie.core.exceptions import AIBudgetExceededError
 from cia_sie.dal.database import get_session_dependency
 from cia_sie.dal.repositories import (
     ChartRepository,
@@ -54,6 +62,15 @@ class ExecutionLogResponse(BaseModel):
     timestamp: str
 
 
+class IterationUsageResponse(BaseModel):
+    """Token usage for one agent iteration."""
+    iteration: int
+    input_tokens: int
+    output_tokens: int
+    cache_creation_input_tokens: int
+    cache_read_input_tokens: int
+
+
 class MarketQueryResponse(BaseModel):
     """Response from market intelligence query."""
     response: str
@@ -62,6 +79,7 @@ class MarketQueryResponse(BaseModel):
     data_sources: list[str]
     disclaimer: str
     query_time_ms: int
+    iteration_usage: list[IterationUsageResponse] = []
 
 
 @router.post("/query", response_model=MarketQueryResponse)
@@ -98,6 +116,21 @@ async def query_market_intelligence(
             detail="AI budget exhausted. Market intelligence is temporarily disabled."
         )
     
+    # Reserve the worst case of the whole agent loop up front
+    admission = get_budget_admission()
+    try:
+        reservation = admission.reserve(
+            settings.anthropic_model,
+            SYSTEM_PROMPT + request.query,
+            max_tokens=MAX_TOKENS_PER_ITERATION,
+            iterations=MAX_ITERATIONS,
+        )
+    except AIBudgetExceededError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI budget exhausted. Market intelligence is temporarily disabled."
+        )
+    
     # Initialize components
     try:
         kite_adapter = get_adapter("Kite")
@@ -108,8 +141,11 @@ async def query_market_intelligence(
             )
         
         kite_engine = KiteIntelligenceEngine(kite_adapter)
+        # Cached for the day after the first query (and across restarts)
+        await kite_engine.ensure_instruments()
         
-        anthropic_client = AsyncAnthropic(api_key=settings.anthropic_api_key)
+        # Shares the application's pooled Anthropic transport
+        anthropic_client = ClaudeClient(model=settings.anthropic_model).client
         
         exposer = RelationshipExposer(
             silo_repository=SiloRepository(session),
@@ -129,13 +165,38 @@ async def query_market_intelligence(
         
         result = await agent.query(
             user_message=request.query,
-            user_context=request.user_context
+            user_context=request.user_context,
+            max_iterations=MAX_ITERATIONS,
         )
         
-        # Record usage (estimate tokens)
-        input_tokens = len(request.query.split()) * 4
-        output_tokens = len(result.response.split()) * 4
-        await tracker.record_usage(settings.anthropic_model, input_tokens, output_tokens)
+        # Record usage (actual counts when the API reported them, else estimate).
+        # Cache writes and reads are priced at their own rates, so keep them apart.
+        if result.iteration_usage:
+            input_tokens = result.uncached_input_tokens
+            output_tokens = result.total_output_tokens
+            cache_creation_tokens = result.cache_creation_input_tokens
+            cache_read_tokens = result.cache_read_input_tokens
+        else:
+            input_tokens = estimate_tokens(SYSTEM_PROMPT + request.query)
+            output_tokens = estimate_tokens(result.response)
+            cache_creation_tokens = cache_read_tokens = 0
+        await tracker.record_usage(
+            settings.anthropic_model,
+            input_tokens,
+            output_tokens,
+            cache_creation_tokens,
+            cache_read_tokens,
+        )
+        admission.reconcile(
+            reservation,
+            estimate_cost(
+                settings.anthropic_model,
+                input_tokens,
+                output_tokens,
+                cache_creation_tokens,
+                cache_read_tokens,
+            ),
+        )
         
         query_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
         
@@ -153,7 +214,17 @@ async def query_market_intelligence(
             ],
             data_sources=result.data_sources,
             disclaimer=result.disclaimer,
-            query_time_ms=query_time_ms
+            query_time_ms=query_time_ms,
+            iteration_usage=[
+                IterationUsageResponse(
+                    iteration=u.iteration,
+                    input_tokens=u.input_tokens,
+                    output_tokens=u.output_tokens,
+                    cache_creation_input_tokens=u.cache_creation_input_tokens,
+                    cache_read_input_tokens=u.cache_read_input_tokens,
+                )
+                for u in result.iteration_usage
+            ]
         )
     
     except HTTPException:
@@ -163,3 +234,5 @@ async def query_market_intelligence(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Market intelligence query failed: {str(e)}"
         )
+    finally:
+        admission.release(reservation)
@@ -23,7 +23,16 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from pydantic import BaseModel
 
 from cia_sie.core.config import get_settings
+from cia_sie.dal.database import get_async_session
+from cia_sie.dal.repositories import InstrumentRepository
 from cia_sie.platforms.base import ConnectionStatus, PlatformCredentials
+from cia_sie.platforms.instruments_master import get_instruments_master
+from cia_sie.platforms.kite_ticker import (
+    get_kite_ticker,
+    refresh_ticker_subscriptions,
+    start_kite_ticker,
+    stop_kite_ticker,
+)
 from cia_sie.platforms.registry import get_registry
 
 logger = logging.getLogger(__name__)
@@ -169,6 +178,8 @@ async def connect_platform(request: PlatformConnectRequest):
 
     try:
         success = await adapter.connect(credentials)
+        if success and request.platform == "Kite":
+            await _start_kite_ticker(adapter)
         return PlatformConnectResponse(
             platform=request.platform,
             status=adapter.status.value,
@@ -198,6 +209,8 @@ async def disconnect_platform(platform_name: str):
         raise HTTPException(status_code=404, detail=f"Platform '{platform_name}' not found")
 
     await adapter.disconnect()
+    if platform_name == "Kite":
+        await stop_kite_ticker()
     return {"platform": platform_name, "status": "disconnected"}
 
 
@@ -437,7 +450,8 @@ async def kite_oauth_callback(
                     api_key=settings.kite_api_key,
                     access_token=access_token,
                 )
-                await adapter.connect(credentials)
+                if await adapter.connect(credentials):
+                    await _start_kite_ticker(adapter)
 
             # Return success page
             return HTMLResponse(
@@ -471,12 +485,49 @@ async def kite_connection_status():
     _ensure_adapters_registered()
 
     adapter = registry.get("Kite")
+    ticker = get_kite_ticker()
 
     return {
         "configured": bool(settings.kite_api_key and settings.kite_api_secret),
         "connected": adapter.is_connected if adapter else False,
         "status": adapter.status.value if adapter else "not_initialized",
         "login_url": "/api/v1/platforms/kite/login" if settings.kite_api_key else None,
+        "ticker": {
+            "connected": ticker.is_connected,
+            "subscribed": len(ticker.subscribed_tokens),
+        } if ticker else None,
+    }
+
+
+@router.post("/kite/ticker/sync")
+async def sync_kite_ticker():
+    """
+    Resubscribe the Kite tick stream to the active instruments.
+
+    Starts the stream if it is enabled but not yet running.
+    """
+    registry = get_registry()
+    _ensure_adapters_registered()
+
+    adapter = registry.get("Kite")
+    if not adapter or not adapter.is_connected:
+        raise HTTPException(status_code=400, detail="Not connected to Kite. Please login first.")
+    if not get_settings().kite_ticker_enabled:
+        raise HTTPException(status_code=400, detail="Kite ticker disabled (set KITE_TICKER_ENABLED)")
+
+    if get_kite_ticker() is None:
+        await _start_kite_ticker(adapter)
+        unresolved = []
+    else:
+        async with get_async_session() as session:
+            unresolved = await refresh_ticker_subscriptions(
+                InstrumentRepository(session), get_instruments_master()
+            )
+
+    ticker = get_kite_ticker()
+    return {
+        "subscribed": len(ticker.subscribed_tokens) if ticker else 0,
+        "unresolved": unresolved or [],
     }
 
 
@@ -590,6 +641,24 @@ async def get_kite_profile():
 # ============================================================================
 
 
+async def _start_kite_ticker(adapter) -> None:
+    """Start streaming ticks for the active instruments, if enabled."""
+    if not get_settings().kite_ticker_enabled:
+        return
+    try:
+        instruments = get_instruments_master()
+        await instruments.ensure_loaded(adapter._client)
+        await start_kite_ticker(adapter._api_key, adapter._access_token)
+        async with get_async_session() as session:
+            unresolved = await refresh_ticker_subscriptions(
+                InstrumentRepository(session), instruments
+            )
+        if unresolved:
+            logger.warning(f"Kite ticker: no instrument token for {unresolved}")
+    except Exception as e:
+        logger.error(f"Kite ticker start failed: {e}")
+
+
 def _ensure_adapters_registered():
     """Ensure default adapters are registered."""
     registry = get_registry()
@@ -22,10 +22,17 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from cia_sie.ai.budget_admission import get_budget_admission
 from cia_sie.ai.claude_client import ClaudeClient
-from cia_sie.ai.model_registry import estimate_cost, get_default_model, get_model_info
+from cia_sie.ai.model_registry import (
+    estimate_cost,
+    estimate_tokens,
+    get_default_model,
+    get_model_info,
+)
 from cia_sie.ai.response_validator import ensure_disclaimer, validate_ai_response
 from cia_sie.ai.usage_tracker import UsageTracker
+from cia_sie.core.exceptions import AIBudgetExceededError
 from cia_sie.dal.database import get_session_dependency
 from cia_sie.dal.repositories import (
     ChartRepository,
@@ -311,38 +318,53 @@ async def evaluate_strategy_alignment(
     # Build prompts
     system_prompt, user_prompt = build_strategy_prompt(request.strategy_description, context)
 
-    # Generate response
-    client = ClaudeClient(model=model_id)
+    # Reserve the worst-case cost before calling Claude
+    prompt_text = system_prompt + user_prompt
+    admission = get_budget_admission()
     try:
-        response_text = await client.generate(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            max_tokens=1500,
-            temperature=0.2,  # Lower temperature for more factual responses
-        )
-    except Exception as e:
-        logger.error(f"AI generation error: {e}")
+        reservation = admission.reserve(model_id, prompt_text, max_tokens=1500)
+    except AIBudgetExceededError:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="AI service temporarily unavailable.",
+            detail="AI budget exhausted. AI features are temporarily disabled.",
         )
 
-    # Validate response
-    validation = validate_ai_response(response_text)
-    if not validation.is_valid:
-        logger.warning(f"Strategy evaluation validation failed: {validation.violations}")
-        # Remediate
-        response_text = ensure_disclaimer(response_text)
-
-    # Estimate tokens
-    input_tokens = (len(system_prompt.split()) + len(user_prompt.split())) * 4
-    output_tokens = len(response_text.split()) * 4
-
-    # Calculate cost
-    cost = estimate_cost(model_id, input_tokens, output_tokens)
+    try:
+        # Generate response
+        client = ClaudeClient(model=model_id)
+        try:
+            response_text = await client.generate(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                max_tokens=1500,
+                temperature=0.2,  # Lower temperature for more factual responses
+            )
+        except Exception as e:
+            logger.error(f"AI generation error: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="AI service temporarily unavailable.",
+            )
 
-    # Record usage
-    await tracker.record_usage(model_id, input_tokens, output_tokens)
+        # Validate response
+        validation = validate_ai_response(response_text)
+        if not validation.is_valid:
+            logger.warning(f"Strategy evaluation validation failed: {validation.violations}")
+            # Remediate
+            response_text = ensure_disclaimer(response_text)
+
+        # Estimate tokens with the estimator the reservation used
+        input_tokens = estimate_tokens(prompt_text)
+        output_tokens = estimate_tokens(response_text)
+
+        # Calculate cost
+        cost = estimate_cost(model_id, input_tokens, output_tokens)
+
+        # Record usage, then settle the up-front reservation
+        await tracker.record_usage(model_id, input_tokens, output_tokens)
+        admission.reconcile(reservation, cost)
+    finally:
+        admission.release(reservation)
 
     # Build structured response from context (not from AI response)
     # The AI response is just additional descriptive text
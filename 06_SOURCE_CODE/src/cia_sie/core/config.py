@@ -69,6 +69,21 @@ class Settings(BaseSettings):
         default="claude-3-5-sonnet-20241022",
         description="Claude model to use for narrative generation",
     )
+    anthropic_base_url: Optional[str] = Field(
+        default=None, description="Override Anthropic API base URL (e.g. local fake server)"
+    )
+    anthropic_max_connections: int = Field(
+        default=20, ge=1, description="Maximum pooled connections to the Anthropic API"
+    )
+    anthropic_max_keepalive_connections: int = Field(
+        default=10, ge=0, description="Idle connections kept alive for reuse"
+    )
+    anthropic_keepalive_expiry: float = Field(
+        default=30.0, gt=0, description="Seconds an idle pooled connection is kept open"
+    )
+    anthropic_timeout: float = Field(
+        default=60.0, gt=0, description="Anthropic request timeout in seconds"
+    )
 
     # =========================================================================
     # AI BUDGET & USAGE
@@ -86,6 +101,15 @@ class Settings(BaseSettings):
     ai_fallback_model: str = Field(
         default="claude-3-haiku-20240307", description="Fallback model when budget is low"
     )
+    ai_usage_flush_interval_seconds: float = Field(
+        default=30.0, gt=0, description="Seconds between write-behind flushes of AI usage"
+    )
+    chat_history_token_budget: int = Field(
+        default=4000, ge=0, description="Max tokens of prior conversation sent with a chat turn"
+    )
+    chat_history_max_messages: int = Field(
+        default=20, ge=0, description="Max prior messages sent with a chat turn"
+    )
 
     # =========================================================================
     # WEBHOOK
@@ -101,6 +125,35 @@ class Settings(BaseSettings):
         default="http://127.0.0.1:8000/api/v1/platforms/kite/callback",
         description="Kite OAuth redirect URI",
     )
+    kite_candle_store_path: Optional[str] = Field(
+        default="./data/kite_candles.db",
+        description="SQLite file caching Kite historical candles (empty to disable)",
+    )
+    kite_instruments_cache_path: Optional[str] = Field(
+        default="./data/kite_instruments.csv",
+        description="Kite instruments dump cache, refreshed daily (empty for memory only)",
+    )
+    kite_quote_ttl_seconds: float = Field(
+        default=1.0,
+        description="Seconds a Kite quote is reused across requests (0 to only coalesce)",
+    )
+    kite_ticker_enabled: bool = Field(
+        default=False,
+        description="Stream ticks for active instruments over the Kite WebSocket feed",
+    )
+    kite_ticker_url: str = Field(
+        default="wss://ws.kite.trade",
+        description="Kite WebSocket feed URL",
+    )
+    index_snapshot_dir: Optional[str] = Field(
+        default="./data/index_snapshots",
+        description="Dated index constituent and sector snapshots (CSV/JSON)",
+    )
+    index_snapshot_refresh_hours: float = Field(
+        default=0,
+        ge=0,
+        description="Hours between downloads of NSE index lists (0 to disable)",
+    )
 
     # =========================================================================
     # FRESHNESS DEFAULTS (can be overridden per silo)
@@ -99,6 +99,12 @@ class AIProviderError(CIASIEError):
     pass
 
 
+class AIBudgetExceededError(CIASIEError):
+    """Raised when an AI request cannot be admitted within the remaining budget."""
+
+    pass
+
+
 class PlatformAdapterError(CIASIEError):
     """Raised when platform adapter operations fail."""
 
@@ -281,7 +281,7 @@ class ConversationDB(Base):
     )
     messages: Mapped[str] = mapped_column(
         JSON, nullable=False, default="[]"
-    )  # Array of {role, content, timestamp}
+    )  # Legacy array of {role, content, timestamp}; see ConversationMessageDB
     model_used: Mapped[str] = mapped_column(String(50), nullable=False)
     total_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     total_cost: Mapped[Decimal] = mapped_column(Numeric(10, 6), nullable=False, default=0)
@@ -297,6 +297,36 @@ class ConversationDB(Base):
     )
 
 
+class ConversationMessageDB(Base):
+    """
+    AI Conversation Messages Table.
+
+    One row per message, appended in order. Replaces rewriting the whole
+    ConversationDB.messages JSON list on every turn, and lets prompt
+    assembly read only the most recent messages that fit a token budget.
+
+    Per Gold Standard Specification Section 14 (AI Integration).
+    """
+
+    __tablename__ = "conversation_messages"
+
+    message_id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    conversation_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("conversations.conversation_id"), nullable=False
+    )
+    sequence: Mapped[int] = mapped_column(Integer, nullable=False)  # 0-based, per conversation
+    role: Mapped[str] = mapped_column(String(20), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    token_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=utc_now)
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint("conversation_id", "sequence", name="uq_conversation_message_sequence"),
+        Index("idx_conversation_messages_sequence", "conversation_id", "sequence"),
+    )
+
+
 class AIUsageDB(Base):
     """
     AI Usage Tracking Table.
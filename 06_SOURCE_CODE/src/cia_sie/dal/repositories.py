@@ -13,7 +13,8 @@ from collections.abc import Sequence
 from datetime import datetime
 from typing import Generic, Optional, TypeVar
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -25,6 +26,7 @@ from cia_sie.dal.models import (
     AnalyticalBasketDB,
     BasketChartDB,
     ChartDB,
+    ConversationMessageDB,
     InstrumentDB,
     SignalDB,
     SiloDB,
@@ -473,3 +475,220 @@ class BasketRepository(BaseRepository[AnalyticalBasketDB]):
         basket.updated_at = datetime.utcnow()
         await self.session.flush()
         return True
+
+
+# =============================================================================
+# CONVERSATION MESSAGE REPOSITORY
+# =============================================================================
+
+
+class ConversationMessageRepository(BaseRepository[ConversationMessageDB]):
+    """
+    Repository for append-only conversation messages.
+
+    Every read is bounded: prompt assembly takes a token-budgeted window of
+    the most recent messages and history is served a page at a time, both
+    via the (conversation_id, sequence) index.
+    """
+
+    # Attempts to allocate a sequence before a concurrent append's
+    # IntegrityError is surfaced to the caller
+    SEQUENCE_ATTEMPTS = 5
+
+    async def get_by_id(self, message_id: str) -> Optional[ConversationMessageDB]:
+        """Get message by ID."""
+        result = await self.session.execute(
+            select(ConversationMessageDB).where(ConversationMessageDB.message_id == message_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_all(self, active_only: bool = True) -> Sequence[ConversationMessageDB]:
+        """Get all messages (messages have no active flag)."""
+        result = await self.session.execute(
+            select(ConversationMessageDB).order_by(
+                ConversationMessageDB.conversation_id, ConversationMessageDB.sequence
+            )
+        )
+        return result.scalars().all()
+
+    async def create(self, message: ConversationMessageDB) -> ConversationMessageDB:
+        """
+        Create a message, assigning the next sequence if unset.
+
+        Two concurrent appends to one conversation can read the same last
+        sequence; the loser hits uq_conversation_message_sequence. Each
+        attempt runs in a savepoint, so only that insert is rolled back and
+        the sequence is re-read and retried.
+        """
+        if message.sequence is not None:
+            self.session.add(message)
+            await self.session.flush()
+            return message
+
+        attempts = 0
+        while True:
+            message.sequence = await self._next_sequence(message.conversation_id)
+            try:
+                async with self.session.begin_nested():
+                    self.session.add(message)
+                    await self.session.flush()
+                return message
+            except IntegrityError:
+                attempts += 1
+                if attempts >= self.SEQUENCE_ATTEMPTS:
+                    raise
+
+    async def append(
+        self,
+        conversation_id: str,
+        role: str,
+        content: str,
+        token_count: int,
+    ) -> ConversationMessageDB:
+        """Append one message to the end of a conversation."""
+        return await self.create(
+            ConversationMessageDB(
+                conversation_id=conversation_id,
+                role=role,
+                content=content,
+                token_count=token_count,
+            )
+        )
+
+    async def count(self, conversation_id: str) -> int:
+        """Number of messages in a conversation."""
+        result = await self.session.execute(
+            select(func.count())
+            .select_from(ConversationMessageDB)
+            .where(ConversationMessageDB.conversation_id == conversation_id)
+        )
+        return result.scalar_one()
+
+    async def get_context_window(
+        self,
+        conversation_id: str,
+        token_budget: int,
+        max_messages: int,
+    ) -> list[ConversationMessageDB]:
+        """
+        Get the most recent messages that fit within a token budget.
+
+        Reads at most max_messages rows, newest first, and stops at the
+        first message that would exceed the budget.
+
+        Returns:
+            Messages in chronological order
+        """
+        if token_budget <= 0 or max_messages <= 0:
+            return []
+
+        result = await self.session.execute(
+            select(ConversationMessageDB)
+            .where(ConversationMessageDB.conversation_id == conversation_id)
+            .order_by(ConversationMessageDB.sequence.desc())
+            .limit(max_messages)
+        )
+
+        window: list[ConversationMessageDB] = []
+        used = 0
+        for message in result.scalars():
+            if used + message.token_count > token_budget:
+                break
+            window.append(message)
+            used += message.token_count
+
+        window.reverse()
+        return window
+
+    async def get_page(
+        self,
+        conversation_id: str,
+        limit: int = 50,
+        before_sequence: Optional[int] = None,
+    ) -> list[ConversationMessageDB]:
+        """
+        Get a page of messages ending just before a sequence number.
+
+        Pass the sequence of the oldest message already shown as
+        before_sequence to page backwards.
+
+        Returns:
+            Messages in chronological order
+        """
+        query = select(ConversationMessageDB).where(
+            ConversationMessageDB.conversation_id == conversation_id
+        )
+        if before_sequence is not None:
+            query = query.where(ConversationMessageDB.sequence < before_sequence)
+        result = await self.session.execute(
+            query.order_by(ConversationMessageDB.sequence.desc()).limit(limit)
+        )
+        messages = list(result.scalars().all())
+        messages.reverse()
+        return messages
+
+    async def get_latest_by_conversations(
+        self,
+        conversation_ids: list[str],
+        per_conversation: int,
+    ) -> dict[str, list[ConversationMessageDB]]:
+        """
+        Get the latest messages for multiple conversations in one query.
+
+        Returns:
+            Dict mapping conversation_id to its messages in chronological order
+        """
+        if not conversation_ids or per_conversation <= 0:
+            return {}
+
+        ranked = (
+            select(
+                ConversationMessageDB.message_id,
+                func.row_number()
+                .over(
+                    partition_by=ConversationMessageDB.conversation_id,
+                    order_by=ConversationMessageDB.sequence.desc(),
+                )
+                .label("rank"),
+            )
+            .where(ConversationMessageDB.conversation_id.in_(conversation_ids))
+            .subquery()
+        )
+        result = await self.session.execute(
+            select(ConversationMessageDB)
+            .join(ranked, ConversationMessageDB.message_id == ranked.c.message_id)
+            .where(ranked.c.rank <= per_conversation)
+            .order_by(ConversationMessageDB.conversation_id, ConversationMessageDB.sequence)
+        )
+
+        grouped: dict[str, list[ConversationMessageDB]] = {}
+        for message in result.scalars():
+            grouped.setdefault(message.conversation_id, []).append(message)
+        return grouped
+
+    async def count_by_conversations(self, conversation_ids: list[str]) -> dict[str, int]:
+        """Message counts for multiple conversations in one query."""
+        if not conversation_ids:
+            return {}
+        result = await self.session.execute(
+            select(ConversationMessageDB.conversation_id, func.count())
+            .where(ConversationMessageDB.conversation_id.in_(conversation_ids))
+            .group_by(ConversationMessageDB.conversation_id)
+        )
+        return {conversation_id: count for conversation_id, count in result.all()}
+
+    async def delete(self, message_id: str) -> bool:
+        """Hard delete a message."""
+        result = await self.session.execute(
+            delete(ConversationMessageDB).where(ConversationMessageDB.message_id == message_id)
+        )
+        return result.rowcount > 0
+
+    async def _next_sequence(self, conversation_id: str) -> int:
+        result = await self.session.execute(
+            select(func.max(ConversationMessageDB.sequence)).where(
+                ConversationMessageDB.conversation_id == conversation_id
+            )
+        )
+        last = result.scalar_one_or_none()
+        return 0 if last is None else last + 1
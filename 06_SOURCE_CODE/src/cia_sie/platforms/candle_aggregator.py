@@ -0,0 +1,257 @@
+"""
+CIA-SIE Candle Aggregator
+=========================
+
+Intraday OHLCV candles built locally from streamed ticks.
+
+The current trading day is never stored (candles are still forming), so
+every intraday request for today used to go to Kite's historical API. With
+the ticker running, the aggregator folds each tick into the open candle of
+every tracked interval as it arrives:
+
+- O(1) per tick per interval: the tick's bucket is computed arithmetically;
+  the same bucket updates the open candle in place, a new one appends.
+- Candle volume is the change in Kite's cumulative day volume between
+  ticks, so a candle's volume is what traded inside it.
+- Session VWAP and running day volume are kept as running sums. VWAP is
+  seeded from the exchange's average price on the first tick, so it is
+  correct even when streaming starts mid-session.
+
+If streaming started after the open, the earlier candles are backfilled
+once from Kite and kept, after which today is served entirely locally.
+
+All wall-clock arithmetic (bucket boundaries, the trading day, the session
+open) is done in exchange time (IST), whatever the server's local zone.
+Candle timestamps are naive IST, as Kite's historical candles are.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+from array import array
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+# Intervals aggregated by default (Kite interval names -> seconds)
+INTERVAL_SECONDS = {
+    "minute": 60,
+    "5minute": 300,
+    "15minute": 900,
+}
+
+# NSE/BSE cash session open, in exchange time
+MARKET_OPEN = time(9, 15)
+MARKET_TZ = ZoneInfo("Asia/Kolkata")
+
+CandleRow = tuple[datetime, Decimal, Decimal, Decimal, Decimal, int]
+
+
+def market_time(timestamp: float) -> datetime:
+    """Epoch seconds as naive exchange (IST) wall-clock time."""
+    return datetime.fromtimestamp(timestamp, MARKET_TZ).replace(tzinfo=None)
+
+
+def market_today() -> date:
+    """The current trading day's date in exchange time."""
+    return datetime.now(MARKET_TZ).date()
+
+
+class _Bars:
+    """Candles for one instrument and interval, oldest first; the last is open."""
+
+    __slots__ = ("seconds", "starts", "open", "high", "low", "close", "volume", "backfill")
+
+    def __init__(self, seconds: int):
+        self.seconds = seconds
+        self.starts = array("d")
+        self.open = array("d")
+        self.high = array("d")
+        self.low = array("d")
+        self.close = array("d")
+        self.volume = array("q")
+        self.backfill: Optional[list[CandleRow]] = None
+
+    def update(self, start: float, price: float, volume: int) -> None:
+        if self.starts and self.starts[-1] == start:
+            if price > self.high[-1]:
+                self.high[-1] = price
+            elif price < self.low[-1]:
+                self.low[-1] = price
+            self.close[-1] = price
+            self.volume[-1] += volume
+        elif not self.starts or start > self.starts[-1]:
+            self.starts.append(start)
+            self.open.append(price)
+            self.high.append(price)
+            self.low.append(price)
+            self.close.append(price)
+            self.volume.append(volume)
+        # Ticks older than the open candle are late arrivals; ignored
+
+    def rows(self) -> list[CandleRow]:
+        rows = list(self.backfill or ())
+        for i in range(len(self.starts)):
+            rows.append((
+                market_time(self.starts[i]),
+                Decimal(str(self.open[i])),
+                Decimal(str(self.high[i])),
+                Decimal(str(self.low[i])),
+                Decimal(str(self.close[i])),
+                self.volume[i],
+            ))
+        return rows
+
+
+class _Session:
+    """One instrument's running state for the current trading day."""
+
+    __slots__ = ("day", "bars", "last_volume", "pv", "pv_volume", "baseline", "baseline_days")
+
+    def __init__(self, day: date, intervals: dict[str, int]):
+        self.day = day
+        self.bars = {name: _Bars(seconds) for name, seconds in intervals.items()}
+        self.last_volume: Optional[int] = None
+        self.pv = 0.0
+        self.pv_volume = 0
+        self.baseline: Optional[float] = None
+        self.baseline_days: Optional[int] = None
+
+
+class CandleAggregator:
+    """
+    Incremental per-instrument, per-interval candle builder.
+
+    Feed it ticks via on_tick (or on_ticks straight from a TickTable);
+    read candles, VWAP and running volume back by instrument token.
+    """
+
+    def __init__(self, intervals: Optional[dict[str, int]] = None):
+        """
+        Initialize the aggregator.
+
+        Args:
+            intervals: Interval name -> bucket seconds (default: 1m, 5m, 15m)
+        """
+        self.intervals = dict(intervals or INTERVAL_SECONDS)
+        self._sessions: dict[int, _Session] = {}
+        # Buckets align to exchange wall-clock boundaries (IST has no DST)
+        self._utc_offset = datetime.now(MARKET_TZ).utcoffset().total_seconds()
+
+    def on_tick(
+        self,
+        token: int,
+        timestamp: float,
+        price: float,
+        cumulative_volume: int = 0,
+        average_price: float = 0.0,
+    ) -> None:
+        """
+        Fold one tick into every interval's open candle.
+
+        Args:
+            token: Instrument token
+            timestamp: Tick time (epoch seconds)
+            price: Last traded price
+            cumulative_volume: Day volume so far, as Kite reports it
+            average_price: Exchange VWAP for the day, if known
+        """
+        day = market_time(timestamp).date()
+        session = self._sessions.get(token)
+        if session is None or session.day != day:
+            session = self._sessions[token] = _Session(day, self.intervals)
+
+        if session.last_volume is None:
+            traded = 0
+            if average_price and cumulative_volume:
+                session.pv = average_price * cumulative_volume
+                session.pv_volume = cumulative_volume
+        else:
+            traded = max(cumulative_volume - session.last_volume, 0)
+            session.pv += price * traded
+            session.pv_volume += traded
+        session.last_volume = cumulative_volume
+
+        local = timestamp + self._utc_offset
+        for bars in session.bars.values():
+            bars.update(timestamp - local % bars.seconds, price, traded)
+
+    def on_ticks(self, table, rows: Iterable[int]) -> None:
+        """Fold updated TickTable rows into their candles."""
+        for row in rows:
+            self.on_tick(
+                table.tokens[row],
+                table.exchange_time[row] or table.received_at[row],
+                table.ltp[row],
+                table.volume[row],
+                table.average_price[row],
+            )
+
+    def drop(self, token: int) -> None:
+        """Forget an instrument (e.g. on unsubscribe)."""
+        self._sessions.pop(token, None)
+
+    # =========================================================================
+    # CANDLES
+    # =========================================================================
+
+    def has_candles(self, token: int, interval: str) -> bool:
+        """True if today's candles for this instrument and interval are tracked."""
+        session = self._sessions.get(token)
+        return (
+            session is not None
+            and session.day == market_today()
+            and interval in session.bars
+            and len(session.bars[interval].starts) > 0
+        )
+
+    def needs_backfill(self, token: int, interval: str) -> bool:
+        """True if streaming started after the open and earlier candles are missing."""
+        bars = self._sessions[token].bars[interval]
+        if bars.backfill is not None:
+            return False
+        return market_time(bars.starts[0]).time() > MARKET_OPEN
+
+    def backfill(self, token: int, interval: str, rows: Sequence[CandleRow]) -> None:
+        """Keep fetched candles that precede the first streamed one."""
+        bars = self._sessions[token].bars[interval]
+        first = market_time(bars.starts[0])
+        bars.backfill = [r for r in rows if r[0] < first]
+
+    def candles(self, token: int, interval: str) -> list[CandleRow]:
+        """Today's candles, oldest first; the last one may still be forming."""
+        session = self._sessions.get(token)
+        if session is None or interval not in session.bars:
+            return []
+        return session.bars[interval].rows()
+
+    # =========================================================================
+    # ROLLING INDICATORS
+    # =========================================================================
+
+    def vwap(self, token: int) -> Optional[float]:
+        """Session volume-weighted average price."""
+        session = self._sessions.get(token)
+        if session is None or not session.pv_volume:
+            return None
+        return session.pv / session.pv_volume
+
+    def running_volume(self, token: int) -> Optional[int]:
+        """Day volume so far."""
+        session = self._sessions.get(token)
+        return session.last_volume if session is not None else None
+
+    def set_baseline(self, token: int, average_volume: float, days: int) -> None:
+        """Record the average daily volume the running volume is compared to."""
+        session = self._sessions.get(token)
+        if session is not None:
+            session.baseline = average_volume
+            session.baseline_days = days
+
+    def baseline(self, token: int, days: int) -> Optional[float]:
+        """Baseline recorded today for this many days, if any."""
+        session = self._sessions.get(token)
+        if session is None or session.baseline_days != days:
+            return None
+        return session.baseline
@@ -0,0 +1,276 @@
+"""
+CIA-SIE Kite Candle Store
+=========================
+
+Persistent local store for Kite historical OHLCV candles.
+
+Kite's /instruments/historical API is strictly rate limited, and pivots,
+comparisons, volume profiles and the agent's get_historical_data tool all
+ask for overlapping date ranges. The store keeps every candle fetched,
+keyed by (instrument_token, interval), together with the date ranges that
+have been fetched in full. A request is then served from local data, and
+only the date gaps not yet covered go to Kite.
+
+Storage is a single SQLite file:
+- candles:        WITHOUT ROWID table clustered on (token, interval, ts),
+                  so a date range is one contiguous index scan
+- candle_coverage: merged [from_date, to_date] ranges already fetched
+
+The current trading day is mutable (candles are still forming), so it is
+never stored or marked covered; it is always fetched live.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional
+
+from cia_sie.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Longest date range Kite serves per historical request, by interval
+MAX_DAYS_PER_REQUEST = {
+    "minute": 60,
+    "3minute": 100,
+    "5minute": 100,
+    "10minute": 100,
+    "15minute": 200,
+    "30minute": 200,
+    "60minute": 400,
+    "day": 2000,
+}
+
+DateRange = tuple[date, date]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    instrument_token INTEGER NOT NULL,
+    interval TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume INTEGER NOT NULL,
+    PRIMARY KEY (instrument_token, interval, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS candle_coverage (
+    instrument_token INTEGER NOT NULL,
+    interval TEXT NOT NULL,
+    from_date TEXT NOT NULL,
+    to_date TEXT NOT NULL,
+    PRIMARY KEY (instrument_token, interval, from_date)
+) WITHOUT ROWID;
+"""
+
+
+def subtract_ranges(requested: DateRange, covered: list[DateRange]) -> list[DateRange]:
+    """
+    Get the parts of a date range not covered by any of the given ranges.
+
+    Args:
+        requested: Inclusive (from_date, to_date)
+        covered: Inclusive ranges, sorted by start and non-overlapping
+
+    Returns:
+        Uncovered inclusive ranges in order
+    """
+    start, end = requested
+    gaps = []
+    for cov_start, cov_end in covered:
+        if cov_end < start:
+            continue
+        if cov_start > end:
+            break
+        if cov_start > start:
+            gaps.append((start, cov_start - timedelta(days=1)))
+        start = max(start, cov_end + timedelta(days=1))
+        if start > end:
+            return gaps
+    if start <= end:
+        gaps.append((start, end))
+    return gaps
+
+
+def merge_ranges(ranges: list[DateRange]) -> list[DateRange]:
+    """Merge overlapping or adjacent inclusive date ranges."""
+    merged: list[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def split_range(requested: DateRange, max_days: int) -> list[DateRange]:
+    """Split an inclusive date range into chunks of at most max_days days."""
+    start, end = requested
+    chunks = []
+    while start <= end:
+        chunk_end = min(end, start + timedelta(days=max_days - 1))
+        chunks.append((start, chunk_end))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+class CandleStore:
+    """
+    SQLite-backed candle store.
+
+    Methods are synchronous and serialized by a lock; the engine calls them
+    via asyncio.to_thread so the event loop never waits on disk.
+
+    Rows are plain tuples (timestamp, open, high, low, close, volume) so the
+    store has no dependency on the engine's dataclasses.
+    """
+
+    def __init__(self, path: str | Path = ":memory:"):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite file path, or ":memory:" for a process-local store
+        """
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
+
+    # =========================================================================
+    # COVERAGE
+    # =========================================================================
+
+    def get_coverage(self, token: int, interval: str) -> list[DateRange]:
+        """Date ranges fully fetched for a key, sorted and merged."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT from_date, to_date FROM candle_coverage "
+                "WHERE instrument_token = ? AND interval = ? ORDER BY from_date",
+                (token, interval),
+            ).fetchall()
+        return [(date.fromisoformat(f), date.fromisoformat(t)) for f, t in rows]
+
+    def get_missing_ranges(
+        self,
+        token: int,
+        interval: str,
+        from_date: date,
+        to_date: date,
+    ) -> list[DateRange]:
+        """Date ranges within [from_date, to_date] not yet fetched."""
+        if from_date > to_date:
+            return []
+        return subtract_ranges((from_date, to_date), self.get_coverage(token, interval))
+
+    # =========================================================================
+    # READ / WRITE
+    # =========================================================================
+
+    def get_candles(
+        self,
+        token: int,
+        interval: str,
+        from_date: date,
+        to_date: date,
+    ) -> list[tuple[datetime, Decimal, Decimal, Decimal, Decimal, int]]:
+        """Stored candles with timestamps in [from_date, to_date], oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, open, high, low, close, volume FROM candles "
+                "WHERE instrument_token = ? AND interval = ? AND ts >= ? AND ts < ? "
+                "ORDER BY ts",
+                (token, interval, _day_start(from_date), _day_start(to_date + timedelta(days=1))),
+            ).fetchall()
+        return [
+            (
+                datetime.fromisoformat(ts),
+                Decimal(str(o)),
+                Decimal(str(h)),
+                Decimal(str(lo)),
+                Decimal(str(c)),
+                v,
+            )
+            for ts, o, h, lo, c, v in rows
+        ]
+
+    def put_candles(
+        self,
+        token: int,
+        interval: str,
+        candles: list[tuple[datetime, Decimal, Decimal, Decimal, Decimal, int]],
+        covered: Optional[DateRange] = None,
+    ) -> None:
+        """
+        Upsert candles and optionally record a date range as fully fetched.
+
+        Both happen in one transaction, so a range is never marked covered
+        without its candles.
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO candles "
+                "(instrument_token, interval, ts, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (token, interval, ts.isoformat(sep=" "), *map(float, (o, h, lo, c)), v)
+                    for ts, o, h, lo, c, v in candles
+                ],
+            )
+            if covered is not None:
+                self._add_coverage(token, interval, covered)
+
+    def _add_coverage(self, token: int, interval: str, covered: DateRange) -> None:
+        rows = self._conn.execute(
+            "SELECT from_date, to_date FROM candle_coverage "
+            "WHERE instrument_token = ? AND interval = ?",
+            (token, interval),
+        ).fetchall()
+        ranges = [(date.fromisoformat(f), date.fromisoformat(t)) for f, t in rows]
+        merged = merge_ranges(ranges + [covered])
+
+        self._conn.execute(
+            "DELETE FROM candle_coverage WHERE instrument_token = ? AND interval = ?",
+            (token, interval),
+        )
+        self._conn.executemany(
+            "INSERT INTO candle_coverage (instrument_token, interval, from_date, to_date) "
+            "VALUES (?, ?, ?, ?)",
+            [(token, interval, f.isoformat(), t.isoformat()) for f, t in merged],
+        )
+
+
+def _day_start(day: date) -> str:
+    return datetime.combine(day, datetime.min.time()).isoformat(sep=" ")
+
+
+_candle_store: Optional[CandleStore] = None
+
+
+def get_candle_store() -> Optional[CandleStore]:
+    """Get the application-wide candle store (None if disabled in settings)."""
+    global _candle_store
+    if _candle_store is None:
+        path = get_settings().kite_candle_store_path
+        if not path:
+            return None
+        _candle_store = CandleStore(path)
+        logger.info(f"Kite candle store opened at {path}")
+    return _candle_store
@@ -0,0 +1,408 @@
+"""
+CIA-SIE Index Registry
+======================
+
+Index constituents and sector membership, versioned by date.
+
+Index membership changes with every rebalance, so it is kept as dated
+snapshots rather than one hard-coded list. A query for a date uses the
+latest snapshot on or before it, so a historical comparison sees the
+index as it was then; a query without a date uses the current snapshot.
+
+Snapshots live in a directory (setting: index_snapshot_dir):
+
+- <INDEX>_<YYYY-MM-DD>.csv    Index membership in NSE's published list
+                              format (a "Symbol" column; other columns are
+                              ignored), e.g. NIFTY50_2024-09-30.csv
+- SECTORS_<YYYY-MM-DD>.csv    Sector map with "Symbol" and "Sector" columns
+- <anything>.json             {"as_of": "YYYY-MM-DD",
+                               "indices": {"NIFTY50": [...]},
+                               "sectors": {"IT": [...]}}
+
+Index and sector names are normalized to upper case without spaces
+("Nifty 50" -> "NIFTY50"). Reverse indexes for the current snapshots
+(symbol -> indices, symbol -> sector) answer membership queries in O(1).
+
+The directory is re-read when its files change, and NSE's published
+lists can be downloaded into it on a schedule (index_snapshot_refresh_hours).
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import asyncio
+import bisect
+import csv
+import io
+import json
+import logging
+import time
+from collections.abc import Iterable, Mapping
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from cia_sie.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+SECTORS_FILE_PREFIX = "SECTORS"
+
+# NSE's published constituent lists, by index
+NSE_INDEX_LIST_URL = "https://archives.nseindia.com/content/indices/{file}"
+NSE_INDEX_LIST_FILES = {
+    "NIFTY50": "ind_nifty50list.csv",
+    "NIFTY100": "ind_nifty100list.csv",
+    "NIFTYBANK": "ind_niftybanklist.csv",
+    "NIFTYIT": "ind_niftyitlist.csv",
+    "NIFTYPHARMA": "ind_niftypharmalist.csv",
+    "NIFTYAUTO": "ind_niftyautolist.csv",
+}
+
+# Minimum seconds between checks of the snapshot directory for changes
+RELOAD_CHECK_SECONDS = 60.0
+
+# Built-in membership, dated before any real snapshot so snapshots win
+_SEED_AS_OF = date.min
+_SEED_INDICES: dict[str, list[str]] = {
+    "NIFTY50": [],
+    "NIFTYBANK": [],
+    "NIFTYIT": [],
+}
+_SEED_SECTORS: dict[str, list[str]] = {
+    "BANKING": ["HDFCBANK", "ICICIBANK", "SBIN", "KOTAKBANK", "AXISBANK"],
+    "IT": ["TCS", "INFY", "WIPRO", "HCLTECH", "TECHM"],
+    "AUTO": ["MARUTI", "TATAMOTORS", "M&M", "BAJAJ-AUTO"],
+}
+
+
+def normalize_name(name: str) -> str:
+    """Canonical index/sector name: upper case, no spaces."""
+    return name.upper().replace(" ", "")
+
+
+class _SectorVersion:
+    """Sector map as of one date, indexed both ways."""
+
+    __slots__ = ("by_symbol", "by_sector")
+
+    def __init__(self, by_symbol: dict[str, str]):
+        self.by_symbol = by_symbol
+        by_sector: dict[str, list[str]] = {}
+        for symbol, sector in by_symbol.items():
+            by_sector.setdefault(sector, []).append(symbol)
+        self.by_sector = {sector: tuple(symbols) for sector, symbols in by_sector.items()}
+
+
+class IndexRegistry:
+    """
+    Dated index and sector snapshots with current reverse indexes.
+
+    Each index has its own version history (indices rebalance on different
+    dates); sector maps are versioned as a whole.
+    """
+
+    def __init__(self, snapshot_dir: Optional[str | Path] = None):
+        """
+        Initialize an empty registry.
+
+        Args:
+            snapshot_dir: Directory of snapshot files (None for memory only)
+        """
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self._index_dates: dict[str, list[date]] = {}
+        self._index_members: dict[str, list[tuple[str, ...]]] = {}
+        self._sector_dates: list[date] = []
+        self._sector_versions: list[_SectorVersion] = []
+        self._symbol_indices: Optional[dict[str, tuple[str, ...]]] = None
+        self._dir_signature: Optional[tuple] = None
+        self._checked_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    # =========================================================================
+    # SNAPSHOTS
+    # =========================================================================
+
+    def add_index(self, index: str, as_of: date, symbols: Iterable[str]) -> None:
+        """Record an index's membership as of a date (replaces that date's)."""
+        index = normalize_name(index)
+        dates = self._index_dates.setdefault(index, [])
+        members = self._index_members.setdefault(index, [])
+        snapshot = tuple(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        i = bisect.bisect_left(dates, as_of)
+        if i < len(dates) and dates[i] == as_of:
+            members[i] = snapshot
+        else:
+            dates.insert(i, as_of)
+            members.insert(i, snapshot)
+        self._symbol_indices = None
+
+    def add_sectors(self, as_of: date, sectors: Mapping[str, Iterable[str]]) -> None:
+        """
+        Record sector membership as of a date.
+
+        Merged into the sector map of the latest earlier date, so a
+        snapshot that covers only some sectors leaves the rest unchanged.
+        """
+        i = bisect.bisect_right(self._sector_dates, as_of)
+        by_symbol = dict(self._sector_versions[i - 1].by_symbol) if i else {}
+        for sector, symbols in sectors.items():
+            sector = normalize_name(sector)
+            for symbol in [s for s, sec in by_symbol.items() if sec == sector]:
+                del by_symbol[symbol]
+            for symbol in symbols:
+                if symbol.strip():
+                    by_symbol[symbol.strip().upper()] = sector
+        version = _SectorVersion(by_symbol)
+        if i and self._sector_dates[i - 1] == as_of:
+            self._sector_versions[i - 1] = version
+        else:
+            self._sector_dates.insert(i, as_of)
+            self._sector_versions.insert(i, version)
+
+    def load_seed(self) -> None:
+        """Add the built-in membership as the oldest snapshot."""
+        for index, symbols in _SEED_INDICES.items():
+            self.add_index(index, _SEED_AS_OF, symbols)
+        self.add_sectors(_SEED_AS_OF, _SEED_SECTORS)
+
+    def load_directory(self) -> int:
+        """
+        Read every snapshot file in the snapshot directory.
+
+        Returns:
+            Number of files loaded (unreadable files are logged and skipped)
+        """
+        if self.snapshot_dir is None or not self.snapshot_dir.is_dir():
+            return 0
+        loaded = 0
+        for path in sorted(self.snapshot_dir.iterdir()):
+            try:
+                if path.suffix == ".csv":
+                    self._load_csv(path)
+                elif path.suffix == ".json":
+                    self._load_json(path)
+                else:
+                    continue
+                loaded += 1
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping index snapshot {path.name}: {e}")
+        self._dir_signature = self._signature()
+        return loaded
+
+    def reload_if_changed(self) -> bool:
+        """Re-read the directory if its files changed (checked at most once a minute)."""
+        now = time.monotonic()
+        if self.snapshot_dir is None or now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return False
+        self._checked_at = now
+        if self._signature() == self._dir_signature:
+            return False
+        self._index_dates.clear()
+        self._index_members.clear()
+        self._sector_dates.clear()
+        self._sector_versions.clear()
+        self._symbol_indices = None
+        self.load_seed()
+        self.load_directory()
+        return True
+
+    def _signature(self) -> tuple:
+        if self.snapshot_dir is None or not self.snapshot_dir.is_dir():
+            return ()
+        return tuple(
+            (p.name, p.stat().st_mtime_ns)
+            for p in sorted(self.snapshot_dir.iterdir())
+            if p.suffix in (".csv", ".json")
+        )
+
+    def _load_csv(self, path: Path) -> None:
+        name, _, day = path.stem.rpartition("_")
+        as_of = date.fromisoformat(day)
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            rows = [
+                {key.strip().lower(): (value or "").strip() for key, value in row.items() if key}
+                for row in csv.DictReader(f)
+            ]
+        if normalize_name(name) == SECTORS_FILE_PREFIX:
+            sectors: dict[str, list[str]] = {}
+            for row in rows:
+                sectors.setdefault(row["sector"], []).append(row["symbol"])
+            self.add_sectors(as_of, sectors)
+        else:
+            self.add_index(name, as_of, [row["symbol"] for row in rows])
+
+    def _load_json(self, path: Path) -> None:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        as_of = date.fromisoformat(data["as_of"])
+        for index, symbols in data.get("indices", {}).items():
+            self.add_index(index, as_of, symbols)
+        if data.get("sectors"):
+            self.add_sectors(as_of, data["sectors"])
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def index_names(self) -> list[str]:
+        """Indices with at least one snapshot."""
+        return sorted(self._index_dates)
+
+    def sector_names(self, as_of: Optional[date] = None) -> list[str]:
+        """Sectors in the sector map as of a date."""
+        version = self._sector_version(as_of)
+        return sorted(version.by_sector) if version else []
+
+    def versions(self, index: str) -> list[date]:
+        """Snapshot dates for an index, oldest first."""
+        return list(self._index_dates.get(normalize_name(index), []))
+
+    def constituents(self, index: str, as_of: Optional[date] = None) -> Optional[tuple[str, ...]]:
+        """
+        Index members as of a date (default: latest snapshot).
+
+        Returns:
+            Member symbols, or None if the index is unknown or had no
+            snapshot by that date
+        """
+        index = normalize_name(index)
+        dates = self._index_dates.get(index)
+        if not dates:
+            return None
+        if as_of is None:
+            return self._index_members[index][-1]
+        i = bisect.bisect_right(dates, as_of)
+        return self._index_members[index][i - 1] if i else None
+
+    def sector_members(
+        self, sector: str, as_of: Optional[date] = None
+    ) -> Optional[tuple[str, ...]]:
+        """Symbols in a sector as of a date, or None if the sector is unknown."""
+        version = self._sector_version(as_of)
+        if version is None:
+            return None
+        return version.by_sector.get(normalize_name(sector))
+
+    def sector_of(self, symbol: str, as_of: Optional[date] = None) -> Optional[str]:
+        """Sector of a symbol as of a date."""
+        version = self._sector_version(as_of)
+        return version.by_symbol.get(symbol.upper()) if version else None
+
+    def indices_for(self, symbol: str, as_of: Optional[date] = None) -> tuple[str, ...]:
+        """Indices a symbol belongs to (current membership from the reverse index)."""
+        symbol = symbol.upper()
+        if as_of is not None:
+            return tuple(
+                index for index in sorted(self._index_dates)
+                if symbol in (self.constituents(index, as_of) or ())
+            )
+        if self._symbol_indices is None:
+            self._symbol_indices = self._build_symbol_indices()
+        return self._symbol_indices.get(symbol, ())
+
+    def _sector_version(self, as_of: Optional[date]) -> Optional[_SectorVersion]:
+        if not self._sector_versions:
+            return None
+        if as_of is None:
+            return self._sector_versions[-1]
+        i = bisect.bisect_right(self._sector_dates, as_of)
+        return self._sector_versions[i - 1] if i else None
+
+    def _build_symbol_indices(self) -> dict[str, tuple[str, ...]]:
+        reverse: dict[str, list[str]] = {}
+        for index in sorted(self._index_members):
+            for symbol in self._index_members[index][-1]:
+                reverse.setdefault(symbol, []).append(index)
+        return {symbol: tuple(indices) for symbol, indices in reverse.items()}
+
+    # =========================================================================
+    # REFRESH
+    # =========================================================================
+
+    async def refresh_from_nse(
+        self,
+        client: httpx.AsyncClient,
+        indices: Optional[Iterable[str]] = None,
+    ) -> list[str]:
+        """
+        Download NSE's current constituent lists as today's snapshots.
+
+        Each list is written to <INDEX>_<today>.csv in the snapshot
+        directory (when configured) and added to the registry.
+
+        Returns:
+            Indices that could not be downloaded (including unknown names)
+        """
+        today = date.today()
+        failed = []
+        for index in indices or NSE_INDEX_LIST_FILES:
+            index = normalize_name(index)
+            file = NSE_INDEX_LIST_FILES.get(index)
+            if file is None:
+                logger.warning(f"No NSE constituent list for index {index}")
+                failed.append(index)
+                continue
+            url = NSE_INDEX_LIST_URL.format(file=file)
+            try:
+                response = await client.get(url)
+                response.raise_for_status()
+                text = response.text
+                symbols = [row.get("Symbol") or "" for row in csv.DictReader(io.StringIO(text))]
+            except (httpx.HTTPError, csv.Error) as e:
+                logger.warning(f"Index list download failed for {index}: {e}")
+                failed.append(index)
+                continue
+            if self.snapshot_dir is not None:
+                self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+                path = self.snapshot_dir / f"{index}_{today.isoformat()}.csv"
+                await asyncio.to_thread(path.write_text, text, encoding="utf-8")
+            self.add_index(index, today, symbols)
+        self._dir_signature = self._signature()
+        return failed
+
+    def start_refresh(self, interval_hours: float) -> None:
+        """Download NSE lists now and then every interval_hours."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop(interval_hours))
+
+    async def stop_refresh(self) -> None:
+        """Stop scheduled downloads."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self, interval_hours: float) -> None:
+        # NSE rejects requests without a browser user agent
+        headers = {"User-Agent": "Mozilla/5.0", "Accept": "text/csv,*/*"}
+        async with httpx.AsyncClient(headers=headers, timeout=30.0) as client:
+            while True:
+                try:
+                    failed = await self.refresh_from_nse(client)
+                    logger.info(
+                        "Index snapshots refreshed "
+                        f"({len(NSE_INDEX_LIST_FILES) - len(failed)} indices)"
+                    )
+                except Exception as e:
+                    # Keep the schedule; the next run retries every index
+                    logger.error(f"Index snapshot refresh failed: {e}")
+                await asyncio.sleep(interval_hours * 3600)
+
+
+_index_registry: Optional[IndexRegistry] = None
+
+
+def get_index_registry() -> IndexRegistry:
+    """Get the application-wide index registry (re-read when its files change)."""
+    global _index_registry
+    if _index_registry is None:
+        _index_registry = IndexRegistry(get_settings().index_snapshot_dir)
+        _index_registry.load_seed()
+        _index_registry.load_directory()
+    else:
+        _index_registry.reload_if_changed()
+    return _index_registry
@@ -0,0 +1,416 @@
+"""
+CIA-SIE Kite Instruments Master
+===============================
+
+Local copy of Kite's instruments master (the daily /instruments CSV dump,
+~100k rows across NSE, BSE, NFO, MCX, ...) with fast lookups.
+
+Rows are not materialized as one object each. InstrumentTable keeps one
+column per field - array('q')/array('d') for numbers, lists of interned
+strings for text - and a row is just an index into those columns. On top
+of the columns it builds:
+- hash indexes on "EXCHANGE:SYMBOL" and instrument token (O(1) lookups)
+- a sorted symbol list for prefix search (bisect)
+- a trigram index for substring search over symbol and name, built on
+  first use so processes that only resolve tokens never pay for it
+
+The CSV is stream-parsed line by line, and the downloaded dump is kept in
+a local cache file. Kite regenerates the dump once a day, so a cache file
+written today is loaded instead of downloading again on startup.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import asyncio
+import bisect
+import csv
+import io
+import logging
+import os
+import sys
+from array import array
+from collections.abc import Iterable
+from datetime import date, datetime
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import httpx
+
+from cia_sie.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXCHANGE = "NSE"
+MAX_SEARCH_RESULTS = 20
+
+
+class InstrumentRow(NamedTuple):
+    """One instrument, materialized from the columns on demand."""
+
+    instrument_token: int
+    exchange_token: int
+    tradingsymbol: str
+    name: str
+    expiry: Optional[date]
+    strike: float
+    tick_size: float
+    lot_size: int
+    instrument_type: str
+    segment: str
+    exchange: str
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class InstrumentTable:
+    """
+    Columnar instrument rows with hash and search indexes.
+
+    Build with from_csv; tables are not modified after construction, so a
+    refresh builds a new table and swaps it in.
+    """
+
+    __slots__ = (
+        "tokens",
+        "exchange_tokens",
+        "symbols",
+        "names",
+        "expiries",
+        "strikes",
+        "tick_sizes",
+        "lot_sizes",
+        "instrument_types",
+        "segments",
+        "exchanges",
+        "_by_key",
+        "_by_token",
+        "_prefix_keys",
+        "_prefix_rows",
+        "_symbol_grams",
+        "_name_grams",
+        "_name_rows",
+    )
+
+    def __init__(self):
+        self.tokens = array("q")
+        self.exchange_tokens = array("q")
+        self.symbols: list[str] = []
+        self.names: list[str] = []
+        self.expiries: list[str] = []
+        self.strikes = array("d")
+        self.tick_sizes = array("d")
+        self.lot_sizes = array("q")
+        self.instrument_types: list[str] = []
+        self.segments: list[str] = []
+        self.exchanges: list[str] = []
+        self._by_key: dict[str, int] = {}
+        self._by_token: dict[int, int] = {}
+        self._prefix_keys: list[str] = []
+        self._prefix_rows = array("I")
+        self._symbol_grams: Optional[_TrigramIndex] = None
+        self._name_grams: Optional[_TrigramIndex] = None
+        self._name_rows: list[array] = []
+
+    @classmethod
+    def from_csv(cls, lines: Iterable[str]) -> "InstrumentTable":
+        """
+        Stream-parse Kite's instruments CSV.
+
+        Args:
+            lines: CSV lines including the header (a file object works)
+
+        Returns:
+            Populated table with hash and prefix indexes built
+        """
+        table = cls()
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return table
+        col = {name: i for i, name in enumerate(header)}
+        i_token = col["instrument_token"]
+        i_exch_token = col["exchange_token"]
+        i_symbol = col["tradingsymbol"]
+        i_name = col["name"]
+        i_expiry = col["expiry"]
+        i_strike = col["strike"]
+        i_tick = col["tick_size"]
+        i_lot = col["lot_size"]
+        i_type = col["instrument_type"]
+        i_segment = col["segment"]
+        i_exchange = col["exchange"]
+
+        intern = sys.intern
+        for row in reader:
+            if len(row) < len(header):
+                continue
+            exchange = intern(row[i_exchange])
+            symbol = row[i_symbol]
+            token = int(row[i_token])
+            index = len(table.symbols)
+
+            table.tokens.append(token)
+            table.exchange_tokens.append(int(row[i_exch_token] or 0))
+            table.symbols.append(symbol)
+            # Names, expiries and types repeat across derivative rows
+            table.names.append(intern(row[i_name]))
+            table.expiries.append(intern(row[i_expiry]))
+            table.strikes.append(float(row[i_strike] or 0))
+            table.tick_sizes.append(float(row[i_tick] or 0))
+            table.lot_sizes.append(int(row[i_lot] or 1))
+            table.instrument_types.append(intern(row[i_type]))
+            table.segments.append(intern(row[i_segment]))
+            table.exchanges.append(exchange)
+
+            table._by_key[f"{exchange}:{symbol}"] = index
+            table._by_token[token] = index
+
+        order = sorted(range(len(table.symbols)), key=lambda r: table.symbols[r].lower())
+        table._prefix_keys = [table.symbols[r].lower() for r in order]
+        table._prefix_rows = array("I", order)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    # =========================================================================
+    # LOOKUPS
+    # =========================================================================
+
+    def find(self, symbol: str, exchange: str = DEFAULT_EXCHANGE) -> Optional[int]:
+        """Row index for a symbol ("SYMBOL" or "EXCHANGE:SYMBOL"), or None."""
+        key = symbol if ":" in symbol else f"{exchange}:{symbol}"
+        return self._by_key.get(key)
+
+    def find_token(self, instrument_token: int) -> Optional[int]:
+        """Row index for an instrument token, or None."""
+        return self._by_token.get(instrument_token)
+
+    def row(self, index: int) -> InstrumentRow:
+        """Materialize one row."""
+        expiry = self.expiries[index]
+        return InstrumentRow(
+            instrument_token=self.tokens[index],
+            exchange_token=self.exchange_tokens[index],
+            tradingsymbol=self.symbols[index],
+            name=self.names[index],
+            expiry=date.fromisoformat(expiry) if expiry else None,
+            strike=self.strikes[index],
+            tick_size=self.tick_sizes[index],
+            lot_size=self.lot_sizes[index],
+            instrument_type=self.instrument_types[index],
+            segment=self.segments[index],
+            exchange=self.exchanges[index],
+        )
+
+    def symbols_for(self, exchange: str, instrument_type: Optional[str] = None) -> list[str]:
+        """Trading symbols on an exchange, optionally of one instrument type, in file order."""
+        return [
+            symbol
+            for symbol, exch, itype in zip(self.symbols, self.exchanges, self.instrument_types)
+            if exch == exchange and (instrument_type is None or itype == instrument_type)
+        ]
+
+    # =========================================================================
+    # SEARCH
+    # =========================================================================
+
+    def search(self, query: str, limit: int = MAX_SEARCH_RESULTS) -> list[int]:
+        """
+        Rows whose symbol or name contains the query (case-insensitive).
+
+        Symbol prefix matches come first in symbol order (so an exact match
+        leads), then other substring matches in file order.
+        """
+        needle = query.strip().lower()
+        if not needle or limit <= 0:
+            return []
+
+        results: list[int] = []
+        keys = self._prefix_keys
+        position = bisect.bisect_left(keys, needle)
+        while position < len(keys) and keys[position].startswith(needle):
+            results.append(self._prefix_rows[position])
+            if len(results) >= limit:
+                return results
+            position += 1
+
+        seen = set(results)
+        for index in self._substring_candidates(needle):
+            if index in seen:
+                continue
+            if needle in self.symbols[index].lower() or needle in self.names[index].lower():
+                results.append(index)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def _substring_candidates(self, needle: str) -> Iterable[int]:
+        """Rows that may contain needle, in file order (all rows for short queries)."""
+        if len(needle) < 3:
+            return range(len(self))
+
+        if self._symbol_grams is None:
+            self._build_trigram_indexes()
+        candidates = self._symbol_grams.candidates(needle)
+        for name_id in self._name_grams.candidates(needle):
+            candidates.update(self._name_rows[name_id])
+        return sorted(candidates)
+
+    def _build_trigram_indexes(self) -> None:
+        # Derivative rows share their underlying's name, so names are indexed
+        # once per distinct name and mapped back to rows separately
+        name_ids: dict[str, int] = {}
+        name_rows: list[array] = []
+        for index, name in enumerate(self.names):
+            name_id = name_ids.get(name)
+            if name_id is None:
+                name_id = name_ids[name] = len(name_rows)
+                name_rows.append(array("I"))
+            name_rows[name_id].append(index)
+
+        self._symbol_grams = _TrigramIndex(self.symbols)
+        self._name_grams = _TrigramIndex(name_ids)
+        self._name_rows = name_rows
+
+
+class _TrigramIndex:
+    """Trigram -> ids of the strings containing it, as array('I') posting lists."""
+
+    __slots__ = ("_postings",)
+
+    def __init__(self, terms: Iterable[str]):
+        postings: dict[str, array] = {}
+        for term_id, term in enumerate(terms):
+            for gram in _trigrams(term.lower()):
+                ids = postings.get(gram)
+                if ids is None:
+                    ids = postings[gram] = array("I")
+                ids.append(term_id)
+        self._postings = postings
+
+    def candidates(self, needle: str) -> set[int]:
+        """Ids of strings containing every trigram of needle (a superset of matches)."""
+        lists = []
+        for gram in _trigrams(needle):
+            ids = self._postings.get(gram)
+            if ids is None:
+                return set()
+            lists.append(ids)
+        lists.sort(key=len)
+
+        found = set(lists[0])
+        for ids in lists[1:]:
+            found.intersection_update(ids)
+            if not found:
+                break
+        return found
+
+
+class InstrumentsMaster:
+    """
+    The current instruments table plus its daily-refreshed cache file.
+
+    Lookups go to `table`, which is replaced wholesale on refresh, so
+    readers never see a half-built index.
+    """
+
+    def __init__(self, cache_path: Optional[str | Path] = None):
+        """
+        Create an empty master.
+
+        Args:
+            cache_path: CSV file to persist the dump to (None keeps it in memory only)
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.table = InstrumentTable()
+        self.loaded_on: Optional[date] = None
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        """True if nothing is loaded or the loaded dump is from an earlier day."""
+        return self.loaded_on is None or self.loaded_on < date.today()
+
+    def cache_is_fresh(self) -> bool:
+        """True if the cache file was written today."""
+        if self.cache_path is None or not self.cache_path.exists():
+            return False
+        return datetime.fromtimestamp(self.cache_path.stat().st_mtime).date() >= date.today()
+
+    def load_csv(self, lines: Iterable[str]) -> None:
+        """Replace the table with one parsed from CSV lines."""
+        self.table = InstrumentTable.from_csv(lines)
+        self.loaded_on = date.today()
+        logger.info(f"Instruments master loaded: {len(self.table)} instruments")
+
+    def load_cache(self) -> bool:
+        """Load the cache file if present; returns whether it was loaded."""
+        if self.cache_path is None or not self.cache_path.exists():
+            return False
+        with open(self.cache_path, newline="", encoding="utf-8") as f:
+            self.load_csv(f)
+        self.loaded_on = datetime.fromtimestamp(self.cache_path.stat().st_mtime).date()
+        return True
+
+    async def refresh(self, client: httpx.AsyncClient) -> None:
+        """
+        Download the instruments dump and swap in a new table.
+
+        The response is streamed to the cache file (via a temporary file,
+        so a failed download never clobbers the previous copy) and parsed
+        off the event loop.
+        """
+        async with client.stream("GET", "/instruments") as response:
+            if response.status_code != 200:
+                raise ConnectionError(f"Instruments download failed: HTTP {response.status_code}")
+
+            if self.cache_path is None:
+                text = (await response.aread()).decode("utf-8")
+                await asyncio.to_thread(self.load_csv, io.StringIO(text, newline=""))
+                return
+
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            partial = self.cache_path.with_suffix(self.cache_path.suffix + ".part")
+            with open(partial, "wb") as f:
+                async for chunk in response.aiter_bytes():
+                    f.write(chunk)
+        os.replace(partial, self.cache_path)
+        await asyncio.to_thread(self.load_cache)
+
+    async def ensure_loaded(self, client: httpx.AsyncClient) -> None:
+        """Load today's dump: from the cache file if fresh, else from Kite."""
+        if not self.is_stale:
+            return
+        async with self._refresh_lock:
+            if not self.is_stale:
+                return
+            if self.cache_is_fresh():
+                await asyncio.to_thread(self.load_cache)
+            else:
+                await self.refresh(client)
+
+
+def instrument_keys(instruments: Iterable) -> list[str]:
+    """
+    Lookup keys for CIA-SIE instruments: "EXCHANGE:SYMBOL" when the
+    instrument's metadata names an exchange, else the bare symbol.
+    """
+    keys = []
+    for instrument in instruments:
+        exchange = (instrument.metadata_json or {}).get("exchange")
+        keys.append(f"{exchange}:{instrument.symbol}" if exchange else instrument.symbol)
+    return keys
+
+
+_instruments_master: Optional[InstrumentsMaster] = None
+
+
+def get_instruments_master() -> InstrumentsMaster:
+    """Get the application-wide instruments master."""
+    global _instruments_master
+    if _instruments_master is None:
+        _instruments_master = InstrumentsMaster(get_settings().kite_instruments_cache_path)
+    return _instruments_master
@@ -18,13 +18,52 @@ CONSTITUTIONAL COMPLIANCE:
 GOVERNED BY: Section 8 (Platform Integration) and Constitutional Rules
 """
 
+import asyncio
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, time
 from decimal import Decimal
 from enum import Enum
 from typing import Optional
 
+from cia_sie.dal.database import get_async_session
+from cia_sie.dal.repositories import InstrumentRepository
+from cia_sie.platforms.candle_aggregator import market_today
+from cia_sie.platforms.candle_store import (
+    MAX_DAYS_PER_REQUEST,
+    CandleStore,
+    get_candle_store,
+    split_range,
+)
+from cia_sie.platforms.index_registry import IndexRegistry, get_index_registry
+from cia_sie.platforms.instruments_master import (
+    DEFAULT_EXCHANGE,
+    MAX_SEARCH_RESULTS,
+    InstrumentRow,
+    InstrumentsMaster,
+    get_instruments_master,
+    instrument_keys,
+)
 from cia_sie.platforms.kite import KiteAdapter
+from cia_sie.platforms.kite_scheduler import (
+    BatchResult,
+    KiteRequestScheduler,
+    get_kite_scheduler,
+)
+from cia_sie.platforms.kite_ticker import KiteTicker, Tick, get_kite_ticker
+from cia_sie.platforms.movers import QuoteColumns, rank
+from cia_sie.platforms.ohlcv_analytics import (
+    OHLCVSeries,
+    average_volume,
+    compare_series,
+    pivot_levels,
+    pivot_levels_many,
+    quantize_levels,
+    volume_ratio,
+)
+from cia_sie.platforms.quote_cache import QuoteCache, get_quote_cache
+
+# Sentinel: use the application-wide candle store
+_DEFAULT_STORE = object()
 
 
 class KiteInterval(str, Enum):
@@ -50,6 +89,11 @@ class Quote:
     change: Decimal
     change_percent: Decimal
     timestamp: datetime
+    
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since this quote was fetched from Kite."""
+        return (datetime.now(self.timestamp.tzinfo) - self.timestamp).total_seconds()
 
 
 @dataclass
@@ -113,24 +157,42 @@ class KiteIntelligenceEngine:
     - Data is exposed for user interpretation
     """
     
-    # Index constituent mappings (cached on startup)
-    # These should be loaded from Kite instruments API
-    INDEX_CONSTITUENTS = {
-        "NIFTY50": [],  # Load from Kite instruments
-        "NIFTYBANK": [],
-        "NIFTYIT": [],
-        # etc.
-    }
-    
-    SECTOR_MAPPINGS = {
-        "BANKING": ["HDFCBANK", "ICICIBANK", "SBIN", "KOTAKBANK", "AXISBANK"],
-        "IT": ["TCS", "INFY", "WIPRO", "HCLTECH", "TECHM"],
-        "AUTO": ["MARUTI", "TATAMOTORS", "M&M", "BAJAJ-AUTO"],
-        # etc.
-    }
-
-    def __init__(self, kite_adapter: KiteAdapter):
+    def __init__(
+        self,
+        kite_adapter: KiteAdapter,
+        candle_store: Optional[CandleStore] = _DEFAULT_STORE,
+        scheduler: Optional[KiteRequestScheduler] = None,
+        instruments: Optional[InstrumentsMaster] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        ticker: Optional[KiteTicker] = None,
+        index_registry: Optional[IndexRegistry] = None,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            kite_adapter: Connected Kite adapter
+            candle_store: Local candle store (defaults to the application-wide
+                one; pass None to always fetch from Kite)
+            scheduler: Rate-aware request scheduler (defaults to the
+                application-wide one, so limits are shared across engines)
+            instruments: Instruments master for symbol/token resolution
+                (defaults to the application-wide one)
+            quote_cache: Short-TTL quote cache that coalesces concurrent
+                requests (defaults to the application-wide one)
+            ticker: Streaming tick feed; subscribed instruments are quoted
+                from it (defaults to the application-wide one, if running)
+            index_registry: Dated index constituent and sector snapshots
+                (defaults to the application-wide one)
+        """
         self.adapter = kite_adapter
+        self.candle_store = get_candle_store() if candle_store is _DEFAULT_STORE else candle_store
+        self.scheduler = scheduler or get_kite_scheduler()
+        self.instruments = instruments or get_instruments_master()
+        self.quote_cache = quote_cache or get_quote_cache()
+        self.ticker = ticker or get_kite_ticker()
+        self.index_registry = index_registry or get_index_registry()
+        # Explicit overrides, consulted before the instruments master
         self._instruments_cache: dict[str, InstrumentInfo] = {}
         self._last_cache_refresh: Optional[datetime] = None
     
@@ -138,12 +200,21 @@ class KiteIntelligenceEngine:
     # REAL-TIME DATA
     # =========================================================================
     
-    async def get_quotes(self, symbols: list[str]) -> dict[str, Quote]:
+    async def get_quotes(
+        self,
+        symbols: list[str],
+        max_age: Optional[float] = None
+    ) -> dict[str, Quote]:
         """
         Get real-time quotes for multiple instruments.
         
+        Instruments subscribed on the tick feed are served from their last
+        tick; the rest may come from the shared quote cache. Each Quote's
+        timestamp (and age_seconds) says when it was received from Kite.
+        
         Args:
             symbols: List of trading symbols
+            max_age: Maximum acceptable quote age in seconds (default: cache TTL)
             
         Returns:
             Dict mapping symbol to Quote
@@ -154,9 +225,69 @@ class KiteIntelligenceEngine:
         # Convert symbols to instrument tokens
         tokens = [self._get_token(s) for s in symbols]
         
+        quotes, remaining = self._quotes_from_ticks(symbols, tokens)
+        if remaining:
+            batch = await self.quote_cache.get_many(
+                remaining, self._fetch_quotes, max_age=max_age, raise_errors=True
+            )
+            quotes.update(batch.results)
+        return quotes
+    
+    async def get_quotes_batch(
+        self,
+        symbols: list[str],
+        max_age: Optional[float] = None
+    ) -> BatchResult[Quote]:
+        """
+        Get quotes for many instruments, tolerating per-symbol failures.
+        
+        Misses are sent in /quote calls of up to QUOTE_BATCH_SIZE
+        instruments each, paced by the shared quote rate limit and merged
+        with concurrent requests for overlapping symbols.
+        
+        Returns:
+            BatchResult with a Quote or an error for each symbol
+        """
+        if not self.adapter.is_connected:
+            raise ConnectionError("Kite adapter not connected")
+        
+        tokens = []
+        for symbol in symbols:
+            try:
+                tokens.append(self._get_token(symbol))
+            except ValueError:
+                tokens.append(None)
+        
+        quotes, remaining = self._quotes_from_ticks(symbols, tokens)
+        batch = await self.quote_cache.get_many(remaining, self._fetch_quotes, max_age=max_age)
+        batch.results.update(quotes)
+        return batch
+    
+    def _quotes_from_ticks(
+        self,
+        symbols: list[str],
+        tokens: list[Optional[int]]
+    ) -> tuple[dict[str, Quote], list[str]]:
+        """Split symbols into quotes served from live ticks and the rest."""
+        if self.ticker is None or not self.ticker.is_connected:
+            return {}, list(symbols)
+        
+        quotes: dict[str, Quote] = {}
+        remaining = []
+        for symbol, token in zip(symbols, tokens):
+            tick = self.ticker.get_tick(token) if token is not None else None
+            if tick is None:
+                remaining.append(symbol)
+            else:
+                quotes[symbol] = _tick_to_quote(symbol, tick)
+        return quotes, remaining
+    
+    async def _fetch_quotes(self, symbols: list[str]) -> dict[str, Quote]:
+        """Fetch quotes for up to QUOTE_BATCH_SIZE symbols in one /quote call."""
+        await self.scheduler.acquire("quote")
         response = await self.adapter._client.get(
             "/quote",
-            params={"i": [f"NSE:{s}" for s in symbols]}
+            params={"i": [_quote_key(s) for s in symbols]}
         )
         
         if response.status_code != 200:
@@ -180,6 +311,13 @@ class KiteIntelligenceEngine:
             for symbol, d in self._parse_quote_response(data, symbols).items()
         }
     
+    def get_intraday_vwap(self, symbol: str) -> Optional[Decimal]:
+        """Session VWAP for a streamed instrument (None if not streamed)."""
+        if self.ticker is None:
+            return None
+        vwap = self.ticker.aggregator.vwap(self._get_token(symbol))
+        return Decimal(str(round(vwap, 2))) if vwap is not None else None
+    
     async def get_market_depth(self, symbol: str) -> dict:
         """Get order book depth showing buy/sell pressure."""
         response = await self.adapter._client.get(
@@ -219,7 +357,121 @@ class KiteIntelligenceEngine:
                 raise ValueError(f"Invalid interval: {interval}. Must be one of {[e.value for e in KiteInterval]}")
         
         token = self._get_token(symbol)
+        today = market_today()
+
+        # Today's intraday candles are built from ticks when streaming
+        streamed = await self._get_streamed_candles(token, interval) if to_date >= today else None
+        if streamed is not None:
+            if from_date >= today:
+                return streamed
+            to_date = today - timedelta(days=1)
+
+        if self.candle_store is None:
+            candles = await self._fetch_historical(token, interval, from_date, to_date)
+        else:
+            candles = await self._get_historical_cached(token, interval, from_date, to_date)
+
+        return candles + streamed if streamed is not None else candles
+
+    async def get_historical_ohlcv_many(
+        self,
+        symbols: list[str],
+        from_date: date,
+        to_date: date,
+        interval: str | KiteInterval = KiteInterval.DAY
+    ) -> BatchResult[list[OHLCV]]:
+        """
+        Get historical OHLCV data for many symbols concurrently.
         
+        Fetches run in parallel under the shared historical rate limit;
+        ranges already in the candle store make no Kite call at all.
+        
+        Returns:
+            BatchResult with candles or an error for each symbol
+        """
+        return await self.scheduler.map(
+            symbols,
+            lambda symbol: self.get_historical_ohlcv(symbol, from_date, to_date, interval),
+        )
+
+    async def _get_historical_cached(
+        self,
+        token: int,
+        interval: KiteInterval,
+        from_date: date,
+        to_date: date,
+    ) -> list[OHLCV]:
+        """
+        Serve candles from the local store, fetching only missing gaps.
+
+        Days before today are immutable: once fetched they are stored and
+        marked covered. Today (still trading) is always fetched live and
+        never stored.
+        """
+        store = self.candle_store
+        today = market_today()
+        settled_to = min(to_date, today - timedelta(days=1))
+
+        missing = await asyncio.to_thread(
+            store.get_missing_ranges, token, interval.value, from_date, settled_to
+        )
+        for gap in missing:
+            for chunk in split_range(gap, MAX_DAYS_PER_REQUEST[interval.value]):
+                fetched = await self._fetch_historical(token, interval, *chunk)
+                await asyncio.to_thread(
+                    store.put_candles,
+                    token,
+                    interval.value,
+                    [_ohlcv_to_row(c) for c in fetched],
+                    chunk,
+                )
+
+        candles = []
+        if from_date <= settled_to:
+            rows = await asyncio.to_thread(
+                store.get_candles, token, interval.value, from_date, settled_to
+            )
+            candles = [OHLCV(*row) for row in rows]
+
+        if to_date >= today:
+            live_from = max(from_date, today)
+            candles.extend(await self._fetch_historical(token, interval, live_from, to_date))
+
+        return candles
+
+    async def _get_streamed_candles(
+        self,
+        token: int,
+        interval: KiteInterval
+    ) -> Optional[list[OHLCV]]:
+        """
+        Today's candles from the tick aggregator, or None if not streamed.
+        
+        If streaming started after the open, the earlier candles are
+        fetched from Kite once and kept by the aggregator.
+        """
+        if self.ticker is None:
+            return None
+        aggregator = self.ticker.aggregator
+        if not aggregator.has_candles(token, interval.value):
+            return None
+        
+        if aggregator.needs_backfill(token, interval.value):
+            today = market_today()
+            fetched = await self._fetch_historical(token, interval, today, today)
+            aggregator.backfill(token, interval.value, [_ohlcv_to_row(c) for c in fetched])
+        
+        return [OHLCV(*row) for row in aggregator.candles(token, interval.value)]
+    
+    async def _fetch_historical(
+        self,
+        token: int,
+        interval: KiteInterval,
+        from_date: date,
+        to_date: date,
+    ) -> list[OHLCV]:
+        """Fetch candles from the Kite historical API."""
+        await self.scheduler.acquire("historical")
         response = await self.adapter._client.get(
             f"/instruments/historical/{token}/{interval.value}",
             params={
@@ -249,27 +501,65 @@ class KiteIntelligenceEngine:
     # REFERENCE DATA
     # =========================================================================
     
-    async def get_index_constituents(self, index: str) -> list[str]:
-        """Get all symbols in a major index."""
-        if index not in self.INDEX_CONSTITUENTS:
+    async def get_index_constituents(
+        self,
+        index: str,
+        as_of: Optional[date] = None
+    ) -> list[str]:
+        """Get all symbols in an index (as of a date; default: current)."""
+        members = self.index_registry.constituents(index, as_of)
+        if members is None:
             raise ValueError(f"Unknown index: {index}")
-        return self.INDEX_CONSTITUENTS[index]
+        return list(members)
     
-    async def get_sector_instruments(self, sector: str) -> list[str]:
-        """Get all symbols in a sector."""
-        sector_upper = sector.upper()
-        if sector_upper not in self.SECTOR_MAPPINGS:
+    async def get_sector_instruments(
+        self,
+        sector: str,
+        as_of: Optional[date] = None
+    ) -> list[str]:
+        """Get all symbols in a sector (as of a date; default: current)."""
+        members = self.index_registry.sector_members(sector, as_of)
+        if members is None:
             raise ValueError(f"Unknown sector: {sector}")
-        return self.SECTOR_MAPPINGS[sector_upper]
+        return list(members)
+    
+    def get_memberships(self, symbol: str) -> dict:
+        """Indices and sector a symbol currently belongs to."""
+        return {
+            "symbol": symbol,
+            "indices": list(self.index_registry.indices_for(symbol)),
+            "sector": self.index_registry.sector_of(symbol),
+        }
     
     async def refresh_instruments_cache(self) -> None:
         """Refresh the instruments master list from Kite."""
-        response = await self.adapter._client.get("/instruments")
-        if response.status_code == 200:
-            # Parse CSV response and populate cache
-            self._parse_instruments_csv(response.text)
+        await self.instruments.refresh(self.adapter._client)
+        self._last_cache_refresh = datetime.now()
+    
+    async def ensure_instruments(self) -> None:
+        """Load today's instruments master (from the local cache when fresh)."""
+        await self.instruments.ensure_loaded(self.adapter._client)
+        if self._last_cache_refresh is None:
             self._last_cache_refresh = datetime.now()
     
+    def get_instrument_info(self, symbol: str) -> InstrumentInfo:
+        """Get instrument details for a symbol ("SYMBOL" or "EXCHANGE:SYMBOL")."""
+        if symbol in self._instruments_cache:
+            return self._instruments_cache[symbol]
+        index = self.instruments.table.find(symbol)
+        if index is None:
+            raise ValueError(f"Unknown symbol: {symbol}")
+        return _row_to_info(self.instruments.table.row(index))
+    
+    def search_instruments(
+        self,
+        query: str,
+        limit: int = MAX_SEARCH_RESULTS
+    ) -> list[InstrumentInfo]:
+        """Search instruments by symbol or name (prefix matches first)."""
+        table = self.instruments.table
+        return [_row_to_info(table.row(i)) for i in table.search(query, limit)]
+    
     # =========================================================================
     # COMPUTED METRICS
     # =========================================================================
@@ -285,7 +575,8 @@ class KiteIntelligenceEngine:
         Get top/bottom performers by a specific metric.
         
         Args:
-            universe: NIFTY50, NIFTYBANK, ALL, or WATCHLIST
+            universe: Index name (NIFTY50, NIFTYBANK, ...), ALL (every NSE
+                equity), or WATCHLIST (active CIA-SIE instruments)
             metric: volume, change_percent, range_percent, value_traded
             limit: Number of results
             direction: "top" or "bottom"
@@ -293,46 +584,54 @@ class KiteIntelligenceEngine:
         Returns:
             List of TopMover results
         """
-        # Get universe symbols
-        if universe == "ALL":
-            symbols = list(self._instruments_cache.keys())[:200]  # Limit for API
-        elif universe == "WATCHLIST":
-            symbols = await self._get_user_watchlist_symbols()
-        else:
-            symbols = await self.get_index_constituents(universe)
-        
-        # Fetch quotes
-        quotes = await self.get_quotes(symbols)
-        
-        # Calculate metric for each
-        ranked = []
-        for symbol, quote in quotes.items():
-            if metric == "volume":
-                value = quote.volume
-            elif metric == "change_percent":
-                value = float(quote.change_percent)
-            elif metric == "range_percent":
-                value = float((quote.high - quote.low) / quote.open * 100) if quote.open > 0 else 0
-            elif metric == "value_traded":
-                value = float(quote.ltp) * quote.volume
-            else:
-                continue
-            
-            ranked.append((symbol, value, quote.ltp))
+        ranked = await self.rank_universe(universe, [metric], limit, direction)
+        return ranked[metric]
+    
+    async def rank_universe(
+        self,
+        universe: str,
+        metrics: list[str],
+        limit: int = 10,
+        direction: str = "top"
+    ) -> dict[str, list[TopMover]]:
+        """
+        Rank a universe by several metrics from one set of quotes.
         
-        # Sort
-        ranked.sort(key=lambda x: x[1], reverse=(direction == "top"))
+        Quotes are fetched in batched /quote calls (QUOTE_BATCH_SIZE
+        instruments each) through the quote cache; symbols without a
+        quote are left out of the ranking.
         
-        return [
-            TopMover(
-                symbol=r[0],
-                ltp=Decimal(str(r[2])),
-                metric_value=r[1],
-                metric_name=metric,
-                rank=i + 1
-            )
-            for i, r in enumerate(ranked[:limit])
-        ]
+        Returns:
+            Metric -> TopMover list (empty for unknown metrics)
+        """
+        symbols = await self._resolve_universe(universe)
+        quotes = (await self.get_quotes_batch(symbols)).results
+        columns = QuoteColumns.from_quotes(quotes)
+        
+        ranked = rank(columns, metrics, limit, direction)
+        return {
+            metric: [
+                TopMover(
+                    symbol=columns.symbols[row],
+                    ltp=quotes[columns.symbols[row]].ltp,
+                    metric_value=value,
+                    metric_name=metric,
+                    rank=i + 1
+                )
+                for i, (row, value) in enumerate(ranked.get(metric, []))
+            ]
+            for metric in metrics
+        }
+    
+    async def _resolve_universe(self, universe: str, as_of: Optional[date] = None) -> list[str]:
+        """Symbols in a named universe (index membership as of a date)."""
+        if universe == "ALL":
+            await self.ensure_instruments()
+            symbols = self.instruments.table.symbols_for(DEFAULT_EXCHANGE, "EQ")
+            return symbols or list(self._instruments_cache.keys())
+        if universe == "WATCHLIST":
+            return await self._get_user_watchlist_symbols()
+        return await self.get_index_constituents(universe, as_of)
     
     async def detect_volume_anomalies(
         self,
@@ -353,23 +652,23 @@ class KiteIntelligenceEngine:
         Returns:
             List of instruments with unusual volume
         """
-        # Get universe symbols
-        if universe == "WATCHLIST":
-            symbols = await self._get_user_watchlist_symbols()
-        else:
-            symbols = await self.get_index_constituents(universe)
-        
-        anomalies = []
+        symbols = await self._resolve_universe(universe)
+        
+        # One batched quote call for current volumes, then baselines in parallel
+        quotes = await self.get_quotes_batch(symbols)
+        profiles = await self.scheduler.map(
+            quotes.results,
+            lambda symbol: self._calculate_volume_profile(
+                symbol, baseline_days, time_window,
+                current_volume=quotes.results[symbol].volume
+            )
+        )
         
-        for symbol in symbols:
-            try:
-                profile = await self._calculate_volume_profile(
-                    symbol, baseline_days, time_window
-                )
-                if profile.volume_ratio >= threshold_multiplier:
-                    anomalies.append(profile)
-            except Exception:
-                continue  # Skip symbols with missing data
+        # Symbols with missing data are skipped
+        anomalies = [
+            p for p in profiles.results.values()
+            if p.volume_ratio >= threshold_multiplier
+        ]
         
         # Sort by volume ratio descending
         anomalies.sort(key=lambda x: x.volume_ratio, reverse=True)
@@ -395,8 +694,9 @@ class KiteIntelligenceEngine:
             Dict with pivot, support, and resistance levels
         """
         # Get previous day's OHLC
-        from_date = date.today() - timedelta(days=7)
-        to_date = date.today() - timedelta(days=1)
+        today = market_today()
+        from_date = today - timedelta(days=7)
+        to_date = today - timedelta(days=1)
         
         candles = await self.get_historical_ohlcv(
             symbol, from_date, to_date, KiteInterval.DAY
@@ -406,48 +706,45 @@ class KiteIntelligenceEngine:
             raise ValueError(f"No historical data for {symbol}")
         
         prev = candles[-1]  # Previous day
-        high, low, close = float(prev.high), float(prev.low), float(prev.close)
-        
-        if method == "standard_pivot":
-            pivot = (high + low + close) / 3
-            return {
-                "method": "standard_pivot",
-                "pivot": round(pivot, 2),
-                "r1": round(2 * pivot - low, 2),
-                "r2": round(pivot + (high - low), 2),
-                "r3": round(high + 2 * (pivot - low), 2),
-                "s1": round(2 * pivot - high, 2),
-                "s2": round(pivot - (high - low), 2),
-                "s3": round(low - 2 * (high - pivot), 2),
-            }
-        elif method == "fibonacci":
-            pivot = (high + low + close) / 3
-            range_ = high - low
-            return {
-                "method": "fibonacci",
-                "pivot": round(pivot, 2),
-                "r1": round(pivot + 0.382 * range_, 2),
-                "r2": round(pivot + 0.618 * range_, 2),
-                "r3": round(pivot + 1.0 * range_, 2),
-                "s1": round(pivot - 0.382 * range_, 2),
-                "s2": round(pivot - 0.618 * range_, 2),
-                "s3": round(pivot - 1.0 * range_, 2),
-            }
-        elif method == "camarilla":
-            range_ = high - low
-            return {
-                "method": "camarilla",
-                "r1": round(close + range_ * 1.1 / 12, 2),
-                "r2": round(close + range_ * 1.1 / 6, 2),
-                "r3": round(close + range_ * 1.1 / 4, 2),
-                "r4": round(close + range_ * 1.1 / 2, 2),
-                "s1": round(close - range_ * 1.1 / 12, 2),
-                "s2": round(close - range_ * 1.1 / 6, 2),
-                "s3": round(close - range_ * 1.1 / 4, 2),
-                "s4": round(close - range_ * 1.1 / 2, 2),
-            }
-        else:
-            raise ValueError(f"Unknown method: {method}")
+        return quantize_levels(
+            pivot_levels(float(prev.high), float(prev.low), float(prev.close), method)
+        )
+    
+    async def calculate_technical_levels_many(
+        self,
+        symbols: list[str],
+        method: str = "standard_pivot"
+    ) -> dict:
+        """
+        Calculate pivot levels for many symbols in one pass.
+        
+        Returns:
+            Dict with levels per symbol and per-symbol errors
+        """
+        today = market_today()
+        from_date = today - timedelta(days=7)
+        to_date = today - timedelta(days=1)
+        
+        batch = await self.get_historical_ohlcv_many(
+            symbols, from_date, to_date, KiteInterval.DAY
+        )
+        series = {
+            symbol: OHLCVSeries.from_candles(symbol, candles[-1:])
+            for symbol, candles in batch.results.items()
+        }
+        errors = dict(batch.errors)
+        errors.update({s: f"No historical data for {s}" for s, c in batch.results.items() if not c})
+        
+        levels = {
+            "method": method,
+            "instruments": {
+                symbol: quantize_levels(symbol_levels)
+                for symbol, symbol_levels in pivot_levels_many(series, method).items()
+            },
+        }
+        if errors:
+            levels["errors"] = errors
+        return levels
     
     async def compare_instruments(
         self,
@@ -469,44 +766,44 @@ class KiteIntelligenceEngine:
         from_date = date.today() - timedelta(days=period_days)
         to_date = date.today()
         
-        results = {}
+        batch = await self.get_historical_ohlcv_many(
+            symbols, from_date, to_date, KiteInterval.DAY
+        )
         
-        for symbol in symbols:
-            candles = await self.get_historical_ohlcv(
-                symbol, from_date, to_date, KiteInterval.DAY
-            )
-            
-            if len(candles) < 2:
-                continue
-            
-            if metric == "price_change":
-                start_price = float(candles[0].close)
-                end_price = float(candles[-1].close)
-                change = ((end_price - start_price) / start_price) * 100
-                results[symbol] = {"change_percent": round(change, 2)}
-                
-            elif metric == "volume_change":
-                first_half = sum(c.volume for c in candles[:len(candles)//2])
-                second_half = sum(c.volume for c in candles[len(candles)//2:])
-                change = ((second_half - first_half) / first_half * 100) if first_half > 0 else 0
-                results[symbol] = {"volume_change_percent": round(change, 2)}
-                
-            elif metric == "volatility":
-                returns = []
-                for i in range(1, len(candles)):
-                    daily_return = (float(candles[i].close) - float(candles[i-1].close)) / float(candles[i-1].close)
-                    returns.append(daily_return)
-                
-                import statistics
-                if returns:
-                    volatility = statistics.stdev(returns) * 100 * (252 ** 0.5)  # Annualized
-                    results[symbol] = {"volatility_percent": round(volatility, 2)}
+        series = {
+            symbol: OHLCVSeries.from_candles(symbol, batch.results[symbol])
+            for symbol in symbols
+            if symbol in batch.results
+        }
+        results = compare_series(series, metric)
         
-        return {
+        comparison = {
             "metric": metric,
             "period_days": period_days,
             "instruments": results
         }
+        if batch.errors:
+            comparison["errors"] = batch.errors
+        return comparison
+    
+    async def compare_index_members(
+        self,
+        index: str,
+        metric: str,
+        period_days: int
+    ) -> dict:
+        """
+        Compare an index's members over a period.
+        
+        Uses the membership at the start of the period, so stocks added to
+        the index since are not compared over a time they were not in it.
+        """
+        from_date = date.today() - timedelta(days=period_days)
+        symbols = await self._resolve_universe(index, as_of=from_date)
+        comparison = await self.compare_instruments(symbols, metric, period_days)
+        comparison["index"] = index
+        comparison["membership_as_of"] = from_date.isoformat()
+        return comparison
     
     # =========================================================================
     # HELPER METHODS
@@ -516,59 +813,120 @@ class KiteIntelligenceEngine:
         """Get instrument token for a symbol."""
         if symbol in self._instruments_cache:
             return self._instruments_cache[symbol].instrument_token
-        raise ValueError(f"Unknown symbol: {symbol}")
+        index = self.instruments.table.find(symbol)
+        if index is None:
+            raise ValueError(f"Unknown symbol: {symbol}")
+        return self.instruments.table.tokens[index]
     
     async def _calculate_volume_profile(
         self,
         symbol: str,
         baseline_days: int,
-        time_window: Optional[tuple[time, time]]
+        time_window: Optional[tuple[time, time]],
+        current_volume: Optional[int] = None
     ) -> VolumeProfile:
         """Calculate volume profile for an instrument."""
-        # Get current quote
-        quotes = await self.get_quotes([symbol])
-        current_volume = quotes[symbol].volume
-        
-        # Get historical data
-        from_date = date.today() - timedelta(days=baseline_days + 5)
-        to_date = date.today() - timedelta(days=1)
+        token = self._get_token(symbol)
+        aggregator = self.ticker.aggregator if self.ticker is not None else None
         
-        candles = await self.get_historical_ohlcv(
-            symbol, from_date, to_date, KiteInterval.DAY
-        )
+        # Streamed instruments keep a running day volume
+        running = aggregator.running_volume(token) if aggregator is not None else None
+        if running is not None:
+            current_volume = running
         
-        if not candles:
-            raise ValueError(f"No historical data for {symbol}")
+        # Get current quote (unless the caller already batched it)
+        if current_volume is None:
+            quotes = await self.get_quotes([symbol])
+            current_volume = quotes[symbol].volume
         
-        # Calculate average volume
-        avg_volume = sum(c.volume for c in candles[-baseline_days:]) / baseline_days
+        # The baseline is fixed for the day; streamed instruments keep it
+        avg_volume = (
+            aggregator.baseline(token, baseline_days) if aggregator is not None else None
+        )
+        if avg_volume is None:
+            from_date = date.today() - timedelta(days=baseline_days + 5)
+            to_date = date.today() - timedelta(days=1)
+            
+            candles = await self.get_historical_ohlcv(
+                symbol, from_date, to_date, KiteInterval.DAY
+            )
+            
+            if not candles:
+                raise ValueError(f"No historical data for {symbol}")
+            
+            # Calculate average volume
+            series = OHLCVSeries.from_candles(symbol, candles)
+            avg_volume = average_volume(series.volume, baseline_days)
+            if aggregator is not None:
+                aggregator.set_baseline(token, avg_volume, baseline_days)
         
         return VolumeProfile(
             symbol=symbol,
             current_volume=current_volume,
             average_volume=avg_volume,
-            volume_ratio=current_volume / avg_volume if avg_volume > 0 else 0,
+            volume_ratio=volume_ratio(current_volume, avg_volume),
             time_window=time_window or (time(9, 15), time(15, 30)),
             baseline_days=baseline_days
         )
     
     async def _get_user_watchlist_symbols(self) -> list[str]:
-        """Get symbols from user's watchlist."""
-        # This should integrate with CIA-SIE instruments
-        # For now, return empty list
-        return []
+        """Get symbols of the user's active CIA-SIE instruments."""
+        async with get_async_session() as session:
+            active = await InstrumentRepository(session).get_all_active()
+        return instrument_keys(active)
     
     def _parse_quote_response(self, data: dict, symbols: list[str]) -> dict:
         """Parse Kite quote API response."""
         result = {}
         for symbol in symbols:
-            key = f"NSE:{symbol}"
+            key = _quote_key(symbol)
             if key in data:
                 result[symbol] = data[key]
         return result
     
     def _parse_instruments_csv(self, csv_text: str) -> None:
-        """Parse Kite instruments CSV and populate cache."""
-        # Implementation would parse CSV and populate _instruments_cache
-        # For now, placeholder
-        pass
+        """Parse Kite instruments CSV into the instruments master."""
+        self.instruments.load_csv(csv_text.splitlines())
+
+
+def _quote_key(symbol: str) -> str:
+    """Kite instrument key for a symbol ("EXCHANGE:SYMBOL" passes through)."""
+    return symbol if ":" in symbol else f"{DEFAULT_EXCHANGE}:{symbol}"
+
+
+def _row_to_info(row: InstrumentRow) -> InstrumentInfo:
+    """Convert an instruments master row to InstrumentInfo."""
+    return InstrumentInfo(
+        symbol=row.tradingsymbol,
+        trading_symbol=row.tradingsymbol,
+        exchange=row.exchange,
+        instrument_token=row.instrument_token,
+        instrument_type=row.instrument_type,
+        segment=row.segment,
+        lot_size=row.lot_size,
+        tick_size=Decimal(str(row.tick_size)),
+    )
+
+
+def _tick_to_quote(symbol: str, tick: Tick) -> Quote:
+    """Convert a streamed tick to a Quote."""
+    close = Decimal(str(tick.close))
+    change = Decimal(str(tick.ltp)) - close
+    change_percent = (change / close * 100).quantize(Decimal("0.01")) if close else Decimal(0)
+    return Quote(
+        symbol=symbol,
+        ltp=Decimal(str(tick.ltp)),
+        open=Decimal(str(tick.open)),
+        high=Decimal(str(tick.high)),
+        low=Decimal(str(tick.low)),
+        close=close,
+        volume=tick.volume,
+        change=change,
+        change_percent=change_percent,
+        timestamp=tick.received_at,
+    )
+
+
+def _ohlcv_to_row(candle: OHLCV) -> tuple:
+    """Convert a candle to a CandleStore row."""
+    return (candle.timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume)
@@ -0,0 +1,168 @@
+"""
+CIA-SIE Kite Request Scheduler
+==============================
+
+Concurrent, rate-aware scheduling of Kite Connect REST calls.
+
+Kite limits each API key per endpoint class (quote: 1 req/s,
+historical: 3 req/s, everything else: 10 req/s). Scanning an index one
+symbol at a time leaves most of that budget unused, while firing every
+request at once gets 429s. The scheduler runs many fetches concurrently
+and paces them through one token bucket per endpoint class, shared by
+every KiteIntelligenceEngine in the process.
+
+Multi-symbol fetches return partial results: each symbol either has a
+value or an error message, and one failure never discards the rest.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Kite Connect per-endpoint limits (requests per second, per API key)
+KITE_RATE_LIMITS = {
+    "quote": 1.0,
+    "historical": 3.0,
+    "default": 10.0,
+}
+
+# Maximum instruments per /quote call
+QUOTE_BATCH_SIZE = 500
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Waiters are served in arrival order (the lock is held while sleeping),
+    so a burst drains at exactly the configured rate.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Burst size (defaults to one second's worth, min 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available, then take them."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+@dataclass
+class BatchResult(Generic[T]):
+    """Per-symbol results of a multi-symbol fetch."""
+
+    results: dict[str, T] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether every symbol succeeded."""
+        return not self.errors
+
+
+class KiteRequestScheduler:
+    """
+    Runs Kite calls concurrently under shared per-endpoint rate limits.
+
+    Usage:
+        scheduler = get_kite_scheduler()
+        await scheduler.acquire("historical")          # before one call
+        batch = await scheduler.map(symbols, fetch)    # many symbols at once
+    """
+
+    def __init__(
+        self,
+        rate_limits: Optional[dict[str, float]] = None,
+        max_concurrency: int = 10,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            rate_limits: Requests per second by endpoint class (defaults to Kite's)
+            max_concurrency: Maximum fetches in flight at once
+        """
+        self.rate_limits = {**KITE_RATE_LIMITS, **(rate_limits or {})}
+        self.max_concurrency = max_concurrency
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        """Get the token bucket for an endpoint class."""
+        if endpoint not in self._buckets:
+            rate = self.rate_limits.get(endpoint, self.rate_limits["default"])
+            self._buckets[endpoint] = TokenBucket(rate)
+        return self._buckets[endpoint]
+
+    async def acquire(self, endpoint: str) -> None:
+        """Wait for permission to make one call to an endpoint class."""
+        await self.bucket(endpoint).acquire()
+
+    async def map(
+        self,
+        symbols: Iterable[str],
+        fetch: Callable[[str], Awaitable[T]],
+    ) -> BatchResult[T]:
+        """
+        Run fetch(symbol) for every symbol concurrently.
+
+        Pacing is left to fetch (which acquires the bucket for whatever
+        endpoint it calls, or none when served locally); this bounds
+        concurrency and collects per-symbol errors.
+
+        Returns:
+            BatchResult with a value or an error for each symbol
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batch: BatchResult[T] = BatchResult()
+
+        async def run(symbol: str) -> None:
+            async with semaphore:
+                try:
+                    batch.results[symbol] = await fetch(symbol)
+                except Exception as e:
+                    logger.debug(f"Kite fetch failed for {symbol}: {e}")
+                    batch.errors[symbol] = str(e) or type(e).__name__
+
+        await asyncio.gather(*(run(s) for s in dict.fromkeys(symbols)))
+        return batch
+
+
+_kite_scheduler: Optional[KiteRequestScheduler] = None
+
+
+def get_kite_scheduler() -> KiteRequestScheduler:
+    """Get the application-wide Kite request scheduler."""
+    global _kite_scheduler
+    if _kite_scheduler is None:
+        _kite_scheduler = KiteRequestScheduler()
+    return _kite_scheduler
@@ -0,0 +1,556 @@
+"""
+CIA-SIE Kite Ticker
+===================
+
+Streaming market data from Kite's WebSocket feed (wss://ws.kite.trade).
+
+REST quotes are polled and rate limited (1 req/s). For the instruments a
+user tracks, the ticker keeps a live last-tick table instead, and
+KiteIntelligenceEngine.get_quotes serves subscribed instruments from it
+without any REST call.
+
+Kite sends ticks as binary frames:
+
+    [n_packets: uint16] ([length: uint16] [packet: length bytes]) * n
+
+Packets are big-endian int32 fields whose layout depends on the length:
+8 (ltp mode), 28/32 (index quote/full), 44 (quote), 184 (full, with five
+levels of depth). Prices are integers in paise (1/10^7 for currency
+derivatives, 1/10^4 for BSE currency). A 1-byte frame is a heartbeat;
+text frames are JSON (order updates, errors).
+
+Decoding reads fields straight out of the frame with struct.unpack_from
+on a memoryview, and writes them into TickTable - preallocated typed
+arrays with one row per subscribed token - so no per-tick objects are
+created. Tick snapshots are materialized only when read. Each applied
+tick is also folded into the ticker's CandleAggregator, which builds
+today's intraday candles locally.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import time
+from array import array
+from collections.abc import Iterable
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+import websockets
+
+from cia_sie.core.config import get_settings
+from cia_sie.platforms.candle_aggregator import CandleAggregator
+from cia_sie.platforms.instruments_master import InstrumentsMaster, instrument_keys
+
+logger = logging.getLogger(__name__)
+
+KITE_TICKER_URL = "wss://ws.kite.trade"
+
+# Kite allows up to 3000 instruments per WebSocket connection
+MAX_TOKENS_PER_CONNECTION = 3000
+
+MODE_LTP = "ltp"
+MODE_QUOTE = "quote"
+MODE_FULL = "full"
+
+# Exchange segment (low byte of the token) -> price divisor
+_SEGMENT_CDS = 3
+_SEGMENT_BCD = 6
+
+_COUNT = struct.Struct(">H")
+_LTP = struct.Struct(">ii")
+_INDEX_QUOTE = struct.Struct(">7i")
+_INDEX_FULL = struct.Struct(">8i")
+_QUOTE = struct.Struct(">11i")
+_FULL_EXTRA = struct.Struct(">5i")  # last trade time, oi, oi high, oi low, exchange time
+_DEPTH_LEVEL = struct.Struct(">iih2x")  # quantity, price, orders
+
+_DEPTH_OFFSET = 64
+_DEPTH_LEVELS = 5
+
+
+class Tick(NamedTuple):
+    """Latest tick for one instrument (prices in rupees)."""
+
+    instrument_token: int
+    ltp: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    last_quantity: int
+    average_price: float
+    buy_quantity: int
+    sell_quantity: int
+    oi: int
+    bid: float
+    ask: float
+    exchange_time: Optional[datetime]
+    received_at: datetime
+
+    @property
+    def change(self) -> float:
+        """Change from previous close."""
+        return self.ltp - self.close if self.close else 0.0
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since this tick arrived."""
+        return (datetime.now() - self.received_at).total_seconds()
+
+
+class TickTable:
+    """
+    Preallocated last-tick table, one row per subscribed instrument token.
+
+    Columns are typed arrays sized at construction; rows are assigned on
+    subscribe and recycled on unsubscribe. received_at == 0 marks a row
+    that has not had a tick yet.
+    """
+
+    __slots__ = (
+        "capacity",
+        "_rows",
+        "_free",
+        "tokens",
+        "ltp",
+        "open",
+        "high",
+        "low",
+        "close",
+        "average_price",
+        "bid",
+        "ask",
+        "volume",
+        "last_quantity",
+        "buy_quantity",
+        "sell_quantity",
+        "oi",
+        "exchange_time",
+        "received_at",
+    )
+
+    def __init__(self, capacity: int = MAX_TOKENS_PER_CONNECTION):
+        self.capacity = capacity
+        self._rows: dict[int, int] = {}
+        self._free = list(range(capacity - 1, -1, -1))
+        zeros_d = array("d", [0.0]) * capacity
+        zeros_q = array("q", [0]) * capacity
+        self.tokens = array("q", zeros_q)
+        self.ltp = array("d", zeros_d)
+        self.open = array("d", zeros_d)
+        self.high = array("d", zeros_d)
+        self.low = array("d", zeros_d)
+        self.close = array("d", zeros_d)
+        self.average_price = array("d", zeros_d)
+        self.bid = array("d", zeros_d)
+        self.ask = array("d", zeros_d)
+        self.volume = array("q", zeros_q)
+        self.last_quantity = array("q", zeros_q)
+        self.buy_quantity = array("q", zeros_q)
+        self.sell_quantity = array("q", zeros_q)
+        self.oi = array("q", zeros_q)
+        self.exchange_time = array("d", zeros_d)
+        self.received_at = array("d", zeros_d)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, token: int) -> bool:
+        return token in self._rows
+
+    def row_of(self, token: int) -> Optional[int]:
+        """Row index for a subscribed token, or None."""
+        return self._rows.get(token)
+
+    def add(self, token: int) -> int:
+        """Assign a row to a token (idempotent)."""
+        row = self._rows.get(token)
+        if row is not None:
+            return row
+        if not self._free:
+            raise ValueError(f"Tick table full ({self.capacity} instruments)")
+        row = self._free.pop()
+        self._rows[token] = row
+        self.tokens[row] = token
+        self.received_at[row] = 0.0
+        return row
+
+    def remove(self, token: int) -> None:
+        """Release a token's row."""
+        row = self._rows.pop(token, None)
+        if row is not None:
+            self.received_at[row] = 0.0
+            self._free.append(row)
+
+    def get(self, token: int) -> Optional[Tick]:
+        """Latest tick for a token, or None if unsubscribed or no tick yet."""
+        row = self._rows.get(token)
+        if row is None or not self.received_at[row]:
+            return None
+        exchange_time = self.exchange_time[row]
+        return Tick(
+            instrument_token=token,
+            ltp=self.ltp[row],
+            open=self.open[row],
+            high=self.high[row],
+            low=self.low[row],
+            close=self.close[row],
+            volume=self.volume[row],
+            last_quantity=self.last_quantity[row],
+            average_price=self.average_price[row],
+            buy_quantity=self.buy_quantity[row],
+            sell_quantity=self.sell_quantity[row],
+            oi=self.oi[row],
+            bid=self.bid[row],
+            ask=self.ask[row],
+            exchange_time=datetime.fromtimestamp(exchange_time) if exchange_time else None,
+            received_at=datetime.fromtimestamp(self.received_at[row]),
+        )
+
+
+def _divisor(token: int) -> float:
+    segment = token & 0xFF
+    if segment == _SEGMENT_CDS:
+        return 10_000_000.0
+    if segment == _SEGMENT_BCD:
+        return 10_000.0
+    return 100.0
+
+
+def decode_frame(
+    frame: bytes,
+    table: TickTable,
+    received_at: Optional[float] = None,
+    updated: Optional[list[int]] = None,
+) -> int:
+    """
+    Decode one binary frame into the tick table.
+
+    Packets for tokens not in the table are skipped.
+
+    Args:
+        frame: Binary WebSocket message
+        table: Table to update in place
+        received_at: Epoch seconds to stamp (default: now)
+        updated: If given, the row of each applied packet is appended
+
+    Returns:
+        Number of packets applied
+    """
+    if len(frame) < 2:
+        return 0  # heartbeat
+
+    view = memoryview(frame)
+    stamp = received_at if received_at is not None else time.time()
+    (count,) = _COUNT.unpack_from(view, 0)
+    offset = 2
+    applied = 0
+
+    for _ in range(count):
+        (length,) = _COUNT.unpack_from(view, offset)
+        offset += 2
+        start = offset
+        offset += length
+        if offset > len(view) or length < 8:
+            break
+
+        token = _LTP.unpack_from(view, start)[0]
+        row = table.row_of(token)
+        if row is None:
+            continue
+        div = _divisor(token)
+
+        if length == 8:
+            table.ltp[row] = _LTP.unpack_from(view, start)[1] / div
+        elif length in (28, 32):
+            fields = (_INDEX_FULL if length == 32 else _INDEX_QUOTE).unpack_from(view, start)
+            _, ltp, high, low, open_, close = fields[:6]
+            table.ltp[row] = ltp / div
+            table.high[row] = high / div
+            table.low[row] = low / div
+            table.open[row] = open_ / div
+            table.close[row] = close / div
+            if length == 32:
+                table.exchange_time[row] = fields[7]
+        elif length >= 44:
+            (_, ltp, last_qty, avg_price, volume, buy_qty, sell_qty,
+             open_, high, low, close) = _QUOTE.unpack_from(view, start)
+            table.ltp[row] = ltp / div
+            table.last_quantity[row] = last_qty
+            table.average_price[row] = avg_price / div
+            table.volume[row] = volume
+            table.buy_quantity[row] = buy_qty
+            table.sell_quantity[row] = sell_qty
+            table.open[row] = open_ / div
+            table.high[row] = high / div
+            table.low[row] = low / div
+            table.close[row] = close / div
+            if length >= _DEPTH_OFFSET + 2 * _DEPTH_LEVELS * _DEPTH_LEVEL.size:
+                _, oi, _, _, exchange_time = _FULL_EXTRA.unpack_from(view, start + 44)
+                table.oi[row] = oi
+                table.exchange_time[row] = exchange_time
+                bid_at = start + _DEPTH_OFFSET
+                ask_at = bid_at + _DEPTH_LEVELS * _DEPTH_LEVEL.size
+                table.bid[row] = _DEPTH_LEVEL.unpack_from(view, bid_at)[1] / div
+                table.ask[row] = _DEPTH_LEVEL.unpack_from(view, ask_at)[1] / div
+        else:
+            continue
+
+        table.received_at[row] = stamp
+        applied += 1
+        if updated is not None:
+            updated.append(row)
+
+    return applied
+
+
+class KiteTicker:
+    """
+    WebSocket client for Kite's tick feed.
+
+    Keeps the desired subscriptions locally and replays them on every
+    (re)connect, reconnecting with exponential backoff until stopped.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        access_token: str,
+        url: str = KITE_TICKER_URL,
+        capacity: int = MAX_TOKENS_PER_CONNECTION,
+        mode: str = MODE_QUOTE,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+    ):
+        """
+        Initialize the ticker (call start() to connect).
+
+        Args:
+            api_key: Kite API key
+            access_token: Session access token
+            url: Feed URL (a local fake feed in tests)
+            capacity: Maximum subscribed instruments
+            mode: Default subscription mode (ltp, quote or full)
+            reconnect_delay: First reconnect delay in seconds (doubles per failure)
+            max_reconnect_delay: Backoff ceiling in seconds
+        """
+        self._url = f"{url}?api_key={api_key}&access_token={access_token}"
+        self.table = TickTable(capacity)
+        self.aggregator = CandleAggregator()
+        self.mode = mode
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._modes: dict[int, str] = {}
+        self._symbols: dict[str, int] = {}
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+        self.frames_received = 0
+
+    @property
+    def is_connected(self) -> bool:
+        """True while the WebSocket is open."""
+        return self._connected.is_set()
+
+    @property
+    def subscribed_tokens(self) -> set[int]:
+        """Tokens currently subscribed."""
+        return set(self._modes)
+
+    def get_tick(self, token: int) -> Optional[Tick]:
+        """Latest tick for a subscribed token, or None while disconnected."""
+        if not self.is_connected:
+            return None
+        return self.table.get(token)
+
+    # =========================================================================
+    # SUBSCRIPTIONS
+    # =========================================================================
+
+    async def subscribe(self, tokens: Iterable[int], mode: Optional[str] = None) -> None:
+        """Subscribe tokens in a mode (default: the ticker's mode)."""
+        mode = mode or self.mode
+        tokens = list(dict.fromkeys(tokens))
+        for token in tokens:
+            self.table.add(token)
+            self._modes[token] = mode
+        if tokens:
+            await self._send({"a": "subscribe", "v": tokens})
+            await self._send({"a": "mode", "v": [mode, tokens]})
+
+    async def unsubscribe(self, tokens: Iterable[int]) -> None:
+        """Unsubscribe tokens and free their rows."""
+        tokens = [t for t in dict.fromkeys(tokens) if t in self._modes]
+        for token in tokens:
+            self.table.remove(token)
+            self.aggregator.drop(token)
+            del self._modes[token]
+        if tokens:
+            await self._send({"a": "unsubscribe", "v": tokens})
+
+    async def set_subscriptions(self, tokens: Iterable[int]) -> None:
+        """Make the subscription set exactly `tokens` (sends only the difference)."""
+        wanted = set(tokens)
+        current = set(self._modes)
+        await self.unsubscribe(current - wanted)
+        await self.subscribe(sorted(wanted - current))
+
+    async def sync_symbols(
+        self,
+        symbols: Iterable[str],
+        instruments: InstrumentsMaster,
+    ) -> list[str]:
+        """
+        Subscribe exactly the given symbols ("SYMBOL" or "EXCHANGE:SYMBOL").
+
+        Returns:
+            Symbols the instruments master could not resolve
+        """
+        table = instruments.table
+        resolved: dict[str, int] = {}
+        unresolved = []
+        for symbol in symbols:
+            row = table.find(symbol)
+            if row is None:
+                unresolved.append(symbol)
+            else:
+                resolved[symbol] = table.tokens[row]
+        await self.set_subscriptions(resolved.values())
+        self._symbols = resolved
+        return unresolved
+
+    def token_for(self, symbol: str) -> Optional[int]:
+        """Token of a symbol subscribed via sync_symbols."""
+        return self._symbols.get(symbol)
+
+    # =========================================================================
+    # CONNECTION
+    # =========================================================================
+
+    def start(self) -> None:
+        """Start the connection loop in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Close the connection and stop reconnecting."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._connected.clear()
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Wait until connected; returns False on timeout."""
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self._url, max_size=None) as ws:
+                    self._ws = ws
+                    await self._resubscribe()
+                    self._connected.set()
+                    delay = self.reconnect_delay
+                    logger.info(f"Kite ticker connected ({len(self._modes)} instruments)")
+                    async for message in ws:
+                        if isinstance(message, bytes):
+                            self.frames_received += 1
+                            rows: list[int] = []
+                            decode_frame(message, self.table, updated=rows)
+                            self.aggregator.on_ticks(self.table, rows)
+                        else:
+                            self._on_text(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Kite ticker connection lost: {e}")
+            finally:
+                self._ws = None
+                self._connected.clear()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _resubscribe(self) -> None:
+        by_mode: dict[str, list[int]] = {}
+        for token, mode in self._modes.items():
+            by_mode.setdefault(mode, []).append(token)
+        for mode, tokens in by_mode.items():
+            await self._send({"a": "subscribe", "v": tokens})
+            await self._send({"a": "mode", "v": [mode, tokens]})
+
+    async def _send(self, message: dict) -> None:
+        if self._ws is None:
+            return  # replayed on connect
+        try:
+            await self._ws.send(json.dumps(message))
+        except Exception as e:
+            logger.debug(f"Kite ticker send failed (will resubscribe on reconnect): {e}")
+
+    def _on_text(self, message: str) -> None:
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            return
+        if payload.get("type") == "error":
+            logger.warning(f"Kite ticker error: {payload.get('data')}")
+
+
+_kite_ticker: Optional[KiteTicker] = None
+
+
+def get_kite_ticker() -> Optional[KiteTicker]:
+    """Get the running application-wide ticker, if any."""
+    return _kite_ticker
+
+
+async def start_kite_ticker(api_key: str, access_token: str) -> KiteTicker:
+    """Start (or restart with new credentials) the application-wide ticker."""
+    global _kite_ticker
+    await stop_kite_ticker()
+    _kite_ticker = KiteTicker(api_key, access_token, url=get_settings().kite_ticker_url)
+    _kite_ticker.start()
+    return _kite_ticker
+
+
+async def stop_kite_ticker() -> None:
+    """Stop the application-wide ticker."""
+    global _kite_ticker
+    if _kite_ticker is not None:
+        await _kite_ticker.stop()
+        _kite_ticker = None
+
+
+async def refresh_ticker_subscriptions(
+    instrument_repository,
+    instruments: InstrumentsMaster,
+) -> Optional[list[str]]:
+    """
+    Subscribe the running ticker to CIA-SIE's active instruments.
+
+    Args:
+        instrument_repository: InstrumentRepository for the active list
+        instruments: Instruments master for token resolution
+
+    Returns:
+        Unresolved symbols, or None if no ticker is running
+    """
+    ticker = get_kite_ticker()
+    if ticker is None:
+        return None
+    active = await instrument_repository.get_all_active()
+    return await ticker.sync_symbols(instrument_keys(active), instruments)
@@ -0,0 +1,102 @@
+"""
+CIA-SIE Top Movers Ranking
+==========================
+
+Top-k / bottom-k selection over a universe of quotes.
+
+Ranking used to compute each metric with Decimal arithmetic into a list of
+tuples and fully sort it to return a handful of rows. Here quotes are
+converted once, in a single pass, into float columns from which every
+metric is derived, and each requested metric is ranked by bounded-heap
+selection of `limit` rows (heapq.nlargest / nsmallest) - O(n log k)
+rather than a full O(n log n) sort.
+
+Ties keep universe order (earlier symbols rank first), as the previous
+stable sort did.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import heapq
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+
+METRICS = ("volume", "change_percent", "range_percent", "value_traded")
+
+
+class QuoteColumns:
+    """Quotes for a universe as parallel float columns, in universe order."""
+
+    __slots__ = ("symbols", "ltp", "open", "high", "low", "volume", "change_percent")
+
+    def __init__(self):
+        self.symbols: list[str] = []
+        self.ltp = array("d")
+        self.open = array("d")
+        self.high = array("d")
+        self.low = array("d")
+        self.volume = array("q")
+        self.change_percent = array("d")
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_quotes(cls, quotes: Mapping) -> "QuoteColumns":
+        """Build columns from Quote objects keyed by symbol."""
+        columns = cls()
+        for symbol, quote in quotes.items():
+            columns.symbols.append(symbol)
+            columns.ltp.append(float(quote.ltp))
+            columns.open.append(float(quote.open))
+            columns.high.append(float(quote.high))
+            columns.low.append(float(quote.low))
+            columns.volume.append(quote.volume)
+            columns.change_percent.append(float(quote.change_percent))
+        return columns
+
+
+def metric_columns(columns: QuoteColumns) -> dict[str, Sequence[float]]:
+    """Every metric as a column aligned with columns.symbols."""
+    return {
+        "volume": columns.volume,
+        "change_percent": columns.change_percent,
+        "range_percent": array("d", [
+            (high - low) / open_ * 100 if open_ > 0 else 0.0
+            for high, low, open_ in zip(columns.high, columns.low, columns.open)
+        ]),
+        "value_traded": array("d", [
+            ltp * volume for ltp, volume in zip(columns.ltp, columns.volume)
+        ]),
+    }
+
+
+def rank(
+    columns: QuoteColumns,
+    metrics: Iterable[str],
+    limit: int,
+    direction: str = "top",
+) -> dict[str, list[tuple[int, float]]]:
+    """
+    Rank rows by several metrics.
+
+    Args:
+        columns: Universe quotes
+        metrics: Metric names (unknown names rank nothing)
+        limit: Rows to keep per metric
+        direction: "top" (largest first) or "bottom" (smallest first)
+
+    Returns:
+        Metric -> [(row index, metric value)] in rank order
+    """
+    values = metric_columns(columns)
+    select = heapq.nlargest if direction == "top" else heapq.nsmallest
+    ranked: dict[str, list[tuple[int, float]]] = {}
+    for metric in dict.fromkeys(metrics):
+        column = values.get(metric)
+        if column is None or limit <= 0:
+            ranked[metric] = []
+            continue
+        rows = select(limit, range(len(column)), key=column.__getitem__)
+        ranked[metric] = [(row, column[row]) for row in rows]
+    return ranked
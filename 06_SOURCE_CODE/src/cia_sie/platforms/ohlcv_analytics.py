@@ -0,0 +1,266 @@
+"""
+CIA-SIE OHLCV Analytics Kernels
+===============================
+
+Array-backed OHLCV series and the calculations the intelligence engine
+exposes: returns, annualised volatility, volume averages and ratios, and
+pivot levels (standard, fibonacci, camarilla).
+
+Candles arrive as per-row OHLCV dataclasses holding Decimals, which is the
+right shape for display but slow to compute on: every step paid a
+Decimal -> float conversion and per-object attribute access. OHLCVSeries
+converts once into contiguous array('d') columns, and the kernels below
+work column-at-a-time with math.fsum, so a 500-symbol scan is a handful of
+tight loops instead of a million Decimal operations. Stdlib only.
+
+Exact Decimal values remain on the OHLCV candles for display; levels are
+quantized back to Decimal with quantize_levels where they are shown.
+
+CONSTITUTIONAL COMPLIANCE:
+- Mathematical calculations only; no predictions or scores
+
+GOVERNED BY: Section 8 (Platform Integration) and Constitutional Rules
+"""
+
+import math
+from array import array
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+from decimal import ROUND_HALF_EVEN, Decimal
+
+TRADING_DAYS_PER_YEAR = 252
+
+PIVOT_METHODS = ("standard_pivot", "fibonacci", "camarilla")
+COMPARISON_METRICS = ("price_change", "volume_change", "volatility")
+
+
+class OHLCVSeries:
+    """
+    Columnar OHLCV data for one symbol, oldest first.
+
+    Prices are array('d') and volume array('q'); timestamps stay a list.
+    """
+
+    __slots__ = ("symbol", "timestamps", "open", "high", "low", "close", "volume")
+
+    def __init__(
+        self,
+        symbol: str,
+        timestamps: list[datetime],
+        open: array,
+        high: array,
+        low: array,
+        close: array,
+        volume: array,
+    ):
+        self.symbol = symbol
+        self.timestamps = timestamps
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def from_candles(cls, symbol: str, candles: Iterable) -> "OHLCVSeries":
+        """Build a series from OHLCV candles (anything with the OHLCV attributes)."""
+        candles = list(candles)
+        return cls(
+            symbol=symbol,
+            timestamps=[c.timestamp for c in candles],
+            open=array("d", [float(c.open) for c in candles]),
+            high=array("d", [float(c.high) for c in candles]),
+            low=array("d", [float(c.low) for c in candles]),
+            close=array("d", [float(c.close) for c in candles]),
+            volume=array("q", [c.volume for c in candles]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+# =============================================================================
+# RETURNS & VOLATILITY
+# =============================================================================
+
+
+def simple_returns(close: array) -> array:
+    """Period-over-period simple returns (len(close) - 1 values)."""
+    return array("d", [b / a - 1.0 for a, b in zip(close, close[1:])])
+
+
+def price_change_percent(close: array) -> float:
+    """Percent change from first to last close."""
+    return (close[-1] - close[0]) / close[0] * 100
+
+
+def sample_stdev(values: array) -> float:
+    """Sample standard deviation (n - 1), two-pass with fsum for accuracy."""
+    n = len(values)
+    if n < 2:
+        raise ValueError("At least two values are required")
+    mean = math.fsum(values) / n
+    return math.sqrt(math.fsum([(v - mean) ** 2 for v in values]) / (n - 1))
+
+
+def annualized_volatility_percent(
+    close: array,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+) -> float:
+    """Annualised volatility of simple returns, in percent."""
+    return sample_stdev(simple_returns(close)) * 100 * math.sqrt(periods_per_year)
+
+
+# =============================================================================
+# VOLUME
+# =============================================================================
+
+
+def volume_change_percent(volume: array) -> float:
+    """Percent change in total volume from the first half to the second half."""
+    half = len(volume) // 2
+    first = sum(volume[:half])
+    second = sum(volume[half:])
+    return (second - first) / first * 100 if first > 0 else 0
+
+
+def average_volume(volume: array, baseline: int) -> float:
+    """
+    Average volume over the last `baseline` periods.
+
+    Divides by `baseline` even when fewer periods are available, matching
+    how the engine has always reported its baseline.
+    """
+    return sum(volume[-baseline:]) / baseline
+
+
+def rolling_mean(values: array, window: int) -> array:
+    """Trailing rolling mean (len(values) - window + 1 values), O(n)."""
+    if window <= 0 or window > len(values):
+        return array("d")
+    total = float(sum(values[:window]))
+    means = array("d", [total / window])
+    for old, new in zip(values, values[window:]):
+        total += new - old
+        means.append(total / window)
+    return means
+
+
+def volume_ratio(current_volume: float, avg_volume: float) -> float:
+    """Current volume as a multiple of the average (0 if no average)."""
+    return current_volume / avg_volume if avg_volume > 0 else 0
+
+
+# =============================================================================
+# PIVOT LEVELS
+# =============================================================================
+
+
+def pivot_levels(high: float, low: float, close: float, method: str) -> dict:
+    """
+    Support, resistance and pivot levels from one period's high/low/close.
+
+    Args:
+        high, low, close: Previous period values
+        method: standard_pivot, fibonacci or camarilla
+
+    Returns:
+        Dict with method plus levels rounded to 2 places
+    """
+    range_ = high - low
+    if method == "standard_pivot":
+        pivot = (high + low + close) / 3
+        levels = {
+            "pivot": pivot,
+            "r1": 2 * pivot - low,
+            "r2": pivot + range_,
+            "r3": high + 2 * (pivot - low),
+            "s1": 2 * pivot - high,
+            "s2": pivot - range_,
+            "s3": low - 2 * (high - pivot),
+        }
+    elif method == "fibonacci":
+        pivot = (high + low + close) / 3
+        levels = {
+            "pivot": pivot,
+            "r1": pivot + 0.382 * range_,
+            "r2": pivot + 0.618 * range_,
+            "r3": pivot + 1.0 * range_,
+            "s1": pivot - 0.382 * range_,
+            "s2": pivot - 0.618 * range_,
+            "s3": pivot - 1.0 * range_,
+        }
+    elif method == "camarilla":
+        levels = {
+            "r1": close + range_ * 1.1 / 12,
+            "r2": close + range_ * 1.1 / 6,
+            "r3": close + range_ * 1.1 / 4,
+            "r4": close + range_ * 1.1 / 2,
+            "s1": close - range_ * 1.1 / 12,
+            "s2": close - range_ * 1.1 / 6,
+            "s3": close - range_ * 1.1 / 4,
+            "s4": close - range_ * 1.1 / 2,
+        }
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    return {"method": method, **{k: round(v, 2) for k, v in levels.items()}}
+
+
+def quantize_levels(levels: Mapping, places: int = 2) -> dict:
+    """Convert float levels to Decimals at a fixed number of places (for display)."""
+    exponent = Decimal(1).scaleb(-places)
+    return {
+        k: Decimal(str(v)).quantize(exponent, rounding=ROUND_HALF_EVEN)
+        if isinstance(v, float)
+        else v
+        for k, v in levels.items()
+    }
+
+
+# =============================================================================
+# MULTI-SYMBOL
+# =============================================================================
+
+
+def compare_series(series: Mapping[str, OHLCVSeries], metric: str) -> dict[str, dict]:
+    """
+    Compute one comparison metric for many symbols.
+
+    Symbols with too few periods for the metric are skipped.
+
+    Returns:
+        Dict mapping symbol to its metric result
+    """
+    if metric not in COMPARISON_METRICS:
+        return {}
+
+    results = {}
+    for symbol, s in series.items():
+        if len(s) < 2:
+            continue
+        if metric == "price_change":
+            results[symbol] = {"change_percent": round(price_change_percent(s.close), 2)}
+        elif metric == "volume_change":
+            results[symbol] = {"volume_change_percent": round(volume_change_percent(s.volume), 2)}
+        elif len(s) > 2:  # stdev needs at least two returns
+            results[symbol] = {
+                "volatility_percent": round(annualized_volatility_percent(s.close), 2)
+            }
+    return results
+
+
+def rolling_volumes_many(series: Mapping[str, OHLCVSeries], window: int) -> dict[str, array]:
+    """Trailing rolling average volume for each symbol (see rolling_mean)."""
+    return {symbol: rolling_mean(s.volume, window) for symbol, s in series.items()}
+
+
+def pivot_levels_many(series: Mapping[str, OHLCVSeries], method: str) -> dict[str, dict]:
+    """Pivot levels from each symbol's last period."""
+    if method not in PIVOT_METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    return {
+        symbol: pivot_levels(s.high[-1], s.low[-1], s.close[-1], method)
+        for symbol, s in series.items()
+        if len(s)
+    }
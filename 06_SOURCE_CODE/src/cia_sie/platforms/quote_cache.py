@@ -0,0 +1,207 @@
+"""
+CIA-SIE Quote Cache
+===================
+
+Short-lived quote snapshots with coalesced upstream fetches.
+
+During market hours the chat, strategy, agent and top-movers paths all ask
+for quotes independently, often for the same index within the same second,
+and each ask used to be its own /quote call against a 1 req/s limit. The
+cache sits in front of those calls:
+
+- Hits: a quote fetched within the TTL is returned as-is. Quotes carry the
+  timestamp they were fetched at, so callers can see (and report) their age.
+- Coalescing: misses are not fetched immediately. They are parked for one
+  event-loop turn, so every caller that misses in the same moment joins a
+  single batched fetch of the union of their symbols. Symbols already being
+  fetched are awaited rather than fetched again.
+
+The cache is process-wide and keyed by symbol only, so it assumes all
+callers quote from the same Kite account - true for this application.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Generic, Optional, TypeVar
+
+from cia_sie.core.config import get_settings
+from cia_sie.platforms.kite_scheduler import QUOTE_BATCH_SIZE, BatchResult
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+FetchQuotes = Callable[[list[str]], Awaitable[dict[str, T]]]
+
+
+class QuoteCache(Generic[T]):
+    """
+    TTL cache with fan-in of concurrent misses into batched fetches.
+
+    `fetch` receives up to `max_batch` symbols and returns the quotes it
+    found; symbols it leaves out are reported as missing, and an exception
+    fails every symbol in that batch.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 1.0,
+        max_batch: int = QUOTE_BATCH_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a quote is served from cache (0 disables reuse but
+                still coalesces concurrent requests)
+            max_batch: Most symbols passed to one fetch call
+            clock: Monotonic time source
+        """
+        self.ttl = ttl
+        self.max_batch = max_batch
+        self._clock = clock
+        self._entries: dict[str, tuple[float, T]] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    async def get_many(
+        self,
+        symbols: Iterable[str],
+        fetch: FetchQuotes,
+        max_age: Optional[float] = None,
+        raise_errors: bool = False,
+    ) -> BatchResult[T]:
+        """
+        Get quotes, from cache where fresh enough and otherwise via fetch.
+
+        Args:
+            symbols: Symbols to quote
+            fetch: Upstream batch fetch, used if this call starts a flush
+            max_age: Tighter freshness bound than the TTL for this call
+            raise_errors: Re-raise a failed fetch instead of recording it
+
+        Returns:
+            BatchResult with a quote or an error for each symbol
+        """
+        max_age = self.ttl if max_age is None else min(max_age, self.ttl)
+        now = self._clock()
+        batch: BatchResult[T] = BatchResult()
+        waiting: dict[str, asyncio.Future] = {}
+
+        for symbol in dict.fromkeys(symbols):
+            entry = self._entries.get(symbol)
+            if entry is not None and now - entry[0] <= max_age:
+                batch.results[symbol] = entry[1]
+                self.hits += 1
+                continue
+            self.misses += 1
+            future = self._in_flight.get(symbol) or self._pending.get(symbol)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._pending[symbol] = future
+            waiting[symbol] = future
+
+        if not waiting:
+            return batch
+
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush(fetch))
+
+        # Shield: one caller giving up must not cancel a fetch others await
+        outcomes = await asyncio.gather(
+            *(asyncio.shield(f) for f in waiting.values()), return_exceptions=True
+        )
+        for symbol, outcome in zip(waiting, outcomes):
+            if isinstance(outcome, BaseException):
+                if raise_errors:
+                    raise outcome
+                batch.errors[symbol] = str(outcome) or type(outcome).__name__
+            elif outcome is None:
+                batch.errors[symbol] = "No quote returned"
+            else:
+                batch.results[symbol] = outcome
+        return batch
+
+    def invalidate(self, symbols: Optional[Iterable[str]] = None) -> None:
+        """Drop cached quotes (all of them if symbols is None)."""
+        if symbols is None:
+            self._entries.clear()
+        else:
+            for symbol in symbols:
+                self._entries.pop(symbol, None)
+
+    async def _flush(self, fetch: FetchQuotes) -> None:
+        # One loop turn lets concurrent callers add their misses
+        await asyncio.sleep(0)
+        pending, self._pending = self._pending, {}
+        self._in_flight.update(pending)
+        self._flush_task = None
+
+        symbols = list(pending)
+        chunks = [
+            symbols[start:start + self.max_batch]
+            for start in range(0, len(symbols), self.max_batch)
+        ]
+        try:
+            await asyncio.gather(*(self._fetch_chunk(chunk, pending, fetch) for chunk in chunks))
+        finally:
+            for symbol, future in pending.items():
+                self._in_flight.pop(symbol, None)
+                _resolve(future, exception=ConnectionError("Quote fetch cancelled"))
+
+    async def _fetch_chunk(
+        self,
+        chunk: list[str],
+        futures: dict[str, asyncio.Future],
+        fetch: FetchQuotes,
+    ) -> None:
+        self.fetches += 1
+        try:
+            quotes = await fetch(chunk)
+        except Exception as e:
+            logger.debug(f"Quote fetch failed for {len(chunk)} symbols: {e}")
+            for symbol in chunk:
+                _resolve(futures[symbol], exception=e)
+            return
+
+        fetched_at = self._clock()
+        for symbol in chunk:
+            quote = quotes.get(symbol)
+            if quote is not None:
+                self._entries[symbol] = (fetched_at, quote)
+            _resolve(futures[symbol], result=quote)
+
+
+def _resolve(
+    future: asyncio.Future,
+    result=None,
+    exception: Optional[BaseException] = None,
+) -> None:
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+        # Retrieved here so an abandoned waiter doesn't log "never retrieved"
+        future.exception()
+    else:
+        future.set_result(result)
+
+
+_quote_cache: Optional[QuoteCache] = None
+
+
+def get_quote_cache() -> QuoteCache:
+    """Get the application-wide quote cache."""
+    global _quote_cache
+    if _quote_cache is None:
+        _quote_cache = QuoteCache(ttl=get_settings().kite_quote_ttl_seconds)
+    return _quote_cache
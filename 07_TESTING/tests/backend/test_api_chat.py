@@ -180,6 +180,45 @@ class TestChatHistory:
             if "conversation_id" in data:
                 assert data["conversation_id"] is not None
 
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("params", [
+        {"offset": -1},
+        {"limit": 0},
+        {"limit": 100000},
+        {"message_limit": 0},
+    ])
+    async def test_history_rejects_out_of_range_paging(self, client, sample_instrument, params):
+        """
+        API-CHAT-007: History paging parameters are bounded.
+        
+        Start: 1 instrument
+        Action: GET /chat/{id}/history with out-of-range limit/offset
+        End: 422 error
+        """
+        response = await client.get(
+            f"/api/v1/chat/{sample_instrument.instrument_id}/history", params=params
+        )
+        
+        assert response.status_code == 422
+    
+    @pytest.mark.api
+    @pytest.mark.asyncio
+    async def test_conversation_page_rejects_zero_limit(self, client, sample_instrument):
+        """
+        API-CHAT-007b: Conversation message page size is bounded.
+        
+        Start: 1 instrument
+        Action: GET /chat/{id}/history/{conversation_id}?limit=0
+        End: 422 error
+        """
+        response = await client.get(
+            f"/api/v1/chat/{sample_instrument.instrument_id}/history/{uuid4()}",
+            params={"limit": 0},
+        )
+        
+        assert response.status_code == 422
+
 
 class TestChatEdgeCases:
     """Tests for edge cases in chat."""
@@ -0,0 +1,57 @@
+"""
+Unit Test Shared Fixtures
+=========================
+
+Provides:
+- Kite intelligence engine factory backed by a fake Kite REST API
+"""
+
+from collections.abc import Callable
+from decimal import Decimal
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from cia_sie.platforms.kite_intelligence import InstrumentInfo, KiteIntelligenceEngine
+
+
+# =============================================================================
+# KITE ENGINE FACTORY
+# =============================================================================
+
+@pytest.fixture
+def engine_factory() -> Callable[..., KiteIntelligenceEngine]:
+    """
+    Build KiteIntelligenceEngines whose REST calls go to a fake handler.
+
+    The returned factory takes an httpx handler (sync or async), a mapping
+    of symbol -> instrument token to seed the instruments cache, and any
+    KiteIntelligenceEngine keyword arguments (candle_store, scheduler, ...).
+    """
+
+    def make(
+        handler: Callable[[httpx.Request], httpx.Response],
+        tokens: dict[str, int],
+        **engine_kwargs,
+    ) -> KiteIntelligenceEngine:
+        adapter = Mock()
+        adapter.is_connected = True
+        adapter._client = httpx.AsyncClient(
+            base_url="https://api.kite.trade", transport=httpx.MockTransport(handler)
+        )
+        engine = KiteIntelligenceEngine(adapter, **engine_kwargs)
+        for symbol, token in tokens.items():
+            engine._instruments_cache[symbol] = InstrumentInfo(
+                symbol=symbol,
+                trading_symbol=symbol,
+                exchange="NSE",
+                instrument_token=token,
+                instrument_type="EQ",
+                segment="NSE",
+                lot_size=1,
+                tick_size=Decimal("0.05"),
+            )
+        return engine
+
+    return make
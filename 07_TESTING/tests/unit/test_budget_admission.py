@@ -0,0 +1,130 @@
+"""
+Tests for CIA-SIE AI Budget Admission Control
+=============================================
+
+Validates up-front cost reservation against the remaining budget.
+
+GOVERNED BY: Section 14 (AI Narrative Engine)
+"""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from cia_sie.ai.budget_admission import BudgetAdmissionController
+from cia_sie.ai.model_registry import estimate_cost
+from cia_sie.ai.usage_accumulator import UsageAccumulator
+from cia_sie.core.exceptions import AIBudgetExceededError
+
+MODEL = "claude-3-haiku-20240307"
+
+
+def _controller(budget_limit=1.0, **kwargs) -> BudgetAdmissionController:
+    return BudgetAdmissionController(
+        accumulator=UsageAccumulator(flush_interval_seconds=60),
+        budget_limit=budget_limit,
+        **kwargs,
+    )
+
+
+class TestEstimate:
+    """Tests for worst-case cost estimation."""
+
+    def test_estimate_uses_prompt_length_and_max_tokens(self):
+        """Test estimate prices ~4 chars/token input plus full max_tokens output."""
+        controller = _controller()
+
+        estimated = controller.estimate(MODEL, "x" * 4000, max_tokens=1500)
+
+        assert estimated == Decimal(str(estimate_cost(MODEL, 1000, 1500)))
+
+    def test_estimate_covers_every_iteration(self):
+        """Test a multi-call request reserves prompt and max_tokens per call."""
+        controller = _controller()
+
+        estimated = controller.estimate(MODEL, "x" * 4000, max_tokens=4000, iterations=10)
+
+        assert estimated == Decimal(str(estimate_cost(MODEL, 10000, 40000)))
+
+
+class TestReserve:
+    """Tests for reservation and release."""
+
+    def test_reserve_within_budget(self):
+        """Test a request that fits is admitted and held."""
+        controller = _controller()
+
+        reservation = controller.reserve(MODEL, "hello", max_tokens=1500)
+
+        assert controller.outstanding == 1
+        assert controller.reserved == reservation.estimated_cost
+
+    def test_reserve_rejects_over_budget(self):
+        """Test a request that does not fit is rejected."""
+        controller = _controller(budget_limit=0.0001)
+
+        with pytest.raises(AIBudgetExceededError) as exc_info:
+            controller.reserve(MODEL, "hello", max_tokens=1500)
+
+        assert "estimated_cost" in exc_info.value.details
+        assert controller.outstanding == 0
+
+    def test_burst_cannot_overshoot_budget(self):
+        """Test concurrent reservations are limited by the budget, not by spend."""
+        controller = _controller()
+        per_request = controller.estimate(MODEL, "hello", max_tokens=1500)
+        capacity = int(Decimal("1.0") / per_request)
+
+        admitted = []
+        for _ in range(capacity + 10):
+            try:
+                admitted.append(controller.reserve(MODEL, "hello", max_tokens=1500))
+            except AIBudgetExceededError:
+                pass
+
+        assert len(admitted) == capacity
+        assert controller.reserved <= Decimal("1.0")
+
+    def test_release_frees_budget(self):
+        """Test released reservations no longer count."""
+        controller = _controller()
+        reservation = controller.reserve(MODEL, "hello", max_tokens=1500)
+
+        controller.release(reservation)
+        controller.release(reservation)  # idempotent
+
+        assert controller.outstanding == 0
+        assert controller.reserved == 0
+
+    def test_actual_spend_reduces_remaining(self):
+        """Test recorded usage in the accumulator counts against the budget."""
+        controller = _controller()
+        controller.accumulator.record(MODEL, 100, 50, Decimal("0.75"))
+
+        assert controller.remaining() == Decimal("0.25")
+
+    def test_stale_reservations_expire(self):
+        """Test reservations never released are dropped after the TTL."""
+        controller = _controller(reservation_ttl_seconds=10)
+        with patch("cia_sie.ai.budget_admission.time.monotonic", return_value=0.0):
+            controller.reserve(MODEL, "hello", max_tokens=1500)
+
+        with patch("cia_sie.ai.budget_admission.time.monotonic", return_value=100.0):
+            controller.reserve(MODEL, "hello", max_tokens=1500)
+
+        assert controller.outstanding == 1
+
+
+class TestReconcile:
+    """Tests for reconciling reservations with actual usage."""
+
+    def test_reconcile_releases_and_reports_delta(self):
+        """Test reconcile releases the hold and returns estimate minus actual."""
+        controller = _controller()
+        reservation = controller.reserve(MODEL, "hello", max_tokens=1500)
+
+        delta = controller.reconcile(reservation, 0.0001)
+
+        assert controller.outstanding == 0
+        assert delta == reservation.estimated_cost - Decimal("0.0001")
@@ -0,0 +1,193 @@
+"""
+Tests for CIA-SIE Candle Aggregator
+===================================
+
+Validates intraday candles built from ticks, rolling VWAP and running
+volume, and merging of streamed candles into historical requests.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import time as systime
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from cia_sie.platforms.candle_aggregator import MARKET_TZ, CandleAggregator, market_today
+from cia_sie.platforms.kite_intelligence import (
+    InstrumentInfo,
+    KiteIntelligenceEngine,
+    KiteInterval,
+)
+from cia_sie.platforms.kite_scheduler import KiteRequestScheduler
+from cia_sie.platforms.kite_ticker import KiteTicker
+from cia_sie.platforms.quote_cache import QuoteCache
+
+TOKEN = 408065
+
+
+def at(hour: int, minute: int, second: int = 0, day: date | None = None) -> float:
+    """Epoch seconds for an exchange (IST) wall-clock time today."""
+    wall = datetime.combine(day or market_today(), time(hour, minute, second), MARKET_TZ)
+    return wall.timestamp()
+
+
+class TestCandles:
+    """Tests for per-interval candle building."""
+
+    def test_ticks_fold_into_buckets(self):
+        """Test ticks in one minute form one candle and the next minute opens another."""
+        agg = CandleAggregator()
+        agg.on_tick(TOKEN, at(9, 15, 1), 100.0, 1000)
+        agg.on_tick(TOKEN, at(9, 15, 20), 103.0, 1200)
+        agg.on_tick(TOKEN, at(9, 15, 40), 99.0, 1500)
+        agg.on_tick(TOKEN, at(9, 16, 5), 101.0, 1600)
+
+        minute = agg.candles(TOKEN, "minute")
+        five = agg.candles(TOKEN, "5minute")
+
+        assert [c[0].time() for c in minute] == [time(9, 15), time(9, 16)]
+        assert minute[0][1:] == (
+            Decimal("100.0"), Decimal("103.0"), Decimal("99.0"), Decimal("99.0"), 500
+        )
+        assert minute[1][5] == 100
+        assert len(five) == 1
+        assert five[0][2:5] == (Decimal("103.0"), Decimal("99.0"), Decimal("101.0"))
+        assert five[0][5] == 600
+
+    def test_new_day_resets_session(self):
+        """Test the first tick of a new day starts fresh candles."""
+        agg = CandleAggregator()
+        yesterday = market_today() - timedelta(days=1)
+        agg.on_tick(TOKEN, at(15, 29, day=yesterday), 100.0, 5000)
+        agg.on_tick(TOKEN, at(9, 15), 110.0, 100)
+
+        assert len(agg.candles(TOKEN, "minute")) == 1
+        assert agg.running_volume(TOKEN) == 100
+
+    def test_backfill_needed_only_after_late_start(self):
+        """Test streaming from the open needs no backfill, a late start does."""
+        agg = CandleAggregator()
+        agg.on_tick(TOKEN, at(9, 15, 2), 100.0)
+        agg.on_tick(TOKEN + 1, at(11, 0, 2), 100.0)
+
+        assert not agg.needs_backfill(TOKEN, "minute")
+        assert agg.needs_backfill(TOKEN + 1, "minute")
+
+    def test_buckets_use_exchange_time(self, monkeypatch):
+        """Test candles and the session open are IST whatever the server's zone."""
+        if not hasattr(systime, "tzset"):
+            pytest.skip("time.tzset not available")
+        monkeypatch.setenv("TZ", "America/New_York")
+        systime.tzset()
+        try:
+            agg = CandleAggregator()
+            agg.on_tick(TOKEN, at(9, 15, 2), 100.0)
+            agg.on_tick(TOKEN, at(9, 22, 30), 101.0)
+
+            five = agg.candles(TOKEN, "5minute")
+            assert [c[0] for c in five] == [
+                datetime.combine(market_today(), time(9, 15)),
+                datetime.combine(market_today(), time(9, 20)),
+            ]
+            assert not agg.needs_backfill(TOKEN, "5minute")
+            assert agg.has_candles(TOKEN, "5minute")
+        finally:
+            monkeypatch.undo()
+            systime.tzset()
+
+
+class TestIndicators:
+    """Tests for incrementally maintained indicators."""
+
+    def test_vwap_seeded_from_exchange_average(self):
+        """Test VWAP includes pre-stream volume via the exchange average price."""
+        agg = CandleAggregator()
+        agg.on_tick(TOKEN, at(10, 0), 100.0, cumulative_volume=1000, average_price=90.0)
+        agg.on_tick(TOKEN, at(10, 0, 5), 110.0, cumulative_volume=2000)
+
+        assert agg.vwap(TOKEN) == pytest.approx((90.0 * 1000 + 110.0 * 1000) / 2000)
+        assert agg.running_volume(TOKEN) == 2000
+
+    def test_baseline_kept_per_day(self):
+        """Test the baseline is remembered for the same number of days only."""
+        agg = CandleAggregator()
+        agg.on_tick(TOKEN, at(10, 0), 100.0, 1000)
+        agg.set_baseline(TOKEN, 5000.0, days=10)
+
+        assert agg.baseline(TOKEN, 10) == 5000.0
+        assert agg.baseline(TOKEN, 20) is None
+
+
+class TestEngineMerge:
+    """Tests for streamed candles in get_historical_ohlcv."""
+
+    @staticmethod
+    def _engine(requests: list[httpx.Request]) -> KiteIntelligenceEngine:
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            day = request.url.params["from"][:10]
+            return httpx.Response(200, json={"data": {"candles": [
+                [f"{day}T09:15:00+0530", 90, 91, 89, 90, 10],
+                [f"{day}T09:16:00+0530", 90, 92, 90, 91, 20],
+            ]}})
+
+        adapter = Mock()
+        adapter.is_connected = True
+        adapter._client = httpx.AsyncClient(
+            base_url="https://api.kite.trade", transport=httpx.MockTransport(handler)
+        )
+        engine = KiteIntelligenceEngine(
+            adapter,
+            candle_store=None,
+            scheduler=KiteRequestScheduler({"historical": 1000}),
+            quote_cache=QuoteCache(),
+            ticker=KiteTicker("key", "token"),
+        )
+        engine._instruments_cache["INFY"] = InstrumentInfo(
+            symbol="INFY",
+            trading_symbol="INFY",
+            exchange="NSE",
+            instrument_token=TOKEN,
+            instrument_type="EQ",
+            segment="NSE",
+            lot_size=1,
+            tick_size=Decimal("0.05"),
+        )
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_today_served_from_ticks(self):
+        """Test today's candles come from ticks and only past days are fetched."""
+        requests: list[httpx.Request] = []
+        engine = self._engine(requests)
+        engine.ticker.aggregator.on_tick(TOKEN, at(9, 15, 1), 100.0, 0)
+        today = market_today()
+
+        candles = await engine.get_historical_ohlcv(
+            "INFY", today - timedelta(days=1), today, KiteInterval.MINUTE
+        )
+
+        assert len(requests) == 1
+        assert requests[0].url.params["to"].startswith(str(today - timedelta(days=1)))
+        assert candles[-1].timestamp == datetime.combine(today, time(9, 15))
+        assert candles[-1].close == Decimal("100.0")
+
+    @pytest.mark.asyncio
+    async def test_late_start_backfilled_once(self):
+        """Test candles before the first tick are fetched once, then kept."""
+        requests: list[httpx.Request] = []
+        engine = self._engine(requests)
+        engine.ticker.aggregator.on_tick(TOKEN, at(9, 16, 30), 100.0, 0)
+        today = market_today()
+
+        first = await engine.get_historical_ohlcv("INFY", today, today, KiteInterval.MINUTE)
+        second = await engine.get_historical_ohlcv("INFY", today, today, KiteInterval.MINUTE)
+
+        assert len(requests) == 1
+        assert [c.timestamp.time() for c in first] == [time(9, 15), time(9, 16)]
+        assert first[1].close == Decimal("100.0")
+        assert second == first
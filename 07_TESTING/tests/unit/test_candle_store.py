@@ -0,0 +1,216 @@
+"""
+Tests for CIA-SIE Kite Candle Store
+===================================
+
+Validates local candle storage and gap-only fetching against a fake Kite
+historical API.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from cia_sie.platforms.candle_aggregator import market_today
+from cia_sie.platforms.candle_store import (
+    CandleStore,
+    merge_ranges,
+    split_range,
+    subtract_ranges,
+)
+from cia_sie.platforms.kite_intelligence import (
+    KiteIntelligenceEngine,
+    KiteInterval,
+)
+from cia_sie.platforms.kite_scheduler import KiteRequestScheduler
+
+TOKEN = 738561
+TODAY = market_today()
+
+
+class FakeKiteHistorical:
+    """Fake /instruments/historical endpoint returning one candle per day."""
+
+    def __init__(self):
+        self.requests: list[tuple[str, str]] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        start = date.fromisoformat(request.url.params["from"])
+        end = date.fromisoformat(request.url.params["to"])
+        self.requests.append((start.isoformat(), end.isoformat()))
+
+        candles = []
+        day = start
+        while day <= end:
+            price = 100 + day.toordinal() % 50
+            candles.append(
+                [f"{day.isoformat()}T00:00:00+0530", price, price + 2, price - 1, price + 1.5, 1000]
+            )
+            day += timedelta(days=1)
+        return httpx.Response(200, json={"status": "success", "data": {"candles": candles}})
+
+
+@pytest.fixture
+def make_engine(engine_factory):
+    """Engine serving RELIANCE from a fake historical API and the given store."""
+
+    def make(fake: FakeKiteHistorical, store) -> KiteIntelligenceEngine:
+        return engine_factory(
+            fake.handler,
+            {"RELIANCE": TOKEN},
+            candle_store=store,
+            scheduler=KiteRequestScheduler(rate_limits={"historical": 1000}),
+        )
+
+    return make
+
+
+class TestRangeHelpers:
+    """Tests for date range arithmetic."""
+
+    def test_subtract_ranges(self):
+        """Test only uncovered days are returned."""
+        covered = [(date(2025, 1, 5), date(2025, 1, 10)), (date(2025, 1, 20), date(2025, 1, 25))]
+
+        gaps = subtract_ranges((date(2025, 1, 1), date(2025, 1, 31)), covered)
+
+        assert gaps == [
+            (date(2025, 1, 1), date(2025, 1, 4)),
+            (date(2025, 1, 11), date(2025, 1, 19)),
+            (date(2025, 1, 26), date(2025, 1, 31)),
+        ]
+
+    def test_subtract_fully_covered(self):
+        """Test a covered request has no gaps."""
+        covered = [(date(2025, 1, 1), date(2025, 1, 31))]
+        assert subtract_ranges((date(2025, 1, 5), date(2025, 1, 6)), covered) == []
+
+    def test_merge_adjacent_ranges(self):
+        """Test adjacent ranges merge into one."""
+        merged = merge_ranges(
+            [(date(2025, 1, 6), date(2025, 1, 9)), (date(2025, 1, 1), date(2025, 1, 5))]
+        )
+        assert merged == [(date(2025, 1, 1), date(2025, 1, 9))]
+
+    def test_split_range(self):
+        """Test ranges longer than Kite's limit are chunked."""
+        chunks = split_range((date(2025, 1, 1), date(2025, 1, 10)), 4)
+        assert chunks == [
+            (date(2025, 1, 1), date(2025, 1, 4)),
+            (date(2025, 1, 5), date(2025, 1, 8)),
+            (date(2025, 1, 9), date(2025, 1, 10)),
+        ]
+
+
+class TestCandleStore:
+    """Tests for the SQLite store."""
+
+    def test_roundtrip_preserves_decimals(self):
+        """Test stored prices come back as the same Decimals."""
+        store = CandleStore()
+        row = (
+            datetime(2025, 1, 2),
+            Decimal("2450.35"),
+            Decimal("2460.1"),
+            Decimal("2440"),
+            Decimal("2455.05"),
+            12345,
+        )
+
+        store.put_candles(TOKEN, "day", [row], covered=(date(2025, 1, 1), date(2025, 1, 3)))
+
+        assert store.get_candles(TOKEN, "day", date(2025, 1, 1), date(2025, 1, 3)) == [row]
+        assert store.get_missing_ranges(TOKEN, "day", date(2025, 1, 1), date(2025, 1, 5)) == [
+            (date(2025, 1, 4), date(2025, 1, 5))
+        ]
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test a file-backed store survives reopening."""
+        path = tmp_path / "candles.db"
+        store = CandleStore(path)
+        store.put_candles(TOKEN, "day", [], covered=(date(2025, 1, 1), date(2025, 1, 3)))
+        store.close()
+
+        reopened = CandleStore(path)
+        assert reopened.get_coverage(TOKEN, "day") == [(date(2025, 1, 1), date(2025, 1, 3))]
+
+
+class TestEngineGapFetching:
+    """Tests for KiteIntelligenceEngine served from the store."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_served_locally(self, make_engine):
+        """Test a repeated historical range makes no further Kite calls."""
+        fake = FakeKiteHistorical()
+        engine = make_engine(fake, CandleStore())
+        from_date, to_date = TODAY - timedelta(days=30), TODAY - timedelta(days=1)
+
+        first = await engine.get_historical_ohlcv("RELIANCE", from_date, to_date, KiteInterval.DAY)
+        second = await engine.get_historical_ohlcv("RELIANCE", from_date, to_date, KiteInterval.DAY)
+
+        assert len(fake.requests) == 1
+        assert first == second
+        assert len(second) == 30
+
+    @pytest.mark.asyncio
+    async def test_only_gaps_are_fetched(self, make_engine):
+        """Test an overlapping wider range fetches just the uncovered days."""
+        fake = FakeKiteHistorical()
+        engine = make_engine(fake, CandleStore())
+        await engine.get_historical_ohlcv(
+            "RELIANCE", TODAY - timedelta(days=20), TODAY - timedelta(days=10)
+        )
+
+        candles = await engine.get_historical_ohlcv(
+            "RELIANCE", TODAY - timedelta(days=30), TODAY - timedelta(days=1)
+        )
+
+        assert fake.requests[1:] == [
+            ((TODAY - timedelta(days=30)).isoformat(), (TODAY - timedelta(days=21)).isoformat()),
+            ((TODAY - timedelta(days=9)).isoformat(), (TODAY - timedelta(days=1)).isoformat()),
+        ]
+        assert [c.timestamp.date() for c in candles] == [
+            TODAY - timedelta(days=d) for d in range(30, 0, -1)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_today_is_always_fetched_live(self, make_engine):
+        """Test the current trading day is never served from the store."""
+        fake = FakeKiteHistorical()
+        store = CandleStore()
+        engine = make_engine(fake, store)
+
+        await engine.get_historical_ohlcv("RELIANCE", TODAY - timedelta(days=5), TODAY)
+        candles = await engine.get_historical_ohlcv("RELIANCE", TODAY - timedelta(days=5), TODAY)
+
+        assert fake.requests[-1] == (TODAY.isoformat(), TODAY.isoformat())
+        assert len(fake.requests) == 3  # history once, today twice
+        assert candles[-1].timestamp.date() == TODAY
+        assert store.get_candles(TOKEN, "day", TODAY, TODAY) == []
+
+    @pytest.mark.asyncio
+    async def test_long_intraday_gap_is_chunked(self, make_engine):
+        """Test gaps beyond Kite's per-request limit are split."""
+        fake = FakeKiteHistorical()
+        engine = make_engine(fake, CandleStore())
+
+        await engine.get_historical_ohlcv(
+            "RELIANCE", TODAY - timedelta(days=150), TODAY - timedelta(days=1), "minute"
+        )
+
+        assert len(fake.requests) == 3  # 150 days / 60-day limit
+
+    @pytest.mark.asyncio
+    async def test_store_disabled_always_fetches(self, make_engine):
+        """Test candle_store=None keeps the direct-fetch behaviour."""
+        fake = FakeKiteHistorical()
+        engine = make_engine(fake, None)
+        from_date, to_date = TODAY - timedelta(days=10), TODAY - timedelta(days=1)
+
+        await engine.get_historical_ohlcv("RELIANCE", from_date, to_date)
+        await engine.get_historical_ohlcv("RELIANCE", from_date, to_date)
+
+        assert len(fake.requests) == 2
@@ -0,0 +1,127 @@
+"""
+Tests for CIA-SIE Anthropic Client Manager
+==========================================
+
+Validates the pooled, application-scoped Anthropic transport.
+
+GOVERNED BY: Section 14 (AI Narrative Engine)
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from cia_sie.ai.claude_client import ClaudeClient
+from cia_sie.ai.client_manager import AnthropicClientManager, get_client_manager
+
+
+class TestClientManagerLifecycle:
+    """Tests for startup and shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_not_started_by_default(self):
+        """Test manager starts closed."""
+        manager = AnthropicClientManager()
+        assert manager.is_started is False
+
+    @pytest.mark.asyncio
+    async def test_startup_and_shutdown(self):
+        """Test pooled transport opens and closes."""
+        manager = AnthropicClientManager()
+
+        await manager.startup()
+        http_client = manager.http_client
+        assert manager.is_started is True
+
+        await manager.shutdown()
+        assert manager.is_started is False
+        assert http_client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_startup_is_idempotent(self):
+        """Test repeated startup keeps the same transport."""
+        manager = AnthropicClientManager()
+        await manager.startup()
+        first = manager.http_client
+
+        await manager.startup()
+
+        assert manager.http_client is first
+        await manager.shutdown()
+
+    def test_http_client_requires_startup(self):
+        """Test accessing the transport before startup raises."""
+        manager = AnthropicClientManager()
+        with pytest.raises(RuntimeError):
+            _ = manager.http_client
+
+    def test_get_client_manager_is_singleton(self):
+        """Test the application-wide manager is shared."""
+        assert get_client_manager() is get_client_manager()
+
+
+class TestClientManagerClients:
+    """Tests for client hand-out."""
+
+    @pytest.mark.asyncio
+    async def test_clients_share_transport(self):
+        """Test clients for different keys share one transport."""
+        manager = AnthropicClientManager()
+        await manager.startup()
+
+        with patch("cia_sie.ai.client_manager.AsyncAnthropic") as mock_anthropic:
+            manager.get_client("key-a")
+            manager.get_client("key-b")
+
+            for call in mock_anthropic.call_args_list:
+                assert call.kwargs["http_client"] is manager.http_client
+
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_clients_cached_per_key(self):
+        """Test the same key returns the same client."""
+        manager = AnthropicClientManager()
+        await manager.startup()
+
+        assert manager.get_client("key-a") is manager.get_client("key-a")
+        assert manager.get_client("key-a") is not manager.get_client("key-b")
+
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_base_url_override(self):
+        """Test base URL override is applied (e.g. local fake server)."""
+        manager = AnthropicClientManager(base_url="http://127.0.0.1:9999")
+        await manager.startup()
+
+        client = manager.get_client("key-a")
+
+        assert str(client.base_url).startswith("http://127.0.0.1:9999")
+        await manager.shutdown()
+
+
+class TestClaudeClientUsesManager:
+    """Tests for ClaudeClient integration with the manager."""
+
+    @pytest.mark.asyncio
+    async def test_started_manager_supplies_client(self):
+        """Test ClaudeClient reuses the pooled client when started."""
+        manager = AnthropicClientManager()
+        await manager.startup()
+
+        first = ClaudeClient(api_key="test-key", client_manager=manager)
+        second = ClaudeClient(api_key="test-key", client_manager=manager)
+
+        assert first.client is second.client
+        await manager.shutdown()
+
+    def test_unstarted_manager_falls_back_to_private_client(self):
+        """Test ClaudeClient creates its own client before startup."""
+        manager = AnthropicClientManager()
+
+        with patch("cia_sie.ai.claude_client.AsyncAnthropic") as mock_anthropic:
+            client = ClaudeClient(api_key="test-key", client_manager=manager)
+            _ = client.client
+
+            mock_anthropic.assert_called_once_with(api_key="test-key")
@@ -0,0 +1,177 @@
+"""
+Tests for CIA-SIE Conversation Message Storage
+==============================================
+
+Validates append-only message rows, token-budgeted context windows and
+paginated history.
+
+GOVERNED BY: Section 14 (AI Narrative Engine)
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from cia_sie.ai.model_registry import estimate_tokens
+from cia_sie.api.routes.chat import _trim_to_user_start
+from cia_sie.dal.database import Base
+from cia_sie.dal.models import ConversationDB
+from cia_sie.dal.repositories import ConversationMessageRepository
+
+
+@pytest_asyncio.fixture
+async def session():
+    """In-memory database with one conversation."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        for conversation_id in ("conv-a", "conv-b"):
+            session.add(
+                ConversationDB(
+                    conversation_id=conversation_id,
+                    instrument_id="inst-1",
+                    messages=[],
+                    model_used="test-model",
+                )
+            )
+        await session.flush()
+        yield session
+    await engine.dispose()
+
+
+async def _append_turns(repo, conversation_id, turns, tokens=10):
+    for i in range(turns):
+        await repo.append(conversation_id, "user", f"question {i}", token_count=tokens)
+        await repo.append(conversation_id, "assistant", f"answer {i}", token_count=tokens)
+
+
+class TestEstimateTokens:
+    """Tests for the shared token approximation."""
+
+    def test_rounds_up(self):
+        """Test partial tokens count as a whole token."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+
+class TestAppend:
+    """Tests for appending messages."""
+
+    @pytest.mark.asyncio
+    async def test_sequences_are_per_conversation(self, session):
+        """Test each conversation numbers its messages from zero."""
+        repo = ConversationMessageRepository(session)
+        await _append_turns(repo, "conv-a", 2)
+        message = await repo.append("conv-b", "user", "hello", token_count=2)
+
+        assert message.sequence == 0
+        assert await repo.count("conv-a") == 4
+        assert (await repo.get_page("conv-a"))[-1].sequence == 3
+
+    @pytest.mark.asyncio
+    async def test_sequence_collision_retried(self, session):
+        """Test an append that loses a sequence race retries with the next one."""
+        repo = ConversationMessageRepository(session)
+        await repo.append("conv-a", "user", "first", token_count=1)
+        next_sequence = repo._next_sequence
+        reads = []
+
+        async def racing_next_sequence(conversation_id):
+            # The first read predates a concurrent append of sequence 0
+            reads.append(conversation_id)
+            return 0 if len(reads) == 1 else await next_sequence(conversation_id)
+
+        repo._next_sequence = racing_next_sequence
+        message = await repo.append("conv-a", "assistant", "second", token_count=1)
+
+        assert message.sequence == 1
+        assert len(reads) == 2
+        assert [m.content for m in await repo.get_page("conv-a")] == ["first", "second"]
+
+
+class TestContextWindow:
+    """Tests for token-budgeted prompt history."""
+
+    @pytest.mark.asyncio
+    async def test_window_respects_token_budget(self, session):
+        """Test only the newest messages that fit the budget are returned."""
+        repo = ConversationMessageRepository(session)
+        await _append_turns(repo, "conv-a", 5, tokens=10)
+
+        window = await repo.get_context_window("conv-a", token_budget=35, max_messages=100)
+
+        assert [m.sequence for m in window] == [7, 8, 9]
+
+    @pytest.mark.asyncio
+    async def test_window_respects_max_messages(self, session):
+        """Test the row limit caps the window regardless of budget."""
+        repo = ConversationMessageRepository(session)
+        await _append_turns(repo, "conv-a", 5, tokens=1)
+
+        window = await repo.get_context_window("conv-a", token_budget=10_000, max_messages=4)
+
+        assert [m.content for m in window] == [
+            "question 3",
+            "answer 3",
+            "question 4",
+            "answer 4",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_zero_budget_returns_nothing(self, session):
+        """Test history can be disabled via the budget."""
+        repo = ConversationMessageRepository(session)
+        await _append_turns(repo, "conv-a", 1)
+
+        assert await repo.get_context_window("conv-a", token_budget=0, max_messages=10) == []
+
+    def test_trim_to_user_start(self):
+        """Test a window opening mid-turn drops the leading assistant message."""
+        window = [
+            SimpleNamespace(role="assistant", content="answer 0"),
+            SimpleNamespace(role="user", content="question 1"),
+            SimpleNamespace(role="assistant", content="answer 1"),
+        ]
+
+        assert [m.role for m in _trim_to_user_start(window)] == ["user", "assistant"]
+
+
+class TestPagination:
+    """Tests for paginated history reads."""
+
+    @pytest.mark.asyncio
+    async def test_page_backwards(self, session):
+        """Test before_sequence walks back through older messages."""
+        repo = ConversationMessageRepository(session)
+        await _append_turns(repo, "conv-a", 3)
+
+        newest = await repo.get_page("conv-a", limit=4)
+        older = await repo.get_page("conv-a", limit=4, before_sequence=newest[0].sequence)
+
+        assert [m.sequence for m in newest] == [2, 3, 4, 5]
+        assert [m.sequence for m in older] == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_latest_by_conversations(self, session):
+        """Test latest messages for several conversations come back in one call."""
+        repo = ConversationMessageRepository(session)
+        await _append_turns(repo, "conv-a", 3)
+        await _append_turns(repo, "conv-b", 1)
+
+        latest = await repo.get_latest_by_conversations(["conv-a", "conv-b"], per_conversation=2)
+        counts = await repo.count_by_conversations(["conv-a", "conv-b"])
+
+        assert [m.sequence for m in latest["conv-a"]] == [4, 5]
+        assert [m.sequence for m in latest["conv-b"]] == [0, 1]
+        assert counts == {"conv-a": 6, "conv-b": 2}
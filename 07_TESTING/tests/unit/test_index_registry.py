@@ -0,0 +1,172 @@
+"""
+Tests for CIA-SIE Index Registry
+================================
+
+Validates dated constituent and sector snapshots, reverse membership
+indexes, snapshot file loading and NSE list refresh.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import asyncio
+import json
+from datetime import date
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from cia_sie.platforms.index_registry import IndexRegistry
+from cia_sie.platforms.kite_intelligence import KiteIntelligenceEngine
+
+NSE_LIST = (
+    "Company Name,Industry,Symbol,Series,ISIN Code\n"
+    "Infosys Ltd.,Information Technology,INFY,EQ,INE009A01021\n"
+    "Reliance Industries Ltd.,Oil Gas & Consumable Fuels,RELIANCE,EQ,INE002A01018\n"
+)
+
+
+def _registry() -> IndexRegistry:
+    registry = IndexRegistry()
+    registry.add_index("NIFTY 50", date(2024, 3, 28), ["INFY", "HDFC"])
+    registry.add_index("NIFTY50", date(2024, 9, 30), ["INFY", "TRENT"])
+    registry.add_index("NIFTYIT", date(2024, 1, 1), ["INFY", "TCS"])
+    registry.add_sectors(date(2024, 1, 1), {"IT": ["INFY", "TCS"], "FINANCE": ["HDFC"]})
+    return registry
+
+
+class TestVersions:
+    """Tests for point-in-time membership."""
+
+    def test_membership_as_of_date(self):
+        """Test each date sees the latest snapshot on or before it."""
+        registry = _registry()
+
+        assert registry.constituents("NIFTY50") == ("INFY", "TRENT")
+        assert registry.constituents("NIFTY50", date(2024, 6, 1)) == ("INFY", "HDFC")
+        assert registry.constituents("nifty 50", date(2024, 9, 30)) == ("INFY", "TRENT")
+        assert registry.constituents("NIFTY50", date(2023, 1, 1)) is None
+        assert registry.constituents("NIFTYMIDCAP") is None
+        assert registry.versions("NIFTY50") == [date(2024, 3, 28), date(2024, 9, 30)]
+
+    def test_partial_sector_snapshot_merges(self):
+        """Test a later sector snapshot replaces only the sectors it lists."""
+        registry = _registry()
+        registry.add_sectors(date(2024, 6, 1), {"IT": ["INFY", "TCS", "WIPRO"]})
+
+        assert registry.sector_members("IT") == ("INFY", "TCS", "WIPRO")
+        assert registry.sector_members("IT", date(2024, 2, 1)) == ("INFY", "TCS")
+        assert registry.sector_members("FINANCE") == ("HDFC",)
+
+
+class TestReverseIndexes:
+    """Tests for symbol -> membership lookups."""
+
+    def test_indices_for_symbol(self):
+        """Test current and historical index membership of a symbol."""
+        registry = _registry()
+
+        assert registry.indices_for("INFY") == ("NIFTY50", "NIFTYIT")
+        assert registry.indices_for("HDFC") == ()
+        assert registry.indices_for("HDFC", date(2024, 6, 1)) == ("NIFTY50",)
+
+    def test_reverse_index_rebuilt_after_update(self):
+        """Test adding a snapshot updates symbol -> indices."""
+        registry = _registry()
+        registry.indices_for("INFY")
+
+        registry.add_index("NIFTYIT", date(2024, 10, 1), ["TCS"])
+
+        assert registry.indices_for("INFY") == ("NIFTY50",)
+        assert registry.sector_of("tcs") == "IT"
+
+
+class TestSnapshotFiles:
+    """Tests for loading and refreshing snapshot files."""
+
+    def test_load_directory(self, tmp_path):
+        """Test CSV index lists, sector CSVs and JSON snapshots all load."""
+        (tmp_path / "NIFTY50_2024-09-30.csv").write_text(NSE_LIST)
+        (tmp_path / "SECTORS_2024-09-30.csv").write_text(
+            "Symbol,Sector\nINFY,IT\nRELIANCE,Energy\n"
+        )
+        (tmp_path / "banks.json").write_text(json.dumps({
+            "as_of": "2024-06-28",
+            "indices": {"NIFTYBANK": ["HDFCBANK", "SBIN"]},
+        }))
+        (tmp_path / "notes.txt").write_text("ignored")
+        (tmp_path / "BROKEN_not-a-date.csv").write_text(NSE_LIST)
+
+        registry = IndexRegistry(tmp_path)
+
+        assert registry.load_directory() == 3
+        assert registry.index_names() == ["NIFTY50", "NIFTYBANK"]
+        assert registry.constituents("NIFTY50") == ("INFY", "RELIANCE")
+        assert registry.sector_of("RELIANCE") == "ENERGY"
+
+    @pytest.mark.asyncio
+    async def test_refresh_from_nse_writes_snapshot(self, tmp_path):
+        """Test downloaded lists become today's snapshot on disk and in memory."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("ind_nifty50list.csv"):
+                return httpx.Response(200, text=NSE_LIST)
+            return httpx.Response(404)
+
+        registry = IndexRegistry(tmp_path)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            failed = await registry.refresh_from_nse(client, ["NIFTY50", "NIFTYIT"])
+
+        assert failed == ["NIFTYIT"]
+        assert (tmp_path / f"NIFTY50_{date.today().isoformat()}.csv").exists()
+        assert registry.constituents("NIFTY50") == ("INFY", "RELIANCE")
+
+    @pytest.mark.asyncio
+    async def test_refresh_normalizes_and_skips_unknown_names(self, tmp_path):
+        """Test index names are normalized and unknown ones reported as failed."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, text=NSE_LIST)
+
+        registry = IndexRegistry(tmp_path)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            failed = await registry.refresh_from_nse(client, ["nifty 50", "SENSEX"])
+
+        assert failed == ["SENSEX"]
+        assert registry.constituents("NIFTY50") == ("INFY", "RELIANCE")
+
+    @pytest.mark.asyncio
+    async def test_refresh_loop_survives_errors(self, tmp_path, monkeypatch):
+        """Test an unexpected refresh error is logged and the schedule continues."""
+        registry = IndexRegistry(tmp_path)
+        calls = []
+
+        async def failing_refresh(client, indices=None):
+            calls.append(indices)
+            raise OSError("disk full")
+
+        monkeypatch.setattr(registry, "refresh_from_nse", failing_refresh)
+        registry.start_refresh(interval_hours=0.01 / 3600)
+        for _ in range(100):
+            if len(calls) > 1:
+                break
+            await asyncio.sleep(0.01)
+
+        assert len(calls) > 1
+        assert not registry._refresh_task.done()
+        await registry.stop_refresh()
+
+
+class TestEngineUniverses:
+    """Tests for registry-backed engine lookups."""
+
+    @pytest.mark.asyncio
+    async def test_constituents_and_memberships(self):
+        """Test the engine answers index, sector and membership queries from the registry."""
+        engine = KiteIntelligenceEngine(Mock(), candle_store=None, index_registry=_registry())
+
+        assert await engine.get_index_constituents("NIFTY50", date(2024, 6, 1)) == ["INFY", "HDFC"]
+        assert await engine.get_sector_instruments("it") == ["INFY", "TCS"]
+        assert engine.get_memberships("INFY") == {
+            "symbol": "INFY", "indices": ["NIFTY50", "NIFTYIT"], "sector": "IT"
+        }
+        with pytest.raises(ValueError):
+            await engine.get_index_constituents("NIFTYMIDCAP")
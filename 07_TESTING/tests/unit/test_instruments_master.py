@@ -0,0 +1,199 @@
+"""
+Tests for CIA-SIE Kite Instruments Master
+=========================================
+
+Validates CSV parsing, symbol/token indexes, search and the daily cache
+file against a fake Kite /instruments endpoint.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import os
+import time
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from cia_sie.platforms.instruments_master import InstrumentsMaster, InstrumentTable
+from cia_sie.platforms.kite_intelligence import KiteIntelligenceEngine
+from cia_sie.platforms.kite_scheduler import KiteRequestScheduler
+
+HEADER = (
+    "instrument_token,exchange_token,tradingsymbol,name,last_price,expiry,"
+    "strike,tick_size,lot_size,instrument_type,segment,exchange"
+)
+ROWS = [
+    "738561,2885,RELIANCE,RELIANCE INDUSTRIES,0,,0,0.05,1,EQ,NSE,NSE",
+    "128083204,500325,RELIANCE,RELIANCE INDUSTRIES,0,,0,0.05,1,EQ,BSE,BSE",
+    "408065,1594,INFY,INFOSYS,0,,0,0.05,1,EQ,NSE,NSE",
+    "341249,1333,HDFCBANK,HDFC BANK,0,,0,0.05,1,EQ,NSE,NSE",
+    "12345678,48225,RELIANCE25JANFUT,RELIANCE,0,2025-01-30,0,0.05,250,FUT,NFO-FUT,NFO",
+    "256265,1001,NIFTY 50,NIFTY 50,0,,0,0,0,EQ,INDICES,INDICES",
+]
+CSV_TEXT = "\n".join([HEADER, *ROWS]) + "\n"
+
+
+class FakeInstruments:
+    """Fake /instruments endpoint serving the CSV dump."""
+
+    def __init__(self, status_code: int = 200):
+        self.status_code = status_code
+        self.calls = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        return httpx.Response(self.status_code, text=CSV_TEXT)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url="https://api.kite.trade", transport=httpx.MockTransport(self.handler)
+        )
+
+
+class TestInstrumentTable:
+    """Tests for parsing and lookups."""
+
+    def test_columns_are_compact(self):
+        """Test numeric fields are stored in typed arrays."""
+        table = InstrumentTable.from_csv(CSV_TEXT.splitlines())
+
+        assert len(table) == 6
+        assert table.tokens.typecode == "q"
+        assert table.tick_sizes.typecode == "d"
+
+    def test_find_by_exchange_and_symbol(self):
+        """Test bare symbols resolve on NSE and prefixed keys on their exchange."""
+        table = InstrumentTable.from_csv(CSV_TEXT.splitlines())
+
+        assert table.tokens[table.find("RELIANCE")] == 738561
+        assert table.tokens[table.find("BSE:RELIANCE")] == 128083204
+        assert table.find("UNKNOWN") is None
+
+    def test_find_by_token(self):
+        """Test token lookups materialize the full row."""
+        table = InstrumentTable.from_csv(CSV_TEXT.splitlines())
+
+        row = table.row(table.find_token(12345678))
+
+        assert row.tradingsymbol == "RELIANCE25JANFUT"
+        assert row.expiry == date(2025, 1, 30)
+        assert row.lot_size == 250
+
+    def test_search_prefix_first(self):
+        """Test prefix matches lead, then substring matches on name."""
+        table = InstrumentTable.from_csv(CSV_TEXT.splitlines())
+
+        symbols = [table.symbols[i] for i in table.search("reliance")]
+
+        assert symbols == ["RELIANCE", "RELIANCE", "RELIANCE25JANFUT"]
+
+    def test_search_substring_via_trigrams(self):
+        """Test substrings in the middle of a symbol or name are found."""
+        table = InstrumentTable.from_csv(CSV_TEXT.splitlines())
+
+        assert [table.symbols[i] for i in table.search("bank")] == ["HDFCBANK"]
+        assert [table.symbols[i] for i in table.search("osys")] == ["INFY"]
+        assert table.search("zzz") == []
+
+    def test_search_matches_linear_scan(self):
+        """Test indexed search finds the same rows as a linear scan."""
+        table = InstrumentTable.from_csv(CSV_TEXT.splitlines())
+
+        for query in ["re", "nifty", "fut", "25j", "i"]:
+            expected = {
+                i
+                for i in range(len(table))
+                if query in table.symbols[i].lower() or query in table.names[i].lower()
+            }
+            assert set(table.search(query, limit=100)) == expected
+
+    def test_symbols_for_exchange(self):
+        """Test the equity universe can be listed per exchange."""
+        table = InstrumentTable.from_csv(CSV_TEXT.splitlines())
+
+        assert table.symbols_for("NSE", "EQ") == ["RELIANCE", "INFY", "HDFCBANK"]
+
+
+class TestInstrumentsMasterCache:
+    """Tests for the daily cache file."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_writes_cache(self, tmp_path):
+        """Test a download is persisted and parsed."""
+        fake = FakeInstruments()
+        master = InstrumentsMaster(tmp_path / "instruments.csv")
+
+        await master.ensure_loaded(fake.client())
+
+        assert fake.calls == 1
+        assert (tmp_path / "instruments.csv").read_text() == CSV_TEXT
+        assert len(master.table) == 6
+        assert not master.is_stale
+
+    @pytest.mark.asyncio
+    async def test_fresh_cache_skips_download(self, tmp_path):
+        """Test a restart on the same day loads from disk."""
+        fake = FakeInstruments()
+        path = tmp_path / "instruments.csv"
+        path.write_text(CSV_TEXT)
+
+        master = InstrumentsMaster(path)
+        await master.ensure_loaded(fake.client())
+
+        assert fake.calls == 0
+        assert master.table.find("INFY") is not None
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_is_refreshed(self, tmp_path):
+        """Test a cache file from an earlier day triggers a download."""
+        fake = FakeInstruments()
+        path = tmp_path / "instruments.csv"
+        path.write_text(HEADER + "\n")
+        yesterday = time.time() - 86400 * 2
+        os.utime(path, (yesterday, yesterday))
+
+        master = InstrumentsMaster(path)
+        await master.ensure_loaded(fake.client())
+
+        assert fake.calls == 1
+        assert len(master.table) == 6
+
+    @pytest.mark.asyncio
+    async def test_failed_download_keeps_previous_cache(self, tmp_path):
+        """Test an HTTP error raises without clobbering the cache file."""
+        path = tmp_path / "instruments.csv"
+        path.write_text(CSV_TEXT)
+        master = InstrumentsMaster(path)
+
+        with pytest.raises(ConnectionError):
+            await master.refresh(FakeInstruments(status_code=503).client())
+
+        assert path.read_text() == CSV_TEXT
+
+
+class TestEngineResolution:
+    """Tests for engine symbol resolution via the master."""
+
+    @pytest.mark.asyncio
+    async def test_get_token_uses_master(self):
+        """Test symbols not manually cached resolve through the master."""
+        fake = FakeInstruments()
+        adapter = Mock()
+        adapter._client = fake.client()
+        engine = KiteIntelligenceEngine(
+            adapter,
+            candle_store=None,
+            scheduler=KiteRequestScheduler(),
+            instruments=InstrumentsMaster(),
+        )
+
+        await engine.ensure_instruments()
+
+        assert engine._get_token("INFY") == 408065
+        assert engine.get_instrument_info("NFO:RELIANCE25JANFUT").lot_size == 250
+        assert engine.search_instruments("hdfc")[0].tick_size == Decimal("0.05")
+        with pytest.raises(ValueError):
+            engine._get_token("UNKNOWN")
@@ -0,0 +1,282 @@
+"""
+Tests for CIA-SIE Kite Request Scheduler
+========================================
+
+Validates rate-limited concurrent fetching, batched quotes and partial
+results for multi-symbol scans.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import asyncio
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from cia_sie.platforms.index_registry import IndexRegistry
+from cia_sie.platforms import kite_intelligence
+from cia_sie.platforms.kite_intelligence import KiteIntelligenceEngine
+from cia_sie.platforms.kite_scheduler import (
+    QUOTE_BATCH_SIZE,
+    KiteRequestScheduler,
+    TokenBucket,
+)
+from cia_sie.platforms.quote_cache import QuoteCache
+
+SYMBOLS = [f"SYM{i}" for i in range(50)]
+
+
+class FakeKite:
+    """Fake Kite REST API serving /quote and /instruments/historical."""
+
+    def __init__(self, latency: float = 0.0, failing: frozenset = frozenset()):
+        self.latency = latency
+        self.failing = failing
+        self.quote_calls: list[int] = []
+        self.historical_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if request.url.path == "/quote":
+                return self._quote(request)
+            return self._historical(request)
+        finally:
+            self.in_flight -= 1
+
+    def _quote(self, request: httpx.Request) -> httpx.Response:
+        keys = request.url.params.get_list("i")
+        self.quote_calls.append(len(keys))
+        data = {
+            key: {
+                "last_price": 100,
+                "ohlc": {"open": 99, "high": 101, "low": 98, "close": 99},
+                # SYM0 trades at triple its usual volume
+                "volume": 3000 if key == "NSE:SYM0" else 1000,
+                "change": 1,
+            }
+            for key in keys
+            if key.removeprefix("NSE:") not in self.failing
+        }
+        return httpx.Response(200, json={"data": data})
+
+    def _historical(self, request: httpx.Request) -> httpx.Response:
+        self.historical_calls += 1
+        token = int(request.url.path.split("/")[3])
+        if f"SYM{token}" in self.failing:
+            return httpx.Response(500, json={})
+        start = date.fromisoformat(request.url.params["from"])
+        end = date.fromisoformat(request.url.params["to"])
+        candles = []
+        day = start
+        while day <= end:
+            close = 100 + token + (day - start).days
+            candles.append([f"{day.isoformat()}T00:00:00+0530", close, close, close, close, 1000])
+            day += timedelta(days=1)
+        return httpx.Response(200, json={"data": {"candles": candles}})
+
+
+@pytest.fixture
+def make_engine(engine_factory):
+    """Engine over SYMBOLS (token = index) backed by a fake Kite API."""
+
+    def make(fake: FakeKite, scheduler: KiteRequestScheduler) -> KiteIntelligenceEngine:
+        registry = IndexRegistry()
+        registry.add_index("NIFTY50", date.today(), SYMBOLS)
+        return engine_factory(
+            fake.handler,
+            {symbol: i for i, symbol in enumerate(SYMBOLS)},
+            candle_store=None,
+            scheduler=scheduler,
+            quote_cache=QuoteCache(),
+            index_registry=registry,
+        )
+
+    return make
+
+
+class TestTokenBucket:
+    """Tests for request pacing."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_rate(self):
+        """Test a full bucket admits its capacity at once, then paces."""
+        bucket = TokenBucket(rate=50, capacity=5)
+
+        start = time.monotonic()
+        for _ in range(10):
+            await bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        # 5 immediate, 5 more at 50/s
+        assert 0.08 <= elapsed < 0.5
+
+
+class TestSchedulerMap:
+    """Tests for concurrent multi-symbol fetching."""
+
+    @pytest.mark.asyncio
+    async def test_partial_results_with_errors(self):
+        """Test one failing symbol does not discard the others."""
+        scheduler = KiteRequestScheduler()
+
+        async def fetch(symbol):
+            if symbol == "BAD":
+                raise ValueError("Unknown symbol: BAD")
+            return symbol.lower()
+
+        batch = await scheduler.map(["A", "BAD", "B"], fetch)
+
+        assert batch.results == {"A": "a", "B": "b"}
+        assert batch.errors == {"BAD": "Unknown symbol: BAD"}
+        assert not batch.is_complete
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """Test no more than max_concurrency fetches run at once."""
+        scheduler = KiteRequestScheduler(max_concurrency=4)
+        running = 0
+        peak = 0
+
+        async def fetch(symbol):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await scheduler.map([str(i) for i in range(20)], fetch)
+
+        assert peak == 4
+
+
+class TestEngineScans:
+    """Tests for engine scans using the scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_quotes_batched_in_one_call(self, make_engine):
+        """Test a 50-symbol universe needs a single /quote call."""
+        fake = FakeKite()
+        engine = make_engine(fake, KiteRequestScheduler())
+
+        batch = await engine.get_quotes_batch(SYMBOLS)
+
+        assert fake.quote_calls == [50]
+        assert len(batch.results) == 50
+
+    @pytest.mark.asyncio
+    async def test_quotes_split_at_batch_size(self, make_engine):
+        """Test more than QUOTE_BATCH_SIZE instruments are split across calls."""
+        fake = FakeKite()
+        engine = make_engine(fake, KiteRequestScheduler(rate_limits={"quote": 100}))
+        symbols = [f"X{i}" for i in range(QUOTE_BATCH_SIZE + 1)]
+
+        await engine.get_quotes_batch(symbols)
+
+        assert fake.quote_calls == [QUOTE_BATCH_SIZE, 1]
+
+    @pytest.mark.asyncio
+    async def test_volume_anomaly_scan_runs_concurrently(self, make_engine):
+        """Test the NIFTY50 scan makes one quote call and parallel history fetches."""
+        fake = FakeKite(latency=0.02)
+        engine = make_engine(fake, KiteRequestScheduler(rate_limits={"historical": 1000}))
+
+        start = time.monotonic()
+        anomalies = await engine.detect_volume_anomalies("NIFTY50", threshold_multiplier=2.0)
+        elapsed = time.monotonic() - start
+
+        assert fake.quote_calls == [50]
+        assert fake.historical_calls == 50
+        assert fake.max_in_flight > 1
+        assert elapsed < 50 * 0.02  # faster than sequential
+        assert [a.symbol for a in anomalies] == ["SYM0"]
+
+    @pytest.mark.asyncio
+    async def test_historical_rate_limit_respected(self, make_engine):
+        """Test concurrent history fetches are paced by the historical bucket."""
+        fake = FakeKite()
+        engine = make_engine(fake, KiteRequestScheduler(rate_limits={"historical": 20}))
+        today = date.today()
+
+        start = time.monotonic()
+        await engine.get_historical_ohlcv_many(
+            SYMBOLS[:30], today - timedelta(days=10), today - timedelta(days=1)
+        )
+        elapsed = time.monotonic() - start
+
+        # 20 burst, then 10 more at 20/s
+        assert elapsed >= 0.45
+
+    @pytest.mark.asyncio
+    async def test_compare_instruments_reports_errors(self, make_engine):
+        """Test compare_instruments returns partial results with per-symbol errors."""
+        fake = FakeKite(failing=frozenset({"SYM3"}))
+        engine = make_engine(fake, KiteRequestScheduler(rate_limits={"historical": 1000}))
+
+        comparison = await engine.compare_instruments(SYMBOLS[:5], "price_change", 10)
+
+        assert set(comparison["instruments"]) == {"SYM0", "SYM1", "SYM2", "SYM4"}
+        assert set(comparison["errors"]) == {"SYM3"}
+
+    @pytest.mark.asyncio
+    async def test_technical_levels_many(self, make_engine):
+        """Test pivot levels for many symbols come back in one result."""
+        fake = FakeKite(failing=frozenset({"SYM2"}))
+        engine = make_engine(fake, KiteRequestScheduler(rate_limits={"historical": 1000}))
+
+        levels = await engine.calculate_technical_levels_many(SYMBOLS[:4], "camarilla")
+
+        assert levels["method"] == "camarilla"
+        assert set(levels["instruments"]) == {"SYM0", "SYM1", "SYM3"}
+        assert set(levels["errors"]) == {"SYM2"}
+        assert all(
+            isinstance(level, Decimal)
+            for symbol_levels in levels["instruments"].values()
+            for key, level in symbol_levels.items()
+            if key != "method"
+        )
+
+    @pytest.mark.asyncio
+    async def test_technical_levels_use_exchange_date(self, make_engine, monkeypatch):
+        """Test the previous session is taken from the IST trading day."""
+        monkeypatch.setattr(kite_intelligence, "market_today", lambda: date(2025, 3, 12))
+        engine = make_engine(FakeKite(), KiteRequestScheduler(rate_limits={"historical": 1000}))
+        engine.get_historical_ohlcv = AsyncMock(wraps=engine.get_historical_ohlcv)
+        engine.get_historical_ohlcv_many = AsyncMock(wraps=engine.get_historical_ohlcv_many)
+
+        levels = await engine.calculate_technical_levels("SYM1")
+        many = await engine.calculate_technical_levels_many(["SYM1"])
+
+        # Candles run to the day before 12 March IST, whatever the host's date
+        assert engine.get_historical_ohlcv.call_args.args[1:3] == (
+            date(2025, 3, 5), date(2025, 3, 11)
+        )
+        assert engine.get_historical_ohlcv_many.call_args.args[1:3] == (
+            date(2025, 3, 5), date(2025, 3, 11)
+        )
+        assert many["instruments"]["SYM1"] == levels
+
+    @pytest.mark.asyncio
+    async def test_concurrent_engines_share_quote_call(self, make_engine):
+        """Test engines sharing a quote cache merge overlapping requests."""
+        fake = FakeKite(latency=0.01)
+        first = make_engine(fake, KiteRequestScheduler())
+        second = make_engine(fake, KiteRequestScheduler())
+        second.quote_cache = first.quote_cache
+
+        quotes, batch = await asyncio.gather(
+            first.get_quotes(SYMBOLS[:10]),
+            second.get_quotes_batch(SYMBOLS[5:20]),
+        )
+
+        assert fake.quote_calls == [20]
+        assert len(quotes) == 10
+        assert len(batch.results) == 15
@@ -0,0 +1,289 @@
+"""
+Tests for CIA-SIE Kite Ticker
+=============================
+
+Validates binary tick decoding, the preallocated last-tick table,
+subscription management against a local fake feed, and quotes served
+from ticks.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import asyncio
+import json
+import struct
+from decimal import Decimal
+from unittest.mock import Mock
+
+import httpx
+import pytest
+import websockets
+
+from cia_sie.platforms.instruments_master import InstrumentsMaster
+from cia_sie.platforms.kite_intelligence import KiteIntelligenceEngine
+from cia_sie.platforms.kite_scheduler import KiteRequestScheduler
+from cia_sie.platforms.kite_ticker import KiteTicker, TickTable, decode_frame
+from cia_sie.platforms.quote_cache import QuoteCache
+
+INFY = 408065  # NSE equity (segment 1)
+RELIANCE = 738561
+USDINR = 412675  # CDS future (segment 3)
+
+INSTRUMENTS_CSV = [
+    "instrument_token,exchange_token,tradingsymbol,name,last_price,expiry,strike,"
+    "tick_size,lot_size,instrument_type,segment,exchange",
+    f"{INFY},1594,INFY,INFOSYS,0,,0,0.05,1,EQ,NSE,NSE",
+    f"{RELIANCE},2885,RELIANCE,RELIANCE INDUSTRIES,0,,0,0.05,1,EQ,NSE,NSE",
+]
+
+
+def ltp_packet(token: int, ltp: int) -> bytes:
+    return struct.pack(">ii", token, ltp)
+
+
+def quote_packet(token: int, ltp: int, volume: int = 1000, close: int = 0) -> bytes:
+    return struct.pack(
+        ">11i", token, ltp, 10, ltp, volume, 500, 600, ltp - 100, ltp + 100, ltp - 200,
+        close or ltp - 50,
+    )
+
+
+def full_packet(token: int, ltp: int, bid: int, ask: int) -> bytes:
+    head = quote_packet(token, ltp)
+    extra = struct.pack(">5i", 1700000000, 42, 50, 40, 1700000001)
+    bids = struct.pack(">iih2x", 10, bid, 1) + struct.pack(">iih2x", 0, 0, 0) * 4
+    asks = struct.pack(">iih2x", 20, ask, 2) + struct.pack(">iih2x", 0, 0, 0) * 4
+    return head + extra + bids + asks
+
+
+def frame(*packets: bytes) -> bytes:
+    body = b"".join(struct.pack(">H", len(p)) + p for p in packets)
+    return struct.pack(">H", len(packets)) + body
+
+
+class FakeFeed:
+    """Local WebSocket server replaying recorded frames after each subscribe."""
+
+    def __init__(self, frames: list[bytes], drop_first: bool = False):
+        self.frames = frames
+        self.drop_first = drop_first
+        self.connections = 0
+        self.messages: list[dict] = []
+        self.server = None
+
+    async def handler(self, ws):
+        self.connections += 1
+        async for message in ws:
+            payload = json.loads(message)
+            self.messages.append(payload)
+            if payload["a"] == "mode":
+                for data in self.frames:
+                    await ws.send(data)
+                if self.drop_first and self.connections == 1:
+                    await ws.close()
+                    return
+
+    async def __aenter__(self) -> str:
+        self.server = await websockets.serve(self.handler, "localhost", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"ws://localhost:{port}"
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+class TestDecode:
+    """Tests for binary packet decoding."""
+
+    def test_quote_packet(self):
+        """Test quote-mode fields land in the subscribed token's row in rupees."""
+        table = TickTable(4)
+        table.add(INFY)
+
+        applied = decode_frame(frame(quote_packet(INFY, 150025, volume=12345)), table, 1.0)
+        tick = table.get(INFY)
+
+        assert applied == 1
+        assert tick.ltp == 1500.25
+        assert tick.volume == 12345
+        assert tick.high == 1501.25
+        assert tick.close == 1499.75
+
+    def test_full_packet_depth(self):
+        """Test full-mode packets fill OI and best bid/ask."""
+        table = TickTable(4)
+        table.add(INFY)
+
+        decode_frame(frame(full_packet(INFY, 150025, bid=150020, ask=150030)), table)
+        tick = table.get(INFY)
+
+        assert tick.oi == 42
+        assert tick.bid == 1500.20
+        assert tick.ask == 1500.30
+        assert tick.exchange_time is not None
+
+    def test_currency_divisor(self):
+        """Test CDS prices are scaled by 10^7, not 100."""
+        table = TickTable(4)
+        table.add(USDINR)
+
+        decode_frame(frame(ltp_packet(USDINR, 832_512_500)), table)
+
+        assert table.get(USDINR).ltp == pytest.approx(83.25125)
+
+    def test_unsubscribed_and_heartbeat(self):
+        """Test unknown tokens are skipped and heartbeats are ignored."""
+        table = TickTable(4)
+        table.add(INFY)
+
+        assert decode_frame(b"\x00", table) == 0
+        assert decode_frame(frame(ltp_packet(RELIANCE, 100), ltp_packet(INFY, 200)), table) == 1
+        assert table.get(RELIANCE) is None
+        assert table.get(INFY).ltp == 2.0
+
+
+class TestTickTable:
+    """Tests for the preallocated last-tick table."""
+
+    def test_no_tick_yet(self):
+        """Test a subscribed token has no tick until one arrives."""
+        table = TickTable(4)
+        table.add(INFY)
+
+        assert table.get(INFY) is None
+
+    def test_rows_recycled(self):
+        """Test unsubscribed rows are reused and capacity is enforced."""
+        table = TickTable(2)
+        table.add(INFY)
+        table.add(RELIANCE)
+
+        with pytest.raises(ValueError):
+            table.add(USDINR)
+
+        table.remove(INFY)
+        table.add(USDINR)
+        assert len(table) == 2
+        assert INFY not in table
+
+
+class TestKiteTicker:
+    """Tests for the ticker against a local fake feed."""
+
+    @pytest.mark.asyncio
+    async def test_subscribes_and_receives_ticks(self):
+        """Test subscriptions are sent in the ticker mode and ticks are stored."""
+        feed = FakeFeed([frame(quote_packet(INFY, 150025))])
+        async with feed as url:
+            ticker = KiteTicker("key", "token", url=url)
+            await ticker.subscribe([INFY])
+            ticker.start()
+            try:
+                await _until(lambda: ticker.get_tick(INFY) is not None)
+            finally:
+                await ticker.stop()
+
+        assert {"a": "subscribe", "v": [INFY]} in feed.messages
+        assert {"a": "mode", "v": ["quote", [INFY]]} in feed.messages
+
+    @pytest.mark.asyncio
+    async def test_resubscribes_after_reconnect(self):
+        """Test a dropped connection is reopened and subscriptions replayed."""
+        feed = FakeFeed([frame(ltp_packet(INFY, 100))], drop_first=True)
+        async with feed as url:
+            ticker = KiteTicker("key", "token", url=url, reconnect_delay=0.01)
+            await ticker.subscribe([INFY])
+            ticker.start()
+            try:
+                await _until(lambda: sum(m["a"] == "mode" for m in feed.messages) == 2)
+            finally:
+                await ticker.stop()
+
+        subscribes = [m for m in feed.messages if m["a"] == "subscribe"]
+        assert subscribes == [{"a": "subscribe", "v": [INFY]}] * 2
+
+    @pytest.mark.asyncio
+    async def test_sync_symbols_sends_difference(self):
+        """Test syncing to a new symbol list only sends what changed."""
+        master = InstrumentsMaster()
+        master.load_csv(INSTRUMENTS_CSV)
+        feed = FakeFeed([])
+        async with feed as url:
+            ticker = KiteTicker("key", "token", url=url)
+            ticker.start()
+            try:
+                await ticker.wait_connected(2.0)
+                assert await ticker.sync_symbols(["INFY", "NOPE"], master) == ["NOPE"]
+                await ticker.sync_symbols(["NSE:RELIANCE"], master)
+                await _until(lambda: len(feed.messages) == 5)
+            finally:
+                await ticker.stop()
+
+        assert feed.messages[2] == {"a": "unsubscribe", "v": [INFY]}
+        assert feed.messages[3] == {"a": "subscribe", "v": [RELIANCE]}
+        assert ticker.subscribed_tokens == {RELIANCE}
+
+
+class TestQuotesFromTicks:
+    """Tests for get_quotes served from the tick table."""
+
+    @pytest.mark.asyncio
+    async def test_subscribed_symbols_skip_rest(self):
+        """Test subscribed symbols come from ticks and only the rest hit /quote."""
+        requested: list[list[str]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            keys = request.url.params.get_list("i")
+            requested.append(keys)
+            data = {
+                key: {
+                    "last_price": 2500,
+                    "ohlc": {"open": 2490, "high": 2510, "low": 2480, "close": 2495},
+                    "volume": 10,
+                    "change": 5,
+                }
+                for key in keys
+            }
+            return httpx.Response(200, json={"data": data})
+
+        master = InstrumentsMaster()
+        master.load_csv(INSTRUMENTS_CSV)
+        adapter = Mock()
+        adapter.is_connected = True
+        adapter._client = httpx.AsyncClient(
+            base_url="https://api.kite.trade", transport=httpx.MockTransport(handler)
+        )
+
+        feed = FakeFeed([frame(quote_packet(INFY, 150000, volume=777, close=148500))])
+        async with feed as url:
+            ticker = KiteTicker("key", "token", url=url)
+            await ticker.sync_symbols(["INFY"], master)
+            ticker.start()
+            try:
+                await _until(lambda: ticker.get_tick(INFY) is not None)
+                engine = KiteIntelligenceEngine(
+                    adapter,
+                    candle_store=None,
+                    scheduler=KiteRequestScheduler({"quote": 1000}),
+                    quote_cache=QuoteCache(),
+                    instruments=master,
+                    ticker=ticker,
+                )
+                quotes = await engine.get_quotes(["INFY", "RELIANCE"])
+            finally:
+                await ticker.stop()
+
+        assert requested == [["NSE:RELIANCE"]]
+        assert quotes["INFY"].ltp == Decimal("1500.0")
+        assert quotes["INFY"].volume == 777
+        assert quotes["INFY"].change == Decimal("15.0")
+        assert quotes["INFY"].change_percent == Decimal("1.01")
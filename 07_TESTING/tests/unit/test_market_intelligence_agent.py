@@ -0,0 +1,217 @@
+"""
+Tests for CIA-SIE Market Intelligence Agent
+===========================================
+
+Validates the agentic loop: prompt caching, tool result compaction
+and per-iteration token usage reporting.
+
+GOVERNED BY: Constitutional Rules (CR-001, CR-002, CR-003)
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from cia_sie.ai.market_intelligence_agent import (
+    CACHED_MARKET_INTELLIGENCE_TOOLS,
+    MARKET_INTELLIGENCE_TOOLS,
+    TOOL_RESULT_COMPACTION_THRESHOLD,
+    MarketIntelligenceAgent,
+)
+
+
+def _usage(input_tokens=100, output_tokens=20, cache_write=0, cache_read=0):
+    return SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_creation_input_tokens=cache_write,
+        cache_read_input_tokens=cache_read,
+    )
+
+
+def _tool_use_response(tool_id, name, tool_input, usage):
+    block = SimpleNamespace(type="tool_use", id=tool_id, name=name, input=tool_input)
+    return SimpleNamespace(stop_reason="tool_use", content=[block], usage=usage)
+
+
+def _final_response(text, usage):
+    block = SimpleNamespace(type="text", text=text)
+    return SimpleNamespace(stop_reason="end_turn", content=[block], usage=usage)
+
+
+def _make_agent(responses, **kwargs):
+    client = MagicMock()
+    client.messages.create = AsyncMock(side_effect=responses)
+    agent = MarketIntelligenceAgent(
+        anthropic_client=client,
+        kite_engine=MagicMock(),
+        relationship_exposer=MagicMock(),
+        instrument_repository=MagicMock(),
+        **kwargs,
+    )
+    return agent, client
+
+
+class TestPromptCaching:
+    """Tests for cache_control breakpoints."""
+
+    def test_cached_tools_mark_only_last_tool(self):
+        """The breakpoint on the last tool caches the whole tool block."""
+        assert len(CACHED_MARKET_INTELLIGENCE_TOOLS) == len(MARKET_INTELLIGENCE_TOOLS)
+        assert "cache_control" in CACHED_MARKET_INTELLIGENCE_TOOLS[-1]
+        assert all("cache_control" not in t for t in CACHED_MARKET_INTELLIGENCE_TOOLS[:-1])
+        assert all("cache_control" not in t for t in MARKET_INTELLIGENCE_TOOLS)
+
+    @pytest.mark.asyncio
+    async def test_system_and_tools_sent_with_breakpoints(self):
+        """Test system prompt is sent as a cached text block."""
+        agent, client = _make_agent([_final_response("Done.", _usage())])
+
+        await agent.query("How is NIFTY trading?")
+
+        kwargs = client.messages.create.call_args.kwargs
+        assert kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert kwargs["tools"] is CACHED_MARKET_INTELLIGENCE_TOOLS
+
+    @pytest.mark.asyncio
+    async def test_prompt_cache_can_be_disabled(self):
+        """Test plain system string and tools when caching is disabled."""
+        agent, client = _make_agent(
+            [_final_response("Done.", _usage())], enable_prompt_cache=False
+        )
+
+        await agent.query("How is NIFTY trading?")
+
+        kwargs = client.messages.create.call_args.kwargs
+        assert isinstance(kwargs["system"], str)
+        assert kwargs["tools"] is MARKET_INTELLIGENCE_TOOLS
+
+
+class TestIterationUsage:
+    """Tests for per-iteration token accounting."""
+
+    @pytest.mark.asyncio
+    async def test_usage_reported_per_iteration(self):
+        """Test each API call contributes one usage entry."""
+        agent, _ = _make_agent([
+            _tool_use_response("t1", "get_index_constituents", {"index": "NIFTY50"},
+                               _usage(input_tokens=50, cache_write=3000)),
+            _final_response("Done.", _usage(input_tokens=80, output_tokens=40, cache_read=3000)),
+        ])
+        agent.kite.get_index_constituents = AsyncMock(return_value=["RELIANCE"])
+
+        result = await agent.query("What is in NIFTY50?")
+
+        assert [u.iteration for u in result.iteration_usage] == [0, 1]
+        assert result.iteration_usage[1].cache_read_input_tokens == 3000
+        assert result.total_input_tokens == 50 + 3000 + 80 + 3000
+        assert result.uncached_input_tokens == 130
+        assert result.cache_creation_input_tokens == 3000
+        assert result.cache_read_input_tokens == 3000
+        assert result.total_output_tokens == 60
+
+    @pytest.mark.asyncio
+    async def test_missing_usage_is_tolerated(self):
+        """Test responses without usage produce no entries."""
+        response = SimpleNamespace(
+            stop_reason="end_turn", content=[SimpleNamespace(type="text", text="Done.")]
+        )
+        agent, _ = _make_agent([response])
+
+        result = await agent.query("Hello")
+
+        assert result.iteration_usage == []
+
+
+class TestToolResultCompaction:
+    """Tests for compaction of consumed tool results."""
+
+    def _candles(self, n):
+        return [
+            {
+                "timestamp": f"2025-01-{(i % 28) + 1:02d}T00:00:00",
+                "open": 100.0 + i,
+                "high": 110.0 + i,
+                "low": 90.0 + i,
+                "close": 105.0 + i,
+                "volume": 1000,
+            }
+            for i in range(n)
+        ]
+
+    def test_small_results_kept_verbatim(self):
+        """Test payloads under the threshold are not touched."""
+        agent, _ = _make_agent([])
+        content = json.dumps({"symbol": "TCS"})
+
+        assert agent._compact_tool_result("get_quote", {"symbol": "TCS"}, content) == content
+
+    def test_ohlcv_summarised(self):
+        """Test OHLCV arrays collapse to range, extremes and volume."""
+        agent, _ = _make_agent([])
+        candles = self._candles(100)
+        content = json.dumps(candles)
+        assert len(content) > TOOL_RESULT_COMPACTION_THRESHOLD
+
+        summary = json.loads(agent._compact_tool_result("get_historical_data", candles, content))
+
+        assert summary["compacted"] is True
+        assert summary["candles"] == 100
+        assert summary["open"] == 100.0
+        assert summary["close"] == 204.0
+        assert summary["high"] == 209.0
+        assert summary["low"] == 90.0
+        assert summary["total_volume"] == 100_000
+
+    @pytest.mark.asyncio
+    async def test_consumed_results_compacted_before_next_call(self):
+        """Test earlier tool results are compacted once Claude has seen them."""
+        agent, client = _make_agent([
+            _tool_use_response("t1", "get_historical_data",
+                               {"symbol": "TCS", "from_date": "2025-01-01", "to_date": "2025-04-30"},
+                               _usage()),
+            _tool_use_response("t2", "get_index_constituents", {"index": "NIFTY50"}, _usage()),
+            _final_response("Done.", _usage()),
+        ])
+        candles = [
+            SimpleNamespace(
+                timestamp=MagicMock(isoformat=MagicMock(return_value=c["timestamp"])),
+                open=c["open"], high=c["high"], low=c["low"], close=c["close"],
+                volume=c["volume"],
+            )
+            for c in self._candles(100)
+        ]
+        agent.kite.get_historical_ohlcv = AsyncMock(return_value=candles)
+        agent.kite.get_index_constituents = AsyncMock(return_value=["RELIANCE"])
+
+        await agent.query("Analyse TCS")
+
+        messages = client.messages.create.call_args.kwargs["messages"]
+        first_result = messages[2]["content"][0]
+        latest_result = messages[4]["content"][0]
+        assert json.loads(first_result["content"])["compacted"] is True
+        assert json.loads(latest_result["content"]) == ["RELIANCE"]
+
+
+class TestTechnicalLevels:
+    """Tests for the technical levels tool."""
+
+    @pytest.mark.asyncio
+    async def test_symbols_use_batched_levels(self):
+        """Test several symbols are calculated in one batched engine call."""
+        agent, _ = _make_agent([])
+        levels = {"method": "camarilla", "instruments": {"TCS": {}, "INFY": {}}}
+        agent.kite.calculate_technical_levels_many = AsyncMock(return_value=levels)
+        agent.kite.calculate_technical_levels = AsyncMock()
+
+        result = await agent._execute_tool(
+            "calculate_technical_levels", {"symbols": ["TCS", "INFY"], "method": "camarilla"}
+        )
+
+        assert result == levels
+        agent.kite.calculate_technical_levels_many.assert_awaited_once_with(
+            symbols=["TCS", "INFY"], method="camarilla"
+        )
+        agent.kite.calculate_technical_levels.assert_not_called()
@@ -0,0 +1,155 @@
+"""
+Tests for CIA-SIE Top Movers Ranking
+====================================
+
+Validates heap-based top-k/bottom-k selection against a full sort, and
+ranking of real universes through batched quotes.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import random
+import time
+from collections import namedtuple
+from decimal import Decimal
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from cia_sie.platforms.instruments_master import InstrumentsMaster, instrument_keys
+from cia_sie.platforms.kite_intelligence import KiteIntelligenceEngine
+from cia_sie.platforms.kite_scheduler import KiteRequestScheduler
+from cia_sie.platforms.movers import METRICS, QuoteColumns, rank
+from cia_sie.platforms.quote_cache import QuoteCache
+
+FakeQuote = namedtuple("FakeQuote", "ltp open high low volume change_percent")
+
+
+def make_quotes(n: int, seed: int = 7) -> dict[str, FakeQuote]:
+    rng = random.Random(seed)
+    quotes = {}
+    for i in range(n):
+        open_ = rng.uniform(10, 3000)
+        ltp = open_ * rng.uniform(0.9, 1.1)
+        quotes[f"SYM{i}"] = FakeQuote(
+            ltp=Decimal(f"{ltp:.2f}"),
+            open=Decimal(f"{open_:.2f}"),
+            high=Decimal(f"{max(open_, ltp) * 1.01:.2f}"),
+            low=Decimal(f"{min(open_, ltp) * 0.99:.2f}"),
+            volume=rng.choice([1000, 2000, rng.randint(0, 10**7)]),
+            change_percent=Decimal(f"{(ltp / open_ - 1) * 100:.2f}"),
+        )
+    return quotes
+
+
+def full_sort(quotes: dict, metric: str, limit: int, direction: str) -> list[str]:
+    """The engine's previous implementation."""
+    ranked = []
+    for symbol, q in quotes.items():
+        if metric == "volume":
+            value = q.volume
+        elif metric == "change_percent":
+            value = float(q.change_percent)
+        elif metric == "range_percent":
+            value = float((q.high - q.low) / q.open * 100) if q.open > 0 else 0
+        else:
+            value = float(q.ltp) * q.volume
+        ranked.append((symbol, value))
+    ranked.sort(key=lambda x: x[1], reverse=(direction == "top"))
+    return [r[0] for r in ranked[:limit]]
+
+
+class TestRank:
+    """Tests for partial selection."""
+
+    @pytest.mark.parametrize("direction", ["top", "bottom"])
+    def test_matches_full_sort(self, direction):
+        """Test every metric ranks exactly as a full stable sort, ties included."""
+        quotes = make_quotes(2000)
+        columns = QuoteColumns.from_quotes(quotes)
+
+        ranked = rank(columns, METRICS, 15, direction)
+
+        for metric in METRICS:
+            symbols = [columns.symbols[row] for row, _ in ranked[metric]]
+            assert symbols == full_sort(quotes, metric, 15, direction), metric
+
+    def test_unknown_metric_and_small_universe(self):
+        """Test unknown metrics rank nothing and limit may exceed the universe."""
+        columns = QuoteColumns.from_quotes(make_quotes(3))
+
+        ranked = rank(columns, ["volume", "nope"], 10)
+
+        assert len(ranked["volume"]) == 3
+        assert ranked["nope"] == []
+
+    def test_nse_universe_under_a_second(self):
+        """Test ranking the NSE cash universe by all metrics is well under a second."""
+        quotes = make_quotes(3000)
+
+        started = time.perf_counter()
+        rank(QuoteColumns.from_quotes(quotes), METRICS, 20, "top")
+
+        assert time.perf_counter() - started < 1.0
+
+
+class TestUniverses:
+    """Tests for universe resolution in the engine."""
+
+    @pytest.mark.asyncio
+    async def test_all_universe_not_truncated(self):
+        """Test ALL ranks every NSE equity via 500-instrument quote calls."""
+        lines = [
+            "instrument_token,exchange_token,tradingsymbol,name,last_price,expiry,strike,"
+            "tick_size,lot_size,instrument_type,segment,exchange"
+        ]
+        lines += [f"{i},{i},SYM{i},N{i},0,,0,0.05,1,EQ,NSE,NSE" for i in range(1200)]
+        lines.append("99999,1,NIFTY24FUT,NIFTY,0,2024-12-26,0,0.05,50,FUT,NFO-FUT,NFO")
+        master = InstrumentsMaster()
+        master.load_csv(lines)
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            keys = request.url.params.get_list("i")
+            calls.append(len(keys))
+            data = {
+                key: {
+                    "last_price": 100,
+                    "ohlc": {"open": 100, "high": 101, "low": 99, "close": 100},
+                    "volume": int(key.split("SYM")[1]),
+                    "change": 0,
+                }
+                for key in keys
+            }
+            return httpx.Response(200, json={"data": data})
+
+        adapter = Mock()
+        adapter.is_connected = True
+        adapter._client = httpx.AsyncClient(
+            base_url="https://api.kite.trade", transport=httpx.MockTransport(handler)
+        )
+        engine = KiteIntelligenceEngine(
+            adapter,
+            candle_store=None,
+            scheduler=KiteRequestScheduler({"quote": 1000}),
+            quote_cache=QuoteCache(),
+            instruments=master,
+        )
+
+        movers = await engine.get_top_movers("ALL", "volume", limit=3)
+
+        assert sorted(calls) == [200, 500, 500]
+        assert [m.symbol for m in movers] == ["SYM1199", "SYM1198", "SYM1197"]
+        assert movers[0].metric_value == 1199
+
+    def test_watchlist_keys(self):
+        """Test CIA-SIE instruments map to exchange-qualified lookup keys."""
+        Instrument = namedtuple("Instrument", "symbol metadata_json")
+
+        keys = instrument_keys([
+            Instrument("INFY", {"exchange": "BSE"}),
+            Instrument("TCS", None),
+        ])
+
+        assert keys == ["BSE:INFY", "TCS"]
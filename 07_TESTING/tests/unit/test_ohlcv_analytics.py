@@ -0,0 +1,160 @@
+"""
+Tests for CIA-SIE OHLCV Analytics Kernels
+=========================================
+
+Validates array-backed series and kernels against straightforward
+per-candle reference calculations.
+
+GOVERNED BY: Section 8 (Platform Integration) and Constitutional Rules
+"""
+
+import statistics
+from array import array
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from cia_sie.platforms.kite_intelligence import OHLCV
+from cia_sie.platforms.ohlcv_analytics import (
+    OHLCVSeries,
+    annualized_volatility_percent,
+    average_volume,
+    compare_series,
+    pivot_levels,
+    pivot_levels_many,
+    quantize_levels,
+    rolling_mean,
+    rolling_volumes_many,
+    simple_returns,
+    volume_ratio,
+)
+
+CLOSES = ["100", "102.5", "101", "104.25", "103", "106"]
+
+
+def _candles(closes=CLOSES) -> list[OHLCV]:
+    start = datetime(2025, 1, 1)
+    return [
+        OHLCV(
+            timestamp=start + timedelta(days=i),
+            open=Decimal(c),
+            high=Decimal(c) + 2,
+            low=Decimal(c) - 1,
+            close=Decimal(c),
+            volume=1000 * (i + 1),
+        )
+        for i, c in enumerate(closes)
+    ]
+
+
+class TestSeries:
+    """Tests for OHLCVSeries construction."""
+
+    def test_from_candles(self):
+        """Test candles become typed columns."""
+        series = OHLCVSeries.from_candles("ABC", _candles())
+
+        assert len(series) == 6
+        assert series.close.typecode == "d"
+        assert series.volume.typecode == "q"
+        assert series.close[1] == 102.5
+
+
+class TestKernels:
+    """Tests for individual kernels."""
+
+    def test_volatility_matches_statistics_stdev(self):
+        """Test annualised volatility matches the per-candle reference."""
+        closes = [float(c) for c in CLOSES]
+        returns = [(b - a) / a for a, b in zip(closes, closes[1:])]
+        expected = statistics.stdev(returns) * 100 * (252 ** 0.5)
+
+        assert annualized_volatility_percent(array("d", closes)) == pytest.approx(expected)
+
+    def test_simple_returns(self):
+        """Test returns are period over period."""
+        assert list(simple_returns(array("d", [100, 110, 99]))) == pytest.approx([0.1, -0.1])
+
+    def test_rolling_mean(self):
+        """Test trailing means slide one period at a time."""
+        means = rolling_mean(array("q", [1, 2, 3, 4, 5]), 3)
+        assert list(means) == [2.0, 3.0, 4.0]
+        assert len(rolling_mean(array("q", [1, 2]), 3)) == 0
+
+    def test_average_volume_and_ratio(self):
+        """Test baseline average divides by the requested baseline."""
+        avg = average_volume(array("q", [100, 200, 300]), 2)
+        assert avg == 250
+        assert volume_ratio(500, avg) == 2.0
+        assert volume_ratio(500, 0) == 0
+
+    @pytest.mark.parametrize("method", ["standard_pivot", "fibonacci", "camarilla"])
+    def test_pivot_methods(self, method):
+        """Test all pivot methods return ordered support and resistance."""
+        levels = pivot_levels(110.0, 100.0, 105.0, method)
+
+        assert levels["method"] == method
+        assert levels["s1"] < levels["r1"]
+
+    def test_standard_pivot_values(self):
+        """Test standard pivot arithmetic."""
+        levels = pivot_levels(110.0, 100.0, 105.0, "standard_pivot")
+        assert levels["pivot"] == 105.0
+        assert levels["r1"] == 110.0
+        assert levels["s1"] == 100.0
+
+    def test_unknown_pivot_method(self):
+        """Test unknown methods are rejected."""
+        with pytest.raises(ValueError):
+            pivot_levels(110.0, 100.0, 105.0, "gann")
+
+    def test_quantize_levels(self):
+        """Test float levels can be displayed as exact Decimals."""
+        levels = quantize_levels({"method": "standard_pivot", "pivot": 105.125})
+        assert levels == {"method": "standard_pivot", "pivot": Decimal("105.12")}
+
+
+class TestMultiSymbol:
+    """Tests for multi-symbol kernels."""
+
+    def test_compare_series_metrics(self):
+        """Test comparison metrics are computed per symbol."""
+        series = {
+            "ABC": OHLCVSeries.from_candles("ABC", _candles()),
+            "XYZ": OHLCVSeries.from_candles("XYZ", _candles(["50", "55"])),
+        }
+
+        assert compare_series(series, "price_change") == {
+            "ABC": {"change_percent": 6.0},
+            "XYZ": {"change_percent": 10.0},
+        }
+        # Three periods are needed for two returns
+        assert set(compare_series(series, "volatility")) == {"ABC"}
+        assert compare_series(series, "unknown") == {}
+
+    def test_volume_change(self):
+        """Test volume change compares the two halves."""
+        series = {"ABC": OHLCVSeries.from_candles("ABC", _candles())}
+        # first half 1000+2000+3000, second half 4000+5000+6000
+        assert compare_series(series, "volume_change")["ABC"] == {"volume_change_percent": 150.0}
+
+    def test_rolling_volumes_many(self):
+        """Test rolling volumes are computed for every symbol."""
+        series = {
+            "ABC": OHLCVSeries.from_candles("ABC", _candles()),
+            "XYZ": OHLCVSeries.from_candles("XYZ", _candles(["50", "55"])),
+        }
+
+        volumes = rolling_volumes_many(series, 3)
+
+        assert list(volumes["ABC"]) == [2000.0, 3000.0, 4000.0, 5000.0]
+        assert len(volumes["XYZ"]) == 0
+
+    def test_pivot_levels_many_uses_last_period(self):
+        """Test pivots are taken from each symbol's last candle."""
+        series = {"ABC": OHLCVSeries.from_candles("ABC", _candles())}
+
+        levels = pivot_levels_many(series, "standard_pivot")
+
+        assert levels["ABC"] == pivot_levels(108.0, 105.0, 106.0, "standard_pivot")
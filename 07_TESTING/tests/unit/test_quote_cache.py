@@ -0,0 +1,193 @@
+"""
+Tests for CIA-SIE Quote Cache
+=============================
+
+Validates TTL reuse, coalescing of concurrent misses into one upstream
+call, and quote age reporting.
+
+GOVERNED BY: Section 8 (Platform Integration)
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from cia_sie.platforms.kite_intelligence import Quote
+from cia_sie.platforms.quote_cache import QuoteCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeUpstream:
+    """Records batched fetches; optionally slow or failing."""
+
+    def __init__(self, latency: float = 0.0, missing: frozenset = frozenset()):
+        self.latency = latency
+        self.missing = missing
+        self.calls: list[list[str]] = []
+        self.fail_with: Exception | None = None
+
+    async def fetch(self, symbols: list[str]) -> dict[str, str]:
+        self.calls.append(sorted(symbols))
+        await asyncio.sleep(self.latency)
+        if self.fail_with is not None:
+            raise self.fail_with
+        return {s: f"quote:{s}" for s in symbols if s not in self.missing}
+
+
+class TestCaching:
+    """Tests for TTL reuse."""
+
+    @pytest.mark.asyncio
+    async def test_hit_within_ttl(self):
+        """Test a repeat request inside the TTL does not go upstream."""
+        clock = FakeClock()
+        cache = QuoteCache(ttl=1.0, clock=clock)
+        upstream = FakeUpstream()
+
+        await cache.get_many(["NIFTY"], upstream.fetch)
+        clock.now = 0.9
+        batch = await cache.get_many(["NIFTY"], upstream.fetch)
+
+        assert batch.results == {"NIFTY": "quote:NIFTY"}
+        assert len(upstream.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_refetched(self):
+        """Test quotes older than the TTL are fetched again."""
+        clock = FakeClock()
+        cache = QuoteCache(ttl=1.0, clock=clock)
+        upstream = FakeUpstream()
+
+        await cache.get_many(["NIFTY"], upstream.fetch)
+        clock.now = 1.5
+        await cache.get_many(["NIFTY"], upstream.fetch)
+
+        assert len(upstream.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_max_age_tightens_ttl(self):
+        """Test a caller can demand fresher quotes than the TTL."""
+        clock = FakeClock()
+        cache = QuoteCache(ttl=5.0, clock=clock)
+        upstream = FakeUpstream()
+
+        await cache.get_many(["NIFTY"], upstream.fetch)
+        clock.now = 2.0
+        await cache.get_many(["NIFTY"], upstream.fetch, max_age=1.0)
+
+        assert len(upstream.calls) == 2
+
+
+class TestCoalescing:
+    """Tests for fan-in of concurrent requests."""
+
+    @pytest.mark.asyncio
+    async def test_overlapping_requests_share_one_call(self):
+        """Test concurrent misses for overlapping sets become one batched fetch."""
+        cache = QuoteCache(ttl=1.0)
+        upstream = FakeUpstream(latency=0.01)
+
+        first, second = await asyncio.gather(
+            cache.get_many(["NIFTY", "RELIANCE"], upstream.fetch),
+            cache.get_many(["RELIANCE", "INFY"], upstream.fetch),
+        )
+
+        assert upstream.calls == [["INFY", "NIFTY", "RELIANCE"]]
+        assert set(first.results) == {"NIFTY", "RELIANCE"}
+        assert set(second.results) == {"RELIANCE", "INFY"}
+
+    @pytest.mark.asyncio
+    async def test_in_flight_symbols_are_awaited(self):
+        """Test a request arriving mid-fetch waits instead of refetching."""
+        cache = QuoteCache(ttl=0)
+        upstream = FakeUpstream(latency=0.05)
+
+        first = asyncio.create_task(cache.get_many(["NIFTY"], upstream.fetch))
+        await asyncio.sleep(0.01)
+        second = await cache.get_many(["NIFTY"], upstream.fetch)
+
+        assert (await first).results == second.results
+        assert len(upstream.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_large_request_split_into_batches(self):
+        """Test misses are fetched in chunks of max_batch."""
+        cache = QuoteCache(max_batch=2)
+        upstream = FakeUpstream()
+
+        await cache.get_many(["A", "B", "C"], upstream.fetch)
+
+        assert sorted(len(c) for c in upstream.calls) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_fetch(self):
+        """Test one caller timing out leaves the shared fetch running for others."""
+        cache = QuoteCache()
+        upstream = FakeUpstream(latency=0.05)
+
+        impatient = asyncio.create_task(cache.get_many(["NIFTY"], upstream.fetch))
+        patient = asyncio.create_task(cache.get_many(["NIFTY"], upstream.fetch))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+
+        assert (await patient).results == {"NIFTY": "quote:NIFTY"}
+
+
+class TestErrors:
+    """Tests for missing symbols and failed fetches."""
+
+    @pytest.mark.asyncio
+    async def test_missing_symbol_reported(self):
+        """Test symbols the upstream omits are errors, not cached."""
+        cache = QuoteCache()
+        upstream = FakeUpstream(missing=frozenset({"BAD"}))
+
+        batch = await cache.get_many(["NIFTY", "BAD"], upstream.fetch)
+
+        assert batch.errors == {"BAD": "No quote returned"}
+        assert "NIFTY" in batch.results
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_recorded_or_raised(self):
+        """Test fetch failures become errors, or propagate when asked."""
+        cache = QuoteCache()
+        upstream = FakeUpstream()
+        upstream.fail_with = ConnectionError("Quote API error: 429")
+
+        batch = await cache.get_many(["NIFTY"], upstream.fetch)
+        assert batch.errors == {"NIFTY": "Quote API error: 429"}
+
+        with pytest.raises(ConnectionError):
+            await cache.get_many(["NIFTY"], upstream.fetch, raise_errors=True)
+
+
+class TestQuoteAge:
+    """Tests for staleness reporting on quotes."""
+
+    def test_age_seconds(self):
+        """Test a quote reports how long ago it was fetched."""
+        quote = Quote(
+            symbol="NIFTY",
+            ltp=Decimal("100"),
+            open=Decimal("99"),
+            high=Decimal("101"),
+            low=Decimal("98"),
+            close=Decimal("99"),
+            volume=1000,
+            change=Decimal("1"),
+            change_percent=Decimal("1.01"),
+            timestamp=datetime.now() - timedelta(seconds=3),
+        )
+
+        assert 3 <= quote.age_seconds < 4
@@ -0,0 +1,232 @@
+"""
+Tests for CIA-SIE AI Usage Accumulator
+======================================
+
+Validates write-behind usage accounting and flushing to AIUsageDB.
+
+GOVERNED BY: Section 14 (AI Narrative Engine)
+"""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from cia_sie.ai.usage_accumulator import UsageAccumulator, UsageTotals
+from cia_sie.ai.usage_tracker import UsageTracker
+from cia_sie.core.enums import UsagePeriod
+from cia_sie.dal.models import AIUsageDB
+
+TODAY = date(2025, 6, 18)  # Wednesday
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """In-memory database holding only the usage table."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(AIUsageDB.__table__.create)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _rows(session_factory) -> dict[str, AIUsageDB]:
+    async with session_factory() as session:
+        result = await session.execute(select(AIUsageDB))
+        return {row.period_type: row for row in result.scalars().all()}
+
+
+class TestUsageTotals:
+    """Tests for UsageTotals arithmetic."""
+
+    def test_add_updates_breakdown(self):
+        """Test adding a request updates totals and per-model stats."""
+        totals = UsageTotals()
+        totals.add("model-a", 100, 50, Decimal("0.01"))
+        totals.add("model-a", 10, 5, Decimal("0.002"))
+
+        assert totals.requests_count == 2
+        assert totals.cost == Decimal("0.012")
+        assert totals.model_breakdown["model-a"]["input_tokens"] == 110
+
+    def test_merge(self):
+        """Test merging totals sums every field."""
+        a = UsageTotals()
+        a.add("model-a", 100, 50, Decimal("0.01"))
+        b = UsageTotals()
+        b.add("model-b", 10, 5, Decimal("0.002"))
+
+        a.merge(b)
+
+        assert a.requests_count == 2
+        assert set(a.model_breakdown) == {"model-a", "model-b"}
+
+
+class TestRecord:
+    """Tests for in-memory recording."""
+
+    def test_record_updates_all_periods(self):
+        """Test a request is counted in daily, weekly and monthly totals."""
+        acc = UsageAccumulator(flush_interval_seconds=60)
+
+        totals = acc.record("model-a", 100, 50, Decimal("0.01"), TODAY)
+
+        assert set(totals) == {UsagePeriod.DAILY, UsagePeriod.WEEKLY, UsagePeriod.MONTHLY}
+        for period_totals in totals.values():
+            assert period_totals.requests_count == 1
+
+    def test_period_bounds(self):
+        """Test periods are keyed by their start date."""
+        acc = UsageAccumulator(flush_interval_seconds=60)
+        acc.record("model-a", 100, 50, Decimal("0.01"), TODAY)
+
+        assert acc.get(UsagePeriod.WEEKLY, TODAY).period_start == date(2025, 6, 16)
+        assert acc.get(UsagePeriod.MONTHLY, TODAY).period_end == date(2025, 6, 30)
+
+    def test_new_day_starts_new_daily_period(self):
+        """Test the daily period rolls over while monthly accumulates."""
+        acc = UsageAccumulator(flush_interval_seconds=60)
+        acc.record("model-a", 100, 50, Decimal("0.01"), TODAY)
+        acc.record("model-a", 100, 50, Decimal("0.01"), date(2025, 6, 19))
+
+        assert acc.get(UsagePeriod.DAILY, date(2025, 6, 19)).totals.requests_count == 1
+        assert acc.get(UsagePeriod.MONTHLY, TODAY).totals.requests_count == 2
+
+
+class TestFlush:
+    """Tests for writing pending usage to the database."""
+
+    @pytest.mark.asyncio
+    async def test_flush_creates_rows(self, session_factory):
+        """Test first flush creates one row per period."""
+        acc = UsageAccumulator(flush_interval_seconds=60)
+        acc.record("model-a", 100, 50, Decimal("0.01"), TODAY)
+
+        async with session_factory() as session:
+            written = await acc.flush(session)
+
+        rows = await _rows(session_factory)
+        assert written == 3
+        assert set(rows) == {"DAILY", "WEEKLY", "MONTHLY"}
+        assert rows["MONTHLY"].requests_count == 1
+        assert rows["MONTHLY"].total_cost == Decimal("0.01")
+
+    @pytest.mark.asyncio
+    async def test_flush_adds_deltas_to_existing_rows(self, session_factory):
+        """Test later flushes add only what was recorded since."""
+        acc = UsageAccumulator(flush_interval_seconds=60)
+        acc.record("model-a", 100, 50, Decimal("0.01"), TODAY)
+        async with session_factory() as session:
+            await acc.flush(session)
+
+        acc.record("model-b", 10, 5, Decimal("0.002"), TODAY)
+        async with session_factory() as session:
+            await acc.flush(session)
+
+        monthly = (await _rows(session_factory))["MONTHLY"]
+        assert monthly.requests_count == 2
+        assert monthly.input_tokens == 110
+        assert set(monthly.model_breakdown) == {"model-a", "model-b"}
+        assert acc.get(UsagePeriod.MONTHLY, TODAY).pending.is_empty
+
+    @pytest.mark.asyncio
+    async def test_flush_with_nothing_pending(self, session_factory):
+        """Test an idle flush writes nothing."""
+        acc = UsageAccumulator(flush_interval_seconds=60)
+
+        async with session_factory() as session:
+            assert await acc.flush(session) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_pending(self, session_factory):
+        """Test pending usage survives a failed flush."""
+        acc = UsageAccumulator(flush_interval_seconds=60)
+        acc.record("model-a", 100, 50, Decimal("0.01"), TODAY)
+
+        async with session_factory() as session:
+            with patch.object(session, "commit", side_effect=RuntimeError("db down")):
+                with pytest.raises(RuntimeError):
+                    await acc.flush(session)
+
+        assert acc.get(UsagePeriod.MONTHLY, TODAY).pending.requests_count == 1
+
+    @pytest.mark.asyncio
+    async def test_ensure_loaded_reads_persisted_totals(self, session_factory):
+        """Test a fresh accumulator picks up totals from earlier runs."""
+        first = UsageAccumulator(flush_interval_seconds=60)
+        first.record("model-a", 100, 50, Decimal("0.01"), TODAY)
+        async with session_factory() as session:
+            await first.flush(session)
+
+        second = UsageAccumulator(flush_interval_seconds=60)
+        async with session_factory() as session:
+            await second.ensure_loaded(session, TODAY)
+        second.record("model-a", 100, 50, Decimal("0.01"), TODAY)
+
+        assert second.get(UsagePeriod.MONTHLY, TODAY).totals.requests_count == 2
+
+
+class TestTrackerIntegration:
+    """Tests for UsageTracker served from the accumulator."""
+
+    @pytest.mark.asyncio
+    async def test_check_budget_after_record(self, session_factory):
+        """Test budget reflects recorded usage before any flush."""
+        acc = UsageAccumulator(flush_interval_seconds=60)
+        with patch("cia_sie.ai.usage_tracker.get_settings") as mock_settings:
+            mock_settings.return_value.ai_budget_limit = 1.0
+            mock_settings.return_value.ai_budget_alert_threshold = 80
+
+            async with session_factory() as session:
+                tracker = UsageTracker(session, accumulator=acc)
+                with patch("cia_sie.ai.usage_tracker.estimate_cost", return_value=0.5):
+                    await tracker.record_usage("model-a", 100, 50)
+                    await tracker.record_usage("model-a", 100, 50)
+
+                status = await tracker.check_budget()
+
+        assert status["within_budget"] is False
+        assert await _rows(session_factory) == {}
+
+    @pytest.mark.asyncio
+    async def test_get_usage_daily_and_weekly(self, session_factory):
+        """Test daily and weekly statistics are maintained."""
+        acc = UsageAccumulator(flush_interval_seconds=60)
+        async with session_factory() as session:
+            tracker = UsageTracker(session, accumulator=acc)
+            await tracker.record_usage("claude-3-haiku-20240307", 1000, 500)
+
+            daily = await tracker.get_usage(UsagePeriod.DAILY)
+            weekly = await tracker.get_usage(UsagePeriod.WEEKLY)
+
+        assert daily["requests_count"] == 1
+        assert weekly["tokens_used"]["total"] == 1500
+
+    @pytest.mark.asyncio
+    async def test_cache_tokens_priced_at_own_rates(self, session_factory):
+        """Test cache writes cost 1.25x and cache reads 0.1x the input rate."""
+        acc = UsageAccumulator(flush_interval_seconds=60)
+        async with session_factory() as session:
+            tracker = UsageTracker(session, accumulator=acc)
+            record = await tracker.record_usage(
+                "claude-3-haiku-20240307",
+                1000,
+                0,
+                cache_creation_tokens=4000,
+                cache_read_tokens=40000,
+            )
+
+            usage = await tracker.get_usage(UsagePeriod.DAILY)
+
+        # 1K uncached + 4K written at 1.25x + 40K read at 0.1x = 10K input-equivalents
+        assert record["cost"] == pytest.approx(10 * 0.00025)
+        assert usage["tokens_used"]["input"] == 45000